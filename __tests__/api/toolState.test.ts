@@ -0,0 +1,134 @@
+import { POST } from '@/app/api/user/tool-state/route';
+import { auth } from '@clerk/nextjs/server';
+import { getToolModel } from '@/models/tools';
+import User from '@/models/user';
+
+jest.mock('@clerk/nextjs/server', () => ({
+  auth: jest.fn(),
+}));
+
+// Mock the database connections
+jest.mock('@/lib/db/websitedb', () => ({
+  connectToolsDB: jest.fn().mockResolvedValue(undefined),
+}));
+
+jest.mock('@/lib/db/userdb', () => ({
+  connectUserDB: jest.fn().mockResolvedValue(undefined),
+}));
+
+// Mock the database models
+jest.mock('@/models/tools', () => ({
+  getToolModel: jest.fn(),
+}));
+
+jest.mock('@/models/user', () => ({
+  __esModule: true,
+  default: { findOne: jest.fn() },
+}));
+
+const mockAuth = auth as unknown as jest.Mock;
+const mockGetToolModel = getToolModel as jest.MockedFunction<typeof getToolModel>;
+const mockFindUser = User.findOne as jest.Mock;
+
+const TOOL_A = '507f1f77bcf86cd799439011';
+const TOOL_B = '507f1f77bcf86cd799439012';
+
+// Stand-in for Model.find/findOne(...).select(...).lean()
+const query = (result: unknown) => ({
+  select: jest.fn().mockReturnValue({ lean: jest.fn().mockResolvedValue(result) }),
+});
+
+const request = (body: unknown) =>
+  new Request('http://localhost:3000/api/user/tool-state', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  }) as any;
+
+describe('Tool State API', () => {
+  let mockToolModel: any;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    mockAuth.mockResolvedValue({ userId: 'user_123' });
+
+    mockToolModel = {
+      find: jest.fn().mockReturnValue(query([
+        { _id: TOOL_A, title: 'Tool A', likeCount: 3, saveCount: 1 },
+        { _id: TOOL_B, title: 'Tool B', likeCount: 0, saveCount: 2 },
+      ])),
+    };
+    mockGetToolModel.mockResolvedValue(mockToolModel);
+
+    mockFindUser.mockReturnValue(query({
+      likedTools: [TOOL_A],
+      savedTools: [],
+      folders: [
+        { name: 'Work', tools: [{ name: 'Tool B' }], createdAt: new Date('2024-01-01T00:00:00.000Z') },
+      ],
+    }));
+  });
+
+  describe('POST /api/user/tool-state', () => {
+    it('should return the state of every requested tool with one query each', async () => {
+      const response = await POST(request({ toolIds: [TOOL_A, TOOL_B, TOOL_A] }));
+      const data = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(mockToolModel.find).toHaveBeenCalledTimes(1);
+      expect(mockToolModel.find).toHaveBeenCalledWith({ _id: { $in: [TOOL_A, TOOL_B] } });
+      expect(mockFindUser).toHaveBeenCalledWith({ clerkId: 'user_123' });
+      expect(data.states).toEqual({
+        [TOOL_A]: { hasLiked: true, hasSaved: false, folder: null, likeCount: 3, saveCount: 1 },
+        [TOOL_B]: { hasLiked: false, hasSaved: true, folder: 'Work', likeCount: 0, saveCount: 2 },
+      });
+      expect(data.folders).toEqual([
+        { name: 'Work', tools: [{ name: 'Tool B' }], createdAt: '2024-01-01T00:00:00.000Z' },
+      ]);
+    });
+
+    it('should require authentication', async () => {
+      mockAuth.mockResolvedValue({ userId: null });
+
+      const response = await POST(request({ toolIds: [TOOL_A] }));
+
+      expect(response.status).toBe(401);
+      expect(mockGetToolModel).not.toHaveBeenCalled();
+    });
+
+    it('should reject a missing or empty id list', async () => {
+      expect((await POST(request({}))).status).toBe(400);
+      expect((await POST(request({ toolIds: [] }))).status).toBe(400);
+      expect((await POST(request({ toolIds: ['not-an-id'] }))).status).toBe(400);
+    });
+
+    it('should reject more than 100 tool ids', async () => {
+      const toolIds = Array.from({ length: 101 }, (_, i) => i.toString(16).padStart(24, '0'));
+
+      const response = await POST(request({ toolIds }));
+
+      expect(response.status).toBe(400);
+      expect(mockToolModel.find).not.toHaveBeenCalled();
+    });
+
+    it('should return 404 when the user does not exist', async () => {
+      mockFindUser.mockReturnValue(query(null));
+
+      const response = await POST(request({ toolIds: [TOOL_A] }));
+
+      expect(response.status).toBe(404);
+    });
+
+    it('should handle database errors', async () => {
+      mockToolModel.find.mockImplementation(() => {
+        throw new Error('Database error');
+      });
+
+      const response = await POST(request({ toolIds: [TOOL_A] }));
+      const data = await response.json();
+
+      expect(response.status).toBe(500);
+      expect(data.error).toBe('Failed to get tool state');
+    });
+  });
+});
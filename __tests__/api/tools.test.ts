@@ -10,6 +10,7 @@ jest.mock('@/lib/db/websitedb', () => ({
 // Mock the database models
 jest.mock('@/models/tools', () => ({
   getToolModel: jest.fn(),
+  toCategorySlug: jest.requireActual('@/models/tools').toCategorySlug,
 }));
 
 jest.mock('@/lib/rateLimiter', () => ({
@@ -33,6 +34,8 @@ describe('Tools API', () => {
       findByIdAndUpdate: jest.fn(),
       findByIdAndDelete: jest.fn(),
       countDocuments: jest.fn(),
+      exists: jest.fn().mockResolvedValue({ _id: '507f1f77bcf86cd799439011' }),
+      distinct: jest.fn().mockResolvedValue([]),
     };
 
     mockGetToolModel.mockResolvedValue(mockToolModel);
@@ -151,6 +154,56 @@ describe('Tools API', () => {
       expect(data.success).toBe(true);
       expect(data.tools).toHaveLength(1);
       expect(data.tools[0].category).toBe('AI');
+      const filter = mockToolModel.find.mock.calls[0][0];
+      expect(filter.isActive).toBe(true);
+      expect(filter.$or[0]).toEqual({ categorySlug: 'ai' });
+      // Tools not yet backfilled with a slug are matched on their name
+      expect(filter.$or[1].categorySlug).toEqual({ $exists: false });
+      expect(filter.$or[1].category.$regex.test('AI')).toBe(true);
+      expect(filter.$or[1].category.$regex.test('AI Writing')).toBe(false);
+    });
+
+    it('should fall back to partial category matches like the category route', async () => {
+      mockToolModel.exists.mockResolvedValue(null);
+      mockToolModel.distinct.mockResolvedValue(['all-in-one-tools']);
+      mockToolModel.find.mockReturnValue({
+        sort: jest.fn().mockReturnValue({
+          skip: jest.fn().mockReturnValue({
+            limit: jest.fn().mockReturnValue({
+              lean: jest.fn().mockResolvedValue([]),
+            }),
+          }),
+        }),
+      });
+
+      const response = await GET(new Request('http://localhost:3000/api/tools?category=all-in-one') as any);
+
+      expect(response.status).toBe(200);
+      expect(mockToolModel.distinct).toHaveBeenCalledWith('categorySlug', { categorySlug: { $regex: /all-in-one/ } });
+      const filter = mockToolModel.find.mock.calls[0][0];
+      expect(filter.$or[0]).toEqual({ categorySlug: 'all-in-one-tools' });
+      expect(filter.$or[1].category.$regex.test('All In One Tools')).toBe(true);
+    });
+
+    it('should match categories stored HTML-escaped by their raw name', async () => {
+      mockToolModel.find.mockReturnValue({
+        sort: jest.fn().mockReturnValue({
+          skip: jest.fn().mockReturnValue({
+            limit: jest.fn().mockReturnValue({
+              lean: jest.fn().mockResolvedValue([]),
+            }),
+          }),
+        }),
+      });
+
+      const request = new Request('http://localhost:3000/api/tools?category=AI%20%26%20ML') as any;
+      const response = await GET(request);
+
+      expect(response.status).toBe(200);
+      const filter = mockToolModel.find.mock.calls[0][0];
+      expect(filter.$or[0]).toEqual({ categorySlug: 'ai-&-ml' });
+      expect(filter.$or[1].category.$regex.test('AI &amp; ML')).toBe(true);
+      expect(jest.requireActual('@/models/tools').toCategorySlug('AI &amp; ML')).toBe('ai-&-ml');
     });
 
     it('should search tools by title when search parameter is provided', async () => {
@@ -191,5 +244,42 @@ describe('Tools API', () => {
       expect(data.tools).toHaveLength(1);
       expect(data.tools[0].title).toBe('Searchable Tool');
     });
+
+    it('should page the date sort through tools without createdAt', async () => {
+      const undated = [
+        { _id: '507f1f77bcf86cd799439012', title: 'Newer Tool', category: 'AI', likeCount: 0, saveCount: 0 },
+        { _id: '507f1f77bcf86cd799439011', title: 'Older Tool', category: 'AI', likeCount: 0, saveCount: 0 },
+      ];
+      mockToolModel.find.mockReturnValue({
+        sort: jest.fn().mockReturnValue({
+          skip: jest.fn().mockReturnValue({
+            limit: jest.fn().mockReturnValue({
+              lean: jest.fn().mockResolvedValue(undated),
+            }),
+          }),
+        }),
+      });
+      mockToolModel.countDocuments.mockResolvedValue(2);
+
+      const response = await GET(new Request('http://localhost:3000/api/tools?sortBy=date&limit=1') as any);
+      const data = await response.json();
+
+      expect(response.status).toBe(200);
+      expect(data.tools).toHaveLength(1);
+      expect(data.pagination.hasNext).toBe(true);
+      expect(data.pagination.nextCursor).toEqual(expect.any(String));
+
+      mockToolModel.find.mockClear();
+      const next = await GET(
+        new Request(`http://localhost:3000/api/tools?sortBy=date&limit=1&cursor=${data.pagination.nextCursor}`) as any
+      );
+
+      expect(next.status).toBe(200);
+      // Past an undated tool only other undated tools with a lower _id remain
+      expect(mockToolModel.find).toHaveBeenCalledWith({
+        isActive: true,
+        $or: [{ createdAt: null, _id: { $lt: '507f1f77bcf86cd799439012' } }],
+      });
+    });
   });
 }); 
\ No newline at end of file
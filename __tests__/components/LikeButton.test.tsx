@@ -1,7 +1,8 @@
 import React from 'react';
-import { render, screen, fireEvent, waitFor } from '@testing-library/react';
+import { render, screen, fireEvent, waitFor, act } from '@testing-library/react';
 import '@testing-library/jest-dom';
 import LikeButton from '../../components/S-components/LikeButton';
+import { resetToolUserState } from '../../lib/toolUserState';
 
 // Mock Clerk
 jest.mock('@clerk/nextjs', () => ({
@@ -14,6 +15,40 @@ global.fetch = jest.fn();
 
 const mockUseUser = require('@clerk/nextjs').useUser;
 
+type MockResponse = { ok: boolean; status?: number; json?: () => Promise<unknown> };
+
+// Answer fetch calls by URL; card state comes from the batched tool-state endpoint
+const mockApi = (responses: Record<string, MockResponse | (() => Promise<MockResponse>)>) => {
+  (fetch as jest.Mock).mockImplementation((url: string) => {
+    const response = responses[url];
+    if (typeof response === 'function') return response();
+    return Promise.resolve(response ?? { ok: false, status: 404, json: () => Promise.resolve({}) });
+  });
+};
+
+const toolState = (state: { hasLiked: boolean; likeCount?: number }): MockResponse => ({
+  ok: true,
+  json: () => Promise.resolve({
+    success: true,
+    states: {
+      'test-tool-id': { hasSaved: false, folder: null, likeCount: 10, saveCount: 0, ...state },
+    },
+    folders: [],
+  }),
+});
+
+const likeResponse = (likeCount: number): MockResponse => ({ ok: true, json: () => Promise.resolve({ likeCount }) });
+
+// Wait until the batched state request was sent and its result applied
+const waitForToolState = async () => {
+  await waitFor(() => {
+    expect(fetch).toHaveBeenCalledWith('/api/user/tool-state', expect.any(Object));
+  });
+  await act(async () => {
+    await new Promise(resolve => setTimeout(resolve, 0));
+  });
+};
+
 const renderLikeButton = (props: any, authState: any = { isSignedIn: false, isLoaded: true }) => {
   mockUseUser.mockReturnValue(authState);
   
@@ -28,7 +63,8 @@ describe('LikeButton Component', () => {
 
   beforeEach(() => {
     jest.clearAllMocks();
-    (fetch as jest.Mock).mockClear();
+    (fetch as jest.Mock).mockReset();
+    resetToolUserState();
   });
 
   describe('Authentication States', () => {
@@ -63,27 +99,31 @@ describe('LikeButton Component', () => {
       });
     });
 
-    test('makes API calls when user is authenticated', async () => {
-      (fetch as jest.Mock).mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) });
+    test('loads its state through the batched tool-state request', async () => {
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
       await waitFor(() => {
         expect(fetch).toHaveBeenCalledTimes(1);
-        expect(fetch).toHaveBeenCalledWith('/api/tools/like?toolId=test-tool-id', expect.any(Object));
+        expect(fetch).toHaveBeenCalledWith('/api/user/tool-state', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ toolIds: ['test-tool-id'] }),
+        });
       });
     });
 
     test('handles 401 errors gracefully', async () => {
-      (fetch as jest.Mock).mockResolvedValueOnce({ ok: false, status: 401 });
+      mockApi({ '/api/user/tool-state': { ok: false, status: 401 } });
 
-      const consoleSpy = jest.spyOn(console, 'log').mockImplementation();
+      const consoleSpy = jest.spyOn(console, 'error').mockImplementation();
       
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
-      await waitFor(() => {
-        expect(consoleSpy).toHaveBeenCalledWith('User not authenticated for like check');
-      });
+      await waitForToolState();
+      expect(screen.getByText('❤️ Likes 10')).toBeInTheDocument();
+      expect(consoleSpy).not.toHaveBeenCalled();
       
       consoleSpy.mockRestore();
     });
@@ -91,11 +131,10 @@ describe('LikeButton Component', () => {
 
   describe('Like Functionality', () => {
     test('calls like API when like button is clicked', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 11 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': likeResponse(11) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
@@ -110,18 +149,17 @@ describe('LikeButton Component', () => {
     });
 
     test('calls unlike API when like button is clicked and already liked', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: true }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 9 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: true }), '/api/tools/like': likeResponse(9) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
       const likeButton = screen.getByText('❤️ Likes 10');
+      await waitFor(() => expect(likeButton).toHaveClass('active'));
       fireEvent.click(likeButton);
       
       await waitFor(() => {
         expect(fetch).toHaveBeenCalledWith('/api/tools/like', {
-          method: 'POST',
+          method: 'DELETE',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ toolId: 'test-tool-id' }),
         });
@@ -129,13 +167,12 @@ describe('LikeButton Component', () => {
     });
 
     test('handles 401 errors in like action gracefully', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockResolvedValueOnce({ ok: false, status: 401 });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': { ok: false, status: 401 } });
 
       const consoleSpy = jest.spyOn(console, 'log').mockImplementation();
       
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
@@ -160,11 +197,10 @@ describe('LikeButton Component', () => {
 
   describe('State Management', () => {
     test('updates like count after successful like', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 11 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': likeResponse(11) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
@@ -175,13 +211,12 @@ describe('LikeButton Component', () => {
     });
 
     test('updates like count after successful unlike', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: true }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 9 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: true }), '/api/tools/like': likeResponse(9) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
       const likeButton = screen.getByText('❤️ Likes 10');
+      await waitFor(() => expect(likeButton).toHaveClass('active'));
       fireEvent.click(likeButton);
       
       await waitFor(() => {
@@ -190,7 +225,7 @@ describe('LikeButton Component', () => {
     });
 
     test('shows active state when tool is liked', async () => {
-      (fetch as jest.Mock).mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: true }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: true }) });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
@@ -203,11 +238,13 @@ describe('LikeButton Component', () => {
 
   describe('Loading States', () => {
     test('disables button during API call', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockImplementationOnce(() => new Promise(resolve => setTimeout(() => resolve({ ok: true, json: () => Promise.resolve({ likeCount: 11 }) }), 100)));
+      mockApi({
+        '/api/user/tool-state': toolState({ hasLiked: false }),
+        '/api/tools/like': () => new Promise(resolve => setTimeout(() => resolve(likeResponse(11)), 100)),
+      });
 
       renderLikeButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
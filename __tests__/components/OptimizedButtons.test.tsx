@@ -1,8 +1,9 @@
 import React from 'react';
-import { render, screen, fireEvent, waitFor } from '@testing-library/react';
+import { render, screen, fireEvent, waitFor, act } from '@testing-library/react';
 import { useUser } from '@clerk/nextjs';
 import OptimizedLikeButton from '@/components/S-components/OptimizedLikeButton';
 import OptimizedSaveButton from '@/components/S-components/OptimizedSaveButton';
+import { resetToolUserState } from '@/lib/toolUserState';
 
 // Mock Clerk
 jest.mock('@clerk/nextjs', () => ({
@@ -23,9 +24,51 @@ global.fetch = jest.fn();
 
 const mockUseUser = useUser as jest.MockedFunction<typeof useUser>;
 
+type MockResponse = { ok: boolean; status?: number; json?: () => Promise<unknown> };
+
+// Answer fetch calls by URL; a response list is consumed in order
+const mockApi = (responses: Record<string, MockResponse | Array<MockResponse | Error>>) => {
+  (fetch as jest.Mock).mockImplementation((url: string) => {
+    const response = responses[url];
+    const next = Array.isArray(response) ? response.shift() : response;
+    return next instanceof Error
+      ? Promise.reject(next)
+      : Promise.resolve(next ?? { ok: false, status: 404, json: () => Promise.resolve({}) });
+  });
+};
+
+const json = (body: unknown): MockResponse => ({ ok: true, json: () => Promise.resolve(body) });
+
+// Batched tool-state response for the tools under test
+const toolState = (
+  state: { hasLiked?: boolean; hasSaved?: boolean },
+  folders: Array<{ name: string; tools: Array<{ name: string }> }> = [],
+  toolIds: string[] = ['test-tool-id']
+): MockResponse =>
+  json({
+    success: true,
+    states: Object.fromEntries(toolIds.map(id => [
+      id,
+      { hasLiked: false, hasSaved: false, folder: null, likeCount: 10, saveCount: 5, ...state },
+    ])),
+    folders,
+  });
+
+// Wait until the batched state request was sent and its result applied
+const waitForToolState = async () => {
+  await waitFor(() => {
+    expect(fetch).toHaveBeenCalledWith('/api/user/tool-state', expect.any(Object));
+  });
+  await act(async () => {
+    await new Promise(resolve => setTimeout(resolve, 0));
+  });
+};
+
 describe('Optimized Button Components', () => {
   beforeEach(() => {
     jest.clearAllMocks();
+    (fetch as jest.Mock).mockReset();
+    resetToolUserState();
     mockUseUser.mockReturnValue({
       isSignedIn: true,
       isLoaded: true,
@@ -59,43 +102,41 @@ describe('Optimized Button Components', () => {
     });
 
     test('handles like action with API call management', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 11 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': json({ likeCount: 11 }) });
 
       renderOptimizedLikeButton();
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
       
       // Wait for the API call to complete and state to update
       await waitFor(() => {
-        expect(fetch).toHaveBeenCalledWith('/api/tools/like', expect.any(Object));
+        expect(fetch).toHaveBeenCalledWith('/api/tools/like', expect.objectContaining({ method: 'POST' }));
+        expect(screen.getByText('❤️ Likes 11')).toBeInTheDocument();
       });
     });
 
     test('handles unlike action correctly', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: true }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 9 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: true }), '/api/tools/like': json({ likeCount: 9 }) });
 
       renderOptimizedLikeButton();
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
       
       // Wait for the API call to complete
       await waitFor(() => {
-        expect(fetch).toHaveBeenCalledWith('/api/tools/like', expect.any(Object));
+        expect(fetch).toHaveBeenCalledWith('/api/tools/like', expect.objectContaining({ method: 'DELETE' }));
       });
     });
 
     test('prevents multiple simultaneous API calls', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ likeCount: 11 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': json({ likeCount: 11 }) });
 
       renderOptimizedLikeButton();
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       
@@ -106,16 +147,15 @@ describe('Optimized Button Components', () => {
       
       // Should only make one API call
       await waitFor(() => {
-        expect(fetch).toHaveBeenCalledTimes(2); // Initial check + one like action
+        expect(fetch).toHaveBeenCalledTimes(2); // Batched state check + one like action
       });
     });
 
     test('handles API errors gracefully', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasLiked: false }) })
-        .mockRejectedValueOnce(new Error('Network error'));
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: false }), '/api/tools/like': [new Error('Network error')] });
 
       renderOptimizedLikeButton();
+      await waitForToolState();
       
       const likeButton = screen.getByText('❤️ Likes 10');
       fireEvent.click(likeButton);
@@ -154,11 +194,10 @@ describe('Optimized Button Components', () => {
     });
 
     test('handles save action with API call management', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ saveCount: 6 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: false }), '/api/tools/save': json({ saveCount: 6 }) });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.click(saveButton);
@@ -169,11 +208,10 @@ describe('Optimized Button Components', () => {
     });
 
     test('handles unsave action correctly', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: true }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ saveCount: 4 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: true }), '/api/tools/save': json({ saveCount: 4 }) });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.click(saveButton);
@@ -183,25 +221,21 @@ describe('Optimized Button Components', () => {
       });
     });
 
-    test('caches folders to prevent multiple API calls', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) });
+    test('loads folders with the batched state instead of a separate request', async () => {
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: false }, [{ name: 'Test Folder', tools: [] }]) });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
-      // Wait for initial load
-      await waitFor(() => {
-        expect(fetch).toHaveBeenCalled();
-      });
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(fetch).not.toHaveBeenCalledWith('/api/user/folders', expect.anything());
     });
 
     test('handles right-click menu correctly', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [{ name: 'Test Folder', tools: [] }] }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: false }, [{ name: 'Test Folder', tools: [] }]) });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       
@@ -214,12 +248,10 @@ describe('Optimized Button Components', () => {
     });
 
     test('prevents multiple simultaneous API calls', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ saveCount: 6 }) });
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: false }), '/api/tools/save': json({ saveCount: 6 }) });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       
@@ -238,12 +270,10 @@ describe('Optimized Button Components', () => {
     });
 
     test('handles API errors gracefully', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) })
-        .mockRejectedValueOnce(new Error('Network error'));
+      mockApi({ '/api/user/tool-state': toolState({ hasSaved: false }), '/api/tools/save': [new Error('Network error')] });
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.click(saveButton);
@@ -255,16 +285,16 @@ describe('Optimized Button Components', () => {
     });
 
     test('handles tool limit reached error', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) })
-        .mockResolvedValueOnce({ 
-          ok: false, 
-          json: () => Promise.resolve({ 
+      mockApi({
+        '/api/user/tool-state': toolState({ hasSaved: false }),
+        '/api/tools/save': {
+          ok: false,
+          json: () => Promise.resolve({
             error: 'Tool limit reached',
-            redirectToPricing: true 
-          }) 
-        });
+            redirectToPricing: true
+          })
+        },
+      });
 
       // Mock window.location.href
       const originalLocation = window.location;
@@ -272,6 +302,7 @@ describe('Optimized Button Components', () => {
       window.location = { ...originalLocation, href: '' } as any;
 
       renderOptimizedSaveButton();
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.click(saveButton);
@@ -286,42 +317,29 @@ describe('Optimized Button Components', () => {
   });
 
   describe('API Call Management', () => {
-    test('debounces API calls to prevent overwhelming the server', async () => {
-      jest.useFakeTimers();
-      
-      (fetch as jest.Mock).mockResolvedValue({ ok: true, json: () => Promise.resolve({ hasLiked: false }) });
+    test('coalesces the state checks of a page of buttons into one request', async () => {
+      mockApi({ '/api/user/tool-state': toolState({}, [], ['tool-1', 'tool-2', 'tool-3']) });
 
-      // Render multiple like buttons
-      const { rerender } = render(
-        <OptimizedLikeButton toolId="tool-1" initialLikeCount={10} />
-      );
-
-      rerender(<OptimizedLikeButton toolId="tool-2" initialLikeCount={10} />);
-      rerender(<OptimizedLikeButton toolId="tool-3" initialLikeCount={10} />);
-
-      // Fast forward time to trigger debounced calls
-      jest.advanceTimersByTime(3000);
+      render(<OptimizedLikeButton toolId="tool-1" initialLikeCount={10} />);
+      render(<OptimizedLikeButton toolId="tool-2" initialLikeCount={10} />);
+      render(<OptimizedSaveButton toolId="tool-3" toolTitle="Tool 3" initialSaveCount={5} />);
 
-      await waitFor(() => {
-        // Should have made API calls with delays
-        expect(fetch).toHaveBeenCalled();
-      }, { timeout: 5000 });
+      await waitForToolState();
 
-      jest.useRealTimers();
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(JSON.parse((fetch as jest.Mock).mock.calls[0][1].body)).toEqual({ toolIds: ['tool-1', 'tool-2', 'tool-3'] });
     });
 
-    test('queues API calls to prevent race conditions', async () => {
-      (fetch as jest.Mock)
-        .mockImplementation(() => new Promise(resolve => setTimeout(() => resolve({ ok: true, json: () => Promise.resolve({ hasLiked: false }) }), 100)));
+    test('dedupes state checks for the same tool', async () => {
+      mockApi({ '/api/user/tool-state': toolState({ hasLiked: true }, [], ['tool-1']) });
 
       render(<OptimizedLikeButton toolId="tool-1" initialLikeCount={10} />);
-      render(<OptimizedLikeButton toolId="tool-2" initialLikeCount={10} />);
-      render(<OptimizedLikeButton toolId="tool-3" initialLikeCount={10} />);
+      render(<OptimizedSaveButton toolId="tool-1" toolTitle="Tool 1" initialSaveCount={5} />);
 
-      await waitFor(() => {
-        // Should have made API calls in sequence
-        expect(fetch).toHaveBeenCalledTimes(3);
-      }, { timeout: 5000 });
+      await waitForToolState();
+
+      expect(fetch).toHaveBeenCalledTimes(1);
+      expect(JSON.parse((fetch as jest.Mock).mock.calls[0][1].body)).toEqual({ toolIds: ['tool-1'] });
     });
   });
-}); 
\ No newline at end of file
+});
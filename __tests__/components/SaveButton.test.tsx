@@ -1,8 +1,9 @@
 import React from 'react';
-import { render, screen, fireEvent, waitFor } from '@testing-library/react';
+import { render, screen, fireEvent, waitFor, act } from '@testing-library/react';
 import '@testing-library/jest-dom';
 import SaveButton from '../../components/S-components/SaveButton';
 import { AlertProvider } from '../../components/B-components/alert/AlertContext';
+import { resetToolUserState } from '../../lib/toolUserState';
 
 // Mock Clerk
 jest.mock('@clerk/nextjs', () => ({
@@ -15,6 +16,36 @@ global.fetch = jest.fn();
 
 const mockUseUser = require('@clerk/nextjs').useUser;
 
+type MockResponse = { ok: boolean; status?: number; json?: () => Promise<unknown> };
+
+// Answer fetch calls by URL; card state and folders come from the batched tool-state endpoint
+const mockApi = (responses: Record<string, MockResponse>) => {
+  (fetch as jest.Mock).mockImplementation((url: string) =>
+    Promise.resolve(responses[url] ?? { ok: false, status: 404, json: () => Promise.resolve({}) })
+  );
+};
+
+const toolState = (hasSaved: boolean, folders: Array<{ name: string; tools: Array<{ name: string }> }> = []): MockResponse => ({
+  ok: true,
+  json: () => Promise.resolve({
+    success: true,
+    states: {
+      'test-tool-id': { hasLiked: false, hasSaved, folder: null, likeCount: 0, saveCount: 5 },
+    },
+    folders,
+  }),
+});
+
+// Wait until the batched state request was sent and its result applied
+const waitForToolState = async () => {
+  await waitFor(() => {
+    expect(fetch).toHaveBeenCalledWith('/api/user/tool-state', expect.any(Object));
+  });
+  await act(async () => {
+    await new Promise(resolve => setTimeout(resolve, 0));
+  });
+};
+
 const renderSaveButton = (props: any, authState: any = { isSignedIn: false, isLoaded: true }) => {
   mockUseUser.mockReturnValue(authState);
   
@@ -34,7 +65,8 @@ describe('SaveButton Component', () => {
 
   beforeEach(() => {
     jest.clearAllMocks();
-    (fetch as jest.Mock).mockClear();
+    (fetch as jest.Mock).mockReset();
+    resetToolUserState();
   });
 
   describe('Authentication States', () => {
@@ -70,41 +102,41 @@ describe('SaveButton Component', () => {
       });
     });
 
-    test('makes API calls when user is authenticated', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) });
+    test('loads its state and folders through the batched tool-state request', async () => {
+      mockApi({ '/api/user/tool-state': toolState(false) });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
       
       await waitFor(() => {
-        expect(fetch).toHaveBeenCalledWith('/api/tools/save?toolId=test-tool-id', expect.any(Object));
+        expect(fetch).toHaveBeenCalledWith('/api/user/tool-state', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ toolIds: ['test-tool-id'] }),
+        });
       });
+      expect(fetch).toHaveBeenCalledTimes(1);
     });
 
-             test('handles 401 errors gracefully', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: false, status: 401 });
+    test('handles 401 errors gracefully', async () => {
+      mockApi({ '/api/user/tool-state': { ok: false, status: 401 } });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       // Component should not crash and should handle the 401 error gracefully
-      await waitFor(() => {
-        const saveButton = screen.getByText('💾 Save (5)');
-        expect(saveButton).toBeInTheDocument();
-      });
+      expect(screen.getByText('💾 Save (5)')).toBeInTheDocument();
     });
   });
 
   describe('Save Functionality', () => {
     test('calls save API when save button is clicked', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ folders: [] }) })
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ saveCount: 6 }) });
+      mockApi({
+        '/api/user/tool-state': toolState(false),
+        '/api/tools/save': { ok: true, json: () => Promise.resolve({ saveCount: 6 }) },
+      });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.click(saveButton);
@@ -131,19 +163,15 @@ describe('SaveButton Component', () => {
 
   describe('Right-click Menu', () => {
     test('shows folder menu when right-clicked and user is authenticated', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ 
-          ok: true, 
-          json: () => Promise.resolve({ 
-            folders: [
-              { name: 'Work Tools', tools: [] },
-              { name: 'Personal Tools', tools: [] }
-            ] 
-          }) 
-        });
+      mockApi({
+        '/api/user/tool-state': toolState(false, [
+          { name: 'Work Tools', tools: [] },
+          { name: 'Personal Tools', tools: [] }
+        ]),
+      });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.contextMenu(saveButton);
@@ -167,19 +195,15 @@ describe('SaveButton Component', () => {
 
   describe('Folder Menu Logic', () => {
     test('shows all folders when tool is not saved', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: false }) })
-        .mockResolvedValueOnce({ 
-          ok: true, 
-          json: () => Promise.resolve({ 
-            folders: [
-              { name: 'Work Tools', tools: [] },
-              { name: 'Personal Tools', tools: [{ name: 'Other Tool' }] }
-            ] 
-          }) 
-        });
+      mockApi({
+        '/api/user/tool-state': toolState(false, [
+          { name: 'Work Tools', tools: [] },
+          { name: 'Personal Tools', tools: [{ name: 'Other Tool' }] }
+        ]),
+      });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.contextMenu(saveButton);
@@ -192,19 +216,15 @@ describe('SaveButton Component', () => {
     });
 
     test('shows only available folders when tool is saved', async () => {
-      (fetch as jest.Mock)
-        .mockResolvedValueOnce({ ok: true, json: () => Promise.resolve({ hasSaved: true }) })
-        .mockResolvedValueOnce({ 
-          ok: true, 
-          json: () => Promise.resolve({ 
-            folders: [
-              { name: 'Work Tools', tools: [] },
-              { name: 'Personal Tools', tools: [{ name: 'Test Tool' }] }
-            ] 
-          }) 
-        });
+      mockApi({
+        '/api/user/tool-state': toolState(true, [
+          { name: 'Work Tools', tools: [] },
+          { name: 'Personal Tools', tools: [{ name: 'Test Tool' }] }
+        ]),
+      });
 
       renderSaveButton(defaultProps, { isSignedIn: true, isLoaded: true });
+      await waitForToolState();
       
       const saveButton = screen.getByText('💾 Save (5)');
       fireEvent.contextMenu(saveButton);
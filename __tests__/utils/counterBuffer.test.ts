@@ -0,0 +1,107 @@
+jest.mock('@/models/tools', () => ({
+  getToolModel: jest.fn(),
+}));
+
+type CounterBuffer = typeof import('@/lib/counterBuffer');
+
+const TOOL_A = '507f1f77bcf86cd799439011';
+const TOOL_B = '507f1f77bcf86cd799439012';
+
+const incOf = (op: any) => [op.updateOne.filter._id, op.updateOne.update.$inc];
+
+// Let pending promise callbacks run
+const settle = async () => {
+  for (let i = 0; i < 10; i++) await Promise.resolve();
+};
+
+describe('Counter buffer', () => {
+  let buffer: CounterBuffer;
+  let bulkWrite: jest.Mock;
+
+  beforeEach(() => {
+    // The buffer is module state, so every test starts from a fresh copy
+    jest.resetModules();
+    jest.useFakeTimers();
+    bulkWrite = jest.fn().mockResolvedValue({});
+    jest.requireMock('@/models/tools').getToolModel.mockResolvedValue({ bulkWrite });
+    jest.spyOn(console, 'error').mockImplementation(() => {});
+    buffer = require('@/lib/counterBuffer');
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+    jest.restoreAllMocks();
+  });
+
+  it('should coalesce deltas into one $inc per tool', async () => {
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+    buffer.recordCounterDelta(TOOL_A, 'saveCount', 1);
+    buffer.recordCounterDelta(TOOL_B, 'likeCount', 1);
+    buffer.recordCounterDelta(TOOL_B, 'likeCount', -1);
+
+    await buffer.flushCounters();
+
+    expect(bulkWrite).toHaveBeenCalledTimes(1);
+    const [ops, options] = bulkWrite.mock.calls[0];
+    // TOOL_B's deltas cancel out, so it is not written at all
+    expect(ops.map(incOf)).toEqual([[TOOL_A, { likeCount: 2, saveCount: 1 }]]);
+    expect(options).toEqual({ ordered: false });
+  });
+
+  it('should merge a failed flush back and retry it', async () => {
+    bulkWrite.mockRejectedValueOnce(new Error('Write conflict'));
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+
+    await buffer.flushCounters();
+
+    expect(buffer.getCounterBufferStats()).toMatchObject({ pendingTools: 1, failures: 1 });
+    expect(buffer.withPendingCounters(TOOL_A, { likeCount: 5 })).toEqual({ likeCount: 6, saveCount: 0 });
+
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+    await jest.runOnlyPendingTimersAsync();
+    await buffer.flushCounters();
+
+    expect(bulkWrite).toHaveBeenCalledTimes(2);
+    expect(bulkWrite.mock.calls[1][0].map(incOf)).toEqual([[TOOL_A, { likeCount: 2, saveCount: 0 }]]);
+    expect(buffer.getCounterBufferStats()).toMatchObject({ pendingTools: 0, flushes: 1, failures: 1 });
+  });
+
+  it('should count in-flight deltas and run one flush at a time', async () => {
+    let active = 0;
+    let maxActive = 0;
+    const writes: Array<() => void> = [];
+    bulkWrite.mockImplementation(() => {
+      maxActive = Math.max(maxActive, ++active);
+      return new Promise<void>(resolve => writes.push(() => {
+        active--;
+        resolve();
+      }));
+    });
+
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+    const first = buffer.flushCounters();
+    await settle();
+
+    // Sent but not acknowledged: still visible to readers
+    expect(buffer.getCounterBufferStats().inFlightTools).toBe(1);
+    expect(buffer.withPendingCounters(TOOL_A, { likeCount: 5 })).toEqual({ likeCount: 6, saveCount: 0 });
+
+    buffer.recordCounterDelta(TOOL_A, 'likeCount', 1);
+    const second = buffer.flushCounters();
+    await settle();
+    expect(bulkWrite).toHaveBeenCalledTimes(1);
+    expect(buffer.withPendingCounters(TOOL_A, { likeCount: 5 })).toEqual({ likeCount: 7, saveCount: 0 });
+
+    writes[0]();
+    await first;
+    await settle();
+    expect(bulkWrite).toHaveBeenCalledTimes(2);
+    writes[1]();
+    await second;
+
+    expect(maxActive).toBe(1);
+    expect(bulkWrite.mock.calls[1][0].map(incOf)).toEqual([[TOOL_A, { likeCount: 1, saveCount: 0 }]]);
+    expect(buffer.getCounterBufferStats()).toMatchObject({ pendingTools: 0, inFlightTools: 0, flushes: 2 });
+  });
+});
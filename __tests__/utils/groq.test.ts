@@ -0,0 +1,65 @@
+import { TokenBucket } from '@/lib/groq';
+
+describe('TokenBucket', () => {
+  beforeEach(() => {
+    jest.useFakeTimers();
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it('should grant a full bucket without waiting', async () => {
+    const bucket = new TokenBucket(3, 3 / 60000);
+    const granted = jest.fn();
+
+    bucket.take(1).then(granted);
+    bucket.take(2).then(granted);
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(granted).toHaveBeenCalledTimes(2);
+  });
+
+  it('should wait for the refill and serve callers in order', async () => {
+    // One token per second
+    const bucket = new TokenBucket(2, 1 / 1000);
+    const order: string[] = [];
+
+    await bucket.take(2);
+    bucket.take(2).then(() => order.push('large'));
+    bucket.take(1).then(() => order.push('small'));
+
+    await jest.advanceTimersByTimeAsync(1000);
+    // One token is back, but the small request queues behind the large one
+    expect(order).toEqual([]);
+
+    await jest.advanceTimersByTimeAsync(1000);
+    expect(order).toEqual(['large']);
+
+    await jest.advanceTimersByTimeAsync(1000);
+    expect(order).toEqual(['large', 'small']);
+  });
+
+  it('should cap requests larger than the bucket at its capacity', async () => {
+    const bucket = new TokenBucket(5, 5 / 60000);
+    const granted = jest.fn();
+
+    bucket.take(50).then(granted);
+    await jest.advanceTimersByTimeAsync(0);
+
+    expect(granted).toHaveBeenCalled();
+  });
+
+  it('should make callers wait after being drained', async () => {
+    const bucket = new TokenBucket(2, 1 / 1000);
+    const granted = jest.fn();
+
+    bucket.drain();
+    bucket.take(1).then(granted);
+
+    await jest.advanceTimersByTimeAsync(999);
+    expect(granted).not.toHaveBeenCalled();
+    await jest.advanceTimersByTimeAsync(1);
+    expect(granted).toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,87 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+
+type LoggerModule = typeof import('@/lib/logger');
+type RequestContextModule = typeof import('@/lib/requestContext');
+
+describe('Logger', () => {
+  const env = process.env;
+  let dir: string;
+
+  beforeEach(() => {
+    dir = fs.mkdtempSync(path.join(os.tmpdir(), 'logger-test-'));
+  });
+
+  afterEach(() => {
+    process.env = env;
+    fs.rmSync(dir, { recursive: true, force: true });
+  });
+
+  // The logger reads its configuration once, at import
+  function loadLogger(overrides: Record<string, string>) {
+    process.env = { ...env, LOG_STDOUT: 'false', LOG_FILE: path.join(dir, 'app.log'), ...overrides };
+    let modules!: { logging: LoggerModule; context: RequestContextModule };
+    jest.isolateModules(() => {
+      modules = { logging: require('@/lib/logger'), context: require('@/lib/requestContext') };
+    });
+    return modules;
+  }
+
+  function readRecords(): Record<string, unknown>[] {
+    return fs.readFileSync(path.join(dir, 'app.log'), 'utf8')
+      .trim()
+      .split('\n')
+      .map(line => JSON.parse(line));
+  }
+
+  it('should write JSON records at or above the configured level', async () => {
+    const { logger } = loadLogger({ LOG_LEVEL: 'info' }).logging;
+
+    logger.debug('hidden');
+    logger.info('visible', { count: 2 });
+    logger.error('failed', { error: new Error('boom') });
+    await logger.flush();
+
+    const records = readRecords();
+    expect(records.map(r => r.msg)).toEqual(['visible', 'failed']);
+    expect(records[0]).toMatchObject({ level: 'info', count: 2 });
+    expect(records[1].error).toMatchObject({ name: 'Error', message: 'boom' });
+    expect(logger.isLevelEnabled('debug')).toBe(false);
+  });
+
+  it('should tag records with the request ID and sample per route', async () => {
+    const { logging, context } = loadLogger({ LOG_LEVEL: 'debug', LOG_SAMPLE_RATES: '/api/quiet=0' });
+    const { logger } = logging;
+    const request = (route: string, requestId: string) => ({ route, requestId, dbCommands: 0, dbMs: 0 });
+
+    context.runWithRequestContext(request('/api/loud', 'req-1'), () => logger.info('kept'));
+    context.runWithRequestContext(request('/api/quiet', 'req-2'), () => {
+      logger.info('sampled out');
+      logger.warn('always kept');
+    });
+    await logger.flush();
+
+    const records = readRecords();
+    expect(records.map(r => [r.msg, r.requestId, r.route])).toEqual([
+      ['kept', 'req-1', '/api/loud'],
+      ['always kept', 'req-2', '/api/quiet'],
+    ]);
+    expect(logging.getLoggerStats()).toMatchObject({ written: 2, sampledOut: 1, dropped: 0 });
+  });
+
+  it('should rotate the file past its size limit and keep the newest files', async () => {
+    const { RotatingFileSink } = loadLogger({}).logging;
+    const file = path.join(dir, 'rotating.log');
+    const sink = new RotatingFileSink(file, 100, 2, 24 * 60 * 60 * 1000);
+
+    for (let i = 0; i < 12; i++) {
+      await sink.write(`${JSON.stringify({ i, msg: 'x'.repeat(20) })}\n`);
+      await new Promise(resolve => setTimeout(resolve, 2));
+    }
+
+    const files = fs.readdirSync(dir).filter(name => name.startsWith('rotating.log'));
+    expect(files).toHaveLength(3);
+    expect(fs.statSync(file).size).toBeLessThanOrEqual(100);
+  });
+});
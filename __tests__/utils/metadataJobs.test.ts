@@ -0,0 +1,62 @@
+import { isPermanentFetchError, parseBatchReply, retryDelayMs } from '@/lib/metadataJobs';
+import { WebsiteFetchError } from '@/lib/websiteMetadata';
+
+jest.mock('@/models/metadataJob', () => ({
+  getMetadataJobModel: jest.fn(),
+}));
+
+describe('Metadata jobs', () => {
+  describe('parseBatchReply', () => {
+    it('should key entries by their tool number whatever their order', () => {
+      const entries = parseBatchReply(
+        'Here you go: [{"tool": 2, "keywords": ["b"], "about": "Second"}, {"tool": 1, "keywords": ["a"], "about": "First"}]'
+      );
+
+      expect(entries.get(1)?.about).toBe('First');
+      expect(entries.get(2)?.about).toBe('Second');
+    });
+
+    it('should leave missing tools out and number unnumbered entries by position', () => {
+      const entries = parseBatchReply('[{"keywords": ["a"], "about": "First"}, null, {"tool": 3, "about": "Third"}]');
+
+      expect([...entries.keys()]).toEqual([1, 3]);
+      expect(entries.has(2)).toBe(false);
+    });
+
+    it('should return no entries for an unparseable reply', () => {
+      expect(parseBatchReply('Sorry, I cannot help with that.').size).toBe(0);
+      expect(parseBatchReply('[{"tool": 1, "about": ').size).toBe(0);
+      expect(parseBatchReply('{"tool": 1}').size).toBe(0);
+    });
+  });
+
+  describe('retry decisions', () => {
+    it('should back off exponentially with jitter', () => {
+      jest.spyOn(Math, 'random').mockReturnValue(0);
+      expect(retryDelayMs(1)).toBe(5000);
+      expect(retryDelayMs(3)).toBe(20000);
+
+      (Math.random as jest.Mock).mockReturnValue(1);
+      expect(retryDelayMs(1)).toBe(7500);
+      jest.restoreAllMocks();
+    });
+
+    it('should prefer the upstream retry delay', () => {
+      expect(retryDelayMs(2, 12000)).toBe(12000);
+    });
+
+    it('should fail permanent errors and jobs out of attempts', () => {
+      expect(retryDelayMs(1, undefined, true)).toBeNull();
+      expect(retryDelayMs(4)).toBeNull();
+      expect(retryDelayMs(4, 1000)).toBeNull();
+    });
+
+    it('should treat client errors other than 429 as permanent', () => {
+      expect(isPermanentFetchError(new WebsiteFetchError(404, 'Not Found'))).toBe(true);
+      expect(isPermanentFetchError(new WebsiteFetchError(403, 'Forbidden'))).toBe(true);
+      expect(isPermanentFetchError(new WebsiteFetchError(429, 'Too Many Requests'))).toBe(false);
+      expect(isPermanentFetchError(new WebsiteFetchError(503, 'Service Unavailable'))).toBe(false);
+      expect(isPermanentFetchError(new Error('The operation was aborted'))).toBe(false);
+    });
+  });
+});
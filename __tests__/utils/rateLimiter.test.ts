@@ -0,0 +1,60 @@
+import { MemoryRateLimitStore, RateLimiter, RateLimitStore } from '@/lib/rateLimiter';
+
+describe('Rate limiter', () => {
+  describe('MemoryRateLimitStore', () => {
+    it('should grant up to the limit within a window', async () => {
+      const store = new MemoryRateLimitStore();
+      const results = [];
+      for (let i = 0; i < 4; i++) {
+        results.push(await store.consume('ip', 3, 60000, 1, 1000 + i));
+      }
+
+      expect(results.map(r => r.granted)).toEqual([1, 1, 1, 0]);
+      expect(results[2].remaining).toBe(0);
+      expect(results[3].retryAfterMs).toBeGreaterThan(0);
+    });
+
+    it('should weight the previous window by its overlap', async () => {
+      const store = new MemoryRateLimitStore();
+      for (let i = 0; i < 10; i++) {
+        await store.consume('ip', 10, 60000, 1, i);
+      }
+
+      // Halfway through the next window half of the previous one still counts
+      const result = await store.consume('ip', 10, 60000, 10, 90000);
+      expect(result.granted).toBe(5);
+    });
+  });
+
+  describe('RateLimiter', () => {
+    it('should serve leased points without asking the store', async () => {
+      const store = new MemoryRateLimitStore();
+      const consume = jest.spyOn(store, 'consume');
+      const limiter = new RateLimiter('/test', 100, 60, store, store);
+
+      for (let i = 0; i < 10; i++) {
+        expect((await limiter.consume('ip')).allowed).toBe(true);
+      }
+
+      expect(consume).toHaveBeenCalledTimes(1);
+      expect(limiter.stats.localAllowed).toBe(9);
+    });
+
+    it('should fall back to in-process limits when the store fails', async () => {
+      const failing: RateLimitStore = {
+        name: 'redis',
+        consume: jest.fn().mockRejectedValue(new Error('connection refused')),
+      };
+      const limiter = new RateLimiter('/test', 2, 60, failing);
+
+      const results = [];
+      for (let i = 0; i < 3; i++) {
+        results.push(await limiter.consume('ip'));
+      }
+
+      expect(results.map(r => r.allowed)).toEqual([true, true, false]);
+      expect(limiter.stats.storeErrors).toBe(3);
+      expect(limiter.stats.blocked).toBe(1);
+    });
+  });
+});
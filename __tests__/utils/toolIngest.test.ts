@@ -0,0 +1,91 @@
+/**
+ * @jest-environment node
+ */
+import mongoose from 'mongoose';
+import { ToolSchema } from '@/models/tools';
+import { ingestToolChunk, ParsedRow, readToolRows } from '@/lib/toolIngest';
+
+const Tool = mongoose.models.IngestTestTool || mongoose.model('IngestTestTool', ToolSchema);
+
+const body = (text: string) =>
+  new ReadableStream<Uint8Array>({
+    start(controller) {
+      controller.enqueue(new TextEncoder().encode(text));
+      controller.close();
+    },
+  });
+
+const readAll = async (text: string) => {
+  const rows: ParsedRow[] = [];
+  for await (const row of readToolRows(body(text), 'csv')) rows.push(row);
+  return rows;
+};
+
+const CSV = [
+  'title,logoUrl,websiteUrl,category,about,keywords,toolType',
+  'Writer,example.com/w.png,example.com/w,AI Writing,"Drafts posts,',
+  'and edits ""them""",a;b;c;d;e,browser',
+  'Existing Tool,example.com/e.png,example.com/e,AI,About,a;b;c;d;e,browser',
+  'Brand™ Tool,example.com/b.png,example.com/b,AI,About,a;b;c;d;e,browser',
+  'Flaky Tool,example.com/f.png,example.com/f,AI,About,a;b;c;d;e,browser',
+].join('\r\n');
+
+describe('Tool ingestion', () => {
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should read quoted multi-line CSV fields as one row', async () => {
+    const rows = await readAll(CSV);
+
+    expect(rows).toHaveLength(4);
+    expect(rows[0].tool?.about).toBe('Drafts posts,\nand edits "them"');
+    expect(rows[0].tool?.keywords).toEqual(['a', 'b', 'c', 'd', 'e']);
+    expect(rows[1].row).toBe(2);
+  });
+
+  it('should report every row of a chunk by its write outcome', async () => {
+    const insertMany = jest.spyOn(Tool, 'insertMany').mockRejectedValue({
+      writeErrors: [
+        { index: 1, code: 11000, errmsg: 'E11000 duplicate key' },
+        { index: 2, code: 121, errmsg: 'Document failed validation' },
+      ],
+    });
+
+    const result = await ingestToolChunk(Tool, await readAll(CSV));
+
+    // The invalid row is never sent, so write error indexes skip it
+    expect(insertMany.mock.calls[0][0]).toHaveLength(3);
+    expect(result.rows.map(({ row, status }) => [row, status])).toEqual([
+      [1, 'inserted'],
+      [2, 'duplicate'],
+      [3, 'invalid'],
+      [4, 'failed'],
+    ]);
+    expect(result.rows[3].error).toBe('Document failed validation');
+    expect(result.insertedTools.map(tool => tool.title)).toEqual(['Writer']);
+    expect(result.insertedTools[0].websiteUrl).toBe('https://example.com/w');
+  });
+
+  it('should reject titles the JSON upload rejects', async () => {
+    jest.spyOn(Tool, 'insertMany').mockResolvedValue([]);
+
+    const result = await ingestToolChunk(Tool, [
+      {
+        row: 1,
+        tool: {
+          title: 'Arrow → Tool',
+          logoUrl: 'example.com/a.png',
+          websiteUrl: 'example.com/a',
+          category: 'AI',
+          about: 'About',
+          keywords: ['a', 'b', 'c', 'd', 'e'],
+          toolType: 'browser',
+        },
+      },
+    ]);
+
+    expect(result.rows[0].status).toBe('invalid');
+    expect(result.rows[0].error).toMatch(/invalid characters/);
+  });
+});
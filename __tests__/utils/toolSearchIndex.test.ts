@@ -0,0 +1,65 @@
+import { ToolSearchIndex } from '@/lib/toolSearchIndex';
+
+jest.mock('@/models/tools', () => ({
+  getToolModel: jest.fn(),
+  toCategorySlug: jest.requireActual('@/models/tools').toCategorySlug,
+}));
+
+const tool = (id: number, title: string, category: string, keywords: string[] = []) => ({
+  _id: id.toString(16).padStart(24, '0'),
+  title,
+  category,
+  keywords,
+  likeCount: 0,
+  saveCount: 0,
+});
+
+describe('ToolSearchIndex', () => {
+  it('should only score tools of the requested categories', () => {
+    const index = new ToolSearchIndex();
+    index.upsert(tool(1, 'Image Generator', 'AI Art'));
+    index.upsert(tool(2, 'Image Upscaler', 'Photo Editing'));
+    index.upsert(tool(3, 'Image Captioner', 'AI &amp; ML'));
+
+    expect(index.search('image', { categories: ['ai-art'] }).map(hit => hit.id)).toEqual([tool(1, '', '')._id]);
+    expect(index.search('image', { categories: ['ai-&-ml'] }).map(hit => hit.id)).toEqual([tool(3, '', '')._id]);
+    expect(index.search('image', { categories: ['unknown'] })).toEqual([]);
+    expect(index.search('image')).toHaveLength(3);
+  });
+
+  it('should match category slugs exactly before partially', () => {
+    const index = new ToolSearchIndex();
+    index.upsert(tool(1, 'Writer', 'AI'));
+    index.upsert(tool(2, 'Painter', 'AI Art'));
+
+    expect(index.matchingCategories('ai')).toEqual(['ai']);
+    expect(index.matchingCategories('art')).toEqual(['ai-art']);
+    expect(index.matchingCategories('')).toEqual([]);
+  });
+
+  it('should keep the most common prefix expansions', () => {
+    const index = new ToolSearchIndex();
+    // 60 rare terms sort before the common one
+    for (let i = 0; i < 60; i++) {
+      index.upsert(tool(i + 1, `Tool ${i}`, 'Misc', [`coda${String(i).padStart(2, '0')}`]));
+    }
+    index.upsert(tool(100, 'Helper', 'Misc', ['code']));
+    index.upsert(tool(101, 'Assistant', 'Misc', ['code']));
+
+    const ids = index.search('cod').map(hit => hit.id);
+    expect(ids).toContain(tool(100, '', '')._id);
+    expect(ids).toContain(tool(101, '', '')._id);
+  });
+
+  it('should forget removed tools', () => {
+    const index = new ToolSearchIndex();
+    index.upsert(tool(1, 'Image Generator', 'AI Art'));
+    index.upsert(tool(2, 'Image Upscaler', 'AI Art'));
+
+    index.remove(tool(1, '', '')._id);
+
+    expect(index.search('image').map(hit => hit.id)).toEqual([tool(2, '', '')._id]);
+    expect(index.topInCategory('AI Art', 5).map(hit => hit.id)).toEqual([tool(2, '', '')._id]);
+    expect(index.size).toBe(1);
+  });
+});
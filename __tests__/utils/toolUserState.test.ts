@@ -0,0 +1,111 @@
+import {
+  getToolUserState,
+  getUserFolders,
+  resetToolUserState,
+  updateToolUserState,
+} from '@/lib/toolUserState';
+
+const state = (overrides: Record<string, unknown> = {}) => ({
+  hasLiked: false,
+  hasSaved: false,
+  folder: null,
+  likeCount: 1,
+  saveCount: 2,
+  ...overrides,
+});
+
+// Answer every batch with a state for each requested id
+const mockBatches = (folders: unknown[] = []) => {
+  (global.fetch as jest.Mock).mockImplementation((_url: string, init: { body: string }) => {
+    const { toolIds } = JSON.parse(init.body) as { toolIds: string[] };
+    return Promise.resolve({
+      ok: true,
+      json: () => Promise.resolve({
+        success: true,
+        states: Object.fromEntries(toolIds.map(id => [id, state()])),
+        folders,
+      }),
+    });
+  });
+};
+
+const requestedIds = () =>
+  (global.fetch as jest.Mock).mock.calls.map(([, init]) => JSON.parse(init.body).toolIds as string[]);
+
+describe('Tool user state batching', () => {
+  beforeEach(() => {
+    global.fetch = jest.fn();
+    resetToolUserState();
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should coalesce and dedupe requests made within the batch window', async () => {
+    mockBatches();
+
+    const results = await Promise.all([
+      getToolUserState('a', 'user_1'),
+      getToolUserState('b', 'user_1'),
+      getToolUserState('a', 'user_1'),
+    ]);
+
+    expect(global.fetch).toHaveBeenCalledTimes(1);
+    expect(global.fetch).toHaveBeenCalledWith('/api/user/tool-state', expect.objectContaining({ method: 'POST' }));
+    expect(requestedIds()).toEqual([['a', 'b']]);
+    expect(results).toEqual([state(), state(), state()]);
+  });
+
+  it('should split batches at the server limit of 100 ids', async () => {
+    mockBatches();
+
+    await Promise.all(Array.from({ length: 150 }, (_, i) => getToolUserState(`tool-${i}`, 'user_1')));
+
+    expect(requestedIds().map(ids => ids.length)).toEqual([100, 50]);
+  });
+
+  it('should serve repeated lookups from the cache and apply local updates', async () => {
+    mockBatches();
+
+    await getToolUserState('a', 'user_1');
+    updateToolUserState('a', { hasLiked: true, likeCount: 2 });
+
+    await expect(getToolUserState('a', 'user_1')).resolves.toMatchObject({ hasLiked: true, likeCount: 2 });
+    expect(global.fetch).toHaveBeenCalledTimes(1);
+  });
+
+  it('should drop cached state and folders when the user changes', async () => {
+    mockBatches([{ name: 'Work', tools: [], createdAt: '2024-01-01T00:00:00.000Z' }]);
+
+    await getToolUserState('a', 'user_1');
+    expect(getUserFolders('user_1')).toHaveLength(1);
+
+    await getToolUserState('a', 'user_2');
+
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+    expect(getUserFolders('user_1')).toBeNull();
+  });
+
+  it('should refetch state once it has expired', async () => {
+    mockBatches();
+    const now = jest.spyOn(Date, 'now').mockReturnValue(1_000_000);
+
+    await getToolUserState('a', 'user_1');
+    now.mockReturnValue(1_000_000 + 61 * 1000);
+    await getToolUserState('a', 'user_1');
+
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+  });
+
+  it('should retry tools whose batch failed', async () => {
+    (global.fetch as jest.Mock).mockResolvedValueOnce({ ok: false, status: 500, statusText: 'Server Error' });
+    jest.spyOn(console, 'error').mockImplementation();
+
+    await expect(getToolUserState('a', 'user_1')).resolves.toBeNull();
+
+    mockBatches();
+    await expect(getToolUserState('a', 'user_1')).resolves.toEqual(state());
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+  });
+});
@@ -13,6 +13,13 @@ interface Tool {
   toolType: 'browser' | 'downloadable';
 }
 
+interface MetadataJob {
+  id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  result?: { title: string; logoUrl: string; keywords: string[]; about: string };
+  error?: string;
+}
+
 export default function ToolsAdminForm() {
   const [tool, setTool] = useState<Tool>({
     title: "",
@@ -124,50 +131,45 @@ export default function ToolsAdminForm() {
       setAutoFillLoading(true);
       setResult("🔍 Fetching metadata...");
 
-      // Step 1: Fetch metadata (title, logo)
-      const metaRes = await fetch("/api/auto-fill-metadata", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ websiteUrl: tool.websiteUrl }),
-      });
-
-      const meta = await metaRes.json();
-
-      if (!metaRes.ok) throw new Error(meta.error || "Metadata fetch failed");
-
-      // Step 2: Extract keywords from website
-      setResult("🔑 Extracting keywords...");
-      const keywordsRes = await fetch("/api/extract-keywords", {
+      // Step 1: Enqueue a metadata job (title, logo, keywords, short about).
+      // The server scrapes the site and generates keywords and about text in
+      // the background, batched with other tools and within Groq's rate limit.
+      const enqueueRes = await fetch("/api/metadata-jobs", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ websiteUrl: tool.websiteUrl }),
+        body: JSON.stringify({
+          tools: [{
+            websiteUrl: tool.websiteUrl,
+            title: tool.title || undefined,
+            description: tool.about || "AI tool", // Use about as description for AI generation
+          }],
+        }),
       });
 
-      const keywordsData = await keywordsRes.json();
-      if (!keywordsRes.ok) {
-        console.warn("Keywords extraction failed:", keywordsData.error);
-        // Continue without keywords if extraction fails
+      const enqueued = await enqueueRes.json();
+      if (!enqueueRes.ok) throw new Error(enqueued.error || "Metadata job could not be queued");
+
+      // Step 2: Poll the job until it finishes
+      setResult("🤖 Generating keywords and short about text...");
+      let job: MetadataJob = enqueued.jobs[0];
+      const deadline = Date.now() + 2 * 60 * 1000;
+      while (job.status === "queued" || job.status === "running") {
+        if (Date.now() > deadline) throw new Error("Metadata generation is taking too long, try again later");
+        await new Promise(resolve => setTimeout(resolve, 1500));
+
+        const pollRes = await fetch(`/api/metadata-jobs?ids=${job.id}`);
+        const polled = await pollRes.json();
+        if (!pollRes.ok) throw new Error(polled.error || "Metadata job status check failed");
+        job = polled.jobs[0] ?? job;
       }
 
-      // Step 3: Generate short about text (25 words)
-      setResult("🤖 Generating short about text...");
-      const shortAboutRes = await fetch("/api/generate-short-about", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ 
-          title: meta.title || tool.title,
-          description: tool.about || "AI tool", // Use about as description for AI generation
-          keywords: keywordsData.keywords || []
-        }),
-      });
-
-      const shortAboutData = await shortAboutRes.json();
-      if (!shortAboutRes.ok) {
-        console.warn("Short about generation failed:", shortAboutData.error);
-        // Continue without short about if generation fails
+      // A failed job may still carry the scraped title and logo
+      if (!job.result || (job.status === "failed" && !job.result.title && !job.result.logoUrl)) {
+        throw new Error(job.error || "Metadata generation failed");
       }
+      const meta = job.result;
 
-      // Step 4 (optional): Upload logo to ImageKit
+      // Step 3 (optional): Upload logo to ImageKit
       let logoUrl = meta.logoUrl;
       if (logoUrl && logoUrl.startsWith("http")) {
         setResult("🖼️ Uploading logo to ImageKit...");
@@ -196,16 +198,18 @@ export default function ToolsAdminForm() {
         }
       }
 
-              // Step 5: Update the form state
+              // Step 4: Update the form state
         setTool((prev) => ({
           ...prev,
           title: meta.title || prev.title,
-          about: shortAboutData.about || prev.about,
-          keywords: keywordsData.keywords || prev.keywords,
+          about: meta.about || prev.about,
+          keywords: meta.keywords.length > 0 ? meta.keywords : prev.keywords,
           logoUrl: logoUrl || prev.logoUrl,
         }));
 
-      setResult("✅ Auto-filled from website successfully!");
+      setResult(job.status === "failed"
+        ? `⚠️ Filled title and logo only; keywords and about could not be generated: ${job.error || "unknown error"}`
+        : "✅ Auto-filled from website successfully!");
     } catch (err: unknown) {
       console.error("Auto-fill error:", err);
       setResult(`❌ Auto-fill failed: ${err instanceof Error ? err.message : "Unknown error"}`);
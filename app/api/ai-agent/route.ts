@@ -1,9 +1,14 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { connectToolsDB } from '@/lib/db/websitedb';
 import { getToolModel } from '@/models/tools';
+import { getCatalogGeneration, getToolSearchIndex } from '@/lib/toolSearchIndex';
+import { getCachedResults, getChatCacheStats, intentCache, normalizeMessage, setCachedResults } from '@/lib/chatCache';
+import { encodeSSE, readSSE } from '@/lib/sse';
 import { applyRateLimit, getRateLimiter } from '@/lib/rateLimiter';
+import { timeUpstream, withRouteMetrics } from '@/lib/metrics';
+import { logger } from '@/lib/logger';
 
-const GROQ_API_URL = 'https://api.groq.com/openai/v1/chat/completions';
+const GROQ_API_URL = process.env.GROQ_API_URL || 'https://api.groq.com/openai/v1/chat/completions';
 const GROQ_CHATBOT_API_KEY = process.env.GROQ_CHATBOT_API_KEY;
 
 interface GroqResponse {
@@ -19,6 +24,15 @@ interface GroqResponse {
 
 interface AIRequestBody {
   message: string;
+  stream?: boolean;
+}
+
+interface GroqStreamChunk {
+  choices?: {
+    delta?: {
+      content?: string;
+    };
+  }[];
 }
 
 interface ToolResult {
@@ -143,11 +157,18 @@ async function extractSearchIntent(userMessage: string): Promise<{ intent: strin
     };
   }
 
+  // Repeated questions reuse the intent Groq extracted last time
+  const cacheKey = normalizeMessage(userMessage);
+  const cachedIntent = intentCache.get(cacheKey);
+  if (cachedIntent) {
+    return cachedIntent;
+  }
+
   try {
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), 2000); // 2 second timeout
 
-    const groqResponse = await fetch(GROQ_API_URL, {
+    const groqResponse = await timeUpstream('groq', () => fetch(GROQ_API_URL, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -178,7 +199,7 @@ Keep keywords specific and meaningful.`
         temperature: 0.1,
         max_tokens: 100
       })
-    });
+    }));
 
     clearTimeout(timeoutId);
 
@@ -200,18 +221,21 @@ Keep keywords specific and meaningful.`
     // Parse JSON response
     try {
       const parsed = JSON.parse(content);
-      return {
+      const searchIntent = {
         intent: parsed.intent || 'general_search',
         keywords: Array.isArray(parsed.keywords) ? parsed.keywords : [],
         isSpecificTool: Boolean(parsed.isSpecificTool)
       };
+      // Only model answers are cached; heuristic fallbacks are retried next time
+      intentCache.set(cacheKey, searchIntent);
+      return searchIntent;
     } catch {
-      console.error('Failed to parse GROQ response:', content);
+      logger.warn('Failed to parse GROQ intent response', { content });
       throw new Error('Invalid JSON response from GROQ API');
     }
 
   } catch (error) {
-    console.error('Error extracting search intent:', error);
+    logger.warn('Error extracting search intent, using keyword fallback', { error });
     
     // Fallback to basic keyword extraction
     const lowerMessage = userMessage.toLowerCase();
@@ -255,125 +279,57 @@ Keep keywords specific and meaningful.`
   }
 }
 
-// Search tools in database using intelligent matching
+// Generic words that match most of the catalog and drown out the real query
+const GENERIC_KEYWORDS = ['ai', 'tool', 'tools', 'automation', 'productivity', 'software', 'assistant', 'platform', 'app', 'application'];
+
+// Fetch full tool documents for ranked ids, preserving the ranking order
+async function fetchToolsByIds(ids: string[]): Promise<ToolResult[]> {
+  if (ids.length === 0) return [];
+
+  const Tool = await getToolModel();
+  const docs = await Tool.find({ _id: { $in: ids }, isActive: true })
+    .select('_id title logoUrl websiteUrl likeCount saveCount toolType about category keywords')
+    .lean();
+  const byId = new Map(docs.map(doc => [String(doc._id), doc] as const));
+
+  return ids
+    .map(id => byId.get(id))
+    .filter((tool): tool is NonNullable<typeof tool> => Boolean(tool))
+    .map(tool => ({
+      id: String(tool._id),
+      title: tool.title,
+      logoUrl: tool.logoUrl,
+      websiteUrl: tool.websiteUrl,
+      likeCount: tool.likeCount || 0,
+      saveCount: tool.saveCount || 0,
+      toolType: tool.toolType || 'browser',
+      about: tool.about,
+      category: tool.category,
+      keywords: tool.keywords || []
+    }));
+}
+
+function byPopularity(a: ToolResult, b: ToolResult): number {
+  return (b.likeCount + b.saveCount) - (a.likeCount + a.saveCount);
+}
+
+// Search tools using the in-memory ranking index; Mongo is only asked for the winners
 async function searchTools(keywords: string[], isSpecificTool: boolean): Promise<ToolResult[]> {
   try {
     await connectToolsDB();
-    const Tool = await getToolModel();
+    const index = await getToolSearchIndex();
 
     // Case 1: Specific tool name queries
     if (isSpecificTool) {
-      // First, find the exact tool
-      const searchPatterns = [];
-      
-      // Add exact matches first (highest priority)
-      for (const keyword of keywords) {
-        searchPatterns.push(
-          { title: { $regex: `^${keyword}$`, $options: 'i' } }, // Exact title match
-          { title: { $regex: `\\b${keyword}\\b`, $options: 'i' } }, // Word boundary match
-          { title: { $regex: keyword.replace(/\s+/g, ''), $options: 'i' } }, // No spaces version
-          { title: { $regex: keyword, $options: 'i' } } // Contains match
-        );
+      // Find the named tool, then the top 4 other tools from its category
+      const [exactTool] = index.rank(keywords, { k: 1, titles: keywords });
+      if (!exactTool || !exactTool.category) {
+        // If no exact tool found, return empty array for specific tool queries
+        return [];
       }
 
-      const exactTools = await Tool.aggregate([
-        {
-          $match: {
-            $or: searchPatterns,
-            isActive: true
-          }
-        },
-        {
-          $addFields: {
-            // Calculate exact match score
-            exactMatchScore: {
-              $add: [
-                // Perfect title match gets highest score
-                { $cond: [{ $regexMatch: { input: '$title', regex: `^${keywords.join('|')}$`, options: 'i' } }, 100, 0] },
-                // Word boundary match
-                { $cond: [{ $regexMatch: { input: '$title', regex: `\\b${keywords.join('|')}\\b`, options: 'i' } }, 80, 0] },
-                // No spaces version match
-                { $cond: [{ $regexMatch: { input: '$title', regex: keywords.map(k => k.replace(/\s+/g, '')).join('|'), options: 'i' } }, 70, 0] },
-                // Contains match
-                { $cond: [{ $regexMatch: { input: '$title', regex: keywords.join('|'), options: 'i' } }, 50, 0] },
-                // Popularity bonus
-                { $add: ['$likeCount', '$saveCount'] }
-              ]
-            }
-          }
-        },
-        {
-          $sort: { exactMatchScore: -1 }
-        },
-        {
-          $limit: 1
-        }
-      ]);
-
-      // If we found the exact tool, get its category and find top 5 tools from same category
-      if (exactTools.length > 0) {
-        const exactTool = exactTools[0];
-        const category = exactTool.category;
-        
-        if (category) {
-          // Find top 5 tools from the same category, sorted by popularity
-          const categoryTools = await Tool.aggregate([
-            {
-              $match: {
-                category: { $regex: new RegExp(category, 'i') },
-                _id: { $ne: exactTool._id }, // Exclude the exact tool
-                isActive: true
-              }
-            },
-            {
-              $addFields: {
-                popularityScore: {
-                  $add: ['$likeCount', '$saveCount']
-                }
-              }
-            },
-            {
-              $sort: { popularityScore: -1 }
-            },
-            {
-              $limit: 4 // Get 4 more to make total of 5
-            }
-          ]);
-
-          // Combine exact tool with category tools
-          const allTools = [
-            {
-              id: exactTool._id?.toString() || '',
-              title: exactTool.title,
-              logoUrl: exactTool.logoUrl,
-              websiteUrl: exactTool.websiteUrl,
-              likeCount: exactTool.likeCount || 0,
-              saveCount: exactTool.saveCount || 0,
-              toolType: exactTool.toolType || 'browser',
-              about: exactTool.about,
-              category: exactTool.category,
-              keywords: exactTool.keywords || []
-            },
-            ...categoryTools.map(tool => ({
-              id: tool._id?.toString() || '',
-              title: tool.title,
-              logoUrl: tool.logoUrl,
-              websiteUrl: tool.websiteUrl,
-              likeCount: tool.likeCount || 0,
-              saveCount: tool.saveCount || 0,
-              toolType: tool.toolType || 'browser',
-              about: tool.about,
-              category: tool.category,
-              keywords: tool.keywords || []
-            }))
-          ];
-
-          return allTools;
-        }
-      }
-
-      // If no exact tool found, return empty array for specific tool queries
-      return [];
+      const categoryTools = index.topInCategory(exactTool.category, 4, [exactTool.id]);
+      return fetchToolsByIds([exactTool.id, ...categoryTools.map(hit => hit.id)]);
     }
 
     // Case 2: Category queries (like "ALL IN ONE AI TOOLS")
@@ -384,198 +340,80 @@ async function searchTools(keywords: string[], isSpecificTool: boolean): Promise
 
     if (isCategoryQuery) {
       // For category queries, prioritize exact category matches
-      const categoryKeywords = keywords.filter(k => 
-        k.length > 2 && 
-        !['ai', 'tool', 'tools', 'automation', 'productivity', 'software', 'assistant', 'platform', 'app', 'application'].includes(k.toLowerCase())
-      );
-
-      const tools = await Tool.aggregate([
-        {
-          $match: {
-            isActive: true,
-            $or: [
-              // Exact category match gets highest priority
-              { category: { $regex: new RegExp(categoryKeywords.join('|'), 'i') } },
-              // Partial category match
-              { category: { $regex: new RegExp(categoryKeywords.map(k => k.split(/\s+/).join('|')).join('|'), 'i') } }
-            ]
-          }
-        },
-        {
-          $addFields: {
-            popularityScore: {
-              $add: ['$likeCount', '$saveCount']
-            },
-            // Calculate relevance score for category queries
-            relevanceScore: {
-              $add: [
-                // Exact category match gets highest score
-                { $cond: [{ $regexMatch: { input: '$category', regex: categoryKeywords.join('|'), options: 'i' } }, 50, 0] },
-                // Partial category match
-                { $cond: [{ $regexMatch: { input: '$category', regex: categoryKeywords.map(k => k.split(/\s+/).join('|')).join('|'), options: 'i' } }, 30, 0] },
-                // About section relevance
-                { $cond: [{ $regexMatch: { input: '$about', regex: categoryKeywords.join('|'), options: 'i' } }, 15, 0] },
-                // Keyword array matches
-                { $cond: [{ $gt: [{ $size: { $setIntersection: ['$keywords', categoryKeywords] } }, 0] }, 10, 0] },
-                // Bonus for multiple keyword matches
-                { $cond: [{ $gt: [{ $size: { $setIntersection: ['$keywords', categoryKeywords] } }, 1] }, 10, 0] }
-              ]
-            }
-          }
-        },
-        {
-          $sort: { relevanceScore: -1, popularityScore: -1 }
-        },
-        {
-          $limit: 5 // Return top 5 tools
-        }
-      ]);
+      const categoryKeywords = keywords
+        .filter(k => k.length > 2 && !GENERIC_KEYWORDS.includes(k.toLowerCase()))
+        .map(k => k.toLowerCase());
+      const categoryWords = categoryKeywords.flatMap(k => k.split(/\s+/));
+
+      let hits = index.rank(categoryKeywords, {
+        k: 5,
+        filter: tool => categoryKeywords.some(k => tool.category.toLowerCase().includes(k))
+      });
+      if (hits.length === 0) {
+        // Partial category match
+        hits = index.rank(categoryKeywords, {
+          k: 5,
+          filter: tool => categoryWords.some(word => tool.category.toLowerCase().includes(word))
+        });
+      }
 
       // Sort tools by popularity (likeCount + saveCount) in descending order
-      const sortedTools = tools
-        .map(tool => ({
-          id: tool._id?.toString() || '',
-          title: tool.title,
-          logoUrl: tool.logoUrl,
-          websiteUrl: tool.websiteUrl,
-          likeCount: tool.likeCount || 0,
-          saveCount: tool.saveCount || 0,
-          toolType: tool.toolType || 'browser',
-          about: tool.about,
-          category: tool.category,
-          keywords: tool.keywords || []
-        }))
-        .sort((a, b) => (b.likeCount + b.saveCount) - (a.likeCount + a.saveCount));
-
-      return sortedTools;
-    }
-
-    // Case 3: General keyword-based search with improved MongoDB query
+      const tools = await fetchToolsByIds(hits.map(hit => hit.id));
+      return tools.sort(byPopularity);
+    }
+
+    // Case 3: General keyword-based search
     // Filter out generic keywords that cause too many false matches
     const meaningfulKeywords = keywords.filter(k => 
       k.length > 2 && 
-      !['ai', 'tool', 'tools', 'automation', 'productivity', 'software', 'assistant', 'platform', 'app', 'application', 'related'].includes(k.toLowerCase())
+      ![...GENERIC_KEYWORDS, 'related'].includes(k.toLowerCase())
     );
 
-    // If no meaningful keywords, try to find tools that match the original keywords but with better scoring
+    // If no meaningful keywords, fall back to the original keywords
     const searchKeywords = meaningfulKeywords.length > 0 ? meaningfulKeywords : keywords;
-
-    // Enhanced MongoDB query with better ranking
-    const tools = await Tool.aggregate([
-      {
-        $match: {
-          isActive: true,
-          $or: [
-            // Title matches (highest priority)
-            { title: { $regex: searchKeywords.join('|'), $options: 'i' } },
-            // Category matches
-            { category: { $regex: searchKeywords.join('|'), $options: 'i' } },
-            // About section matches
-            { about: { $regex: searchKeywords.join('|'), $options: 'i' } },
-            // Keywords array matches
-            { keywords: { $in: searchKeywords.map(k => new RegExp(k, 'i')) } }
-          ]
-        }
-      },
-      {
-        $addFields: {
-          popularityScore: {
-            $add: ['$likeCount', '$saveCount']
-          },
-          // Calculate relevance score with improved weighting for specific keywords
-          relevanceScore: {
-            $add: [
-              // Title matches get highest priority
-              { $cond: [{ $regexMatch: { input: '$title', regex: searchKeywords.join('|'), options: 'i' } }, 40, 0] },
-              // Category matches
-              { $cond: [{ $regexMatch: { input: '$category', regex: searchKeywords.join('|'), options: 'i' } }, 25, 0] },
-              // About section matches
-              { $cond: [{ $regexMatch: { input: '$about', regex: searchKeywords.join('|'), options: 'i' } }, 15, 0] },
-              // Keyword array matches
-              { $cond: [{ $gt: [{ $size: { $setIntersection: ['$keywords', searchKeywords] } }, 0] }, 12, 0] },
-              // Bonus for multiple keyword matches
-              { $cond: [{ $gt: [{ $size: { $setIntersection: ['$keywords', searchKeywords] } }, 1] }, 10, 0] },
-              // Bonus for exact title matches
-              { $cond: [{ $regexMatch: { input: '$title', regex: `^${searchKeywords.join('|')}$`, options: 'i' } }, 30, 0] },
-              // Penalty for generic tool names that cause false matches
-              { $cond: [{ $regexMatch: { input: '$title', regex: '^(ai|tool|software|assistant|platform)$', options: 'i' } }, -20, 0] },
-              // Penalty for tools with very generic descriptions
-              { $cond: [{ $regexMatch: { input: '$about', regex: '^(ai|tool|software|assistant|platform)', options: 'i' } }, -15, 0] },
-              // Bonus for tools that match multiple meaningful keywords
-              { $cond: [{ $gt: [{ $size: { $setIntersection: ['$keywords', meaningfulKeywords] } }, 1] }, 15, 0] },
-              // Special bonus for tools that match specific high-value keywords
-              { $cond: [{ $regexMatch: { input: '$category', regex: 'image|generator|art|design|creative', options: 'i' } }, 20, 0] },
-              { $cond: [{ $regexMatch: { input: '$about', regex: 'image|generator|art|design|creative', options: 'i' } }, 15, 0] },
-              { $cond: [{ $regexMatch: { input: '$title', regex: 'image|generator|art|design|creative', options: 'i' } }, 25, 0] }
-            ]
-          }
-        }
-      },
-      {
-        $sort: { relevanceScore: -1, popularityScore: -1 }
-      },
-      {
-        $match: {
-          // Only include tools with a minimum relevance score to avoid false matches
-          relevanceScore: { $gte: 10 }
-        }
-      },
-      {
-        $limit: 5 // Return top 5 tools for general keyword queries
-      }
-    ]);
+    const hits = index.rank(searchKeywords, { k: 5 });
+    const tools = await fetchToolsByIds(hits.map(hit => hit.id));
 
     // Filter out tools that don't seem relevant to the search query
     const relevantTools = tools.filter(tool => {
-      // If the tool has a very low relevance score, it's probably not relevant
-      if (tool.relevanceScore < 15) {
-        return false;
-      }
-      
-      // Check if the tool's title, category, or about section contains any of the meaningful keywords
+      // Check if the tool's title, category, or about section contains any of the keywords
       const toolText = `${tool.title} ${tool.category || ''} ${tool.about || ''}`.toLowerCase();
-      const hasRelevantKeywords = meaningfulKeywords.length > 0 ? 
-        meaningfulKeywords.some(keyword => toolText.includes(keyword.toLowerCase())) :
-        searchKeywords.some(keyword => toolText.includes(keyword.toLowerCase()));
-      
-      return hasRelevantKeywords;
+      return searchKeywords.some(keyword => toolText.includes(keyword.toLowerCase()));
     });
 
     // Sort tools by popularity (likeCount + saveCount) in descending order
-    const sortedTools = relevantTools
-      .map(tool => ({
-        id: tool._id?.toString() || '',
-        title: tool.title,
-        logoUrl: tool.logoUrl,
-        websiteUrl: tool.websiteUrl,
-        likeCount: tool.likeCount || 0,
-        saveCount: tool.saveCount || 0,
-        toolType: tool.toolType || 'browser',
-        about: tool.about,
-        category: tool.category,
-        keywords: tool.keywords || []
-      }))
-      .sort((a, b) => (b.likeCount + b.saveCount) - (a.likeCount + a.saveCount));
-
-    return sortedTools;
+    return relevantTools.sort(byPopularity);
   } catch (error) {
-    console.error('Error searching tools:', error);
-    
-    // Log the specific error for debugging
-    if (error instanceof Error) {
-      console.error('Database connection error details:', error.message);
-      
-      // If it's a connection error, we should still return an empty array
-      // but log it for monitoring
-      if (error.message.includes('connection') || error.message.includes('ECONNREFUSED')) {
-        console.error('❌ Database connection failed - AI chatbot will use fallback responses');
-      }
-    }
+    // An empty list makes the chatbot fall back to canned responses
+    const connectionFailed = error instanceof Error &&
+      (error.message.includes('connection') || error.message.includes('ECONNREFUSED'));
+    logger.error('Error searching tools', { error, connectionFailed });
     
     return [];
   }
 }
 
+// Groq chat completion request for the answer text
+function buildAnswerRequest(userMessage: string, tools: ToolResult[], stream: boolean) {
+  return {
+    model: 'llama3-8b-8192',
+    messages: [
+      {
+        role: 'system',
+        content: `Generate a concise response about AI tools. Use exact likeCount/saveCount values. Keep it brief and helpful.
+
+User: "${userMessage}"
+Tools: ${tools.map((t, index) => `${index + 1}. ${t.title} - ${t.about} - ❤️${t.likeCount} 💾${t.saveCount}`).join('\n')}
+
+Respond naturally and briefly.`
+      }
+    ],
+    temperature: 0.7,
+    max_tokens: 300,
+    stream
+  };
+}
+
 // Generate intelligent response using GROQ
 async function generateIntelligentResponse(userMessage: string, tools: ToolResult[], searchIntent: { intent: string; keywords: string[]; isSpecificTool: boolean }): Promise<string> {
   if (!GROQ_CHATBOT_API_KEY) {
@@ -586,35 +424,20 @@ async function generateIntelligentResponse(userMessage: string, tools: ToolResul
     const controller = new AbortController();
     const timeoutId = setTimeout(() => controller.abort(), 2000); // 2 second timeout
 
-    const groqResponse = await fetch(GROQ_API_URL, {
+    const groqResponse = await timeUpstream('groq', () => fetch(GROQ_API_URL, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
         'Authorization': `Bearer ${GROQ_CHATBOT_API_KEY}`,
       },
       signal: controller.signal,
-      body: JSON.stringify({
-        model: 'llama3-8b-8192',
-        messages: [
-          {
-            role: 'system',
-            content: `Generate a concise response about AI tools. Use exact likeCount/saveCount values. Keep it brief and helpful.
-
-User: "${userMessage}"
-Tools: ${tools.map((t, index) => `${index + 1}. ${t.title} - ${t.about} - ❤️${t.likeCount} 💾${t.saveCount}`).join('\n')}
-
-Respond naturally and briefly.`
-          }
-        ],
-        temperature: 0.7,
-        max_tokens: 300
-      })
-    });
+      body: JSON.stringify(buildAnswerRequest(userMessage, tools, false))
+    }));
 
     clearTimeout(timeoutId);
 
     if (!groqResponse.ok) {
-      console.error('GROQ API error for response generation:', groqResponse.status);
+      logger.warn('GROQ API error for response generation', { status: groqResponse.status });
       return generateFallbackResponse(userMessage, tools);
     }
 
@@ -628,11 +451,71 @@ Respond naturally and briefly.`
     return response;
 
   } catch (error) {
-    console.error('Error generating intelligent response:', error);
+    logger.warn('Error generating intelligent response', { error });
     return generateFallbackResponse(userMessage, tools);
   }
 }
 
+// Stream the answer from GROQ token by token. The 2 second budget applies to
+// the first token; once text is flowing it may take up to 15 seconds in total.
+// Falls back to the canned response if nothing was received.
+async function streamIntelligentResponse(userMessage: string, tools: ToolResult[], onToken: (text: string) => void): Promise<string> {
+  const fallback = () => {
+    const text = generateFallbackResponse(userMessage, tools);
+    onToken(text);
+    return text;
+  };
+
+  if (!GROQ_CHATBOT_API_KEY) {
+    return fallback();
+  }
+
+  let answer = '';
+  const controller = new AbortController();
+  const firstTokenTimeout = setTimeout(() => controller.abort(), 2000);
+  const totalTimeout = setTimeout(() => controller.abort(), 15000);
+
+  try {
+    const groqResponse = await timeUpstream('groq', () => fetch(GROQ_API_URL, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${GROQ_CHATBOT_API_KEY}`,
+      },
+      signal: controller.signal,
+      body: JSON.stringify(buildAnswerRequest(userMessage, tools, true))
+    }));
+
+    if (!groqResponse.ok || !groqResponse.body) {
+      logger.warn('GROQ API error for streamed response generation', { status: groqResponse.status });
+      return fallback();
+    }
+
+    await readSSE(groqResponse.body, ({ data }) => {
+      if (data === '[DONE]') return;
+      try {
+        const chunk: GroqStreamChunk = JSON.parse(data);
+        const text = chunk.choices?.[0]?.delta?.content;
+        if (text) {
+          clearTimeout(firstTokenTimeout);
+          answer += text;
+          onToken(text);
+        }
+      } catch {
+        logger.warn('Failed to parse GROQ stream chunk', { data });
+      }
+    });
+  } catch (error) {
+    logger.warn('Error streaming intelligent response', { error });
+  } finally {
+    clearTimeout(firstTokenTimeout);
+    clearTimeout(totalTimeout);
+  }
+
+  // Keep whatever arrived before an interruption; only fall back if nothing did
+  return answer.trim() ? answer.trim() : fallback();
+}
+
 // Fallback response generator
 function generateFallbackResponse(userMessage: string, tools: ToolResult[]): string {
   if (tools.length === 0) {
@@ -798,17 +681,106 @@ function logRequestedTool(userMessage: string, searchIntent: { intent: string; k
     }
     
     if (requestedTool) {
-      console.log(`🔍 [MISSING TOOL REQUEST] User requested: "${requestedTool}" | Query: "${userMessage}" | Intent: ${searchIntent.intent}`);
+      // Not sampled away with the debug traces: these drive catalog additions
+      logger.warn('Missing tool request', { requestedTool, query: userMessage, intent: searchIntent.intent });
       
       // You can extend this to save to a database or send notifications
-      // For now, we'll just log it to the console
     }
   } catch (error) {
-    console.error('Error logging requested tool:', error);
+    logger.error('Error logging requested tool', { error });
   }
 }
 
-export async function GET(): Promise<NextResponse> {
+// Everything in AIResponse except the answer text
+function buildResponseMetadata(message: string, tools: ToolResult[], searchIntent: { intent: string; keywords: string[]; isSpecificTool: boolean }): Omit<AIResponse, 'answer' | 'tools'> {
+  // Generate moreLink based on the found tool's category, or default to 'ai-tools'
+  let moreLink = '/category/ai-tools';
+  if (tools.length > 0) {
+    // Use the category of the first found tool
+    const toolCategory = tools[0].category;
+    if (toolCategory) {
+      // URL encode the category name to handle spaces and special characters
+      // Convert to lowercase first to match the existing category link pattern
+      const encodedCategory = encodeURIComponent(toolCategory.toLowerCase());
+      moreLink = `/category/${encodedCategory}`;
+    }
+  }
+  
+  const metadata: Omit<AIResponse, 'answer' | 'tools'> = {
+    moreLink,
+    isExactMatch: searchIntent.isSpecificTool && tools.length > 0
+  };
+
+  // Add missing tool information if no tools found
+  if (tools.length === 0) {
+    // Check if this looks like a specific tool request
+    const specificToolPatterns = [
+      /tell me about (.+)/i,
+      /what is (.+)/i,
+      /show me (.+)/i,
+      /i want (.+)/i,
+      /find (.+)/i
+    ];
+    
+    for (const pattern of specificToolPatterns) {
+      const match = message.match(pattern);
+      if (match && match[1]) {
+        metadata.missingTool = match[1].trim();
+        break;
+      }
+    }
+    
+    // Check if this looks like a category request
+    if (!metadata.missingTool) {
+      const categoryPatterns = [
+        /tools for (.+)/i,
+        /(.+) tools/i,
+        /ai tools for (.+)/i,
+        /(.+) ai tools/i
+      ];
+      
+      for (const pattern of categoryPatterns) {
+        const match = message.match(pattern);
+        if (match && match[1]) {
+          metadata.missingCategory = match[1].trim();
+          break;
+        }
+      }
+    }
+  }
+
+  return metadata;
+}
+
+// Wrap a producer in a text/event-stream response. Events: `tools` once
+// retrieval is done, `token` for each piece of answer text, then `done` with
+// the full answer and metadata, or `error`.
+function eventStreamResponse(produce: (send: (event: string, data: unknown) => void) => Promise<void>): Response {
+  const stream = new ReadableStream<Uint8Array>({
+    async start(controller) {
+      const send = (event: string, data: unknown) => controller.enqueue(encodeSSE(event, data));
+      try {
+        await produce(send);
+      } catch (error) {
+        logger.error('AI Agent stream error', { error });
+        send('error', { error: 'Internal server error' });
+      } finally {
+        controller.close();
+      }
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      'Connection': 'keep-alive',
+      'X-Accel-Buffering': 'no'
+    }
+  });
+}
+
+async function describeAgent(): Promise<NextResponse> {
   return NextResponse.json({
     message: 'AI Agent API',
     description: 'Scalable AI tool finder with intelligent search and GROQ integration.',
@@ -820,11 +792,12 @@ export async function GET(): Promise<NextResponse> {
       example: {
         message: 'Tell me about Cursor AI'
       }
-    }
+    },
+    cache: getChatCacheStats()
   });
 }
 
-export async function POST(req: NextRequest): Promise<NextResponse> {
+async function handleAgentRequest(req: NextRequest): Promise<Response> {
   try {
     // Apply rate limiting
     const rateLimitResult = await applyRateLimit(req, getRateLimiter('/ai-agent'));
@@ -852,7 +825,7 @@ export async function POST(req: NextRequest): Promise<NextResponse> {
       
       body = JSON.parse(rawBody);
     } catch (parseError) {
-      console.error('Failed to parse request body:', parseError);
+      logger.debug('Failed to parse request body', { error: parseError });
       return NextResponse.json(
         { error: 'Invalid JSON in request body. Please provide valid JSON with a "message" field.' }, 
         { status: 400 }
@@ -860,6 +833,8 @@ export async function POST(req: NextRequest): Promise<NextResponse> {
     }
     
     const { message } = body;
+    // Streaming is opt-in, via the request body or an Accept header
+    const wantsStream = body.stream === true || (req.headers.get('accept') || '').includes('text/event-stream');
 
     if (!validateMessage(message)) {
       return NextResponse.json(
@@ -868,102 +843,79 @@ export async function POST(req: NextRequest): Promise<NextResponse> {
       );
     }
 
-    console.log('🔍 Processing message:', message);
-
     // STEP 1: Check for inappropriate content
     const contentFilter = isInappropriateQuery(message);
     if (contentFilter.isInappropriate) {
-      console.log('🚫 Inappropriate query detected:', contentFilter.reason);
+      logger.info('Inappropriate query refused', { reason: contentFilter.reason });
       
-      return NextResponse.json<AIResponse>({
+      const refusal: AIResponse = {
         answer: `I cannot help you with ${contentFilter.reason}. I'm designed to assist with legitimate AI tool searches and recommendations. Please ask about legal and ethical AI tools that can help with your legitimate needs.`,
         tools: [], // No tools for inappropriate queries
         moreLink: '/category', // Default to main category page for inappropriate queries
         isExactMatch: false,
         toolNotFound: false
-      });
+      };
+
+      if (wantsStream) {
+        return eventStreamResponse(async send => {
+          send('tools', { tools: [], isExactMatch: false });
+          send('done', refusal);
+        });
+      }
+      return NextResponse.json<AIResponse>(refusal);
     }
 
     // STEP 2: Extract search intent and keywords using GROQ
     const searchIntent = await extractSearchIntent(message);
-    console.log('🎯 Search intent:', searchIntent);
 
-    // STEP 3: Search tools in database
-    const tools = await searchTools(searchIntent.keywords, searchIntent.isSpecificTool);
-    console.log('🔍 Found tools:', tools.length);
-    console.log('🔍 Tools found:', tools.map(t => ({ title: t.title, category: t.category })));
+    // STEP 3: Search tools in database (cached per intent until the catalog changes)
+    const catalogGeneration = getCatalogGeneration();
+    let tools = getCachedResults<ToolResult>(searchIntent);
+    if (!tools) {
+      tools = await searchTools(searchIntent.keywords, searchIntent.isSpecificTool);
+      // Empty lists are not cached: searchTools also returns [] when the database is unreachable
+      if (tools.length > 0) {
+        setCachedResults(searchIntent, tools, catalogGeneration);
+      }
+    }
+    logger.debug('AI agent search', {
+      message,
+      intent: searchIntent.intent,
+      keywords: searchIntent.keywords,
+      tools: tools.length
+    });
 
     // Log requested tools that aren't found
     if (tools.length === 0) {
       logRequestedTool(message, searchIntent);
     }
 
+    const metadata = buildResponseMetadata(message, tools, searchIntent);
+
+    // STEP 4 (streaming): tool cards first, then answer tokens, then metadata
+    if (wantsStream) {
+      const foundTools = tools;
+      return eventStreamResponse(async send => {
+        send('tools', { tools: foundTools, isExactMatch: metadata.isExactMatch });
+        const answer = await streamIntelligentResponse(message, foundTools, text => send('token', { text }));
+        send('done', { answer, tools: foundTools, ...metadata });
+      });
+    }
+
     // STEP 4: Generate intelligent response
     const answer = await generateIntelligentResponse(message, tools, searchIntent);
 
-    // STEP 4: Return response with missing tool information
-    // Generate moreLink based on the found tool's category, or default to 'ai-tools'
-    let moreLink = '/category/ai-tools';
-    if (tools.length > 0) {
-      // Use the category of the first found tool
-      const toolCategory = tools[0].category;
-      if (toolCategory) {
-        // URL encode the category name to handle spaces and special characters
-        // Convert to lowercase first to match the existing category link pattern
-        const encodedCategory = encodeURIComponent(toolCategory.toLowerCase());
-        moreLink = `/category/${encodedCategory}`;
-      }
-    }
-    
+    // STEP 5: Return response with missing tool information
     const response: AIResponse = {
       answer,
       tools,
-      moreLink,
-      isExactMatch: searchIntent.isSpecificTool && tools.length > 0
+      ...metadata
     };
 
-    // Add missing tool information if no tools found
-    if (tools.length === 0) {
-      // Check if this looks like a specific tool request
-      const specificToolPatterns = [
-        /tell me about (.+)/i,
-        /what is (.+)/i,
-        /show me (.+)/i,
-        /i want (.+)/i,
-        /find (.+)/i
-      ];
-      
-      for (const pattern of specificToolPatterns) {
-        const match = message.match(pattern);
-        if (match && match[1]) {
-          response.missingTool = match[1].trim();
-          break;
-        }
-      }
-      
-      // Check if this looks like a category request
-      if (!response.missingTool) {
-        const categoryPatterns = [
-          /tools for (.+)/i,
-          /(.+) tools/i,
-          /ai tools for (.+)/i,
-          /(.+) ai tools/i
-        ];
-        
-        for (const pattern of categoryPatterns) {
-          const match = message.match(pattern);
-          if (match && match[1]) {
-            response.missingCategory = match[1].trim();
-            break;
-          }
-        }
-      }
-    }
-
     return NextResponse.json<AIResponse>(response);
 
   } catch (error) {
-    console.error('AI Agent Error:', error);
+    logger.error('AI Agent Error', { error });
     
     const isDevelopment = process.env.NODE_ENV === 'development';
     const errorMessage = isDevelopment 
@@ -976,3 +928,6 @@ export async function POST(req: NextRequest): Promise<NextResponse> {
     );
   }
 }
+
+export const GET = withRouteMetrics('/api/ai-agent', describeAgent);
+export const POST = withRouteMetrics('/api/ai-agent', handleAgentRequest);
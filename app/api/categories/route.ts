@@ -1,6 +1,9 @@
 import { NextResponse } from 'next/server';
 import { connectToolsDB } from '@/lib/db/websitedb';
 import { getToolModel } from '@/models/tools';
+import { withCatalogCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+import { logger } from '@/lib/logger';
 
 interface CategoryData {
   name: string;
@@ -8,6 +11,16 @@ interface CategoryData {
   description: string;
 }
 
+interface CategoryFacets {
+  total: { count: number }[];
+  categories: { name: string; toolCount: number; description?: string | null }[];
+}
+
+// Search text is matched literally against category names
+function escapeRegex(text: string): string {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
 // Retry function for database operations
 async function retryOperation<T>(
   operation: () => Promise<T>,
@@ -18,7 +31,7 @@ async function retryOperation<T>(
     try {
       return await operation();
     } catch (error) {
-      console.error(`Database operation attempt ${attempt} failed:`, error);
+      logger.warn('Database operation attempt failed', { attempt, error });
       
       if (attempt === maxRetries) {
         throw error;
@@ -31,27 +44,18 @@ async function retryOperation<T>(
   throw new Error('All retry attempts failed');
 }
 
-export async function GET(request: Request) {
+async function getCategories(request: Request) {
   try {
     const { searchParams } = new URL(request.url);
     const page = parseInt(searchParams.get('page') || '1');
     const limit = parseInt(searchParams.get('limit') || '20');
     const search = searchParams.get('search') || '';
 
-    console.log('API Request parameters:', {
-      page,
-      limit,
-      search,
-      url: request.url
-    });
-
     // Validate parameters
     if (page < 1) {
-      console.log('Validation failed: page < 1', { page });
       return NextResponse.json({ error: "Page must be greater than 0" }, { status: 400 });
     }
     if (limit < 1 || limit > 100) {
-      console.log('Validation failed: limit out of range', { limit });
       return NextResponse.json({ error: "Limit must be between 1 and 100" }, { status: 400 });
     }
 
@@ -62,69 +66,56 @@ export async function GET(request: Request) {
 
     const Tool = await getToolModel();
 
-    // Get categories with pagination and search support
+    // Get categories with pagination and search support in a single aggregation:
+    // one pass groups every tool by category, counting active tools and keeping
+    // the earliest active tool's description, then $facet pages the sorted names.
     const result = await retryOperation(async () => {
-      // Get all unique categories first
-      const allCategories: string[] = await Tool.distinct('category');
-      const sortedCategories = [...new Set(allCategories)].sort();
-
-      console.log('Database categories:', {
-        totalCategories: allCategories.length,
-        sortedCategories: sortedCategories.length
-      });
-
-      // Apply search filter if provided
-      let filteredCategories = sortedCategories;
+      const match: Record<string, unknown> = {};
       if (search.trim()) {
-        const searchLower = search.toLowerCase();
-        filteredCategories = sortedCategories.filter(category =>
-          category.toLowerCase().includes(searchLower)
-        );
-        console.log('Search filtered categories:', {
-          search,
-          filteredCount: filteredCategories.length
-        });
+        match.category = { $regex: escapeRegex(search.trim()), $options: 'i' };
       }
 
-      // Calculate pagination
-      const totalCategories = filteredCategories.length;
+      const [facets] = await Tool.aggregate<CategoryFacets>([
+        { $match: match },
+        { $project: { category: 1, isActive: 1, about: 1 } },
+        {
+          $group: {
+            _id: '$category',
+            toolCount: { $sum: { $cond: [{ $eq: ['$isActive', true] }, 1, 0] } },
+            // $min ignores nulls, so this picks the lowest _id among active tools
+            firstActive: {
+              $min: { $cond: [{ $eq: ['$isActive', true] }, { _id: '$_id', about: '$about' }, null] }
+            }
+          }
+        },
+        { $sort: { _id: 1 } },
+        {
+          $facet: {
+            total: [{ $count: 'count' }],
+            categories: [
+              { $skip: (page - 1) * limit },
+              { $limit: limit },
+              {
+                $project: {
+                  _id: 0,
+                  name: '$_id',
+                  toolCount: 1,
+                  description: '$firstActive.about'
+                }
+              }
+            ]
+          }
+        }
+      ]);
+
+      const totalCategories = facets?.total[0]?.count ?? 0;
       const totalPages = Math.ceil(totalCategories / limit);
-      const startIndex = (page - 1) * limit;
-      const endIndex = startIndex + limit;
-      const paginatedCategories = filteredCategories.slice(startIndex, endIndex);
-
-      console.log('Pagination calculation:', {
-        totalCategories,
-        totalPages,
-        startIndex,
-        endIndex,
-        paginatedCategoriesCount: paginatedCategories.length
-      });
-
-      // Process only the paginated categories
-      const categoryData: CategoryData[] = await Promise.all(
-        paginatedCategories.map(async (category) => {
-          // Use countDocuments for better performance than find().length
-          const toolCount = await Tool.countDocuments({ 
-            category, 
-            isActive: true 
-          });
-          
-          // Get description from first tool in category
-          const firstTool = await Tool.findOne({ 
-            category, 
-            isActive: true 
-          }).select('about').lean();
-          
-          const description = firstTool?.about || `Explore amazing ${category.toLowerCase()} tools`;
-
-          return {
-            name: category,
-            toolCount,
-            description
-          };
-        })
-      );
+
+      const categoryData: CategoryData[] = (facets?.categories ?? []).map(category => ({
+        name: category.name,
+        toolCount: category.toolCount,
+        description: category.description || `Explore amazing ${category.name.toLowerCase()} tools`
+      }));
 
       return {
         categories: categoryData,
@@ -139,7 +130,13 @@ export async function GET(request: Request) {
       };
     }, 2, 1000);
 
-    console.log(`API: Loaded ${result.categories.length} categories for page ${page} (${result.pagination.totalCategories} total)`);
+    logger.debug('Categories loaded', {
+      page,
+      limit,
+      search,
+      returned: result.categories.length,
+      totalCategories: result.pagination.totalCategories
+    });
 
     return NextResponse.json({
       success: true,
@@ -148,7 +145,7 @@ export async function GET(request: Request) {
     });
 
   } catch (error) {
-    console.error('Categories API error:', error);
+    logger.error('Categories API error', { error });
     return NextResponse.json(
       { 
         error: "Failed to get categories", 
@@ -157,4 +154,9 @@ export async function GET(request: Request) {
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+// Category listings only change with uploads/deletes
+export const GET = withRouteMetrics('/api/categories', (request: Request) =>
+  withCatalogCache(request, { sMaxAge: 300, staleWhileRevalidate: 3600 }, () => getCategories(request))
+);
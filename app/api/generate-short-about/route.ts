@@ -1,5 +1,7 @@
 // app/api/generate-short-about/route.ts
 import { NextResponse } from "next/server";
+import { GroqError, groqChat, isGroqConfigured } from "@/lib/groq";
+import { cleanAboutText } from "@/lib/websiteMetadata";
 
 export async function POST(req: Request) {
   try {
@@ -9,28 +11,18 @@ export async function POST(req: Request) {
       return NextResponse.json({ error: "Title is required" }, { status: 400 });
     }
 
-    if (!process.env.GROQ_FORM_API_KEY) {
+    if (!isGroqConfigured()) {
       console.error("[generate-short-about] GROQ_FORM_API_KEY not configured");
       return NextResponse.json({ error: "Groq API key not configured" }, { status: 500 });
     }
 
-    // Add timeout for Groq API call
-    const controller = new AbortController();
-    const timeoutId = setTimeout(() => controller.abort(), 15000); // 15 second timeout
-
     try {
-      const groqRes = await fetch("https://api.groq.com/openai/v1/chat/completions", {
-        method: "POST",
-        headers: {
-          "Authorization": `Bearer ${process.env.GROQ_FORM_API_KEY}`,
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          model: "llama3-8b-8192",
-          messages: [
-            {
-              role: "system",
-              content: `You are a tool description generator. Create a short, compelling about text (exactly 25 words) for an AI tool that highlights its unique value proposition (USP).
+      // Shares the Groq rate limit with the other metadata routes and jobs
+      const aboutText = await groqChat(
+        [
+          {
+            role: "system",
+            content: `You are a tool description generator. Create a short, compelling about text (exactly 25 words) for an AI tool that highlights its unique value proposition (USP).
 
               RULES:
               - Exactly 25 words maximum
@@ -47,54 +39,36 @@ export async function POST(req: Request) {
               - "Creative AI image generator that turns ideas into stunning visuals. Create professional graphics, illustrations, and designs in seconds."
               
               Return only the about text, no other content.`,
-            },
-            {
-              role: "user",
-              content: `Tool: ${title}
+          },
+          {
+            role: "user",
+            content: `Tool: ${title}
 Description: ${description || 'AI tool'}
 Keywords: ${keywords ? keywords.join(', ') : 'N/A'}
 
 Generate a 25-word about text:`,
-            },
-          ],
-          temperature: 0.7,
-          max_tokens: 100,
-        }),
-        signal: controller.signal,
-      });
-
-      clearTimeout(timeoutId);
-
-      if (!groqRes.ok) {
-        const errorData = await groqRes.text();
-        console.error(`[generate-short-about] Groq API error ${groqRes.status}:`, errorData);
-        return NextResponse.json({ 
-          error: `Groq API error: ${groqRes.status} ${groqRes.statusText}` 
-        }, { status: 500 });
-      }
-
-      const data = await groqRes.json();
-      const aboutText = data.choices?.[0]?.message?.content?.trim();
+          },
+        ],
+        { temperature: 0.7, maxTokens: 100 }
+      );
 
       if (!aboutText) {
-        console.error("[generate-short-about] No content in Groq response:", data);
+        console.error("[generate-short-about] No content in Groq response");
         return NextResponse.json({ error: "Failed to generate about text" }, { status: 500 });
       }
 
       // Clean the response and ensure it's around 25 words
-      const cleanedText = aboutText
-        .replace(/^["']|["']$/g, '') // Remove quotes
-        .replace(/\n/g, ' ') // Replace newlines with spaces
-        .replace(/\s+/g, ' ') // Normalize spaces
-        .trim();
+      const cleanedText = cleanAboutText(aboutText);
 
       const wordCount = cleanedText.split(/\s+/).length;
       
       console.log(`[generate-short-about] Successfully generated about text (${wordCount} words) for: ${title}`);
       return NextResponse.json({ about: cleanedText, wordCount });
     } catch (fetchError: unknown) {
-      clearTimeout(timeoutId);
-      
+      if (fetchError instanceof GroqError) {
+        return NextResponse.json({ error: fetchError.message }, { status: 500 });
+      }
+
       if (fetchError instanceof Error && fetchError.name === 'AbortError') {
         console.error("[generate-short-about] Timeout for Groq API call");
         return NextResponse.json({ 
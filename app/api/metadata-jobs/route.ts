@@ -0,0 +1,91 @@
+// app/api/metadata-jobs/route.ts
+import { NextRequest, NextResponse } from "next/server";
+import {
+  MAX_JOBS_PER_REQUEST,
+  MetadataJobInput,
+  enqueueMetadataJobs,
+  getMetadataJobs,
+  metadataJobKey,
+} from "@/lib/metadataJobs";
+import { applyRateLimit, getRateLimiter } from "@/lib/rateLimiter";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
+
+// POST - Enqueue metadata enrichment (title, logo, keywords, about) for up to
+// MAX_JOBS_PER_REQUEST tools. Returns 202 with one job per distinct tool; poll
+// GET ?ids=... for results. `refresh: true` regenerates tools that already
+// have a result instead of returning it. Enqueues are rate limited; polling
+// only reads job documents and is not.
+async function enqueueJobs(req: NextRequest) {
+  try {
+    const rateLimitResult = await applyRateLimit(req, getRateLimiter("/api/metadata-jobs"));
+    if (rateLimitResult) {
+      return rateLimitResult;
+    }
+
+    const body = await req.json().catch(() => null);
+    const tools: MetadataJobInput[] = Array.isArray(body?.tools) ? body.tools : [];
+
+    if (tools.length === 0 || tools.length > MAX_JOBS_PER_REQUEST) {
+      return NextResponse.json(
+        { error: `tools must be an array of 1 to ${MAX_JOBS_PER_REQUEST} tools` },
+        { status: 400 }
+      );
+    }
+
+    const inputs = [];
+    for (let i = 0; i < tools.length; i++) {
+      const { websiteUrl, title, description } = (tools[i] || {}) as MetadataJobInput;
+      if (websiteUrl !== undefined && (typeof websiteUrl !== "string" || !/^https?:\/\//.test(websiteUrl))) {
+        return NextResponse.json({ error: `Tool ${i + 1}: invalid website URL`, toolIndex: i }, { status: 400 });
+      }
+      const input = {
+        websiteUrl,
+        title: typeof title === "string" ? title.trim() : undefined,
+        description: typeof description === "string" ? description.trim() : undefined,
+      };
+      const key = metadataJobKey(input);
+      if (!key) {
+        return NextResponse.json({ error: `Tool ${i + 1}: websiteUrl or title is required`, toolIndex: i }, { status: 400 });
+      }
+      inputs.push({ ...input, key });
+    }
+
+    const jobs = await enqueueMetadataJobs(inputs, { refresh: body.refresh === true });
+    return NextResponse.json({ success: true, jobs }, { status: 202 });
+  } catch (err) {
+    logger.error("Metadata job enqueue error", { error: err });
+    return NextResponse.json({ error: "Failed to enqueue metadata jobs" }, { status: 500 });
+  }
+}
+
+// GET - Status and results of jobs, ?ids=<id>,<id>,...
+async function getJobs(req: NextRequest) {
+  try {
+    const { searchParams } = new URL(req.url);
+    const ids = (searchParams.get("ids") || "")
+      .split(",")
+      .map(id => id.trim())
+      .filter(id => /^[0-9a-f]{24}$/i.test(id));
+
+    if (ids.length === 0 || ids.length > MAX_JOBS_PER_REQUEST) {
+      return NextResponse.json(
+        { error: `ids must list 1 to ${MAX_JOBS_PER_REQUEST} job IDs` },
+        { status: 400 }
+      );
+    }
+
+    const jobs = await getMetadataJobs(ids);
+    return NextResponse.json({
+      success: true,
+      jobs,
+      pending: jobs.filter(job => job.status === "queued" || job.status === "running").length,
+    });
+  } catch (err) {
+    logger.error("Metadata job poll error", { error: err });
+    return NextResponse.json({ error: "Failed to get metadata jobs" }, { status: 500 });
+  }
+}
+
+export const POST = withRouteMetrics("/api/metadata-jobs", enqueueJobs);
+export const GET = withRouteMetrics("/api/metadata-jobs", getJobs);
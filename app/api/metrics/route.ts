@@ -0,0 +1,139 @@
+// app/api/metrics/route.ts
+import { formatMetric, renderRequestMetrics, Sample } from "@/lib/metrics";
+import { getRateLimiterStats } from "@/lib/rateLimiter";
+import { getChatCacheStats } from "@/lib/chatCache";
+import { getResponseCacheStats } from "@/lib/responseCache";
+import { getCountCacheStats } from "@/lib/toolPagination";
+import { getCounterBufferStats } from "@/lib/counterBuffer";
+import { CacheStats } from "@/lib/lruCache";
+import { getLoggerStats } from "@/lib/logger";
+
+// Scrapes are per instance and must never be served from a cache
+export const dynamic = "force-dynamic";
+
+function rateLimitMetrics(): string[] {
+  const { store, endpoints } = getRateLimiterStats();
+  const decisions: Sample[] = [];
+  const local: Sample[] = [];
+  const storeCalls: Sample[] = [];
+  const storeErrors: Sample[] = [];
+  const storeSeconds: Sample[] = [];
+
+  for (const [endpoint, stats] of Object.entries(endpoints)) {
+    decisions.push({ labels: { endpoint, decision: "allowed" }, value: stats.allowed });
+    decisions.push({ labels: { endpoint, decision: "blocked" }, value: stats.blocked });
+    local.push({ labels: { endpoint, decision: "allowed" }, value: stats.localAllowed });
+    local.push({ labels: { endpoint, decision: "blocked" }, value: stats.localBlocked });
+    storeCalls.push({ labels: { endpoint, store }, value: stats.storeCalls });
+    storeErrors.push({ labels: { endpoint, store }, value: stats.storeErrors });
+    storeSeconds.push({ labels: { endpoint, store }, value: stats.storeLatencyMs / 1000 });
+  }
+
+  return [
+    formatMetric("rate_limit_decisions_total", "counter", "Rate limit decisions by endpoint", decisions),
+    formatMetric("rate_limit_local_decisions_total", "counter", "Decisions answered without asking the shared store", local),
+    formatMetric("rate_limit_store_calls_total", "counter", "Calls to the rate limit store", storeCalls),
+    formatMetric("rate_limit_store_errors_total", "counter", "Failed rate limit store calls (served by in-process limits)", storeErrors),
+    formatMetric("rate_limit_store_seconds_total", "counter", "Time spent waiting on the rate limit store", storeSeconds),
+  ];
+}
+
+function cacheMetrics(): string[] {
+  const chat = getChatCacheStats();
+  const response = getResponseCacheStats();
+  const caches: Record<string, CacheStats> = {
+    chat_intent: chat.intent,
+    chat_results: chat.results,
+    response_bodies: response.bodies,
+    tool_counts: getCountCacheStats(),
+  };
+
+  const requests: Sample[] = [];
+  const entries: Sample[] = [];
+  const evictions: Sample[] = [];
+  for (const [cache, stats] of Object.entries(caches)) {
+    requests.push({ labels: { cache, result: "hit" }, value: stats.hits });
+    requests.push({ labels: { cache, result: "miss" }, value: stats.misses });
+    entries.push({ labels: { cache }, value: stats.size });
+    evictions.push({ labels: { cache }, value: stats.evictions + stats.expirations + stats.invalidations });
+  }
+
+  return [
+    formatMetric("cache_requests_total", "counter", "In-process cache lookups by result", requests),
+    formatMetric("cache_entries", "gauge", "Entries held by in-process caches", entries),
+    formatMetric("cache_removals_total", "counter", "Entries evicted, expired or invalidated", evictions),
+    formatMetric("http_cache_responses_total", "counter", "How catalog GETs were answered", [
+      { labels: { outcome: "not_modified" }, value: response.notModified },
+      { labels: { outcome: "memory" }, value: response.bodyHits },
+      { labels: { outcome: "handler" }, value: response.misses },
+      { labels: { outcome: "uncached" }, value: response.uncached },
+    ]),
+  ];
+}
+
+function counterBufferMetrics(): string[] {
+  const stats = getCounterBufferStats();
+  return [
+    formatMetric("counter_buffer_pending_tools", "gauge", "Tools with buffered like/save deltas", [
+      { labels: { state: "pending" }, value: stats.pendingTools },
+      { labels: { state: "in_flight" }, value: stats.inFlightTools },
+    ]),
+    formatMetric("counter_buffer_flushes_total", "counter", "Counter buffer flushes by outcome", [
+      { labels: { outcome: "ok" }, value: stats.flushes },
+      { labels: { outcome: "error" }, value: stats.failures },
+    ]),
+  ];
+}
+
+function loggerMetrics(): string[] {
+  const stats = getLoggerStats();
+  return [
+    formatMetric("log_records_buffered", "gauge", "Log records waiting for the next flush", [
+      { labels: {}, value: stats.buffered },
+    ]),
+    formatMetric("log_records_total", "counter", "Log records by outcome", [
+      { labels: { outcome: "written" }, value: stats.written },
+      { labels: { outcome: "sampled_out" }, value: stats.sampledOut },
+      { labels: { outcome: "dropped" }, value: stats.dropped },
+    ]),
+    formatMetric("log_sink_errors_total", "counter", "Failed log batch writes", [{ labels: {}, value: stats.sinkErrors }]),
+  ];
+}
+
+function processMetrics(): string[] {
+  const memory = process.memoryUsage();
+  return [
+    formatMetric("process_resident_memory_bytes", "gauge", "Resident memory size", [{ labels: {}, value: memory.rss }]),
+    formatMetric("nodejs_heap_used_bytes", "gauge", "V8 heap in use", [{ labels: {}, value: memory.heapUsed }]),
+    formatMetric("process_uptime_seconds", "gauge", "Seconds since the process started", [{ labels: {}, value: process.uptime() }]),
+  ];
+}
+
+// GET - Prometheus text exposition of this instance's metrics. When
+// METRICS_TOKEN is set, scrapers must send it as a bearer token; production
+// without a token does not expose the endpoint at all.
+export async function GET(req: Request) {
+  const token = process.env.METRICS_TOKEN;
+  if (!token && process.env.NODE_ENV === "production") {
+    return new Response("Not Found\n", { status: 404 });
+  }
+  if (token && req.headers.get("authorization") !== `Bearer ${token}`) {
+    return new Response("Unauthorized\n", { status: 401 });
+  }
+
+  const body = [
+    renderRequestMetrics(),
+    ...rateLimitMetrics(),
+    ...cacheMetrics(),
+    ...counterBufferMetrics(),
+    ...loggerMetrics(),
+    ...processMetrics(),
+  ].join("\n\n");
+
+  return new Response(`${body}\n`, {
+    headers: {
+      "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+      "Cache-Control": "no-store",
+    },
+  });
+}
@@ -1,53 +1,25 @@
 import { NextResponse } from "next/server";
-import { connectUserDB } from "@/lib/db/userdb";
-import { connectToolsDB } from "@/lib/db/websitedb";
-import User from "@/models/user";
-import { getToolModel } from "@/models/tools";
+import { getPlatformStats } from "@/lib/platformStats";
+import { withCatalogCache } from "@/lib/responseCache";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
 
 // GET - Get platform statistics
-export async function GET() {
+// Counters are materialized by the write paths (see lib/platformStats.ts),
+// so this is a single point read regardless of catalog size.
+async function getStats() {
   try {
-    console.log('Stats API: Starting...');
-    
-    // Connect to databases
-    await connectUserDB();
-    console.log('Stats API: User DB connected');
-    await connectToolsDB();
-    console.log('Stats API: Tools DB connected');
+    const { userCount, categoryCount, toolCount } = await getPlatformStats();
 
-    // Get user count (active users who have logged in)
-    const userCount = await User.countDocuments({ 
-      isActive: true,
-      lastLogin: { $exists: true }
-    });
-    console.log('Stats API: User count:', userCount);
-
-    // Get tool model and counts
-    const Tool = await getToolModel();
-    console.log('Stats API: Tool model obtained');
-    
-    // Get category count (unique categories from tools)
-    const categories = await Tool.distinct('category');
-    const categoryCount = categories.length;
-    console.log('Stats API: Categories:', categories);
-    console.log('Stats API: Category count:', categoryCount);
-
-    // Get total tool count
-    const toolCount = await Tool.countDocuments({});
-    console.log('Stats API: Tool count:', toolCount);
-
-    const result = {
+    return NextResponse.json({
       success: true,
       userCount,
       categoryCount,
       toolCount
-    };
-    
-    console.log('Stats API: Final result:', result);
-    return NextResponse.json(result);
+    });
 
   } catch (error) {
-    console.error("Get stats error:", error);
+    logger.error("Get stats error", { error });
     return NextResponse.json(
       { 
         error: "Failed to get statistics", 
@@ -56,4 +28,9 @@ export async function GET() {
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+// userCount moves independently of the catalog, so keep the window short
+export const GET = withRouteMetrics("/api/stats", (req: Request) =>
+  withCatalogCache(req, { sMaxAge: 60, staleWhileRevalidate: 600 }, getStats)
+);
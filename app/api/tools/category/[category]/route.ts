@@ -1,6 +1,21 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { connectToolsDB } from '@/lib/db/websitedb';
-import { getToolModel } from '@/models/tools';
+import { getToolModel, toCategorySlug } from '@/models/tools';
+import { categoryFilter } from '@/lib/categoryFilter';
+import { getToolSearchIndex } from '@/lib/toolSearchIndex';
+import { withCatalogCache } from '@/lib/responseCache';
+import { withRouteMetrics } from '@/lib/metrics';
+import { logger } from '@/lib/logger';
+import {
+  TOOL_SORTS,
+  afterCursor,
+  cachedCount,
+  cursorAfter,
+  decodeCursor,
+  decodeToolCursor,
+  encodeCursor,
+  sortSpec,
+} from '@/lib/toolPagination';
 
 interface ToolCardProps {
   id: string;
@@ -29,7 +44,7 @@ function serializeToolData(rawTool: Record<string, unknown>): ToolCardProps {
   };
 }
 
-export async function GET(
+async function getCategoryTools(
   request: NextRequest,
   { params }: { params: Promise<{ category: string }> }
 ) {
@@ -42,9 +57,13 @@ export async function GET(
     const page = parseInt(searchParams.get('page') || '1');
     const limit = parseInt(searchParams.get('limit') || '25');
     const search = searchParams.get('search') || '';
+    // Opaque cursor from a previous response's nextCursor; replaces `page`,
+    // and the total is then only counted when includeTotal=true
+    const cursor = searchParams.get('cursor');
+    const includeTotal = !cursor || searchParams.get('includeTotal') === 'true';
     
     // Validate parameters
-    if (page < 1 || limit < 1 || limit > 100) {
+    if (!(page >= 1) || !(limit >= 1) || limit > 100) {
       return NextResponse.json(
         { error: 'Invalid pagination parameters' },
         { status: 400 }
@@ -55,71 +74,131 @@ export async function GET(
     await connectToolsDB();
     const Tool = await getToolModel();
 
-    // Build query
-    let query: any = { isActive: true };
-    
+    const fields = '_id title logoUrl websiteUrl category toolType likeCount saveCount about';
+
     if (search.trim()) {
-      // Search in title, about, and category
-      query.$or = [
-        { title: { $regex: search, $options: 'i' } },
-        { about: { $regex: search, $options: 'i' } },
-        { category: { $regex: search, $options: 'i' } }
-      ];
-    }
-    
-    // Category filter
-    query.category = { $regex: new RegExp(`^${decodedCategory}$`, 'i') };
-
-    // Get total count
-    const totalCount = await Tool.countDocuments(query);
-
-    // If no exact match found, try partial match
-    if (totalCount === 0) {
-      query.category = { $regex: new RegExp(decodedCategory, 'i') };
-      const partialCount = await Tool.countDocuments(query);
-      
-      if (partialCount === 0) {
-        return NextResponse.json({
-          tools: [],
-          totalCount: 0,
-          currentPage: page,
-          totalPages: 0,
-          hasMore: false
-        });
+      // Search is served by the in-memory index (relevance order, prefix
+      // matching) and only scores this category's tools; only the page is read
+      // from Mongo. Unknown slugs widen to partial matches like categoryFilter.
+      const index = await getToolSearchIndex();
+      const hits = index.search(search, {
+        categories: index.matchingCategories(toCategorySlug(decodedCategory))
+      });
+
+      // Hits are already in memory, so a search cursor is just the offset
+      let offset = (page - 1) * limit;
+      if (cursor) {
+        const after = decodeCursor(cursor, 'relevance', ['number']);
+        if (!after || !Number.isSafeInteger(after[0]) || (after[0] as number) < 0) {
+          return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+        }
+        offset = after[0] as number;
       }
+
+      const totalCount = hits.length;
+      const totalPages = Math.ceil(totalCount / limit);
+      const hasMore = offset + limit < totalCount;
+      const pageIds = hits.slice(offset, offset + limit).map(hit => hit.id);
+      const found = pageIds.length
+        ? await Tool.find({ _id: { $in: pageIds }, isActive: true }).select(fields).lean()
+        : [];
+      const byId = new Map(found.map(tool => [String(tool._id), tool] as const));
+
+      const serializedTools = pageIds
+        .map(id => byId.get(id))
+        .filter((tool): tool is NonNullable<typeof tool> => Boolean(tool))
+        .map(tool => serializeToolData(tool as unknown as Record<string, unknown>))
+        .filter((tool: ToolCardProps) => tool.title && tool.logoUrl && tool.websiteUrl);
+
+      return NextResponse.json({
+        tools: serializedTools,
+        totalCount,
+        ...(!cursor && { currentPage: page, totalPages }),
+        hasMore,
+        nextCursor: hasMore ? encodeCursor('relevance', [offset + limit]) : null,
+        category: decodedCategory
+      });
+    }
+
+    // Exact lookups are an equality match on the normalized slug; only an
+    // unknown slug falls back to partial matches (see categoryFilter)
+    const match = await categoryFilter(Tool, decodedCategory);
+
+    if (!match) {
+      return NextResponse.json({
+        tools: [],
+        totalCount: 0,
+        ...(!cursor && { currentPage: page, totalPages: 0 }),
+        hasMore: false,
+        nextCursor: null
+      });
     }
 
-    // Calculate pagination
-    const skip = (page - 1) * limit;
-    const totalPages = Math.ceil(totalCount / limit);
+    const query: Record<string, unknown> = {
+      ...match,
+      isActive: true
+    };
+
+    // Popularity order with _id as tie-breaker; a cursor resumes right after
+    // the last tool of the previous page instead of skipping over it
+    const sortFields = TOOL_SORTS.popularity;
+    let filter = query;
+    let skip = 0;
+    if (cursor) {
+      const after = decodeToolCursor(cursor, 'popularity');
+      if (!after) {
+        return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 });
+      }
+      filter = afterCursor(query, sortFields, after);
+    } else {
+      skip = (page - 1) * limit;
+    }
 
-    // Get tools with pagination
-    const tools = await Tool.find(query)
-      .sort({ likeCount: -1, saveCount: -1 }) // Sort by popularity
+    // One extra row tells us whether another page exists without counting
+    const rows = await Tool.find(filter)
+      .sort(sortSpec(sortFields))
       .skip(skip)
-      .limit(limit)
+      .limit(limit + 1)
       .lean()
-      .select('_id title logoUrl websiteUrl category toolType likeCount saveCount about');
+      .select(fields);
+    const hasMore = rows.length > limit;
+    const tools = hasMore ? rows.slice(0, limit) : rows;
+    const nextCursor = hasMore
+      ? cursorAfter('popularity', tools[tools.length - 1] as unknown as Record<string, unknown>)
+      : null;
+
+    const totalCount = includeTotal
+      ? await cachedCount(query, () => Tool.countDocuments(query))
+      : undefined;
 
     // Serialize and filter tools
     const serializedTools = tools
-      .map(serializeToolData)
+      .map(tool => serializeToolData(tool as unknown as Record<string, unknown>))
       .filter((tool: ToolCardProps) => tool.title && tool.logoUrl && tool.websiteUrl);
 
     return NextResponse.json({
       tools: serializedTools,
-      totalCount,
-      currentPage: page,
-      totalPages,
-      hasMore: page < totalPages,
+      ...(totalCount !== undefined && { totalCount }),
+      ...(!cursor && { currentPage: page, totalPages: Math.ceil((totalCount || 0) / limit) }),
+      hasMore,
+      nextCursor,
       category: decodedCategory
     });
 
   } catch (error) {
-    console.error('Error fetching tools by category:', error);
+    logger.error('Error fetching tools by category', { error });
     return NextResponse.json(
       { error: 'Internal server error' },
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+// Like/save counters change between catalog versions; the 60s window bounds the lag
+// Labelled with the route pattern, not the category, to keep series bounded
+export const GET = withRouteMetrics('/api/tools/category/[category]', (
+  request: NextRequest,
+  context: { params: Promise<{ category: string }> }
+) =>
+  withCatalogCache(request, { sMaxAge: 60, staleWhileRevalidate: 300 }, () => getCategoryTools(request, context))
+);
@@ -3,6 +3,9 @@ import { connectUserDB } from "@/lib/db/userdb";
 import User from "@/models/user";
 import { NextRequest, NextResponse } from "next/server";
 import { getToolModel } from "@/models/tools";
+import { recordToolsRemoved } from "@/lib/platformStats";
+import { removeFromToolIndex } from "@/lib/toolSearchIndex";
+import { revalidateCategoryPages } from "@/lib/categoryPages";
 
 export async function DELETE(req: NextRequest) {
   try {
@@ -91,7 +94,12 @@ export async function DELETE(req: NextRequest) {
     await Promise.all(updatePromises);
 
     // Finally, delete the tool from the tools collection
-    await Tool.findByIdAndDelete(toolId);
+    const deleted = await Tool.findByIdAndDelete(toolId);
+    if (deleted) {
+      await recordToolsRemoved([deleted.category]);
+      removeFromToolIndex([String(deleted._id)]);
+      revalidateCategoryPages([deleted.category]);
+    }
 
     console.log(`Successfully deleted tool and cleaned up ${usersWithTool.length} user records`);
 
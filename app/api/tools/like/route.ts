@@ -4,24 +4,25 @@ import { connectToolsDB } from "@/lib/db/websitedb";
 import { getToolModel } from "@/models/tools";
 import User from "@/models/user";
 import { auth } from "@clerk/nextjs/server";
+import { recordCounterDelta, withPendingCounters } from "@/lib/counterBuffer";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
 
 // Helper function to get user ID from Clerk
 const getUserId = async (): Promise<string | null> => {
   try {
     const { userId } = await auth();
     if (!userId) {
-      console.log('No authenticated user found');
       return null;
     }
-    console.log('Authenticated userId:', userId);
     return userId;
   } catch (error) {
-    console.error('Error getting user ID:', error);
+    logger.warn("Error getting user ID", { error });
     return null;
   }
 };
 
-export async function GET(req: Request) {
+async function getLikeStatus(req: Request) {
   try {
     const { searchParams } = new URL(req.url);
     const toolId = searchParams.get('toolId');
@@ -49,6 +50,7 @@ export async function GET(req: Request) {
     // Find the tool
     const tool = await Tool.findById(toolId);
 
+
     if (!tool) {
       return NextResponse.json(
         { error: "Tool not found" },
@@ -62,11 +64,11 @@ export async function GET(req: Request) {
 
     return NextResponse.json({
       hasLiked,
-      likeCount: tool.likeCount || 0
+      likeCount: withPendingCounters(toolId, tool).likeCount
     });
 
   } catch (error) {
-    console.error("Check like status error:", error);
+    logger.error("Check like status error", { error });
     return NextResponse.json(
       { error: "Failed to check like status", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
@@ -74,11 +76,9 @@ export async function GET(req: Request) {
   }
 }
 
-export async function POST(req: NextRequest) {
+async function likeTool(req: NextRequest) {
   try {
     const { toolId } = await req.json();
-    console.log('POST /api/tools/like - toolId:', toolId);
-
     if (!toolId) {
       return NextResponse.json(
         { error: "Tool ID is required" },
@@ -94,8 +94,6 @@ export async function POST(req: NextRequest) {
       );
     }
 
-    console.log('POST /api/tools/like - userId:', userId);
-
     // Connect to both databases
     await connectToolsDB();
     await connectUserDB();
@@ -103,7 +101,6 @@ export async function POST(req: NextRequest) {
 
     // Find the tool
     const tool = await Tool.findById(toolId);
-    console.log('POST /api/tools/like - found tool:', tool ? tool.title : 'not found');
 
     if (!tool) {
       return NextResponse.json(
@@ -112,73 +109,43 @@ export async function POST(req: NextRequest) {
       );
     }
 
-    // Check if user has already liked this tool
-    const user = await User.findOne({ clerkId: userId });
-    if (!user) {
-      return NextResponse.json(
-        { error: "User not found" },
-        { status: 404 }
-      );
-    }
+    // Add the tool to the user's likedTools; the filter makes the write a
+    // no-op when it is already there, so concurrent clicks count once
+    const result = await User.updateOne(
+      { clerkId: userId, likedTools: { $ne: toolId } },
+      { $addToSet: { likedTools: toolId } }
+    );
 
-    // Check if user already liked this tool
-    if (user.likedTools.some(id => id.toString() === toolId)) {
-      console.log('POST /api/tools/like - user already liked, returning early');
+    if (result.matchedCount === 0) {
+      if (!(await User.exists({ clerkId: userId }))) {
+        return NextResponse.json(
+          { error: "User not found" },
+          { status: 404 }
+        );
+      }
+
+      logger.debug("Tool already liked", { toolId, userId });
       return NextResponse.json({
         success: true,
         message: "Tool already liked",
-        likeCount: tool.likeCount || 0,
+        likeCount: withPendingCounters(toolId, tool).likeCount,
         hasLiked: true
       });
     }
 
-    console.log('POST /api/tools/like - user has not liked yet, incrementing likeCount');
-
-    // Increment likeCount and add tool to user's likedTools
-    const updatedTool = await Tool.findByIdAndUpdate(
-      toolId,
-      { 
-        $inc: { likeCount: 1 } 
-      },
-      { new: true, runValidators: true }
-    );
-
-    if (!updatedTool) {
-      return NextResponse.json(
-        { error: "Failed to update tool" },
-        { status: 500 }
-      );
-    }
-
-    console.log('POST /api/tools/like - updated tool likeCount:', updatedTool.likeCount);
-
-    // Also add tool to user's likedTools array
-    await User.findOneAndUpdate(
-      { clerkId: userId },
-      { $addToSet: { likedTools: toolId } },
-      { new: true }
-    );
-
-    console.log('POST /api/tools/like - added tool to user likedTools');
+    // The likeCount increment is buffered and flushed in batches
+    recordCounterDelta(toolId, "likeCount", 1);
+    logger.debug("Tool liked", { toolId, userId });
 
     return NextResponse.json({
       success: true,
       message: "Tool liked successfully",
-      likeCount: updatedTool.likeCount || 0,
+      likeCount: withPendingCounters(toolId, tool).likeCount,
       hasLiked: true
     });
 
-    console.log('POST /api/tools/like - like functionality disabled');
-
-    return NextResponse.json({
-      success: true,
-      message: "Like functionality is currently disabled",
-      likeCount: 0,
-      hasLiked: false
-    });
-
   } catch (error) {
-    console.error("Like tool error:", error);
+    logger.error("Like tool error", { error });
     return NextResponse.json(
       { error: "Failed to like tool", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
@@ -186,11 +153,9 @@ export async function POST(req: NextRequest) {
   }
 }
 
-export async function DELETE(req: Request) {
+async function unlikeTool(req: Request) {
   try {
     const { toolId } = await req.json();
-    console.log('DELETE /api/tools/like - toolId:', toolId);
-
     if (!toolId) {
       return NextResponse.json(
         { error: "Tool ID is required" },
@@ -206,8 +171,6 @@ export async function DELETE(req: Request) {
       );
     }
 
-    console.log('DELETE /api/tools/like - userId:', userId);
-
     // Connect to both databases
     await connectToolsDB();
     await connectUserDB();
@@ -215,7 +178,6 @@ export async function DELETE(req: Request) {
 
     // Find the tool
     const tool = await Tool.findById(toolId);
-    console.log('DELETE /api/tools/like - found tool:', tool ? tool.title : 'not found');
 
     if (!tool) {
       return NextResponse.json(
@@ -224,67 +186,50 @@ export async function DELETE(req: Request) {
       );
     }
 
-    // Check if user has liked this tool
-    const user = await User.findOne({ clerkId: userId });
-    if (!user) {
-      return NextResponse.json(
-        { error: "User not found" },
-        { status: 404 }
-      );
-    }
+    // Remove the tool from the user's likedTools; only a user who actually
+    // liked it matches, so concurrent unlikes decrement once
+    const result = await User.updateOne(
+      { clerkId: userId, likedTools: toolId },
+      { $pull: { likedTools: toolId } }
+    );
+
+    if (result.matchedCount === 0) {
+      if (!(await User.exists({ clerkId: userId }))) {
+        return NextResponse.json(
+          { error: "User not found" },
+          { status: 404 }
+        );
+      }
 
-    // Check if user has actually liked this tool
-    if (!user.likedTools.some(id => id.toString() === toolId)) {
-      console.log('DELETE /api/tools/like - user has not liked this tool, returning early');
+      logger.debug("Tool was not liked", { toolId, userId });
       return NextResponse.json({
         success: true,
         message: "Tool not liked",
-        likeCount: tool.likeCount || 0,
+        likeCount: withPendingCounters(toolId, tool).likeCount,
         hasLiked: false
       });
     }
 
-    console.log('DELETE /api/tools/like - user has liked this tool, decrementing likeCount');
-
-    // Decrement likeCount and remove tool from user's likedTools
-    const updatedTool = await Tool.findByIdAndUpdate(
-      toolId,
-      { 
-        $inc: { likeCount: -1 } 
-      },
-      { new: true, runValidators: true }
-    );
-
-    if (!updatedTool) {
-      return NextResponse.json(
-        { error: "Failed to update tool" },
-        { status: 500 }
-      );
-    }
-
-    console.log('DELETE /api/tools/like - updated tool likeCount:', updatedTool.likeCount);
-
-    // Also remove tool from user's likedTools array
-    await User.findOneAndUpdate(
-      { clerkId: userId },
-      { $pull: { likedTools: toolId } },
-      { new: true }
-    );
-
-    console.log('DELETE /api/tools/like - removed tool from user likedTools');
+    // The likeCount decrement is buffered and flushed in batches
+    recordCounterDelta(toolId, "likeCount", -1);
+    logger.debug("Tool unliked", { toolId, userId });
 
     return NextResponse.json({
       success: true,
       message: "Tool unliked successfully",
-      likeCount: updatedTool.likeCount || 0,
+      likeCount: withPendingCounters(toolId, tool).likeCount,
       hasLiked: false
     });
 
   } catch (error) {
-    console.error("Unlike tool error:", error);
+    logger.error("Unlike tool error", { error });
     return NextResponse.json(
       { error: "Failed to unlike tool", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+export const GET = withRouteMetrics("/api/tools/like", getLikeStatus);
+export const POST = withRouteMetrics("/api/tools/like", likeTool);
+export const DELETE = withRouteMetrics("/api/tools/like", unlikeTool);
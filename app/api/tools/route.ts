@@ -1,70 +1,91 @@
 import { connectToolsDB } from "@/lib/db/websitedb";
 import { getToolModel } from "@/models/tools";
+import { categoryFilter } from "@/lib/categoryFilter";
+import {
+  TOOL_SORTS,
+  afterCursor,
+  cachedCount,
+  cursorAfter,
+  decodeToolCursor,
+  isToolSortKey,
+  sortSpec,
+} from "@/lib/toolPagination";
 import { NextRequest, NextResponse } from "next/server";
+import { withCatalogCache } from "@/lib/responseCache";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
 
-export async function GET(req: NextRequest) {
+async function getTools(req: NextRequest) {
   try {
     const { searchParams } = new URL(req.url);
     const category = searchParams.get('category');
     const sortBy = searchParams.get('sortBy') || 'popularity'; // popularity, name, date
     const limit = parseInt(searchParams.get('limit') || '50');
     const page = parseInt(searchParams.get('page') || '1');
+    // Opaque cursor from a previous response's pagination.nextCursor; when
+    // present it replaces `page` and the total is only counted on request
+    const cursor = searchParams.get('cursor');
+    const includeTotal = !cursor || searchParams.get('includeTotal') === 'true';
+
+    if (!(page >= 1) || !(limit >= 1) || limit > 100) {
+      return NextResponse.json(
+        { error: "Invalid pagination parameters" },
+        { status: 400 }
+      );
+    }
 
     // Connect to tools database
     await connectToolsDB();
     const Tool = await getToolModel();
 
     // Build query
-    const query: Record<string, unknown> = { isActive: true };
+    let query: Record<string, unknown> = { isActive: true };
     if (category) {
-      // Handle both URL-encoded format (from category cards) and slug format (from AI agent)
-      let normalizedCategory = category.toLowerCase();
-      
-      // If it's URL-encoded (contains %20), decode it first
+      // Category cards send the display name (sometimes still URL-encoded) and
+      // the AI agent sends slugs; both normalize to the stored categorySlug,
+      // with the same partial-match fallback as the category route
+      let normalizedCategory = category;
       if (normalizedCategory.includes('%20')) {
         normalizedCategory = decodeURIComponent(normalizedCategory);
       }
-      
-      // Create patterns for different category name formats
-      const patterns = [
-        normalizedCategory, // "all in one"
-        normalizedCategory.replace(/\s+/g, '-'), // "all-in-one"
-        normalizedCategory.replace(/\s+/g, ''), // "allinone"
-        normalizedCategory.split(/\s+/).map(word => word.charAt(0).toUpperCase() + word.slice(1)).join(' '), // "All In One"
-        normalizedCategory.split(/\s+/).map(word => word.charAt(0).toUpperCase() + word.slice(1)).join('-'), // "All-In-One"
-      ];
-      
-      // Create a regex that matches any of these patterns
-      const searchPattern = patterns.map(p => p.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|');
-      query.category = { $regex: new RegExp(searchPattern, 'i') };
+      const match = await categoryFilter(Tool, normalizedCategory);
+      query = match ? { ...query, ...match } : { ...query, _id: { $in: [] } };
     }
 
-    // Build sort
-    let sort: { [key: string]: 1 | -1 } = {};
-    switch (sortBy) {
-      case 'popularity':
-        sort = { likeCount: -1, saveCount: -1 };
-        break;
-      case 'name':
-        sort = { title: 1 };
-        break;
-      case 'date':
-        sort = { createdAt: -1 };
-        break;
-      default:
-        sort = { likeCount: -1, saveCount: -1 };
+    // Build sort; every sort ends with _id so pages never overlap or skip ties
+    const sortKey = isToolSortKey(sortBy) ? sortBy : 'popularity';
+    const sortFields = TOOL_SORTS[sortKey];
+
+    let filter: Record<string, unknown> = query;
+    let skip = 0;
+    if (cursor) {
+      const after = decodeToolCursor(cursor, sortKey);
+      if (!after) {
+        return NextResponse.json(
+          { error: "Invalid cursor" },
+          { status: 400 }
+        );
+      }
+      filter = afterCursor(query, sortFields, after);
+    } else {
+      skip = (page - 1) * limit;
     }
 
-    // Execute query with pagination
-    const skip = (page - 1) * limit;
-    
-    const tools = await Tool.find(query)
-      .sort(sort)
+    // Fetch one extra tool to learn whether another page exists without counting
+    const rows = await Tool.find(filter)
+      .sort(sortSpec(sortFields))
       .skip(skip)
-      .limit(limit)
+      .limit(limit + 1)
       .lean();
+    const hasNext = rows.length > limit;
+    const tools = hasNext ? rows.slice(0, limit) : rows;
+    const nextCursor = hasNext
+      ? cursorAfter(sortKey, tools[tools.length - 1] as Record<string, unknown>)
+      : null;
 
-    const totalTools = await Tool.countDocuments(query);
+    const totalTools = includeTotal
+      ? await cachedCount(query, () => Tool.countDocuments(query))
+      : undefined;
 
     // Transform tools for response
     const transformedTools = tools.map((tool: Record<string, unknown>) => ({
@@ -86,21 +107,34 @@ export async function GET(req: NextRequest) {
     return NextResponse.json({
       success: true,
       tools: transformedTools,
-      pagination: {
-        page,
-        limit,
-        total: totalTools,
-        totalPages: Math.ceil(totalTools / limit),
-        hasNext: page * limit < totalTools,
-        hasPrev: page > 1
-      }
+      pagination: cursor
+        ? {
+            limit,
+            ...(totalTools !== undefined && { total: totalTools }),
+            hasNext,
+            nextCursor
+          }
+        : {
+            page,
+            limit,
+            total: totalTools,
+            totalPages: Math.ceil((totalTools || 0) / limit),
+            hasNext,
+            hasPrev: page > 1,
+            nextCursor
+          }
     });
 
   } catch (error) {
-    console.error("Get tools error:", error);
+    logger.error("Get tools error", { error });
     return NextResponse.json(
       { error: "Failed to get tools", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+// Like/save counters change between catalog versions; the 60s window bounds the lag
+export const GET = withRouteMetrics("/api/tools", (req: NextRequest) =>
+  withCatalogCache(req, { sMaxAge: 60, staleWhileRevalidate: 300 }, () => getTools(req))
+);
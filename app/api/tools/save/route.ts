@@ -4,6 +4,9 @@ import { connectUserDB } from "@/lib/db/userdb";
 import User from "@/models/user";
 import { auth } from "@clerk/nextjs/server";
 import { NextResponse } from "next/server";
+import { recordCounterDelta, withPendingCounters } from "@/lib/counterBuffer";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
 
 // Helper function to get user ID from Clerk
 const getUserId = async (): Promise<string | null> => {
@@ -16,58 +19,12 @@ const getUserId = async (): Promise<string | null> => {
     // Authenticated userId received
     return userId;
   } catch (error) {
-    console.error('Error getting user ID:', error);
+    logger.warn("Error getting user ID", { error });
     return null;
   }
 };
 
-// Helper function to increment saveCount and add user to savedBy for a tool
-const incrementToolSaveCount = async (toolName: string) => {
-  try {
-    // Connect to tools database
-    await connectToolsDB();
-    const Tool = await getToolModel();
-    
-    // Find and update the tool - increment saveCount only
-    const result = await Tool.updateOne(
-      { title: toolName },
-      { 
-        $inc: { saveCount: 1 }
-      }
-    );
-    
-    if (result.modifiedCount > 0) {
-      console.log(`Incremented saveCount for tool: ${toolName}`);
-    }
-  } catch (error) {
-    console.error(`Error incrementing saveCount for tool ${toolName}:`, error);
-  }
-};
-
-// Helper function to decrement saveCount and remove user from savedBy for a tool
-const decrementToolSaveCount = async (toolName: string) => {
-  try {
-    // Connect to tools database
-    await connectToolsDB();
-    const Tool = await getToolModel();
-    
-    // Find and update the tool - decrement saveCount only
-    const result = await Tool.updateOne(
-      { title: toolName },
-      { 
-        $inc: { saveCount: -1 }
-      }
-    );
-    
-    if (result.modifiedCount > 0) {
-      console.log(`Decremented saveCount for tool: ${toolName}`);
-    }
-  } catch (error) {
-    console.error(`Error decrementing saveCount for tool ${toolName}:`, error);
-  }
-};
-
-export async function GET(req: Request) {
+async function getSaveStatus(req: Request) {
   try {
     const { searchParams } = new URL(req.url);
     const toolId = searchParams.get('toolId');
@@ -94,6 +51,7 @@ export async function GET(req: Request) {
 
     // Find the tool to get its name
     const tool = await Tool.findById(toolId);
+
     if (!tool) {
       return NextResponse.json(
         { error: "Tool not found" },
@@ -128,7 +86,7 @@ export async function GET(req: Request) {
     });
 
   } catch (error) {
-    console.error("Check save status error:", error);
+    logger.error("Check save status error", { error });
     return NextResponse.json(
       { error: "Failed to check save status", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
@@ -136,11 +94,9 @@ export async function GET(req: Request) {
   }
 }
 
-export async function POST(req: Request) {
+async function saveTool(req: Request) {
   try {
     const { toolId } = await req.json();
-    console.log('POST /api/tools/save - toolId:', toolId);
-
     if (!toolId) {
       return NextResponse.json(
         { error: "Tool ID is required" },
@@ -156,8 +112,6 @@ export async function POST(req: Request) {
       );
     }
 
-    console.log('POST /api/tools/save - userId:', userId);
-
     // Connect to both databases
     await connectToolsDB();
     await connectUserDB();
@@ -165,7 +119,6 @@ export async function POST(req: Request) {
 
     // Find the tool
     const tool = await Tool.findById(toolId);
-    console.log('POST /api/tools/save - found tool:', tool ? tool.title : 'not found');
 
     if (!tool) {
       return NextResponse.json(
@@ -205,7 +158,7 @@ export async function POST(req: Request) {
     // Check if user already saved this tool
     const existingTool = user.savedTools.find(t => t.name === tool.title);
     if (existingTool) {
-      console.log('POST /api/tools/save - tool already saved, returning early');
+      logger.debug("Tool already saved", { toolId, userId });
       return NextResponse.json({
         success: true,
         message: "Tool already saved",
@@ -224,38 +177,38 @@ export async function POST(req: Request) {
       savedAt: new Date()
     };
 
-    const updatedUser = await User.findByIdAndUpdate(
-      user._id,
+    // The name filter makes a concurrent duplicate save a no-op, so it is counted once
+    const updatedUser = await User.findOneAndUpdate(
+      { _id: user._id, 'savedTools.name': { $ne: tool.title } },
       { $push: { savedTools: savedTool } },
       { new: true, runValidators: true }
     );
 
     if (!updatedUser) {
-      return NextResponse.json(
-        { error: "Failed to save tool" },
-        { status: 500 }
-      );
+      logger.debug("Tool saved concurrently", { toolId, userId });
+      return NextResponse.json({
+        success: true,
+        message: "Tool already saved",
+        savedToolsCount: user.savedTools.length + 1,
+        hasSaved: true
+      });
     }
 
-    console.log('POST /api/tools/save - tool saved successfully');
-
-    // Increment saveCount for the tool and add user to savedBy
-    await incrementToolSaveCount(tool.title);
+    logger.debug("Tool saved", { toolId, userId });
 
-    // Get the updated tool to get the new saveCount
-    const updatedTool = await Tool.findById(toolId);
-    const newSaveCount = updatedTool ? updatedTool.saveCount : tool.saveCount + 1;
+    // The saveCount increment is buffered and flushed in batches
+    recordCounterDelta(toolId, "saveCount", 1);
 
     return NextResponse.json({
       success: true,
       message: "Tool saved successfully",
       savedToolsCount: updatedUser.savedTools.length,
       hasSaved: true,
-      saveCount: newSaveCount
+      saveCount: withPendingCounters(toolId, tool).saveCount
     });
 
   } catch (error) {
-    console.error("Save tool error:", error);
+    logger.error("Save tool error", { error });
     return NextResponse.json(
       { error: "Failed to save tool", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
@@ -263,11 +216,9 @@ export async function POST(req: Request) {
   }
 }
 
-export async function DELETE(req: Request) {
+async function unsaveTool(req: Request) {
   try {
     const { toolId } = await req.json();
-    console.log('DELETE /api/tools/save - toolId:', toolId);
-
     if (!toolId) {
       return NextResponse.json(
         { error: "Tool ID is required" },
@@ -283,8 +234,6 @@ export async function DELETE(req: Request) {
       );
     }
 
-    console.log('DELETE /api/tools/save - userId:', userId);
-
     // Connect to both databases
     await connectToolsDB();
     await connectUserDB();
@@ -292,7 +241,6 @@ export async function DELETE(req: Request) {
 
     // Find the tool
     const tool = await Tool.findById(toolId);
-    console.log('DELETE /api/tools/save - found tool:', tool ? tool.title : 'not found');
 
     if (!tool) {
       return NextResponse.json(
@@ -318,7 +266,7 @@ export async function DELETE(req: Request) {
     );
     
     if (!existingTool && toolInFolders.length === 0) {
-      console.log('DELETE /api/tools/save - tool not saved anywhere, returning early');
+      logger.debug("Tool was not saved", { toolId, userId });
       return NextResponse.json({
         success: true,
         message: "Tool not saved",
@@ -344,42 +292,49 @@ export async function DELETE(req: Request) {
       }
     });
 
-    // Update user document
-    const updatedUser = await User.findByIdAndUpdate(
-      user._id,
+    // Update user document; the filter only matches while the tool is still
+    // saved somewhere, so a concurrent unsave is counted once
+    const updatedUser = await User.findOneAndUpdate(
+      {
+        _id: user._id,
+        $or: [{ 'savedTools.name': tool.title }, { 'folders.tools.name': tool.title }]
+      },
       updateOperations,
       { new: true, runValidators: true }
     );
 
     if (!updatedUser) {
-      return NextResponse.json(
-        { error: "Failed to unsave tool" },
-        { status: 500 }
-      );
+      logger.debug("Tool unsaved concurrently", { toolId, userId });
+      return NextResponse.json({
+        success: true,
+        message: "Tool not saved",
+        savedToolsCount: Math.max(0, user.savedTools.length - (existingTool ? 1 : 0)),
+        hasSaved: false
+      });
     }
 
-    console.log('DELETE /api/tools/save - tool unsaved successfully from all locations');
-
-    // Decrement saveCount for the tool and remove user from savedBy
-    await decrementToolSaveCount(tool.title);
+    logger.debug("Tool unsaved", { toolId, userId });
 
-    // Get the updated tool to get the new saveCount
-    const updatedTool = await Tool.findById(toolId);
-    const newSaveCount = updatedTool ? updatedTool.saveCount : Math.max(0, (tool.saveCount || 0) - 1);
+    // The saveCount decrement is buffered and flushed in batches
+    recordCounterDelta(toolId, "saveCount", -1);
 
     return NextResponse.json({
       success: true,
       message: "Tool unsaved successfully",
       savedToolsCount: updatedUser.savedTools.length,
       hasSaved: false,
-      saveCount: newSaveCount
+      saveCount: withPendingCounters(toolId, tool).saveCount
     });
 
   } catch (error) {
-    console.error("Unsave tool error:", error);
+    logger.error("Unsave tool error", { error });
     return NextResponse.json(
       { error: "Failed to unsave tool", details: error instanceof Error ? error.message : "Unknown error" },
       { status: 500 }
     );
   }
-} 
\ No newline at end of file
+}
+
+export const GET = withRouteMetrics("/api/tools/save", getSaveStatus);
+export const POST = withRouteMetrics("/api/tools/save", saveTool);
+export const DELETE = withRouteMetrics("/api/tools/save", unsaveTool);
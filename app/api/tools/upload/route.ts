@@ -1,76 +1,105 @@
 // app/api/tools/upload/route.ts
 import { connectToolsDB } from "@/lib/db/websitedb";
-import { getToolModel } from "@/models/tools";
+import { getToolModel, ITool } from "@/models/tools";
+import { recordToolsAdded } from "@/lib/platformStats";
+import { indexTools } from "@/lib/toolSearchIndex";
+import { revalidateCategoryPages } from "@/lib/categoryPages";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
+import {
+  CHUNK_SIZE,
+  IngestFormat,
+  IngestTotals,
+  ParsedRow,
+  addToTotals,
+  ingestFormat,
+  ingestToolChunk,
+  readToolRows,
+  validateAndFormatTool,
+} from "@/lib/toolIngest";
 import { NextRequest, NextResponse } from "next/server";
 
-// Helper function to format URLs
-function formatUrl(url: string): string {
-  if (!url) return url;
-  
-  // Remove whitespace
-  url = url.trim();
-  
-  // If it doesn't start with http:// or https://, add https://
-  if (!url.match(/^https?:\/\//)) {
-    url = `https://${url}`;
-  }
-  
-  return url;
+// Bulk ingest: rows are streamed in, written CHUNK_SIZE at a time, and the
+// response streams one NDJSON line per chunk (progress totals plus the
+// per-row report of that chunk) followed by a final summary line.
+function bulkIngest(body: ReadableStream<Uint8Array>, format: IngestFormat): Response {
+  const encoder = new TextEncoder();
+  const startedAt = Date.now();
+
+  const stream = new ReadableStream<Uint8Array>({
+    async start(controller) {
+      const send = (line: unknown) => controller.enqueue(encoder.encode(`${JSON.stringify(line)}\n`));
+      const totals: IngestTotals = { processed: 0, inserted: 0, duplicates: 0, invalid: 0, failed: 0 };
+      const categories: string[] = [];
+
+      try {
+        await connectToolsDB();
+        const Tool = await getToolModel();
+
+        const writeChunk = async (chunk: ParsedRow[]) => {
+          const { rows, insertedTools } = await ingestToolChunk(Tool, chunk);
+          addToTotals(totals, rows);
+          if (insertedTools.length > 0) {
+            const chunkCategories = insertedTools.map(tool => tool.category);
+            categories.push(...chunkCategories);
+            await recordToolsAdded(chunkCategories);
+            indexTools(insertedTools);
+          }
+          send({ type: "progress", ...totals, rows });
+        };
+
+        let chunk: ParsedRow[] = [];
+        for await (const row of readToolRows(body, format)) {
+          chunk.push(row);
+          if (chunk.length === CHUNK_SIZE) {
+            await writeChunk(chunk);
+            chunk = [];
+          }
+        }
+        if (chunk.length > 0) await writeChunk(chunk);
+
+        const durationMs = Date.now() - startedAt;
+        logger.info("Bulk tool ingest finished", { format, ...totals, durationMs });
+        send({ type: "summary", success: true, ...totals, durationMs });
+      } catch (error) {
+        // Chunks already written stay inserted and were reported above
+        logger.error("Bulk tool ingest aborted", { format, ...totals, error });
+        send({
+          type: "error",
+          error: "Bulk ingest aborted",
+          details: error instanceof Error ? error.message : "Unknown error",
+          ...totals,
+        });
+      } finally {
+        revalidateCategoryPages([...new Set(categories)]);
+        controller.close();
+      }
+    }
+  });
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "application/x-ndjson; charset=utf-8",
+      "Cache-Control": "no-cache, no-transform",
+      "X-Accel-Buffering": "no",
+    },
+  });
 }
 
-// Helper function to validate and format tool data
-function validateAndFormatTool(toolData: { title?: string; logoUrl?: string; websiteUrl?: string; category?: string; about?: string; keywords?: string[]; toolType?: string }) {
-  const errors: string[] = [];
-  
-  // Check required fields
-  if (!toolData.title?.trim()) {
-    errors.push("Tool title is required");
-  }
-  
-  if (!toolData.logoUrl?.trim()) {
-    errors.push("Logo URL is required");
-  }
-  
-  if (!toolData.websiteUrl?.trim()) {
-    errors.push("Website URL is required");
-  }
-  
-  if (!toolData.category?.trim()) {
-    errors.push("Category is required");
-  }
-  
-  if (!toolData.about?.trim()) {
-    errors.push("About text is required");
-  }
-  
-  if (!toolData.keywords || !Array.isArray(toolData.keywords) || toolData.keywords.length < 5 || toolData.keywords.length > 10) {
-    errors.push("Keywords must be an array with 5-10 items");
-  }
-  
-  if (!toolData.toolType) {
-    errors.push("Tool type is required");
-  }
-  
-  if (errors.length > 0) {
-    throw new Error(`Validation failed: ${errors.join(', ')}`);
+
+async function uploadTools(req: NextRequest) {
+  // NDJSON / CSV bodies take the bulk path; a JSON array keeps the per-tool upload
+  const format = ingestFormat(req.headers.get("content-type"));
+  if (format) {
+    if (!req.body) {
+      return NextResponse.json(
+        { error: "Request body is required" },
+        { status: 400 }
+      );
+    }
+    return bulkIngest(req.body, format);
   }
-  
-  // Format URLs
-  const formattedLogoUrl = formatUrl(toolData.logoUrl || '');
-  const formattedWebsiteUrl = formatUrl(toolData.websiteUrl || '');
-  
-  return {
-    title: (toolData.title || '').trim(),
-    logoUrl: formattedLogoUrl,
-    websiteUrl: formattedWebsiteUrl,
-    category: (toolData.category || '').trim(),
-    about: toolData.about?.trim() || "",
-    keywords: toolData.keywords || [],
-    toolType: toolData.toolType || '',
-  };
-}
 
-export async function POST(req: NextRequest) {
   try {
     // Connect to tools database
     await connectToolsDB();
@@ -105,69 +134,66 @@ export async function POST(req: NextRequest) {
     }
 
     // Insert tools using Mongoose for proper validation and hooks
-    const inserted = [];
-    for (let i = 0; i < formattedTools.length; i++) {
-      try {
-        const toolData = formattedTools[i];
-        console.log(`Creating tool ${i + 1}:`, {
-          title: toolData.title,
-          titleLength: toolData.title.length,
-          about: toolData.about?.substring(0, 100) + (toolData.about?.length > 100 ? '...' : ''),
-          aboutLength: toolData.about?.length,
-          keywordsCount: toolData.keywords?.length,
-          websiteUrl: toolData.websiteUrl,
-          logoUrl: toolData.logoUrl
-        });
+    const inserted: ITool[] = [];
+    try {
+      for (let i = 0; i < formattedTools.length; i++) {
+        try {
+          const toolData = formattedTools[i];
+          const tool = new Tool({
+            ...toolData,
+            likeCount: 0,
+            saveCount: 0,
+          });
         
-        const tool = new Tool({
-          ...toolData,
-          likeCount: 0,
-          saveCount: 0,
-        });
+          const savedTool = await tool.save();
+          inserted.push(savedTool);
+        } catch (error) {
+          logger.warn("Tool upload row failed", { toolIndex: i, title: formattedTools[i].title, error });
         
-        const savedTool = await tool.save();
-        inserted.push(savedTool);
-        console.log(`Successfully created tool: ${savedTool.title}`);
-      } catch (error) {
-        console.error(`Failed to create tool ${i + 1}:`, error);
-        
-        // Handle specific error types
-        if (error instanceof Error) {
-          if (error.name === 'ValidationError') {
-            return NextResponse.json(
-              { 
-                error: `Tool ${i + 1} validation failed`, 
-                details: error.message,
-                toolIndex: i,
-                field: error.message.includes('websiteUrl') ? 'websiteUrl' : 
-                       error.message.includes('logoUrl') ? 'logoUrl' : 'unknown'
-              },
-              { status: 400 }
-            );
-          }
-          if (error.name === 'MongoServerError' && (error as unknown as { code: number }).code === 11000) {
-            return NextResponse.json(
-              { 
-                error: `Tool ${i + 1} title already exists`, 
-                details: "A tool with this title already exists in the database",
-                toolIndex: i
-              },
-              { status: 409 }
-            );
+          // Handle specific error types
+          if (error instanceof Error) {
+            if (error.name === 'ValidationError') {
+              return NextResponse.json(
+                { 
+                  error: `Tool ${i + 1} validation failed`, 
+                  details: error.message,
+                  toolIndex: i,
+                  field: error.message.includes('websiteUrl') ? 'websiteUrl' : 
+                         error.message.includes('logoUrl') ? 'logoUrl' : 'unknown'
+                },
+                { status: 400 }
+              );
+            }
+            if (error.name === 'MongoServerError' && (error as unknown as { code: number }).code === 11000) {
+              return NextResponse.json(
+                { 
+                  error: `Tool ${i + 1} title already exists`, 
+                  details: "A tool with this title already exists in the database",
+                  toolIndex: i
+                },
+                { status: 409 }
+              );
+            }
           }
-        }
         
-        return NextResponse.json(
-          { 
-            error: `Failed to create tool ${i + 1}`, 
-            details: error instanceof Error ? error.message : "Unknown error",
-            toolIndex: i
-          },
-          { status: 500 }
-        );
+          return NextResponse.json(
+            { 
+              error: `Failed to create tool ${i + 1}`, 
+              details: error instanceof Error ? error.message : "Unknown error",
+              toolIndex: i
+            },
+            { status: 500 }
+          );
+        }
       }
+    } finally {
+      // Tools saved before a failing one stay inserted, so count whatever was saved
+      await recordToolsAdded(inserted.map(tool => tool.category));
+      indexTools(inserted);
+      revalidateCategoryPages(inserted.map(tool => tool.category));
     }
     
+    logger.info("Tools uploaded", { insertedCount: inserted.length });
     return NextResponse.json({ 
       success: true, 
       insertedCount: inserted.length,
@@ -175,7 +201,7 @@ export async function POST(req: NextRequest) {
     });
     
   } catch (err) {
-    console.error("Tool insert error:", err);
+    logger.error("Tool insert error", { error: err });
     
     // Handle specific error types
     if (err instanceof Error) {
@@ -199,3 +225,5 @@ export async function POST(req: NextRequest) {
     );
   }
 }
+
+export const POST = withRouteMetrics("/api/tools/upload", uploadTools);
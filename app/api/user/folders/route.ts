@@ -4,6 +4,7 @@ import { connectToolsDB } from "@/lib/db/websitedb";
 import User from "@/models/user";
 import { getToolModel } from "@/models/tools";
 import { NextResponse } from "next/server";
+import { recordCounterDelta } from "@/lib/counterBuffer";
 
 // Helper function to get user ID from Clerk
 const getUserId = async (): Promise<string | null> => {
@@ -21,16 +22,18 @@ const getUserId = async (): Promise<string | null> => {
   }
 };
 
-// Helper function to decrement tool save count
-const decrementToolSaveCount = async (toolName: string) => {
+// Helper function to decrement tool save counts; the decrements are buffered
+// and flushed in batches with the other like/save counter updates
+const decrementToolSaveCounts = async (toolNames: string[]) => {
+  if (toolNames.length === 0) return;
   try {
     await connectToolsDB();
     const Tool = await getToolModel();
     
-    await Tool.findOneAndUpdate(
-      { title: toolName },
-      { $inc: { saveCount: -1 } }
-    );
+    const tools = await Tool.find({ title: { $in: toolNames } }).select('_id').lean();
+    for (const tool of tools) {
+      recordCounterDelta(String(tool._id), "saveCount", -1);
+    }
   } catch (error) {
     console.error('Error decrementing tool save count:', error);
   }
@@ -243,9 +246,7 @@ export async function DELETE(req: Request) {
     }
 
     // Decrement save count for all tools in the folder before deleting
-    for (const tool of folder.tools) {
-      await decrementToolSaveCount(tool.name);
-    }
+    await decrementToolSaveCounts(folder.tools.map(tool => tool.name));
 
     // Remove folder completely from database
     const updatedUser = await User.findByIdAndUpdate(
@@ -427,7 +428,7 @@ export async function PUT(req: Request) {
       }
 
       // Decrement save count when removing from folder since tool is completely removed
-      await decrementToolSaveCount(toolName);
+      await decrementToolSaveCounts([toolName]);
 
       console.log('PUT /api/user/folders - tool removed from folder successfully');
 
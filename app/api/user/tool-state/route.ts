@@ -0,0 +1,107 @@
+import { NextRequest, NextResponse } from "next/server";
+import { auth } from "@clerk/nextjs/server";
+import { connectUserDB } from "@/lib/db/userdb";
+import { connectToolsDB } from "@/lib/db/websitedb";
+import { getToolModel } from "@/models/tools";
+import User from "@/models/user";
+import { withPendingCounters } from "@/lib/counterBuffer";
+import { withRouteMetrics } from "@/lib/metrics";
+import { logger } from "@/lib/logger";
+
+// Upper bound on tool ids per request; a category page renders well below it
+const MAX_TOOL_IDS = 100;
+
+interface ToolUserState {
+  hasLiked: boolean;
+  hasSaved: boolean;
+  folder: string | null;
+  likeCount: number;
+  saveCount: number;
+}
+
+// POST - Like/save/folder state of many tools for the current user.
+// Tool cards batch their status checks into this endpoint: one tools query and
+// one user document read answer a whole page of cards.
+async function getToolStates(req: NextRequest) {
+  try {
+    const { userId } = await auth();
+    if (!userId) {
+      return NextResponse.json(
+        { error: "Authentication required" },
+        { status: 401 }
+      );
+    }
+
+    const body = await req.json().catch(() => ({}));
+    const toolIds: string[] = Array.isArray(body.toolIds)
+      ? [...new Set<string>(body.toolIds.filter((id: unknown) => typeof id === "string" && /^[0-9a-f]{24}$/i.test(id)))]
+      : [];
+
+    if (toolIds.length === 0 || toolIds.length > MAX_TOOL_IDS) {
+      return NextResponse.json(
+        { error: `toolIds must be an array of 1 to ${MAX_TOOL_IDS} tool IDs` },
+        { status: 400 }
+      );
+    }
+
+    await connectToolsDB();
+    await connectUserDB();
+    const Tool = await getToolModel();
+
+    const [tools, user] = await Promise.all([
+      Tool.find({ _id: { $in: toolIds } }).select("_id title likeCount saveCount").lean(),
+      User.findOne({ clerkId: userId }).select("likedTools savedTools.name folders").lean(),
+    ]);
+
+    if (!user) {
+      return NextResponse.json(
+        { error: "User not found" },
+        { status: 404 }
+      );
+    }
+
+    // Saves and folder entries are keyed by tool title
+    const liked = new Set((user.likedTools || []).map(id => String(id)));
+    const saved = new Set((user.savedTools || []).map(tool => tool.name));
+    const folderByTool = new Map<string, string>();
+    for (const folder of user.folders || []) {
+      for (const tool of folder.tools || []) {
+        folderByTool.set(tool.name, folder.name);
+      }
+    }
+
+    const states: Record<string, ToolUserState> = {};
+    for (const tool of tools) {
+      const id = String(tool._id);
+      const folder = folderByTool.get(tool.title) ?? null;
+      states[id] = {
+        hasLiked: liked.has(id),
+        hasSaved: saved.has(tool.title) || folder !== null,
+        folder,
+        ...withPendingCounters(id, tool),
+      };
+    }
+
+    // Same shape as GET /api/user/folders, so save menus need no extra request
+    const folders = (user.folders || []).map(folder => ({
+      name: folder.name,
+      tools: folder.tools,
+      createdAt: new Date(folder.createdAt).toISOString()
+    }));
+
+    return NextResponse.json({
+      success: true,
+      states,
+      folders
+    });
+
+  } catch (error) {
+    logger.error("Get tool state error", { error });
+    return NextResponse.json(
+      { error: "Failed to get tool state", details: error instanceof Error ? error.message : "Unknown error" },
+      { status: 500 }
+    );
+  }
+}
+
+export const POST = withRouteMetrics("/api/user/tool-state", getToolStates);
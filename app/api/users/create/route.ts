@@ -2,6 +2,7 @@
 import { auth, currentUser } from "@clerk/nextjs/server";
 import { connectUserDB } from "@/lib/db/userdb";
 import User from "@/models/user";
+import { recordUserCreated } from "@/lib/platformStats";
 
 // Enhanced retry function with exponential backoff
 async function retryOperation<T>(
@@ -131,6 +132,7 @@ export async function POST() {
     }
 
     console.log("User created successfully:", newUser._id);
+    await recordUserCreated();
     return Response.json({ created: true, user: newUser });
 
   } catch (error) {
@@ -1,6 +1,9 @@
 import { connectToolsDB } from '@/lib/db/websitedb';
 import { getToolModel } from '@/models/tools';
 import { Metadata } from 'next';
+import { unstable_cache } from 'next/cache';
+import { categoryCacheTag } from '@/lib/categoryPages';
+import { categoryFilter } from '@/lib/categoryFilter';
 import CategoryToolList from '@/components/B-components/category-page-compoo/SSRCategoryToolList';
 
 import Link from 'next/link';
@@ -22,6 +25,35 @@ interface PageProps {
   params: Promise<{ category: string }>;
 }
 
+// Category pages are statically generated and served from the full route
+// cache. Uploads and deletes revalidate the affected category on demand (see
+// lib/categoryPages.ts); `revalidate` is the background refresh window that
+// picks up like/save counter changes.
+export const revalidate = 3600;
+// Categories beyond the pre-rendered ones are generated on first request
+export const dynamicParams = true;
+
+const PRERENDERED_CATEGORIES = 100;
+
+// Pre-render the largest categories at build time
+export async function generateStaticParams(): Promise<Array<{ category: string }>> {
+  try {
+    await connectToolsDB();
+    const Tool = await getToolModel();
+    const rows = await Tool.aggregate<{ _id: string }>([
+      { $match: { isActive: true } },
+      { $group: { _id: '$category', count: { $sum: 1 } } },
+      { $sort: { count: -1 } },
+      { $limit: PRERENDERED_CATEGORIES }
+    ]);
+    return rows.map(row => ({ category: String(row._id).toLowerCase() }));
+  } catch (error) {
+    // Without a database at build time every page is generated on demand
+    console.error('Error generating category params:', error);
+    return [];
+  }
+}
+
 // Generate dynamic metadata for SEO
 export async function generateMetadata({ params }: PageProps): Promise<Metadata> {
   const { category } = await params;
@@ -92,46 +124,31 @@ async function getToolsByCategory(category: string): Promise<ToolCardProps[]> {
 
     const Tool = await getToolModel();
 
-    // Get tools for the category with retry - using case-insensitive matching
+    // Get tools for the category with retry - equality on the normalized slug
+    // (partial slug matches when no tool has the exact one, see categoryFilter),
+    // served in popularity order by the {categorySlug, isActive, likeCount, ...} index
     // Reduced initial load to 25 tools for better performance
+    const match = await retryOperation(() => categoryFilter(Tool, category), 2, 1000);
+    if (!match) return [];
     const tools = await retryOperation(async () => {
       return await Tool.find({ 
-        category: { $regex: new RegExp(`^${category}$`, 'i') }, // Case-insensitive exact match
+        ...match,
         isActive: true 
       })
-      .sort({ likeCount: -1, saveCount: -1 }) // Sort by popularity
+      .sort({ likeCount: -1, saveCount: -1, _id: -1 }) // Sort by popularity
       .limit(25) // Reduced to 25 tools initially for better performance
       .lean()
       .select('_id title logoUrl websiteUrl category toolType likeCount saveCount about'); // Select only needed fields
     }, 2, 1000);
 
-    // If no exact match found, try partial matching
-    if (tools.length === 0) {
-      const partialTools = await retryOperation(async () => {
-        return await Tool.find({ 
-          category: { $regex: new RegExp(category, 'i') }, // Case-insensitive partial match
-          isActive: true 
-        })
-        .sort({ likeCount: -1, saveCount: -1 }) // Sort by popularity
-        .limit(25) // Reduced to 25 tools initially
-        .lean()
-        .select('_id title logoUrl websiteUrl category toolType likeCount saveCount about');
-      }, 2, 1000);
-      
-      if (partialTools.length > 0) {
-        console.log(`Found ${partialTools.length} tools with partial category match for "${category}"`);
-        return partialTools
-          .map(serializeToolData)
-          .filter((tool: ToolCardProps) => tool.title && tool.logoUrl && tool.websiteUrl);
-      }
-    }
-
     return tools
       .map(serializeToolData)
       .filter((tool: ToolCardProps) => tool.title && tool.logoUrl && tool.websiteUrl);
   } catch (error) {
+    // Rethrow so a failed regeneration keeps serving the last good page
+    // instead of caching an empty one
     console.error('Error fetching tools for category:', category, error);
-    return [];
+    throw error;
   }
 }
 
@@ -144,40 +161,44 @@ async function getTotalToolCount(category: string): Promise<number> {
 
     const Tool = await getToolModel();
 
-    // Get total count for exact match
-    let count = await retryOperation(async () => {
+    // Get total count (a count scan over the slug index)
+    const match = await retryOperation(() => categoryFilter(Tool, category), 2, 1000);
+    if (!match) return 0;
+    const count = await retryOperation(async () => {
       return await Tool.countDocuments({ 
-        category: { $regex: new RegExp(`^${category}$`, 'i') },
+        ...match,
         isActive: true 
       });
     }, 2, 1000);
 
-    // If no exact match, try partial match
-    if (count === 0) {
-      count = await retryOperation(async () => {
-        return await Tool.countDocuments({ 
-          category: { $regex: new RegExp(category, 'i') },
-          isActive: true 
-        });
-      }, 2, 1000);
-    }
-
     return count;
   } catch (error) {
     console.error('Error getting total tool count:', error);
-    return 0;
+    throw error;
   }
 }
 
+// First page of tools plus the total, cached under the category's tag
+function getCategoryPageData(category: string): Promise<{ tools: ToolCardProps[]; totalToolCount: number }> {
+  return unstable_cache(
+    async () => {
+      const [tools, totalToolCount] = await Promise.all([
+        getToolsByCategory(category),
+        getTotalToolCount(category)
+      ]);
+      return { tools, totalToolCount };
+    },
+    ['category-page', category.toLowerCase()],
+    { tags: [categoryCacheTag(category)], revalidate }
+  )();
+}
+
 export default async function CategoryPage({ params }: PageProps) {
   const { category } = await params;
   const decodedCategory = decodeURIComponent(category);
   
-  // Fetch tools server-side (limited to 25 initially for better performance)
-  const tools = await getToolsByCategory(decodedCategory);
-  
-  // Get total count for pagination info
-  const totalToolCount = await getTotalToolCount(decodedCategory);
+  // Fetch the first 25 tools and the total count, embedded in the static page
+  const { tools, totalToolCount } = await getCategoryPageData(decodedCategory);
   
   // Determine the tool type for this category
   let categoryToolType: 'browser' | 'downloadable' = 'browser';
@@ -6,9 +6,10 @@ import { useDispatch, useSelector } from 'react-redux';
 import styles from './AIChatbot.module.css';
 import { useAlert } from '@/components/B-components/alert/AlertContext';
 import { RootState } from '@/lib/store';
-import { addMessage, cleanupOldMessages, updateLastActivity, clearChat } from '@/lib/slices/chatSlice';
+import { addMessage, updateMessage, cleanupOldMessages, updateLastActivity, clearChat } from '@/lib/slices/chatSlice';
 import type { ChatMessage, ToolResult } from '@/lib/slices/chatSlice';
 import { useChatCleanup } from '@/lib/hooks/useChatCleanup';
+import { readSSE } from '@/lib/sse';
 import LikeButton from '@/components/S-components/LikeButton';
 import SaveButton from '@/components/S-components/SaveButton';
 import VisitButton from '@/components/S-components/VisitButton';
@@ -95,6 +96,8 @@ export default function AIChatbot() {
   const [isClient, setIsClient] = useState(false);
   const [contextMenu, setContextMenu] = useState<{ x: number; y: number } | null>(null);
   const [typingMessageId, setTypingMessageId] = useState<string | null>(null);
+  // Answer text of the reply currently streaming in, kept out of Redux until it completes
+  const [streaming, setStreaming] = useState<{ id: string; text: string } | null>(null);
   const [showComplaintModal, setShowComplaintModal] = useState(false);
   const [complaintText, setComplaintText] = useState('');
   const [isSubmittingComplaint, setIsSubmittingComplaint] = useState(false);
@@ -174,35 +177,110 @@ export default function AIChatbot() {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Accept': 'text/event-stream',
         },
         body: JSON.stringify({
-          message: inputText
+          message: inputText,
+          stream: true
         })
       });
 
-      const data: AIResponse = await response.json();
-
-      if (!response.ok) {
-        throw new Error(data.error || 'Failed to get response');
+      // Errors (validation, rate limit, missing config) still come back as JSON
+      if (!response.ok || !response.body || !(response.headers.get('content-type') || '').includes('text/event-stream')) {
+        const data: AIResponse = await response.json();
+
+        if (!response.ok) {
+          throw new Error(data.error || 'Failed to get response');
+        }
+
+        const aiMessage: ChatMessage = {
+          id: (Date.now() + 1).toString(),
+          text: data.answer,
+          isUser: false,
+          timestamp: Date.now(),
+          tools: data.tools,
+          moreLink: data.moreLink,
+          isExactMatch: data.isExactMatch,
+          toolNotFound: data.toolNotFound,
+          missingTool: data.missingTool,
+          missingCategory: data.missingCategory
+        };
+
+        dispatch(addMessage(aiMessage));
+        
+        // Start typing effect for the new AI message
+        setTypingMessageId(aiMessage.id);
+        return;
       }
 
-      const aiMessage: ChatMessage = {
-        id: (Date.now() + 1).toString(),
-        text: data.answer,
-        isUser: false,
-        timestamp: Date.now(),
-        tools: data.tools,
-        moreLink: data.moreLink,
-        isExactMatch: data.isExactMatch,
-        toolNotFound: data.toolNotFound,
-        missingTool: data.missingTool,
-        missingCategory: data.missingCategory
-      };
+      // Streamed reply: tool cards render as soon as retrieval finishes,
+      // the answer fills in token by token, metadata lands at the end
+      const messageId = (Date.now() + 1).toString();
+      let streamError: string | null = null;
+      let messageAdded = false;
+      let finished = false;
+      let streamedText = '';
+
+      try {
+        await readSSE(response.body, ({ event, data }) => {
+          const payload = JSON.parse(data);
+
+          if (event === 'tools') {
+            messageAdded = true;
+            dispatch(addMessage({
+              id: messageId,
+              text: '',
+              isUser: false,
+              timestamp: Date.now(),
+              tools: payload.tools,
+              isExactMatch: payload.isExactMatch
+            }));
+            setStreaming({ id: messageId, text: '' });
+            setIsLoading(false);
+          } else if (event === 'token') {
+            streamedText += payload.text;
+            setStreaming(prev => (prev ? { ...prev, text: prev.text + payload.text } : prev));
+          } else if (event === 'done') {
+            finished = true;
+            const data: AIResponse = payload;
+            dispatch(updateMessage({
+              id: messageId,
+              changes: {
+                text: data.answer,
+                moreLink: data.moreLink,
+                isExactMatch: data.isExactMatch,
+                toolNotFound: data.toolNotFound,
+                missingTool: data.missingTool,
+                missingCategory: data.missingCategory
+              }
+            }));
+            setStreaming(null);
+          } else if (event === 'error') {
+            streamError = payload.error || 'Failed to get response';
+          }
+        });
+      } finally {
+        // The tool cards were persisted with an empty answer; on an error or a
+        // stream cut short, keep what was streamed or say the answer failed
+        if (messageAdded && !finished) {
+          dispatch(updateMessage({
+            id: messageId,
+            changes: {
+              text: streamedText.trim()
+                ? streamedText
+                : "Sorry, I couldn't finish this answer. Please try again."
+            }
+          }));
+        }
+        setStreaming(null);
+      }
 
-      dispatch(addMessage(aiMessage));
-      
-      // Start typing effect for the new AI message
-      setTypingMessageId(aiMessage.id);
+      if (!finished && !streamError) {
+        streamError = 'The response ended unexpectedly';
+      }
+      if (streamError) {
+        throw new Error(streamError);
+      }
 
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred');
@@ -304,7 +382,7 @@ export default function AIChatbot() {
     } else {
       scrollToBottom();
     }
-  }, [messages, isLoading]);
+  }, [messages, isLoading, streaming?.text]);
 
   // Update last activity when user interacts with the chat
   useEffect(() => {
@@ -352,7 +430,7 @@ export default function AIChatbot() {
             <div
               key={message.id}
               className={`${styles.message} ${message.isUser ? styles.userMessage : styles.aiMessage} ${
-                !message.isUser && typingMessageId === message.id ? styles.typing : ''
+                !message.isUser && (typingMessageId === message.id || streaming?.id === message.id) ? styles.typing : ''
               }`}
             >
               <div className={styles.messageContent}>
@@ -363,7 +441,7 @@ export default function AIChatbot() {
                     onComplete={() => setTypingMessageId(null)}
                   />
                 ) : (
-                  <p>{message.text}</p>
+                  <p>{streaming?.id === message.id ? streaming.text : message.text}</p>
                 )}
                 <span className={styles.timestamp}>
                   {new Date(message.timestamp).toLocaleTimeString()}
@@ -1,8 +1,15 @@
 "use client";
 
+import { useEffect } from 'react';
 import { Provider } from 'react-redux';
 import { store } from '../../../lib/store';
 
 export default function Providers({ children }: { children: React.ReactNode }) {
+  // Mark the document once the client tree has hydrated so browser tests
+  // can wait on a concrete signal instead of fixed sleeps.
+  useEffect(() => {
+    document.documentElement.dataset.hydrated = 'true';
+  }, []);
+
   return <Provider store={store}>{children}</Provider>;
-} 
\ No newline at end of file
+}
@@ -2,6 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import styled from 'styled-components';
 import { useUser, SignInButton } from '@clerk/nextjs';
+import { getToolUserState, updateToolUserState } from '@/lib/toolUserState';
 
 interface LikeButtonProps {
   toolId: string;
@@ -10,7 +11,8 @@ interface LikeButtonProps {
 }
 
 const LikeButton: React.FC<LikeButtonProps> = ({ toolId, initialLikeCount, className }) => {
-  const { isSignedIn, isLoaded } = useUser();
+  const { isSignedIn, isLoaded, user } = useUser();
+  const userId = user?.id;
   const [currentLikeCount, setCurrentLikeCount] = useState(initialLikeCount);
   const [isLiked, setIsLiked] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
@@ -19,28 +21,18 @@ const LikeButton: React.FC<LikeButtonProps> = ({ toolId, initialLikeCount, class
   useEffect(() => {
     if (!isLoaded || !isSignedIn) return;
 
-    const checkUserInteraction = async () => {
-      try {
-        const likeResponse = await fetch(`/api/tools/like?toolId=${toolId}`, {
-          method: 'GET',
-        });
-        
-        if (likeResponse.ok) {
-          const likeData = await likeResponse.json();
-          setIsLiked(likeData.hasLiked || false);
-        } else if (likeResponse.status === 401) {
-          // User is not authenticated, don't show error
-          console.log('User not authenticated for like check');
-        } else {
-          console.error('Failed to check like status:', likeResponse.status, likeResponse.statusText);
-        }
-      } catch (error) {
-        console.error('Error checking user interaction:', error);
-      }
-    };
+    // Batched with every other card on the page into one tool-state request
+    let cancelled = false;
+    getToolUserState(toolId, userId).then(state => {
+      if (cancelled || !state) return;
+      setIsLiked(state.hasLiked);
+      setCurrentLikeCount(state.likeCount);
+    });
 
-    checkUserInteraction();
-  }, [toolId, isLoaded, isSignedIn]);
+    return () => {
+      cancelled = true;
+    };
+  }, [toolId, isLoaded, isSignedIn, userId]);
 
   const handleLike = async () => {
     if (isLoading) return;
@@ -67,6 +59,7 @@ const LikeButton: React.FC<LikeButtonProps> = ({ toolId, initialLikeCount, class
         console.log('Like response:', data);
         setCurrentLikeCount(data.likeCount);
         setIsLiked(!isLiked);
+        updateToolUserState(toolId, { hasLiked: !isLiked, likeCount: data.likeCount });
         console.log(`Tool ${isLiked ? 'unliked' : 'liked'} successfully. New count: ${data.likeCount}`);
       } else if (response.status === 401) {
         console.log('User not authenticated for like action');
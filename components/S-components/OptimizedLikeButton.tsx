@@ -2,6 +2,7 @@
 import React, { useState, useEffect, useCallback, useRef } from 'react';
 import styled from 'styled-components';
 import { useUser, SignInButton } from '@clerk/nextjs';
+import { getToolUserState, updateToolUserState } from '@/lib/toolUserState';
 
 interface LikeButtonProps {
   toolId: string;
@@ -75,61 +76,29 @@ const likeApiManager = {
 };
 
 const OptimizedLikeButton: React.FC<LikeButtonProps> = ({ toolId, initialLikeCount, className }) => {
-  const { isSignedIn, isLoaded } = useUser();
+  const { isSignedIn, isLoaded, user } = useUser();
+  const userId = user?.id;
   const [currentLikeCount, setCurrentLikeCount] = useState(initialLikeCount);
   const [isLiked, setIsLiked] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
-  const [hasCheckedStatus, setHasCheckedStatus] = useState(false);
-  const checkStatusTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const likeActionTimeoutRef = useRef<NodeJS.Timeout | null>(null);
 
-  // Debounced check for user interaction status
-  const checkUserInteraction = useCallback(async () => {
-    if (!isLoaded || !isSignedIn || hasCheckedStatus) return;
-
-    try {
-      const response = await likeApiManager.queueCall(
-        `check-like-${toolId}`,
-        () => fetch(`/api/tools/like?toolId=${toolId}`, { method: 'GET' })
-      );
-      
-      if (response.ok) {
-        const likeData = await response.json();
-        setIsLiked(likeData.hasLiked || false);
-        setHasCheckedStatus(true);
-      } else if (response.status === 401) {
-        console.log('User not authenticated for like check');
-        setHasCheckedStatus(true);
-      } else {
-        console.error('Failed to check like status:', response.status, response.statusText);
-        setHasCheckedStatus(true);
-      }
-    } catch (error) {
-      console.error('Error checking user interaction:', error);
-      setHasCheckedStatus(true);
-    }
-  }, [toolId, isLoaded, isSignedIn, hasCheckedStatus]);
-
-  // Check if user has already liked this tool on component mount (only if signed in)
+  // Check if user has already liked this tool on component mount (only if signed in).
+  // All cards on the page are coalesced into one tool-state request.
   useEffect(() => {
     if (!isLoaded || !isSignedIn) return;
 
-    // Clear any existing timeout
-    if (checkStatusTimeoutRef.current) {
-      clearTimeout(checkStatusTimeoutRef.current);
-    }
-
-    // Debounce the check to prevent overwhelming the server
-    checkStatusTimeoutRef.current = setTimeout(() => {
-      checkUserInteraction();
-    }, Math.random() * 1000); // Random delay between 0-1000ms
+    let cancelled = false;
+    getToolUserState(toolId, userId).then(state => {
+      if (cancelled || !state) return;
+      setIsLiked(state.hasLiked);
+      setCurrentLikeCount(state.likeCount);
+    });
 
     return () => {
-      if (checkStatusTimeoutRef.current) {
-        clearTimeout(checkStatusTimeoutRef.current);
-      }
+      cancelled = true;
     };
-  }, [toolId, isLoaded, isSignedIn, checkUserInteraction]);
+  }, [toolId, isLoaded, isSignedIn, userId]);
 
   const handleLike = useCallback(async () => {
     if (isLoading) return;
@@ -160,6 +129,7 @@ const OptimizedLikeButton: React.FC<LikeButtonProps> = ({ toolId, initialLikeCou
         console.log('Like response:', data);
         setCurrentLikeCount(data.likeCount);
         setIsLiked(!isLiked);
+        updateToolUserState(toolId, { hasLiked: !isLiked, likeCount: data.likeCount });
         console.log(`Tool ${isLiked ? 'unliked' : 'liked'} successfully. New count: ${data.likeCount}`);
       } else if (response.status === 401) {
         console.log('User not authenticated for like action');
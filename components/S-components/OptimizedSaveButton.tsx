@@ -3,6 +3,7 @@ import React, { useState, useEffect, useCallback, useRef } from 'react';
 import styled from 'styled-components';
 import { useUser, SignInButton } from '@clerk/nextjs';
 import { useAlert } from '@/components/B-components/alert/AlertContext';
+import { getToolUserState, getUserFolders, subscribeUserFolders, updateToolUserState } from '@/lib/toolUserState';
 
 interface SaveButtonProps {
   toolId: string;
@@ -21,8 +22,6 @@ const saveApiManager = {
   pendingCalls: new Map<string, Promise<any>>(),
   callQueue: [] as Array<{ id: string; fn: () => Promise<any> }>,
   isProcessing: false,
-  foldersCache: null as any,
-  foldersCacheTime: 0,
   
   async addCall(callId: string, callFn: () => Promise<Response>) {
     // If already pending, return the existing promise
@@ -80,33 +79,6 @@ const saveApiManager = {
     }
     
     this.isProcessing = false;
-  },
-  
-  // Cache folders to prevent multiple API calls
-  async getFolders() {
-    const now = Date.now();
-    const cacheExpiry = 5 * 60 * 1000; // 5 minutes
-    
-    if (this.foldersCache && (now - this.foldersCacheTime) < cacheExpiry) {
-      return this.foldersCache;
-    }
-    
-    try {
-      const response = await this.queueCall('fetch-folders', () => 
-        fetch('/api/user/folders')
-      );
-      
-      if (response.ok) {
-        const data = await response.json();
-        this.foldersCache = data.folders || [];
-        this.foldersCacheTime = now;
-        return this.foldersCache;
-      }
-      return [];
-    } catch (error) {
-      console.error('Error fetching folders:', error);
-      return [];
-    }
   }
 };
 
@@ -121,7 +93,8 @@ const notifyMenuClose = () => {
 
 const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveCount, className }) => {
   const { showSuccess, showError } = useAlert();
-  const { isSignedIn, isLoaded } = useUser();
+  const { isSignedIn, isLoaded, user } = useUser();
+  const userId = user?.id;
   const [currentSaveCount, setCurrentSaveCount] = useState(initialSaveCount || 0);
   const [isSaved, setIsSaved] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
@@ -129,11 +102,8 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
   const [folders, setFolders] = useState<Folder[]>([]);
   const [menuPosition, setMenuPosition] = useState({ top: 0, left: 0 });
   const [isMounted, setIsMounted] = useState(false);
-  const [hasCheckedStatus, setHasCheckedStatus] = useState(false);
   const buttonRef = useRef<HTMLButtonElement>(null);
   const menuRef = useRef<HTMLDivElement>(null);
-  const checkStatusTimeoutRef = useRef<NodeJS.Timeout | null>(null);
-  const fetchFoldersTimeoutRef = useRef<NodeJS.Timeout | null>(null);
 
   // Set mounted state
   useEffect(() => {
@@ -176,86 +146,32 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
     };
   }, [showMenu]);
 
-  // Check if user has already saved this tool on component mount (only if signed in)
+  // Check if user has already saved this tool on component mount (only if signed in).
+  // All cards on the page are coalesced into one tool-state request, which
+  // also delivers the user's folders for the save menu.
   useEffect(() => {
-    if (!isLoaded || !isSignedIn || hasCheckedStatus) return;
-
-    // Clear any existing timeout
-    if (checkStatusTimeoutRef.current) {
-      clearTimeout(checkStatusTimeoutRef.current);
-    }
+    if (!isLoaded || !isSignedIn) return;
 
-    // Debounce the check to prevent overwhelming the server
-    checkStatusTimeoutRef.current = setTimeout(async () => {
-      try {
-        const saveResponse = await saveApiManager.queueCall(
-          `check-save-${toolId}`,
-          () => fetch(`/api/tools/save?toolId=${toolId}`, { method: 'GET' })
-        );
-        
-        if (saveResponse.ok) {
-          const saveData = await saveResponse.json();
-          const isInSavedTools = saveData.hasSaved || false;
-          
-          const foldersData = await saveApiManager.getFolders();
-          const isInFolder = foldersData.some((folder: Folder) => 
-            folder.tools?.some((tool: { name: string }) => tool.name === toolTitle)
-          ) || false;
-          
-          const finalSavedState = isInSavedTools || isInFolder;
-          setIsSaved(finalSavedState);
-        } else if (saveResponse.status === 401) {
-          console.log('User not authenticated for save check');
-        } else {
-          console.error('Error checking save status:', saveResponse.status);
-        }
-        setHasCheckedStatus(true);
-      } catch (error) {
-        console.error('Error checking user interaction:', error);
-        setHasCheckedStatus(true);
-      }
-    }, Math.random() * 1500); // Random delay between 0-1500ms
+    let cancelled = false;
+    getToolUserState(toolId, userId).then(state => {
+      if (cancelled || !state) return;
+      setIsSaved(state.hasSaved);
+      setCurrentSaveCount(state.saveCount);
+    });
 
     return () => {
-      if (checkStatusTimeoutRef.current) {
-        clearTimeout(checkStatusTimeoutRef.current);
-      }
+      cancelled = true;
     };
-  }, [toolId, toolTitle, isLoaded, isSignedIn, hasCheckedStatus]);
+  }, [toolId, isLoaded, isSignedIn, userId]);
 
-  // Fetch user folders (only if signed in) with debouncing
+  // Share the folders loaded with the batch instead of fetching them per card
   useEffect(() => {
     if (!isLoaded || !isSignedIn) return;
 
-    // Clear any existing timeout
-    if (fetchFoldersTimeoutRef.current) {
-      clearTimeout(fetchFoldersTimeoutRef.current);
-    }
-
-    // Debounce the folders fetch
-    fetchFoldersTimeoutRef.current = setTimeout(async () => {
-      try {
-        const foldersData = await saveApiManager.getFolders();
-        setFolders(foldersData);
-        
-        const isInFolder = foldersData.some((folder: Folder) => 
-          folder.tools?.some((tool: { name: string }) => tool.name === toolTitle)
-        ) || false;
-        
-        if (isInFolder) {
-          setIsSaved(true);
-        }
-      } catch (error) {
-        console.error('Error fetching folders:', error);
-      }
-    }, Math.random() * 2000); // Random delay between 0-2000ms
-
-    return () => {
-      if (fetchFoldersTimeoutRef.current) {
-        clearTimeout(fetchFoldersTimeoutRef.current);
-      }
-    };
-  }, [toolTitle, isLoaded, isSignedIn]);
+    const known = getUserFolders(userId);
+    if (known) setFolders(known);
+    return subscribeUserFolders(setFolders);
+  }, [isLoaded, isSignedIn, userId]);
 
   const handleSave = useCallback(async () => {
     if (isLoading) return;
@@ -291,6 +207,7 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
           if (response.ok) {
             setCurrentSaveCount(prev => Math.max(0, prev - 1));
             setIsSaved(false);
+            updateToolUserState(toolId, { hasSaved: false, folder: null });
             showSuccess(`Tool removed from folder "${toolInFolder.name}" successfully!`);
           } else {
             const errorData = await response.json().catch(() => ({}));
@@ -314,6 +231,7 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
               setCurrentSaveCount(data.saveCount);
             }
             setIsSaved(false);
+            updateToolUserState(toolId, { hasSaved: false, folder: null, ...(data.saveCount !== undefined && { saveCount: data.saveCount }) });
             showSuccess('Tool unsaved successfully!');
           } else {
             const errorData = await response.json().catch(() => ({}));
@@ -338,6 +256,7 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
             setCurrentSaveCount(data.saveCount);
           }
           setIsSaved(true);
+          updateToolUserState(toolId, { hasSaved: true, ...(data.saveCount !== undefined && { saveCount: data.saveCount }) });
           showSuccess('Tool saved successfully!');
         } else {
           const errorData = await response.json().catch(() => ({}));
@@ -411,6 +330,7 @@ const OptimizedSaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, ini
         if (moveResponse.ok) {
           setCurrentSaveCount(prev => prev + 1);
           setIsSaved(true);
+          updateToolUserState(toolId, { hasSaved: true, folder: folderName });
           showSuccess(`Tool saved to folder "${folderName}" successfully!`);
         } else {
           const errorData = await moveResponse.json().catch(() => ({}));
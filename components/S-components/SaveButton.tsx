@@ -5,6 +5,7 @@ import styled from 'styled-components';
 import { useAlert } from '@/components/B-components/alert/AlertContext';
 import { redirectToPricing, shouldRedirectToPricing } from '@/utils/redirect';
 import { useUser, SignInButton } from '@clerk/nextjs';
+import { getToolUserState, getUserFolders, subscribeUserFolders, updateToolUserState } from '@/lib/toolUserState';
 
 interface Folder {
   name: string;
@@ -29,7 +30,8 @@ const notifyMenuClose = () => {
 
 const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveCount, className }) => {
   const { showSuccess, showError } = useAlert();
-  const { isSignedIn, isLoaded } = useUser();
+  const { isSignedIn, isLoaded, user } = useUser();
+  const userId = user?.id;
   const [currentSaveCount, setCurrentSaveCount] = useState(initialSaveCount || 0);
   const [isSaved, setIsSaved] = useState(false);
   const [isLoading, setIsLoading] = useState(false);
@@ -39,7 +41,6 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
   const [isMounted, setIsMounted] = useState(false);
   const buttonRef = useRef<HTMLButtonElement>(null);
   const menuRef = useRef<HTMLDivElement>(null);
-  const [hasCheckedStatus, setHasCheckedStatus] = useState(false);
 
   // Set mounted state
   useEffect(() => {
@@ -113,92 +114,32 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
     }
   }, [showMenu]);
 
-  // Check if user has already saved this tool on component mount (only if signed in)
+  // Check if user has already saved this tool on component mount (only if signed in).
+  // All cards on the page are coalesced into one tool-state request, which
+  // also delivers the user's folders for the save menu.
   useEffect(() => {
-    if (!isLoaded || !isSignedIn || hasCheckedStatus) return;
+    if (!isLoaded || !isSignedIn) return;
 
-    const checkUserInteraction = async () => {
-      try {
-        const saveResponse = await fetch(`/api/tools/save?toolId=${toolId}`, {
-          method: 'GET',
-        });
-        
-        if (saveResponse.ok) {
-          const saveData = await saveResponse.json();
-          const isInSavedTools = saveData.hasSaved || false;
-          
-          // Only fetch folders if user has saved tools
-          if (isInSavedTools) {
-            const foldersResponse = await fetch('/api/user/folders');
-            if (foldersResponse.ok) {
-              const foldersData = await foldersResponse.json();
-              
-              const isInFolder = foldersData.folders?.some((folder: Folder) => 
-                folder.tools?.some((tool: { name: string }) => tool.name === toolTitle)
-              ) || false;
-              
-              const finalSavedState = isInSavedTools || isInFolder;
-              setIsSaved(finalSavedState);
-            } else {
-              setIsSaved(isInSavedTools);
-            }
-          } else {
-            setIsSaved(false);
-          }
-        } else if (saveResponse.status === 401) {
-          // User is not authenticated, don't show error
-          console.log('User not authenticated for save check');
-          setIsSaved(false);
-        } else {
-          console.error('Error checking save status:', saveResponse.status);
-          setIsSaved(false);
-        }
-        setHasCheckedStatus(true);
-      } catch (error) {
-        console.error('Error checking user interaction:', error);
-        setIsSaved(false);
-        setHasCheckedStatus(true);
-      }
-    };
+    let cancelled = false;
+    getToolUserState(toolId, userId).then(state => {
+      if (cancelled || !state) return;
+      setIsSaved(state.hasSaved);
+      setCurrentSaveCount(state.saveCount);
+    });
 
-    // Add debounce to prevent overwhelming the server
-    const timeoutId = setTimeout(checkUserInteraction, Math.random() * 500);
-    return () => clearTimeout(timeoutId);
-  }, [toolId, toolTitle, isLoaded, isSignedIn, hasCheckedStatus]);
+    return () => {
+      cancelled = true;
+    };
+  }, [toolId, isLoaded, isSignedIn, userId]);
 
-  // Fetch user folders (only if signed in and not already fetched)
+  // Share the folders loaded with the batch instead of fetching them per card
   useEffect(() => {
-    if (!isLoaded || !isSignedIn || folders.length > 0) return;
-
-    const fetchFolders = async () => {
-      try {
-        const response = await fetch('/api/user/folders');
-        if (response.ok) {
-          const data = await response.json();
-          setFolders(data.folders || []);
-          
-          const isInFolder = data.folders?.some((folder: Folder) => 
-            folder.tools?.some((tool: { name: string }) => tool.name === toolTitle)
-          ) || false;
-          
-          if (isInFolder) {
-            setIsSaved(true);
-          }
-        } else if (response.status === 401) {
-          // User is not authenticated, don't show error
-          console.log('User not authenticated for folders fetch');
-        } else {
-          console.error('Error fetching folders:', response.status);
-        }
-      } catch (error) {
-        console.error('Error fetching folders:', error);
-      }
-    };
+    if (!isLoaded || !isSignedIn) return;
 
-    // Add debounce to prevent overwhelming the server
-    const timeoutId = setTimeout(fetchFolders, Math.random() * 1000);
-    return () => clearTimeout(timeoutId);
-  }, [toolTitle, isLoaded, isSignedIn, folders.length]);
+    const known = getUserFolders(userId);
+    if (known) setFolders(known);
+    return subscribeUserFolders(setFolders);
+  }, [isLoaded, isSignedIn, userId]);
 
   const handleSave = async () => {
     if (isLoading) return;
@@ -231,6 +172,7 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
           if (response.ok) {
             setCurrentSaveCount(prev => Math.max(0, prev - 1));
             setIsSaved(false);
+            updateToolUserState(toolId, { hasSaved: false, folder: null });
             showSuccess(`Tool removed from folder "${toolInFolder.name}" successfully!`);
           } else {
             const errorData = await response.json().catch(() => ({}));
@@ -251,6 +193,7 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
               setCurrentSaveCount(data.saveCount);
             }
             setIsSaved(false);
+            updateToolUserState(toolId, { hasSaved: false, folder: null, ...(data.saveCount !== undefined && { saveCount: data.saveCount }) });
             showSuccess('Tool unsaved successfully!');
           } else {
             const errorData = await response.json().catch(() => ({}));
@@ -272,6 +215,7 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
             setCurrentSaveCount(data.saveCount);
           }
           setIsSaved(true);
+          updateToolUserState(toolId, { hasSaved: true, ...(data.saveCount !== undefined && { saveCount: data.saveCount }) });
           showSuccess('Tool saved successfully!');
         } else {
           const errorData = await response.json().catch(() => ({}));
@@ -338,6 +282,7 @@ const SaveButton: React.FC<SaveButtonProps> = ({ toolId, toolTitle, initialSaveC
         if (moveResponse.ok) {
           setCurrentSaveCount(prev => prev + 1);
           setIsSaved(true);
+          updateToolUserState(toolId, { hasSaved: true, folder: folderName });
           showSuccess(`Tool saved to folder "${folderName}" successfully!`);
         } else {
           const errorData = await moveResponse.json().catch(() => ({}));
@@ -0,0 +1,62 @@
+// Category lookups shared by the tool listings (/api/tools?category=, the
+// category API and the statically generated category pages).
+// Tools are matched on categorySlug (see toCategorySlug): an equality on the
+// {categorySlug, isActive, ...} index, widened to partial slug matches only
+// when no tool has the exact slug. Tools written before categorySlug existed
+// stay visible until `npm run migrate:category-slug` has backfilled them: a
+// second $or branch matches them on the raw category name, and its index
+// range ({categorySlug: missing}) is empty once the backfill has run.
+import { getToolModel, toCategorySlug } from "../models/tools";
+
+type ToolModel = Awaited<ReturnType<typeof getToolModel>>;
+
+function escapeRegex(value: string): string {
+  return value.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+}
+
+// Stored category names are HTML-escaped by sanitizeToolFields
+const ESCAPED_FORMS: Record<string, string> = {
+  "&": "&amp;",
+  "<": "&lt;",
+  ">": "&gt;",
+  '"': "&quot;",
+  "'": "&#x27;",
+  "/": "&#x2F;",
+};
+
+// Regex over raw category names that toCategorySlug would map to `slug`
+// (anchored) or to a slug containing it (partial)
+function legacyCategoryPattern(slug: string, partial: boolean): RegExp {
+  const body = slug
+    .split("-")
+    .map(word =>
+      [...word]
+        .map(char => (ESCAPED_FORMS[char] ? `(?:${escapeRegex(char)}|${ESCAPED_FORMS[char]})` : escapeRegex(char)))
+        .join("")
+    )
+    .join("[\\s-]+");
+  return new RegExp(partial ? body : `^[\\s-]*${body}[\\s-]*$`, "i");
+}
+
+// Filter selecting the tools of `category`, or null when the name has no
+// usable characters. Costs one exists() probe, plus a distinct() over the
+// slug index when the exact slug is unknown.
+export async function categoryFilter(Tool: ToolModel, category: string): Promise<Record<string, unknown> | null> {
+  const slug = toCategorySlug(category);
+  if (!slug) return null;
+
+  let slugMatch: unknown = slug;
+  let partial = false;
+  if (!(await Tool.exists({ categorySlug: slug }))) {
+    partial = true;
+    const slugs = await Tool.distinct("categorySlug", { categorySlug: { $regex: new RegExp(escapeRegex(slug)) } });
+    slugMatch = slugs.length === 1 ? slugs[0] : { $in: slugs };
+  }
+
+  return {
+    $or: [
+      { categorySlug: slugMatch },
+      { categorySlug: { $exists: false }, category: { $regex: legacyCategoryPattern(slug, partial) } },
+    ],
+  };
+}
@@ -0,0 +1,27 @@
+// On-demand revalidation of the statically generated category pages.
+// Each page caches its tool data under a tag derived from the category slug,
+// so every URL spelling of a category ("All In One", "all%20in%20one") is
+// refreshed together when tools in that category are uploaded or deleted.
+import { revalidatePath, revalidateTag } from "next/cache";
+import { toCategorySlug } from "../models/tools";
+import { logger } from "./logger";
+
+export function categoryCacheTag(category: string): string {
+  return `category:${toCategorySlug(category)}`;
+}
+
+export function revalidateCategoryPages(categories: string[]): void {
+  if (categories.length === 0) return;
+  try {
+    for (const tag of new Set(categories.map(categoryCacheTag))) {
+      revalidateTag(tag);
+    }
+    // The category index lists tool counts too
+    revalidatePath("/category");
+  } catch (error) {
+    // Pages still refresh on their revalidate interval
+    logger.warn("Category page revalidation failed", {
+      error: error instanceof Error ? error.message : error,
+    });
+  }
+}
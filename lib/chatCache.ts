@@ -0,0 +1,57 @@
+// Two-level cache for /api/ai-agent.
+// Level 1 maps a normalized chat message to the search intent extracted by
+// Groq, so repeated questions skip the model round trip. Level 2 maps an
+// intent plus keywords to the ranked tool list; it is tagged with the catalog
+// generation and cleared as soon as tools are added, removed or reloaded.
+import { LRUCache, CacheStats } from "./lruCache";
+import { getCatalogGeneration } from "./toolSearchIndex";
+
+export interface CachedIntent {
+  intent: string;
+  keywords: string[];
+  isSpecificTool: boolean;
+}
+
+// Intents only depend on the message text, so they can live longer than results
+export const intentCache = new LRUCache<CachedIntent>({ maxEntries: 2000, ttlMs: 60 * 60 * 1000 });
+const resultCache = new LRUCache<unknown[]>({ maxEntries: 1000, ttlMs: 10 * 60 * 1000 });
+let resultGeneration = getCatalogGeneration();
+
+export function normalizeMessage(message: string): string {
+  return message
+    .toLowerCase()
+    .replace(/\s+/g, " ")
+    .replace(/[\s?!.,;:]+$/, "")
+    .trim();
+}
+
+export function resultKey(intent: CachedIntent): string {
+  const keywords = intent.keywords.map(k => k.toLowerCase().trim()).sort();
+  return JSON.stringify([intent.intent, intent.isSpecificTool, keywords]);
+}
+
+function syncGeneration(): void {
+  const generation = getCatalogGeneration();
+  if (generation !== resultGeneration) {
+    resultCache.clear();
+    resultGeneration = generation;
+  }
+}
+
+export function getCachedResults<T>(intent: CachedIntent): T[] | undefined {
+  syncGeneration();
+  return resultCache.get(resultKey(intent)) as T[] | undefined;
+}
+
+// `generation` is the catalog generation the results were computed against;
+// results that raced with a catalog change are not stored.
+export function setCachedResults<T>(intent: CachedIntent, tools: T[], generation: number): void {
+  syncGeneration();
+  if (generation === resultGeneration) {
+    resultCache.set(resultKey(intent), tools);
+  }
+}
+
+export function getChatCacheStats(): { intent: CacheStats; results: CacheStats } {
+  return { intent: intentCache.stats(), results: resultCache.stats() };
+}
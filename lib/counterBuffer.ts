@@ -0,0 +1,127 @@
+// Write-behind buffer for tool like/save counters.
+// Membership changes (a user's likedTools/savedTools) are written immediately
+// and decide whether a click counts; the resulting likeCount/saveCount deltas
+// are summed per tool here and flushed as one unordered bulkWrite of $inc
+// updates. A burst of clicks on a trending tool becomes one write per flush
+// instead of one write per click on the same document.
+//
+// Durability bound: a request that records a delta flushes it with after(),
+// i.e. once its response has been sent. On serverless platforms after() keeps
+// the invocation alive until the flush settles, so deltas do not outlive the
+// request that produced them. Coalescing comes from running one flush at a
+// time: clicks that land while a flush is in flight share the next one.
+// Outside a request scope the flush runs on a FLUSH_INTERVAL_MS timer. A
+// failed flush merges its deltas back and is retried on the timer; only those
+// retried deltas can be lost with the process, never the membership itself,
+// which stays the source of truth.
+import { after } from "next/server";
+import { getToolModel } from "../models/tools";
+import { logger } from "./logger";
+
+const FLUSH_INTERVAL_MS = 1000;
+const MAX_PENDING_TOOLS = 500;
+
+export type CounterField = "likeCount" | "saveCount";
+type CounterDelta = Record<CounterField, number>;
+
+let pending = new Map<string, CounterDelta>();
+// Deltas taken out of `pending` by a flush that has not been acknowledged yet;
+// still counted by withPendingCounters so reads never dip mid-flush
+let inFlight = new Map<string, CounterDelta>();
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing: Promise<void> | null = null;
+const flushStats = { flushes: 0, failures: 0 };
+
+function addDelta(target: Map<string, CounterDelta>, toolId: string, delta: Partial<CounterDelta>): void {
+  const entry = target.get(toolId) ?? { likeCount: 0, saveCount: 0 };
+  entry.likeCount += delta.likeCount ?? 0;
+  entry.saveCount += delta.saveCount ?? 0;
+  if (entry.likeCount === 0 && entry.saveCount === 0) target.delete(toolId);
+  else target.set(toolId, entry);
+}
+
+function scheduleFlush(): void {
+  if (flushTimer) return;
+  flushTimer = setTimeout(() => {
+    flushTimer = null;
+    void flushCounters();
+  }, FLUSH_INTERVAL_MS);
+  // Never keep the process alive just for the timer
+  flushTimer.unref?.();
+}
+
+// Flush once the current response has been sent
+function flushAfterResponse(): void {
+  try {
+    after(flushCounters);
+  } catch {
+    // Not inside a request (scripts, tests)
+    scheduleFlush();
+  }
+}
+
+export function recordCounterDelta(toolId: string, field: CounterField, delta: 1 | -1): void {
+  addDelta(pending, toolId, { [field]: delta });
+  if (pending.size >= MAX_PENDING_TOOLS) {
+    void flushCounters();
+  } else if (pending.size > 0) {
+    flushAfterResponse();
+  }
+}
+
+export async function flushCounters(): Promise<void> {
+  // One flush at a time; a caller arriving mid-flush waits and then flushes
+  // whatever accumulated meanwhile
+  while (flushing) await flushing;
+  if (pending.size === 0) return;
+
+  inFlight = pending;
+  pending = new Map();
+  const batch = inFlight;
+
+  flushing = (async () => {
+    try {
+      const Tool = await getToolModel();
+      const ops = [...batch].map(([toolId, delta]) => ({
+        updateOne: {
+          filter: { _id: toolId },
+          update: { $inc: { likeCount: delta.likeCount, saveCount: delta.saveCount } },
+        },
+      }));
+      await Tool.bulkWrite(ops, { ordered: false });
+      flushStats.flushes++;
+    } catch (error) {
+      flushStats.failures++;
+      logger.error("Counter flush failed, retrying", {
+        tools: batch.size,
+        error: error instanceof Error ? error.message : String(error),
+      });
+      batch.forEach((delta, toolId) => addDelta(pending, toolId, delta));
+    } finally {
+      inFlight = new Map();
+      flushing = null;
+      if (pending.size > 0) scheduleFlush();
+    }
+  })();
+  await flushing;
+}
+
+// Stored counters plus everything this instance has buffered, so the acting
+// user reads their own click back before it is flushed
+export function withPendingCounters<T extends Partial<CounterDelta>>(toolId: string, stored: T): CounterDelta {
+  const queued = pending.get(toolId);
+  const sending = inFlight.get(toolId);
+  return {
+    likeCount: Math.max(0, (stored.likeCount || 0) + (queued?.likeCount || 0) + (sending?.likeCount || 0)),
+    saveCount: Math.max(0, (stored.saveCount || 0) + (queued?.saveCount || 0) + (sending?.saveCount || 0)),
+  };
+}
+
+export function getCounterBufferStats(): { pendingTools: number; inFlightTools: number; flushes: number; failures: number } {
+  return { pendingTools: pending.size, inFlightTools: inFlight.size, ...flushStats };
+}
+
+// Flush what is buffered when the event loop drains before exit
+if (typeof process !== "undefined" && typeof process.once === "function") {
+  process.once("beforeExit", () => void flushCounters());
+}
@@ -2,10 +2,10 @@
 // This code is designed to be production-ready, with robust error handling, connection retries, and logging.
 // It uses Mongoose for MongoDB interactions and includes features like connection monitoring, graceful shutdown,
 import mongoose from "mongoose";
-// import { logger } from "winston"; // Assuming winston for logging
 import { logger } from "../logger"; // ✅
 import { env } from "process";
 import { isValidMongoUri } from "../../utils/validators"; // Fixed import path
+import { instrumentMongoClient } from "../metrics";
 
 // Define interfaces for better type safety
 interface MongooseCache {
@@ -118,6 +118,8 @@ async function connectWithRetry(attempt = 1): Promise<typeof mongoose> {
       // DNS resolution improvements
       family: 4, // Force IPv4
       directConnection: false, // Allow connection through mongos
+      // Command events feed the per-request DB metrics
+      monitorCommands: true,
     };
 
     // Try connection with different DNS resolution strategies
@@ -151,6 +153,7 @@ async function connectWithRetry(attempt = 1): Promise<typeof mongoose> {
           connectTimeoutMS: 15000,
           retryWrites: true,
           w: "majority" as const,
+          monitorCommands: true,
         };
         
         connection = await mongoose.connect(MONGO_CONFIG.uri, simplifiedOptions);
@@ -180,7 +183,7 @@ async function connectWithRetry(attempt = 1): Promise<typeof mongoose> {
 async function connectUserDB(): Promise<typeof mongoose> {
   // Return cached connection if available
   if (cached.conn) {
-    logger.info("Reusing existing USER DB connection");
+    logger.debug("Reusing existing USER DB connection");
     return cached.conn;
   }
 
@@ -195,6 +198,7 @@ async function connectUserDB(): Promise<typeof mongoose> {
       logger.info("Initiating new USER DB connection");
       cached.promise = connectWithRetry().then((mongooseInstance) => {
         cached.conn = mongooseInstance;
+        instrumentMongoClient(mongooseInstance.connection.getClient(), "users");
         logger.info("USER DB connected successfully");
         return mongooseInstance;
       }).catch((error) => {
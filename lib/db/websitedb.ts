@@ -1,14 +1,10 @@
 import mongoose, { Mongoose, ConnectOptions } from "mongoose";
+import { instrumentMongoClient } from "../metrics";
+import { logger } from "../logger";
 
-// Structured logging function
-const log = (level: "info" | "error" | "warn", message: string, metadata: Record<string, unknown> = {}) => {
-  const logDetails = {
-    timestamp: new Date().toISOString(),
-    level,
-    message,
-    ...metadata,
-  };
-  console[level](`[TOOLS_DB] ${JSON.stringify(logDetails)}`);
+// Structured logging through the shared buffered logger
+const log = (level: "debug" | "info" | "error" | "warn", message: string, metadata: Record<string, unknown> = {}) => {
+  logger[level](message, { db: "tools", ...metadata });
 };
 
 // MongoDB URI from environment variable
@@ -44,7 +40,8 @@ const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
 async function connectToolsDB(): Promise<Mongoose> {
   // Return cached connection if available
   if (cached.conn) {
-    log("info", "Reusing existing TOOLS DB connection");
+    // Runs on every request; debug keeps it out of production logs
+    log("debug", "Reusing existing TOOLS DB connection");
     return cached.conn;
   }
 
@@ -94,11 +91,14 @@ async function attemptConnectionWithRetry(): Promise<Mongoose> {
         retryReads: true,
         // Add timeout options
         maxStalenessSeconds: 90,
+        // Command events feed the per-request DB metrics
+        monitorCommands: true,
       };
 
       const mongooseInstance = await toolsMongoose.connect(MONGODB_URI_TOOLS, options);
       
       log("info", "Successfully connected to TOOLS DB");
+      instrumentMongoClient(mongooseInstance.connection.getClient(), "tools");
       
       // Only add listeners once to prevent memory leaks
       if (!toolsConnectionListenersAdded) {
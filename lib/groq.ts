@@ -0,0 +1,124 @@
+// Groq chat completions for the admin metadata routes and the metadata job
+// worker. Every call draws from two process-wide token buckets, one for
+// requests and one for (estimated) tokens per minute, so bursts of admin work
+// wait for capacity instead of running into Groq's 429s.
+import { timeUpstream } from "./metrics";
+import { logger } from "./logger";
+
+const GROQ_API_URL = process.env.GROQ_API_URL || "https://api.groq.com/openai/v1/chat/completions";
+const GROQ_MODEL = "llama3-8b-8192";
+
+// Free-tier limits of the model above; override per deployment
+const REQUESTS_PER_MINUTE = Number(process.env.GROQ_REQUESTS_PER_MINUTE) || 30;
+const TOKENS_PER_MINUTE = Number(process.env.GROQ_TOKENS_PER_MINUTE) || 30000;
+
+export interface GroqMessage {
+  role: "system" | "user" | "assistant";
+  content: string;
+}
+
+export interface GroqChatOptions {
+  maxTokens: number;
+  temperature: number;
+  timeoutMs?: number;
+}
+
+// Non-2xx Groq response; retryAfterMs is set from Retry-After on 429s
+export class GroqError extends Error {
+  constructor(public status: number, message: string, public retryAfterMs?: number) {
+    super(message);
+    this.name = "GroqError";
+  }
+}
+
+export class TokenBucket {
+  private tokens: number;
+  private updatedAt = Date.now();
+  private queue: Promise<void> = Promise.resolve();
+
+  constructor(private capacity: number, private refillPerMs: number) {
+    this.tokens = capacity;
+  }
+
+  private refill(): void {
+    const now = Date.now();
+    this.tokens = Math.min(this.capacity, this.tokens + (now - this.updatedAt) * this.refillPerMs);
+    this.updatedAt = now;
+  }
+
+  // Resolve once `amount` tokens have been taken; callers are served in order
+  take(amount: number): Promise<void> {
+    const needed = Math.min(amount, this.capacity);
+    const turn = this.queue.then(async () => {
+      this.refill();
+      while (this.tokens < needed) {
+        await new Promise(resolve => setTimeout(resolve, Math.ceil((needed - this.tokens) / this.refillPerMs)));
+        this.refill();
+      }
+      this.tokens -= needed;
+    });
+    this.queue = turn;
+    return turn;
+  }
+
+  // Empty the bucket, e.g. after the upstream reported a rate limit
+  drain(): void {
+    this.refill();
+    this.tokens = 0;
+  }
+}
+
+const requestBucket = new TokenBucket(REQUESTS_PER_MINUTE, REQUESTS_PER_MINUTE / 60000);
+const tokenBucket = new TokenBucket(TOKENS_PER_MINUTE, TOKENS_PER_MINUTE / 60000);
+
+// Rough prompt + completion size (about four characters per token)
+function estimateTokens(messages: GroqMessage[], maxTokens: number): number {
+  return Math.ceil(messages.reduce((sum, message) => sum + message.content.length, 0) / 4) + maxTokens;
+}
+
+export function isGroqConfigured(): boolean {
+  return Boolean(process.env.GROQ_FORM_API_KEY);
+}
+
+// Text of the first choice. Throws GroqError for HTTP errors, AbortError on timeout.
+export async function groqChat(messages: GroqMessage[], options: GroqChatOptions): Promise<string> {
+  await requestBucket.take(1);
+  await tokenBucket.take(estimateTokens(messages, options.maxTokens));
+
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), options.timeoutMs ?? 15000);
+
+  try {
+    const groqRes = await timeUpstream("groq", () => fetch(GROQ_API_URL, {
+      method: "POST",
+      headers: {
+        "Authorization": `Bearer ${process.env.GROQ_FORM_API_KEY}`,
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        model: GROQ_MODEL,
+        messages,
+        temperature: options.temperature,
+        max_tokens: options.maxTokens,
+      }),
+      signal: controller.signal,
+    }));
+
+    if (!groqRes.ok) {
+      const errorData = await groqRes.text();
+      let retryAfterMs: number | undefined;
+      if (groqRes.status === 429) {
+        requestBucket.drain();
+        const retryAfter = Number(groqRes.headers.get("retry-after"));
+        if (retryAfter > 0) retryAfterMs = retryAfter * 1000;
+      }
+      logger.warn("Groq API error", { status: groqRes.status, body: errorData });
+      throw new GroqError(groqRes.status, `Groq API error: ${groqRes.status} ${groqRes.statusText}`, retryAfterMs);
+    }
+
+    const data = await groqRes.json();
+    return data.choices?.[0]?.message?.content?.trim() || "";
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
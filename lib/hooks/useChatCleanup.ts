@@ -3,6 +3,7 @@ import { useDispatch } from 'react-redux';
 import { useUser } from '@clerk/nextjs';
 import { clearChatForLogout } from '@/lib/slices/chatSlice';
 import { clearHistoryForNewUser } from '@/lib/slices/historySlice';
+import { resetToolUserState } from '@/lib/toolUserState';
 
 export const useChatCleanup = () => {
   const dispatch = useDispatch();
@@ -13,6 +14,7 @@ export const useChatCleanup = () => {
     console.log('Clearing chat and history due to logout');
     dispatch(clearChatForLogout());
     dispatch(clearHistoryForNewUser());
+    resetToolUserState();
   }, [dispatch]);
 
   // Function to clear chat and history for new user
@@ -20,6 +22,7 @@ export const useChatCleanup = () => {
     console.log('Clearing chat and history for new user');
     dispatch(clearChatForLogout());
     dispatch(clearHistoryForNewUser());
+    resetToolUserState();
   }, [dispatch]);
 
   // Track user changes and handle logout/new user scenarios
@@ -1,34 +1,273 @@
-import { createLogger, format, transports } from "winston";
+// Structured JSON logging kept off the request path. Log calls serialize one
+// record into an in-memory buffer; batches are written to stdout and a
+// size/time-rotated file on a timer (or sooner when the buffer fills or an
+// error is logged). Levels below LOG_LEVEL are no-op functions, and debug/info
+// records can be sampled per route: the decision is made once per request, so
+// a request's lines are kept or dropped together. Records logged inside an
+// instrumented route carry its requestId and route for correlation.
+import fs from "fs";
 import path from "path";
+import { getRequestContext } from "./requestContext";
 
-// Define log format
-const logFormat = format.printf(({ level, message, timestamp, ...meta }) => {
-  return `${timestamp} [${level.toUpperCase()}]: ${message} ${Object.keys(meta).length ? JSON.stringify(meta) : ""}`;
-});
-
-// Create logger instance
-export const logger = createLogger({
-  level: process.env.NODE_ENV === "production" ? "info" : "debug",
-  format: format.combine(
-    format.timestamp({ format: "YYYY-MM-DD HH:mm:ss" }),
-    format.errors({ stack: true }),
-    format.splat(),
-    logFormat
-  ),
-  transports: [
-    new transports.Console({
-      format: format.combine(
-        format.colorize(),
-        logFormat
-      ),
-    }),
-    new transports.File({
-      filename: path.join(process.cwd(), "logs", "error.log"),
-      level: "error",
-    }),
-    new transports.File({
-      filename: path.join(process.cwd(), "logs", "combined.log"),
-    }),
-  ],
-  exitOnError: false,
-});
+type Level = "debug" | "info" | "warn" | "error";
+export type LogMeta = Record<string, unknown>;
+type LogMethod = (message: string, meta?: LogMeta) => void;
+
+const LEVEL_VALUES: Record<Level | "silent", number> = { debug: 10, info: 20, warn: 30, error: 40, silent: Infinity };
+
+function envNumber(name: string, fallback: number): number {
+  const value = Number(process.env[name]);
+  return Number.isFinite(value) && value > 0 ? value : fallback;
+}
+
+const configuredLevel = (process.env.LOG_LEVEL || "").toLowerCase();
+const LOG_LEVEL = configuredLevel in LEVEL_VALUES
+  ? (configuredLevel as Level | "silent")
+  : process.env.NODE_ENV === "production" ? "info" : "debug";
+
+const FLUSH_INTERVAL_MS = envNumber("LOG_FLUSH_INTERVAL_MS", 1000);
+const BATCH_SIZE = envNumber("LOG_BATCH_SIZE", 200);
+// Beyond this, records are dropped (and counted) rather than growing memory
+// while a sink is stalled
+const MAX_BUFFERED = envNumber("LOG_MAX_BUFFERED", 10000);
+
+// "/api/categories=0.05,/api/tools/like=0.1"; other routes use LOG_SAMPLE_RATE
+function parseSampleRates(spec: string | undefined): Map<string, number> {
+  const rates = new Map<string, number>();
+  for (const entry of (spec || "").split(",")) {
+    const separator = entry.lastIndexOf("=");
+    if (separator <= 0) continue;
+    const rate = Number(entry.slice(separator + 1));
+    if (Number.isFinite(rate)) rates.set(entry.slice(0, separator).trim(), Math.min(Math.max(rate, 0), 1));
+  }
+  return rates;
+}
+
+const SAMPLE_RATES = parseSampleRates(process.env.LOG_SAMPLE_RATES);
+const configuredSampleRate = Number(process.env.LOG_SAMPLE_RATE ?? 1);
+const DEFAULT_SAMPLE_RATE = Number.isFinite(configuredSampleRate) ? Math.min(Math.max(configuredSampleRate, 0), 1) : 1;
+
+interface LogSink {
+  write(chunk: string): Promise<void>;
+  // Last-resort write while the process exits
+  writeSync(chunk: string): void;
+}
+
+class StdoutSink implements LogSink {
+  write(chunk: string): Promise<void> {
+    return new Promise((resolve, reject) => {
+      process.stdout.write(chunk, error => (error ? reject(error) : resolve()));
+    });
+  }
+
+  writeSync(chunk: string): void {
+    fs.writeSync(1, chunk);
+  }
+}
+
+// Appends to `filePath`, moving it aside to `<file>.<timestamp>` once it
+// exceeds maxBytes or is older than maxAgeMs, keeping the newest maxFiles
+export class RotatingFileSink implements LogSink {
+  private handle?: fs.promises.FileHandle;
+  private size = 0;
+  private openedAt = 0;
+
+  constructor(
+    private filePath: string,
+    private maxBytes: number,
+    private maxFiles: number,
+    private maxAgeMs: number
+  ) {}
+
+  private async open(): Promise<fs.promises.FileHandle> {
+    await fs.promises.mkdir(path.dirname(this.filePath), { recursive: true });
+    const existing = await fs.promises.stat(this.filePath).catch(() => null);
+    this.size = existing?.size ?? 0;
+    this.openedAt = existing?.birthtimeMs || Date.now();
+    this.handle = await fs.promises.open(this.filePath, "a");
+    return this.handle;
+  }
+
+  private async rotate(): Promise<void> {
+    await this.handle?.close();
+    this.handle = undefined;
+    const stamp = new Date().toISOString().replace(/[:.]/g, "-");
+    await fs.promises.rename(this.filePath, `${this.filePath}.${stamp}`);
+
+    const dir = path.dirname(this.filePath);
+    const prefix = `${path.basename(this.filePath)}.`;
+    const rotated = (await fs.promises.readdir(dir)).filter(name => name.startsWith(prefix)).sort();
+    await Promise.all(
+      rotated.slice(0, Math.max(rotated.length - this.maxFiles, 0)).map(name => fs.promises.unlink(path.join(dir, name)))
+    );
+  }
+
+  async write(chunk: string): Promise<void> {
+    let handle = this.handle ?? (await this.open());
+    const bytes = Buffer.byteLength(chunk);
+    if (this.size > 0 && (this.size + bytes > this.maxBytes || Date.now() - this.openedAt >= this.maxAgeMs)) {
+      await this.rotate();
+      handle = await this.open();
+    }
+    await handle.write(chunk);
+    this.size += bytes;
+  }
+
+  writeSync(chunk: string): void {
+    fs.appendFileSync(this.filePath, chunk);
+  }
+}
+
+function createSinks(): LogSink[] {
+  const sinks: LogSink[] = [];
+  if (process.env.LOG_STDOUT !== "false") sinks.push(new StdoutSink());
+  // LOG_FILE= (empty) disables file output
+  const file = process.env.LOG_FILE ?? path.join(process.cwd(), "logs", "app.log");
+  if (file) {
+    sinks.push(
+      new RotatingFileSink(
+        file,
+        envNumber("LOG_MAX_BYTES", 10 * 1024 * 1024),
+        envNumber("LOG_MAX_FILES", 5),
+        envNumber("LOG_ROTATE_HOURS", 24) * 60 * 60 * 1000
+      )
+    );
+  }
+  return sinks;
+}
+
+const sinks = LOG_LEVEL === "silent" ? [] : createSinks();
+
+let buffer: string[] = [];
+// Records handed to the sinks whose write has not finished yet
+let inFlight = 0;
+let flushScheduled = false;
+let flushing: Promise<void> = Promise.resolve();
+let lastSinkErrorAt = 0;
+
+const stats = { written: 0, dropped: 0, sampledOut: 0, sinkErrors: 0 };
+
+// Sink failures go to stderr directly, at most once a minute
+function reportSinkError(error: unknown): void {
+  stats.sinkErrors++;
+  const now = Date.now();
+  if (now - lastSinkErrorAt < 60 * 1000) return;
+  lastSinkErrorAt = now;
+  process.stderr.write(`[logger] sink write failed: ${error instanceof Error ? error.message : String(error)}\n`);
+}
+
+function takeChunk(): string | null {
+  if (buffer.length === 0) return null;
+  const records = buffer;
+  buffer = [];
+  stats.written += records.length;
+  return `${records.join("\n")}\n`;
+}
+
+// Write everything buffered so far; resolves once it reached every sink
+function flush(): Promise<void> {
+  flushScheduled = false;
+  const count = buffer.length;
+  const chunk = takeChunk();
+  if (chunk) {
+    inFlight += count;
+    flushing = flushing.then(async () => {
+      await Promise.all(sinks.map(sink => sink.write(chunk).catch(reportSinkError)));
+      inFlight -= count;
+    });
+  }
+  return flushing;
+}
+
+function scheduleFlush(): void {
+  if (flushScheduled) return;
+  flushScheduled = true;
+  setTimeout(flush, 0);
+}
+
+if (sinks.length > 0) {
+  const flushTimer = setInterval(flush, FLUSH_INTERVAL_MS);
+  flushTimer.unref?.();
+  process.on("exit", () => {
+    const chunk = takeChunk();
+    if (!chunk) return;
+    for (const sink of sinks) {
+      try {
+        sink.writeSync(chunk);
+      } catch {
+        // Nothing left to report to
+      }
+    }
+  });
+}
+
+// Errors keep their message and stack; JSON.stringify would render them as {}
+function replacer(_key: string, value: unknown): unknown {
+  if (value instanceof Error) return { name: value.name, message: value.message, stack: value.stack };
+  if (typeof value === "bigint") return value.toString();
+  return value;
+}
+
+function sampled(level: Level): boolean {
+  if (level === "warn" || level === "error") return true;
+  const context = getRequestContext();
+  if (!context) return true;
+  if (context.logSampled === undefined) {
+    const rate = SAMPLE_RATES.get(context.route) ?? DEFAULT_SAMPLE_RATE;
+    context.logSampled = rate >= 1 || Math.random() < rate;
+  }
+  return context.logSampled;
+}
+
+function serialize(level: Level, message: string, meta: LogMeta | undefined): string {
+  const context = getRequestContext();
+  const record = {
+    time: new Date().toISOString(),
+    level,
+    msg: message,
+    ...(context && { requestId: context.requestId, route: context.route }),
+    ...meta,
+  };
+  try {
+    return JSON.stringify(record, replacer);
+  } catch {
+    // Circular metadata; keep the message rather than losing the line
+    return JSON.stringify({ time: record.time, level, msg: message, meta: "[unserializable]" });
+  }
+}
+
+function write(level: Level, message: string, meta?: LogMeta): void {
+  if (!sampled(level)) {
+    stats.sampledOut++;
+    return;
+  }
+  if (buffer.length + inFlight >= MAX_BUFFERED) {
+    stats.dropped++;
+    return;
+  }
+  buffer.push(serialize(level, message, meta));
+  if (level === "error" || buffer.length >= BATCH_SIZE) scheduleFlush();
+}
+
+const noop: LogMethod = () => {};
+
+function method(level: Level): LogMethod {
+  if (sinks.length === 0 || LEVEL_VALUES[level] < LEVEL_VALUES[LOG_LEVEL]) return noop;
+  return (message, meta) => write(level, message, meta);
+}
+
+export const logger = {
+  debug: method("debug"),
+  info: method("info"),
+  warn: method("warn"),
+  error: method("error"),
+  // Guard for log calls whose metadata is expensive to build
+  isLevelEnabled(level: Level): boolean {
+    return sinks.length > 0 && LEVEL_VALUES[level] >= LEVEL_VALUES[LOG_LEVEL];
+  },
+  flush,
+};
+
+export function getLoggerStats(): { buffered: number; written: number; dropped: number; sampledOut: number; sinkErrors: number } {
+  return { buffered: buffer.length, ...stats };
+}
@@ -0,0 +1,82 @@
+// Bounded in-memory cache with least-recently-used eviction and per-entry TTL.
+// Map iteration order is insertion order, so re-inserting on every hit keeps
+// the least recently used entry first and eviction is O(1).
+
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+export interface LRUCacheOptions {
+  maxEntries: number;
+  ttlMs: number;
+}
+
+export interface CacheStats {
+  size: number;
+  maxEntries: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+  invalidations: number;
+  hitRate: number;
+}
+
+export class LRUCache<V> {
+  private entries = new Map<string, CacheEntry<V>>();
+  private counters = { hits: 0, misses: 0, evictions: 0, expirations: 0, invalidations: 0 };
+
+  constructor(private readonly options: LRUCacheOptions) {}
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.counters.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    if (entry.expiresAt <= Date.now()) {
+      this.counters.expirations++;
+      this.counters.misses++;
+      return undefined;
+    }
+    this.entries.set(key, entry);
+    this.counters.hits++;
+    return entry.value;
+  }
+
+  set(key: string, value: V, ttlMs: number = this.options.ttlMs): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    while (this.entries.size > this.options.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+      this.counters.evictions++;
+    }
+  }
+
+  delete(key: string): boolean {
+    return this.entries.delete(key);
+  }
+
+  // Drop every entry, e.g. when the data behind them changed
+  clear(): void {
+    if (this.entries.size > 0) this.counters.invalidations++;
+    this.entries.clear();
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  stats(): CacheStats {
+    const lookups = this.counters.hits + this.counters.misses;
+    return {
+      size: this.entries.size,
+      maxEntries: this.options.maxEntries,
+      ...this.counters,
+      hitRate: lookups ? Number((this.counters.hits / lookups).toFixed(4)) : 0,
+    };
+  }
+}
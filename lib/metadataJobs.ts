@@ -0,0 +1,333 @@
+// Background metadata enrichment for the admin upload flow.
+// Tools are enqueued as persisted jobs (deduped by website URL, or title when
+// there is no URL) and an in-process worker drains them: it claims a batch,
+// scrapes the websites in parallel and asks Groq for the keywords and about
+// text of the whole batch in one prompt. Failed jobs are retried with
+// exponential backoff. Results stay on the job documents for polling, so any
+// instance can answer a poll and pick up work another instance left behind;
+// they are reused for RESULT_TTL_MS before the tool is scraped again.
+import * as cheerio from "cheerio";
+import { getMetadataJobModel, IMetadataJob, MetadataJobResult, MetadataJobStatus } from "../models/metadataJob";
+import { GroqError, groqChat, isGroqConfigured } from "./groq";
+import {
+  cleanAboutText,
+  cleanKeywords,
+  extractContentForAnalysis,
+  extractTitleAndLogo,
+  fetchWebsiteHtml,
+  WebsiteFetchError,
+} from "./websiteMetadata";
+import { logger } from "./logger";
+
+export const MAX_JOBS_PER_REQUEST = 500;
+
+// Tools per Groq prompt; keeps the prompt well inside the model's context
+const BATCH_SIZE = 5;
+const MAX_ATTEMPTS = 4;
+const BASE_RETRY_DELAY_MS = 5000;
+// A worker that has not finished a batch within this time is presumed dead
+const LOCK_MS = 2 * 60 * 1000;
+// Websites change; older results are regenerated when the tool is enqueued again
+const RESULT_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+export interface MetadataJobInput {
+  websiteUrl?: string;
+  title?: string;
+  description?: string;
+}
+
+export interface MetadataJobView {
+  id: string;
+  key: string;
+  status: MetadataJobStatus;
+  attempts: number;
+  result?: MetadataJobResult;
+  error?: string;
+}
+
+export function metadataJobKey(input: MetadataJobInput): string | null {
+  if (input.websiteUrl) {
+    try {
+      const url = new URL(input.websiteUrl);
+      const host = url.hostname.toLowerCase().replace(/^www\./, "");
+      return `url:${host}${url.pathname.replace(/\/+$/, "")}`;
+    } catch {
+      return null;
+    }
+  }
+  const title = input.title?.trim().toLowerCase();
+  return title ? `title:${title}` : null;
+}
+
+function toView(job: IMetadataJob): MetadataJobView {
+  return {
+    id: String(job._id),
+    key: job.key,
+    status: job.status,
+    attempts: job.attempts,
+    result: job.result,
+    error: job.error,
+  };
+}
+
+// Enqueue jobs for the given tools. Tools already queued, running or recently
+// done are not enqueued again; their existing job is returned. Failed jobs,
+// results older than RESULT_TTL_MS and, with `refresh`, any done job are rerun.
+export async function enqueueMetadataJobs(
+  inputs: Array<MetadataJobInput & { key: string }>,
+  { refresh = false }: { refresh?: boolean } = {}
+): Promise<MetadataJobView[]> {
+  const MetadataJob = await getMetadataJobModel();
+  const unique = new Map(inputs.map(input => [input.key, input]));
+  const keys = [...unique.keys()];
+
+  await MetadataJob.bulkWrite(
+    [...unique.values()].map(({ key, websiteUrl, title, description }) => ({
+      updateOne: {
+        filter: { key },
+        update: { $setOnInsert: { key, websiteUrl, title, description, status: "queued", attempts: 0, runAfter: new Date() } },
+        upsert: true,
+      },
+    })),
+    { ordered: false }
+  );
+  const rerun = refresh
+    ? [{ status: "failed" }, { status: "done" }]
+    : [{ status: "failed" }, { status: "done", updatedAt: { $lt: new Date(Date.now() - RESULT_TTL_MS) } }];
+  await MetadataJob.updateMany(
+    { key: { $in: keys }, $or: rerun },
+    { $set: { status: "queued", attempts: 0, runAfter: new Date() }, $unset: { error: 1, lockedUntil: 1, result: 1 } }
+  );
+
+  const jobs = await MetadataJob.find({ key: { $in: keys } });
+  kickMetadataWorker();
+
+  const byKey = new Map(jobs.map(job => [job.key, toView(job)]));
+  return keys.map(key => byKey.get(key)).filter((job): job is MetadataJobView => Boolean(job));
+}
+
+export async function getMetadataJobs(ids: string[]): Promise<MetadataJobView[]> {
+  const MetadataJob = await getMetadataJobModel();
+  const jobs = await MetadataJob.find({ _id: { $in: ids } });
+  // Polls keep the worker alive on instances that did not receive the enqueue
+  if (jobs.some(job => job.status === "queued" || job.status === "running")) {
+    kickMetadataWorker();
+  }
+  return jobs.map(toView);
+}
+
+let worker: Promise<void> | null = null;
+let wakeTimer: ReturnType<typeof setTimeout> | null = null;
+
+export function kickMetadataWorker(): void {
+  if (worker) return;
+  worker = drainJobs()
+    .catch(error => {
+      logger.error("Metadata job worker failed", { error: error instanceof Error ? error.message : error });
+    })
+    .finally(() => {
+      worker = null;
+    });
+}
+
+async function claimBatch(): Promise<IMetadataJob[]> {
+  const MetadataJob = await getMetadataJobModel();
+  const batch: IMetadataJob[] = [];
+  while (batch.length < BATCH_SIZE) {
+    const now = new Date();
+    const job = await MetadataJob.findOneAndUpdate(
+      {
+        $or: [
+          { status: "queued", runAfter: { $lte: now } },
+          { status: "running", lockedUntil: { $lt: now } },
+        ],
+      },
+      { $set: { status: "running", lockedUntil: new Date(now.getTime() + LOCK_MS) }, $inc: { attempts: 1 } },
+      { sort: { runAfter: 1 }, new: true }
+    );
+    if (!job) break;
+    batch.push(job);
+  }
+  return batch;
+}
+
+async function drainJobs(): Promise<void> {
+  for (;;) {
+    const batch = await claimBatch();
+    if (batch.length === 0) break;
+    await processBatch(batch);
+  }
+  await scheduleWake();
+}
+
+// Jobs waiting out a retry delay need the worker to come back for them
+async function scheduleWake(): Promise<void> {
+  const MetadataJob = await getMetadataJobModel();
+  const next = await MetadataJob.findOne({ status: "queued" }).sort({ runAfter: 1 }).select("runAfter").lean();
+  if (!next) return;
+
+  if (wakeTimer) clearTimeout(wakeTimer);
+  wakeTimer = setTimeout(() => {
+    wakeTimer = null;
+    kickMetadataWorker();
+  }, Math.max(0, new Date(next.runAfter).getTime() - Date.now()));
+  wakeTimer.unref?.();
+}
+
+async function complete(job: IMetadataJob, result: MetadataJobResult): Promise<void> {
+  const MetadataJob = await getMetadataJobModel();
+  await MetadataJob.updateOne(
+    { _id: job._id },
+    { $set: { status: "done", result }, $unset: { error: 1, lockedUntil: 1 } }
+  );
+}
+
+// Delay before the next attempt of a job that has made `attempts` attempts:
+// the upstream's Retry-After, else exponential backoff with jitter. Null when
+// the job should fail instead.
+export function retryDelayMs(attempts: number, delayMs?: number, permanent = false): number | null {
+  if (permanent || attempts >= MAX_ATTEMPTS) return null;
+  return delayMs ?? BASE_RETRY_DELAY_MS * 2 ** (attempts - 1) * (1 + Math.random() * 0.5);
+}
+
+// Client errors (403, 404, ...) will not change on a retry
+export function isPermanentFetchError(error: unknown): boolean {
+  return error instanceof WebsiteFetchError && error.status >= 400 && error.status < 500 && error.status !== 429;
+}
+
+// Requeue after retryDelayMs, or give up, keeping the scraped title and logo
+// (if any) as a partial result
+async function retryOrFail(
+  job: IMetadataJob,
+  error: string,
+  delayMs?: number,
+  permanent = false,
+  scraped?: ScrapedTool
+): Promise<void> {
+  const MetadataJob = await getMetadataJobModel();
+  const backoff = retryDelayMs(job.attempts, delayMs, permanent);
+  if (backoff === null) {
+    const partial = scraped && { title: scraped.title, logoUrl: scraped.logoUrl, keywords: [], about: "" };
+    await MetadataJob.updateOne(
+      { _id: job._id },
+      { $set: { status: "failed", error, ...(partial && { result: partial }) }, $unset: { lockedUntil: 1 } }
+    );
+    return;
+  }
+
+  await MetadataJob.updateOne(
+    { _id: job._id },
+    { $set: { status: "queued", error, runAfter: new Date(Date.now() + backoff) }, $unset: { lockedUntil: 1 } }
+  );
+}
+
+interface ScrapedTool {
+  job: IMetadataJob;
+  title: string;
+  logoUrl: string;
+  content: string;
+}
+
+async function scrape(job: IMetadataJob): Promise<ScrapedTool> {
+  if (!job.websiteUrl) {
+    return { job, title: job.title || "", logoUrl: "", content: "" };
+  }
+  const $ = cheerio.load(await fetchWebsiteHtml(job.websiteUrl));
+  const { title, logoUrl } = extractTitleAndLogo($, job.websiteUrl);
+  return { job, title: title || job.title || "", logoUrl, content: extractContentForAnalysis($, 600) };
+}
+
+function buildPrompt(tools: ScrapedTool[]): string {
+  return tools
+    .map((tool, index) => [
+      `### Tool ${index + 1}`,
+      `Tool: ${tool.title || "Unknown"}`,
+      `Description: ${tool.job.description || "AI tool"}`,
+      tool.content,
+    ].filter(Boolean).join("\n"))
+    .join("\n\n");
+}
+
+const SYSTEM_PROMPT = `You write catalog metadata for AI tools. For every tool below return:
+- "keywords": 5-10 search keywords (1-3 words each, lowercase, include "ai" first if it is an AI tool)
+- "about": a compelling about text of at most 25 words that states the tool's main benefit and what makes it unique, in simple language without jargon
+
+Return only a JSON array with one object per tool, in the same order:
+[{"tool": 1, "keywords": ["ai", "..."], "about": "..."}]`;
+
+// Reply entries by 1-based tool number; an entry without a number takes its position
+export function parseBatchReply(reply: string): Map<number, { keywords?: unknown; about?: unknown }> {
+  const entries = new Map<number, { keywords?: unknown; about?: unknown }>();
+  const start = reply.indexOf("[");
+  const end = reply.lastIndexOf("]");
+  if (start === -1 || end <= start) return entries;
+
+  try {
+    const parsed = JSON.parse(reply.slice(start, end + 1));
+    if (!Array.isArray(parsed)) return entries;
+    parsed.forEach((entry, index) => {
+      if (entry && typeof entry === "object") {
+        entries.set(Number(entry.tool) || index + 1, entry);
+      }
+    });
+  } catch {
+    // An unparseable reply leaves every tool of the batch to be retried
+  }
+  return entries;
+}
+
+async function processBatch(batch: IMetadataJob[]): Promise<void> {
+  const scraped: ScrapedTool[] = [];
+  const settled = await Promise.allSettled(batch.map(scrape));
+  await Promise.all(settled.map(async (outcome, index) => {
+    if (outcome.status === "fulfilled") {
+      scraped.push(outcome.value);
+      return;
+    }
+    const error = outcome.reason;
+    await retryOrFail(
+      batch[index],
+      error instanceof Error ? error.message : "Failed to fetch website",
+      undefined,
+      isPermanentFetchError(error)
+    );
+  }));
+
+  if (scraped.length === 0) return;
+  if (!isGroqConfigured()) {
+    await Promise.all(scraped.map(tool => retryOrFail(tool.job, "Groq API key not configured", undefined, true, tool)));
+    return;
+  }
+
+  let reply: string;
+  try {
+    reply = await groqChat(
+      [
+        { role: "system", content: SYSTEM_PROMPT },
+        { role: "user", content: buildPrompt(scraped) },
+      ],
+      { maxTokens: 160 * scraped.length, temperature: 0.5, timeoutMs: 30000 }
+    );
+  } catch (error) {
+    const message = error instanceof Error ? error.message : "Groq request failed";
+    const delayMs = error instanceof GroqError ? error.retryAfterMs : undefined;
+    await Promise.all(scraped.map(tool => retryOrFail(tool.job, message, delayMs, false, tool)));
+    return;
+  }
+
+  const entries = parseBatchReply(reply);
+  await Promise.all(scraped.map(async (tool, index) => {
+    const entry = entries.get(index + 1);
+    const about = typeof entry?.about === "string" ? cleanAboutText(entry.about) : "";
+    if (!entry || !Array.isArray(entry.keywords) || !about) {
+      await retryOrFail(tool.job, "Incomplete metadata in Groq reply", undefined, false, tool);
+      return;
+    }
+    await complete(tool.job, {
+      title: tool.title,
+      logoUrl: tool.logoUrl,
+      keywords: cleanKeywords(entry.keywords),
+      about,
+    });
+  }));
+}
@@ -0,0 +1,190 @@
+// Request-level instrumentation exposed in Prometheus text format at /api/metrics.
+// withRouteMetrics wraps a route handler and opens a per-request context
+// (lib/requestContext) that MongoDB command monitoring and timeUpstream write
+// into, so each request records its latency alongside how much of it went to
+// the database and how many commands it issued. Upstream calls (Groq,
+// Razorpay, scraped websites, the rate limit store) are timed per dependency
+// and route. Metrics are per process; Prometheus aggregates across instances.
+import type { mongo } from "mongoose";
+import { getRequestContext, requestIdFrom, runWithRequestContext, RequestContext } from "./requestContext";
+
+type Labels = Record<string, string>;
+
+const LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30];
+const COUNT_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100];
+
+function labelKey(labels: Labels): string {
+  return JSON.stringify(Object.entries(labels).sort(([a], [b]) => a.localeCompare(b)));
+}
+
+function escapeLabelValue(value: string): string {
+  return value.replace(/\\/g, "\\\\").replace(/\n/g, "\\n").replace(/"/g, '\\"');
+}
+
+function formatLabels(labels: Labels): string {
+  const entries = Object.entries(labels);
+  if (entries.length === 0) return "";
+  return `{${entries.map(([name, value]) => `${name}="${escapeLabelValue(value)}"`).join(",")}}`;
+}
+
+function formatValue(value: number): string {
+  return Number.isFinite(value) ? String(value) : value > 0 ? "+Inf" : "-Inf";
+}
+
+export interface Sample {
+  labels: Labels;
+  value: number;
+}
+
+// Exposition of one metric family from samples gathered at scrape time
+export function formatMetric(name: string, type: "counter" | "gauge", help: string, samples: Sample[]): string {
+  const lines = [`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`];
+  for (const sample of samples) {
+    lines.push(`${name}${formatLabels(sample.labels)} ${formatValue(sample.value)}`);
+  }
+  return lines.join("\n");
+}
+
+class Histogram {
+  private series = new Map<string, { labels: Labels; counts: number[]; sum: number; count: number }>();
+
+  constructor(readonly name: string, readonly help: string, private buckets: number[]) {}
+
+  observe(labels: Labels, value: number): void {
+    const key = labelKey(labels);
+    let series = this.series.get(key);
+    if (!series) {
+      series = { labels, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 };
+      this.series.set(key, series);
+    }
+    // Bucket counts are stored per bucket and made cumulative on render
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index !== -1) series.counts[index]++;
+    series.sum += value;
+    series.count++;
+  }
+
+  render(): string {
+    const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} histogram`];
+    for (const { labels, counts, sum, count } of this.series.values()) {
+      let cumulative = 0;
+      this.buckets.forEach((bound, i) => {
+        cumulative += counts[i];
+        lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: String(bound) })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: "+Inf" })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    }
+    return lines.join("\n");
+  }
+}
+
+const requestDuration = new Histogram(
+  "http_request_duration_seconds",
+  "Route handler latency until the response is returned",
+  LATENCY_BUCKETS
+);
+const requestDbDuration = new Histogram(
+  "http_request_db_duration_seconds",
+  "Time spent in MongoDB commands per request",
+  LATENCY_BUCKETS
+);
+const requestDbCommands = new Histogram(
+  "http_request_db_commands",
+  "MongoDB commands issued per request",
+  COUNT_BUCKETS
+);
+const dbCommandDuration = new Histogram(
+  "mongodb_command_duration_seconds",
+  "MongoDB command latency by database and command",
+  LATENCY_BUCKETS
+);
+const upstreamDuration = new Histogram(
+  "upstream_request_duration_seconds",
+  "Latency of calls to external dependencies",
+  LATENCY_BUCKETS
+);
+
+// Route label of the request being handled, or "background" outside one
+function currentRoute(): string {
+  return getRequestContext()?.route ?? "background";
+}
+
+function setRequestIdHeader(response: Response, requestId: string): void {
+  try {
+    response.headers.set("x-request-id", requestId);
+  } catch {
+    // Responses passed through from fetch() have immutable headers
+  }
+}
+
+export function withRouteMetrics<Args extends unknown[], R extends Response>(
+  route: string,
+  handler: (...args: Args) => Promise<R>
+): (...args: Args) => Promise<R> {
+  return (...args: Args) => {
+    const request = args[0] as Request | undefined;
+    const context: RequestContext = { route, requestId: requestIdFrom(request), dbCommands: 0, dbMs: 0 };
+    const method = request?.method ?? "GET";
+    const startedAt = performance.now();
+
+    const record = (status: number) => {
+      requestDuration.observe({ route, method, status: String(status) }, (performance.now() - startedAt) / 1000);
+      requestDbDuration.observe({ route }, context.dbMs / 1000);
+      requestDbCommands.observe({ route }, context.dbCommands);
+    };
+
+    return runWithRequestContext(context, async () => {
+      try {
+        const response = await handler(...args);
+        record(response.status);
+        setRequestIdHeader(response, context.requestId);
+        return response;
+      } catch (error) {
+        record(500);
+        throw error;
+      }
+    });
+  };
+}
+
+// Time an external call; `dependency` names the service (groq, razorpay, ...)
+export async function timeUpstream<T>(dependency: string, call: () => Promise<T>): Promise<T> {
+  const route = currentRoute();
+  const startedAt = performance.now();
+  let outcome = "error";
+  try {
+    const result = await call();
+    outcome = "ok";
+    return result;
+  } finally {
+    upstreamDuration.observe({ dependency, route, outcome }, (performance.now() - startedAt) / 1000);
+  }
+}
+
+const instrumentedClients = new WeakSet<mongo.MongoClient>();
+
+// Record every command of a MongoDB client (connected with monitorCommands)
+// against the request that issued it
+export function instrumentMongoClient(client: mongo.MongoClient, database: string): void {
+  if (instrumentedClients.has(client)) return;
+  instrumentedClients.add(client);
+
+  const onCommand = (event: { commandName: string; duration: number }) => {
+    dbCommandDuration.observe({ database, command: event.commandName }, event.duration / 1000);
+    const context = getRequestContext();
+    if (context) {
+      context.dbCommands++;
+      context.dbMs += event.duration;
+    }
+  };
+  client.on("commandSucceeded", event => onCommand(event));
+  client.on("commandFailed", event => onCommand(event));
+}
+
+export function renderRequestMetrics(): string {
+  return [requestDuration, requestDbDuration, requestDbCommands, dbCommandDuration, upstreamDuration]
+    .map(histogram => histogram.render())
+    .join("\n\n");
+}
@@ -0,0 +1,174 @@
+// Incrementally maintained platform statistics.
+// Writers (tool upload/delete, user creation) apply $inc deltas to a single
+// stats document so /api/stats is one point read. A reconciliation pass
+// recomputes everything from the source collections; reads trigger it in the
+// background once the last pass is older than RECONCILE_INTERVAL_MS.
+import { connectUserDB } from "./db/userdb";
+import User from "../models/user";
+import { getToolModel } from "../models/tools";
+import { getPlatformStatsModel, PLATFORM_STATS_ID } from "../models/stats";
+import { logger } from "./logger";
+
+const RECONCILE_INTERVAL_MS = 15 * 60 * 1000;
+// How long an instance trusts its last read of the catalog version
+const CATALOG_VERSION_TTL_MS = 5 * 1000;
+
+export interface PlatformStats {
+  toolCount: number;
+  categoryCount: number;
+  userCount: number;
+}
+
+let reconciling: Promise<PlatformStats> | null = null;
+let catalogVersion: { value: number; expiresAt: number } | null = null;
+
+// Category names become map keys; Mongo field names cannot contain dots or start with $
+function categoryKey(category: string): string {
+  return category.replace(/\./g, "_").replace(/^\$/, "_");
+}
+
+function tally(categories: string[]): Map<string, number> {
+  const counts = new Map<string, number>();
+  for (const category of categories) {
+    const key = categoryKey(category);
+    counts.set(key, (counts.get(key) || 0) + 1);
+  }
+  return counts;
+}
+
+// Apply per-category deltas and adjust categoryCount for categories that
+// appear (0 -> n) or empty out (n -> 0). The pre-image from the atomic
+// findOneAndUpdate tells each writer exactly which transitions it caused.
+async function applyToolDelta(categories: string[], sign: 1 | -1): Promise<void> {
+  if (categories.length === 0) return;
+
+  const Stats = await getPlatformStatsModel();
+  const counts = tally(categories);
+  const inc: Record<string, number> = { toolCount: sign * categories.length, catalogVersion: 1 };
+  counts.forEach((count, key) => {
+    inc[`categories.${key}`] = sign * count;
+  });
+
+  const before = await Stats.findOneAndUpdate(
+    { _id: PLATFORM_STATS_ID },
+    { $inc: inc },
+    { upsert: true, new: false, projection: Object.fromEntries([...counts.keys()].map(k => [`categories.${k}`, 1])) }
+  ).lean<{ categories?: Record<string, number> }>();
+
+  let categoryDelta = 0;
+  counts.forEach((count, key) => {
+    const previous = before?.categories?.[key] || 0;
+    if (sign > 0 && previous <= 0) categoryDelta += 1;
+    if (sign < 0 && previous > 0 && previous - count <= 0) categoryDelta -= 1;
+  });
+
+  // This instance sees its own catalog change immediately
+  catalogVersion = null;
+
+  if (categoryDelta !== 0) {
+    await Stats.updateOne({ _id: PLATFORM_STATS_ID }, { $inc: { categoryCount: categoryDelta } });
+  }
+}
+
+// Stats updates must never fail the write that triggered them; the next
+// reconciliation pass repairs any missed delta.
+async function safely(context: string, update: () => Promise<void>): Promise<void> {
+  try {
+    await update();
+  } catch (error) {
+    logger.warn(`Platform stats ${context} update failed`, {
+      error: error instanceof Error ? error.message : error,
+    });
+  }
+}
+
+export function recordToolsAdded(categories: string[]): Promise<void> {
+  return safely("tool upload", () => applyToolDelta(categories, 1));
+}
+
+export function recordToolsRemoved(categories: string[]): Promise<void> {
+  return safely("tool delete", () => applyToolDelta(categories, -1));
+}
+
+export function recordUserCreated(): Promise<void> {
+  return safely("user create", async () => {
+    const Stats = await getPlatformStatsModel();
+    await Stats.updateOne({ _id: PLATFORM_STATS_ID }, { $inc: { userCount: 1 } }, { upsert: true });
+  });
+}
+
+// Recompute every counter from the source collections.
+export async function reconcilePlatformStats(): Promise<PlatformStats> {
+  const Tool = await getToolModel();
+  await connectUserDB();
+
+  const [categoryRows, userCount] = await Promise.all([
+    Tool.aggregate<{ _id: string; count: number }>([{ $group: { _id: "$category", count: { $sum: 1 } } }]),
+    User.countDocuments({ isActive: true }),
+  ]);
+
+  const categories: Record<string, number> = {};
+  let toolCount = 0;
+  for (const row of categoryRows) {
+    const key = categoryKey(String(row._id));
+    categories[key] = (categories[key] || 0) + row.count;
+    toolCount += row.count;
+  }
+  const stats = { toolCount, categoryCount: Object.keys(categories).length, userCount };
+
+  const Stats = await getPlatformStatsModel();
+  await Stats.updateOne(
+    { _id: PLATFORM_STATS_ID },
+    { $set: { ...stats, categories, reconciledAt: new Date() } },
+    { upsert: true }
+  );
+  logger.info("Platform stats reconciled", stats);
+  return stats;
+}
+
+function reconcileOnce(): Promise<PlatformStats> {
+  if (!reconciling) {
+    reconciling = reconcilePlatformStats().finally(() => {
+      reconciling = null;
+    });
+  }
+  return reconciling;
+}
+
+// Point read of the materialized counters. The first read on an empty
+// collection reconciles inline; stale documents are refreshed in the background.
+export async function getPlatformStats(): Promise<PlatformStats> {
+  const Stats = await getPlatformStatsModel();
+  const doc = await Stats.findById(PLATFORM_STATS_ID)
+    .select("toolCount categoryCount userCount reconciledAt")
+    .lean<PlatformStats & { reconciledAt?: Date }>();
+
+  if (!doc || !doc.reconciledAt) {
+    return reconcileOnce();
+  }
+
+  if (Date.now() - new Date(doc.reconciledAt).getTime() > RECONCILE_INTERVAL_MS) {
+    reconcileOnce().catch(error => {
+      logger.error("Background platform stats reconciliation failed", {
+        error: error instanceof Error ? error.message : error,
+      });
+    });
+  }
+
+  return { toolCount: doc.toolCount, categoryCount: doc.categoryCount, userCount: doc.userCount };
+}
+
+// Version of the tool catalog, shared by all instances through the stats
+// document. Cached for CATALOG_VERSION_TTL_MS so cache validation costs at most
+// one point read per instance per interval.
+export async function getCatalogVersion(): Promise<number> {
+  if (catalogVersion && catalogVersion.expiresAt > Date.now()) {
+    return catalogVersion.value;
+  }
+
+  const Stats = await getPlatformStatsModel();
+  const doc = await Stats.findById(PLATFORM_STATS_ID).select("catalogVersion").lean<{ catalogVersion?: number }>();
+  const value = doc?.catalogVersion || 0;
+  catalogVersion = { value, expiresAt: Date.now() + CATALOG_VERSION_TTL_MS };
+  return value;
+}
@@ -1,8 +1,12 @@
-import { RateLimiterMemory } from 'rate-limiter-flexible';
+import { createHash } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
+import { logger } from './logger';
+import { timeUpstream } from './metrics';
 
-// Create rate limiters for different endpoints
-const rateLimiters = new Map<string, RateLimiterMemory>();
+// Rate limits are sliding-window counters kept in a store shared by every
+// instance (a Redis-protocol store reached over its REST interface), so a
+// limit holds however many instances are serving. Without a configured store,
+// or while it is unreachable, counters fall back to this process.
 
 // Rate limit configuration
 const RATE_LIMIT_CONFIG = {
@@ -22,61 +26,354 @@ const RATE_LIMIT_CONFIG = {
     points: 10,
     duration: 60, // Per minute
   },
+  '/api/metadata-jobs': {
+    points: 10, // Enqueues, each up to MAX_JOBS_PER_REQUEST model calls
+    duration: 60, // Per minute
+  },
   default: {
     points: 100,
     duration: 60, // Per minute
   }
 };
 
+export interface ConsumeResult {
+  // Points granted, between 0 and the requested amount
+  granted: number;
+  // Points left in the window after the grant
+  remaining: number;
+  // When nothing was granted: time until a point frees up
+  retryAfterMs: number;
+}
+
+export interface RateLimitStore {
+  readonly name: string;
+  // Atomically take up to `points` from the key's sliding window of
+  // `windowMs`, never letting the window exceed `limit`
+  consume(key: string, limit: number, windowMs: number, points: number): Promise<ConsumeResult>;
+}
+
+// Sliding window counter: the previous fixed window is weighted by how much
+// of it still overlaps the sliding window. Mirrored by SLIDING_WINDOW_SCRIPT.
+function slidingWindow(
+  prev: number,
+  cur: number,
+  limit: number,
+  windowMs: number,
+  now: number,
+  points: number
+): ConsumeResult {
+  const offset = now % windowMs;
+  const used = prev * (1 - offset / windowMs) + cur;
+  const granted = Math.max(0, Math.min(points, Math.floor(limit - used)));
+  if (granted > 0) {
+    return { granted, remaining: Math.floor(limit - used - granted), retryAfterMs: 0 };
+  }
+
+  // Over the limit in the current window alone: wait for the next one;
+  // otherwise wait until enough of the previous window has slid out
+  const retryAfterMs = cur + 1 > limit
+    ? windowMs - offset
+    : Math.ceil((1 - (limit - cur - 1) / prev) * windowMs - offset);
+  return { granted: 0, remaining: 0, retryAfterMs: Math.max(1, retryAfterMs) };
+}
+
+// In-process store: the fallback without a shared store, and the stand-in for tests
+export class MemoryRateLimitStore implements RateLimitStore {
+  readonly name = 'memory';
+  private windows = new Map<string, { index: number; windowMs: number; prev: number; cur: number }>();
+  private calls = 0;
+
+  async consume(key: string, limit: number, windowMs: number, points: number, now = Date.now()): Promise<ConsumeResult> {
+    const index = Math.floor(now / windowMs);
+    let entry = this.windows.get(key);
+    if (!entry || entry.index < index - 1) {
+      entry = { index, windowMs, prev: 0, cur: 0 };
+      this.windows.set(key, entry);
+    } else if (entry.index === index - 1) {
+      entry.prev = entry.cur;
+      entry.cur = 0;
+      entry.index = index;
+    }
+
+    const result = slidingWindow(entry.prev, entry.cur, limit, windowMs, now, points);
+    entry.cur += result.granted;
+
+    if (++this.calls % 1000 === 0) this.sweep(now);
+    return result;
+  }
+
+  // Drop keys whose windows no longer affect any decision
+  private sweep(now: number): void {
+    for (const [key, entry] of this.windows) {
+      if (entry.index < Math.floor(now / entry.windowMs) - 1) this.windows.delete(key);
+    }
+  }
+}
+
+// KEYS: previous window counter, current window counter
+// ARGV: limit, window ms, now ms, points requested
+const SLIDING_WINDOW_SCRIPT = `
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local points = tonumber(ARGV[4])
+local prev = tonumber(redis.call('GET', KEYS[1]) or '0')
+local cur = tonumber(redis.call('GET', KEYS[2]) or '0')
+local offset = now % window
+local used = prev * (1 - offset / window) + cur
+local granted = math.max(0, math.min(points, math.floor(limit - used)))
+if granted > 0 then
+  redis.call('INCRBY', KEYS[2], granted)
+  redis.call('PEXPIRE', KEYS[2], window * 2)
+  return {granted, math.floor(limit - used - granted), 0}
+end
+local retry
+if cur + 1 > limit then
+  retry = window - offset
+else
+  retry = math.ceil((1 - (limit - cur - 1) / prev) * window - offset)
+end
+return {0, 0, math.max(1, retry)}
+`;
+
+const SLIDING_WINDOW_SHA = createHash('sha1').update(SLIDING_WINDOW_SCRIPT).digest('hex');
+
+// Redis (or any Redis-protocol service with a REST interface, e.g. Upstash).
+// Consumption is one EVALSHA, so read-check-increment is atomic across instances.
+export class RedisRestRateLimitStore implements RateLimitStore {
+  readonly name = 'redis';
+
+  constructor(private url: string, private token: string, private timeoutMs = 1000) {}
+
+  private async command(args: Array<string | number>): Promise<unknown> {
+    const res = await timeUpstream('redis', () => fetch(this.url, {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${this.token}`,
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(args),
+      signal: AbortSignal.timeout(this.timeoutMs),
+    }));
+    const data = await res.json().catch(() => ({ error: `HTTP ${res.status}` }));
+    if (!res.ok || data.error) {
+      throw new Error(String(data.error || `HTTP ${res.status}`));
+    }
+    return data.result;
+  }
+
+  async consume(key: string, limit: number, windowMs: number, points: number): Promise<ConsumeResult> {
+    const now = Date.now();
+    const index = Math.floor(now / windowMs);
+    // The hash tag keeps both windows of a key in one cluster slot
+    const keys = [`rl:{${key}}:${index - 1}`, `rl:{${key}}:${index}`];
+    const args = [2, ...keys, limit, windowMs, now, points];
+
+    let reply: unknown;
+    try {
+      reply = await this.command(['EVALSHA', SLIDING_WINDOW_SHA, ...args]);
+    } catch (error) {
+      if (!(error instanceof Error) || !error.message.includes('NOSCRIPT')) throw error;
+      // First use on this server (or after a script flush): load it with EVAL
+      reply = await this.command(['EVAL', SLIDING_WINDOW_SCRIPT, ...args]);
+    }
+
+    const [granted, remaining, retryAfterMs] = (reply as Array<number | string>).map(Number);
+    return { granted, remaining, retryAfterMs };
+  }
+}
+
+export interface RateLimiterStats {
+  allowed: number;
+  blocked: number;
+  // Decisions answered from the local lease / block cache without a store hop
+  localAllowed: number;
+  localBlocked: number;
+  storeCalls: number;
+  storeErrors: number;
+  storeLatencyMs: number;
+}
+
+const STORE_ERROR_LOG_INTERVAL_MS = 60 * 1000;
+
+export class RateLimiter {
+  readonly stats: RateLimiterStats = {
+    allowed: 0,
+    blocked: 0,
+    localAllowed: 0,
+    localBlocked: 0,
+    storeCalls: 0,
+    storeErrors: 0,
+    storeLatencyMs: 0,
+  };
+
+  // Local pre-check: points already reserved in the shared window that this
+  // instance may hand out without a hop, and keys known to be blocked. Both
+  // only ever make the limiter stricter than the shared count, never looser.
+  private leases = new Map<string, { points: number; remaining: number; expiresAt: number }>();
+  private blockedUntil = new Map<string, number>();
+  private leaseSize: number;
+  private lastErrorLoggedAt = 0;
+  private calls = 0;
+
+  constructor(
+    readonly endpoint: string,
+    readonly points: number,
+    readonly duration: number,
+    private store: RateLimitStore,
+    private fallback: RateLimitStore = new MemoryRateLimitStore()
+  ) {
+    // Reserving ahead only pays off for generous limits; tight ones (like the
+    // chatbot's 10/min) ask the store every time so no instance hoards points
+    this.leaseSize = points >= 50 ? Math.floor(points / 10) : 1;
+  }
+
+  private get windowMs(): number {
+    return this.duration * 1000;
+  }
+
+  async consume(key: string): Promise<{ allowed: boolean; remaining: number; retryAfterMs: number }> {
+    const now = Date.now();
+    if (++this.calls % 1000 === 0) this.sweep(now);
+
+    const blockedUntil = this.blockedUntil.get(key);
+    if (blockedUntil !== undefined && blockedUntil > now) {
+      this.stats.localBlocked++;
+      this.stats.blocked++;
+      return { allowed: false, remaining: 0, retryAfterMs: blockedUntil - now };
+    }
+
+    const lease = this.leases.get(key);
+    if (lease && lease.expiresAt > now && lease.points > 0) {
+      lease.points--;
+      this.stats.localAllowed++;
+      this.stats.allowed++;
+      return { allowed: true, remaining: lease.remaining + lease.points, retryAfterMs: 0 };
+    }
+
+    const result = await this.consumeFromStore(key, now);
+    if (result.granted === 0) {
+      this.leases.delete(key);
+      this.blockedUntil.set(key, now + result.retryAfterMs);
+      this.stats.blocked++;
+      return { allowed: false, remaining: 0, retryAfterMs: result.retryAfterMs };
+    }
+
+    this.blockedUntil.delete(key);
+    if (result.granted > 1) {
+      // Reserved points belong to the current fixed window
+      this.leases.set(key, {
+        points: result.granted - 1,
+        remaining: result.remaining,
+        expiresAt: now + this.windowMs - (now % this.windowMs),
+      });
+    }
+    this.stats.allowed++;
+    return { allowed: true, remaining: result.remaining + result.granted - 1, retryAfterMs: 0 };
+  }
+
+  private async consumeFromStore(key: string, now: number): Promise<ConsumeResult> {
+    const storeKey = `${this.endpoint}:${key}`;
+    if (this.store === this.fallback) {
+      return this.fallback.consume(storeKey, this.points, this.windowMs, this.leaseSize);
+    }
+
+    const startedAt = Date.now();
+    this.stats.storeCalls++;
+    try {
+      return await this.store.consume(storeKey, this.points, this.windowMs, this.leaseSize);
+    } catch (error) {
+      this.stats.storeErrors++;
+      if (now - this.lastErrorLoggedAt > STORE_ERROR_LOG_INTERVAL_MS) {
+        this.lastErrorLoggedAt = now;
+        logger.warn('Rate limit store unavailable, using in-process limits', {
+          endpoint: this.endpoint,
+          store: this.store.name,
+          error: error instanceof Error ? error.message : error,
+        });
+      }
+      return this.fallback.consume(storeKey, this.points, this.windowMs, this.leaseSize);
+    } finally {
+      this.stats.storeLatencyMs += Date.now() - startedAt;
+    }
+  }
+
+  private sweep(now: number): void {
+    for (const [key, lease] of this.leases) {
+      if (lease.expiresAt <= now) this.leases.delete(key);
+    }
+    for (const [key, until] of this.blockedUntil) {
+      if (until <= now) this.blockedUntil.delete(key);
+    }
+  }
+}
+
+function createStore(): RateLimitStore {
+  const url = process.env.RATE_LIMIT_REDIS_REST_URL || process.env.UPSTASH_REDIS_REST_URL;
+  const token = process.env.RATE_LIMIT_REDIS_REST_TOKEN || process.env.UPSTASH_REDIS_REST_TOKEN;
+  if (url && token) return new RedisRestRateLimitStore(url, token);
+  return new MemoryRateLimitStore();
+}
+
+let sharedStore: RateLimitStore | null = null;
+
+// Create rate limiters for different endpoints
+const rateLimiters = new Map<string, RateLimiter>();
+
 // Get or create a rate limiter for a specific endpoint
-export function getRateLimiter(endpoint: string): RateLimiterMemory {
+export function getRateLimiter(endpoint: string): RateLimiter {
   if (!rateLimiters.has(endpoint)) {
     const config = RATE_LIMIT_CONFIG[endpoint as keyof typeof RATE_LIMIT_CONFIG] || RATE_LIMIT_CONFIG.default;
-    
-    const rateLimiter = new RateLimiterMemory({
-      points: config.points,
-      duration: config.duration,
-    });
-    
+    if (!sharedStore) sharedStore = createStore();
+
+    const rateLimiter = new RateLimiter(
+      endpoint,
+      config.points,
+      config.duration,
+      sharedStore,
+      sharedStore instanceof MemoryRateLimitStore ? sharedStore : undefined
+    );
+
     rateLimiters.set(endpoint, rateLimiter);
   }
-  
+
   return rateLimiters.get(endpoint)!;
 }
 
 // Apply rate limiting to a request
 export async function applyRateLimit(
-  req: NextRequest, 
-  rateLimiter: RateLimiterMemory
+  req: NextRequest,
+  rateLimiter: RateLimiter
 ): Promise<NextResponse | null> {
-  try {
-    const ip = req.headers.get('x-forwarded-for') || 
-               req.headers.get('x-real-ip') || 
-               'unknown';
-    
-    await rateLimiter.consume(ip);
+  // The first forwarded address is the client; later ones are proxies
+  const ip = req.headers.get('x-forwarded-for')?.split(',')[0].trim() ||
+             req.headers.get('x-real-ip') ||
+             'unknown';
+
+  const result = await rateLimiter.consume(ip);
+  if (result.allowed) {
     return null; // No rate limit exceeded
-  } catch (rejRes: any) {
-    // Rate limit exceeded
-    const secs = Math.round(rejRes.msBeforeNext / 1000) || 1;
-    
-    return NextResponse.json(
-      {
-        error: 'Too many requests',
-        message: `Rate limit exceeded. Please try again in ${secs} seconds.`,
-        retryAfter: secs
-      },
-      {
-        status: 429,
-        headers: {
-          'Retry-After': secs.toString(),
-          'X-RateLimit-Limit': rateLimiter.points.toString(),
-          'X-RateLimit-Remaining': '0',
-          'X-RateLimit-Reset': new Date(Date.now() + rejRes.msBeforeNext).toISOString()
-        }
-      }
-    );
   }
+
+  // Rate limit exceeded
+  const secs = Math.ceil(result.retryAfterMs / 1000) || 1;
+
+  return NextResponse.json(
+    {
+      error: 'Too many requests',
+      message: `Rate limit exceeded. Please try again in ${secs} seconds.`,
+      retryAfter: secs
+    },
+    {
+      status: 429,
+      headers: {
+        'Retry-After': secs.toString(),
+        'X-RateLimit-Limit': rateLimiter.points.toString(),
+        'X-RateLimit-Remaining': '0',
+        'X-RateLimit-Reset': new Date(Date.now() + result.retryAfterMs).toISOString()
+      }
+    }
+  );
 }
 
 // Get rate limit info for an endpoint
@@ -87,4 +384,13 @@ export function getRateLimitInfo(endpoint: string) {
     window: config.duration,
     windowUnit: 'seconds'
   };
-} 
\ No newline at end of file
+}
+
+// Backend and per-endpoint counters of every limiter created in this process
+export function getRateLimiterStats(): { store: string; endpoints: Record<string, RateLimiterStats> } {
+  const endpoints: Record<string, RateLimiterStats> = {};
+  rateLimiters.forEach((limiter, endpoint) => {
+    endpoints[endpoint] = { ...limiter.stats };
+  });
+  return { store: sharedStore?.name ?? 'none', endpoints };
+}
@@ -0,0 +1,32 @@
+// Per-request state carried through async calls (AsyncLocalStorage). Opened by
+// withRouteMetrics for every instrumented route; MongoDB command monitoring
+// adds to the DB counters and the logger reads the request ID and the
+// request's sampling decision from it.
+import { AsyncLocalStorage } from "async_hooks";
+import { randomUUID } from "crypto";
+
+export interface RequestContext {
+  route: string;
+  requestId: string;
+  dbCommands: number;
+  dbMs: number;
+  // Whether sampled log levels are written for this request; decided on the
+  // first such log call so requests that never log pay nothing
+  logSampled?: boolean;
+}
+
+const storage = new AsyncLocalStorage<RequestContext>();
+
+// Honour an ID assigned by the proxy in front of us so log lines correlate end to end
+export function requestIdFrom(request: Request | undefined): string {
+  const incoming = request?.headers?.get("x-request-id");
+  return incoming && incoming.length <= 128 ? incoming : randomUUID();
+}
+
+export function runWithRequestContext<T>(context: RequestContext, fn: () => T): T {
+  return storage.run(context, fn);
+}
+
+export function getRequestContext(): RequestContext | undefined {
+  return storage.getStore();
+}
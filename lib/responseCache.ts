@@ -0,0 +1,100 @@
+// HTTP caching for the read-only catalog GET routes.
+// The ETag is derived from the request URL, the catalog version (bumped on
+// every tool upload/delete, see platformStats) and a freshness bucket of
+// sMaxAge seconds, which bounds how long like/save counters and user counts
+// can lag. It is known before any catalog query runs, so a matching
+// If-None-Match is answered with 304 and a recently built body is served
+// from memory; neither touches the tools collection. Cache-Control lets the
+// CDN serve and revalidate anonymous browsing on its own.
+import { createHash } from "crypto";
+import { CacheStats, LRUCache } from "./lruCache";
+import { getCatalogVersion } from "./platformStats";
+import { logger } from "./logger";
+
+export interface CatalogCacheOptions {
+  // Seconds a shared cache may serve the response without revalidating
+  sMaxAge: number;
+  // Seconds a shared cache may keep serving it while revalidating in the background
+  staleWhileRevalidate: number;
+}
+
+interface CachedBody {
+  body: string;
+  contentType: string;
+}
+
+const bodies = new LRUCache<CachedBody>({ maxEntries: 500, ttlMs: 60 * 1000 });
+// How requests were answered: 304, body from memory, handler run, or uncached
+const outcomes = { notModified: 0, bodyHits: 0, misses: 0, uncached: 0 };
+
+function cacheKey(url: URL): string {
+  const params = [...url.searchParams].sort(([a], [b]) => a.localeCompare(b));
+  return `${url.pathname}?${new URLSearchParams(params).toString()}`;
+}
+
+function matchesETag(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch.split(",").some(tag => {
+    const candidate = tag.trim();
+    return candidate === "*" || candidate === etag || candidate === `W/${etag}`;
+  });
+}
+
+export async function withCatalogCache(
+  req: Request,
+  options: CatalogCacheOptions,
+  handler: () => Promise<Response>
+): Promise<Response> {
+  let version: number;
+  try {
+    version = await getCatalogVersion();
+  } catch (error) {
+    // Without a version there is nothing safe to validate against; serve uncached
+    logger.warn("Catalog version unavailable, skipping response cache", {
+      error: error instanceof Error ? error.message : error,
+    });
+    outcomes.uncached++;
+    return handler();
+  }
+
+  const bucket = Math.floor(Date.now() / (options.sMaxAge * 1000));
+  const key = cacheKey(new URL(req.url));
+  const etag = `"${createHash("sha1").update(`${version}:${bucket}:${key}`).digest("base64url")}"`;
+  const headers = {
+    ETag: etag,
+    "Cache-Control": `public, max-age=0, s-maxage=${options.sMaxAge}, stale-while-revalidate=${options.staleWhileRevalidate}`,
+  };
+
+  if (matchesETag(req.headers.get("if-none-match"), etag)) {
+    outcomes.notModified++;
+    return new Response(null, { status: 304, headers });
+  }
+
+  const cached = bodies.get(etag);
+  if (cached) {
+    outcomes.bodyHits++;
+    return new Response(cached.body, {
+      status: 200,
+      headers: { ...headers, "Content-Type": cached.contentType },
+    });
+  }
+
+  outcomes.misses++;
+  const response = await handler();
+  // Errors and validation failures are passed through uncached
+  if (response.status !== 200) {
+    return response;
+  }
+
+  const body = await response.text();
+  const contentType = response.headers.get("content-type") || "application/json";
+  bodies.set(etag, { body, contentType }, options.sMaxAge * 1000);
+  return new Response(body, {
+    status: 200,
+    headers: { ...headers, "Content-Type": contentType },
+  });
+}
+
+export function getResponseCacheStats(): typeof outcomes & { bodies: CacheStats } {
+  return { ...outcomes, bodies: bodies.stats() };
+}
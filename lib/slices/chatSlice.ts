@@ -91,6 +91,23 @@ const chatSlice = createSlice({
       }
     },
     
+    updateMessage: (state, action: PayloadAction<{ id: string; changes: Partial<Omit<ChatMessage, 'id'>> }>) => {
+      const message = state.messages.find(msg => msg.id === action.payload.id);
+      if (!message) return;
+      Object.assign(message, action.payload.changes);
+      state.lastActivity = Date.now();
+      
+      // Save to localStorage
+      if (typeof window !== 'undefined') {
+        try {
+          localStorage.setItem('aiChatMessages', JSON.stringify(state.messages));
+          localStorage.setItem('aiChatLastActivity', state.lastActivity.toString());
+        } catch (error) {
+          console.error('Error saving chat to localStorage:', error);
+        }
+      }
+    },
+    
     setMessages: (state, action: PayloadAction<ChatMessage[]>) => {
       state.messages = action.payload;
       state.lastActivity = Date.now();
@@ -185,6 +202,7 @@ const chatSlice = createSlice({
 
 export const { 
   addMessage, 
+  updateMessage,
   setMessages, 
   clearChat, 
   clearChatForLogout,
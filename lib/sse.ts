@@ -0,0 +1,48 @@
+// Minimal Server-Sent Events helpers shared by the streaming chatbot route
+// (which both emits SSE and consumes Groq's SSE stream) and the chat client.
+
+export interface SSEEvent {
+  event: string;
+  data: string;
+}
+
+const encoder = new TextEncoder();
+
+export function encodeSSE(event: string, data: unknown): Uint8Array {
+  return encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+}
+
+// Read an event stream, calling onEvent for each complete event. Events
+// without an `event:` field are reported as "message", per the SSE spec.
+export async function readSSE(
+  body: ReadableStream<Uint8Array>,
+  onEvent: (event: SSEEvent) => void
+): Promise<void> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const dispatch = (block: string) => {
+    let event = 'message';
+    const data: string[] = [];
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data.push(line.slice(5).replace(/^ /, ''));
+    }
+    if (data.length > 0) onEvent({ event, data: data.join('\n') });
+  };
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, '\n');
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary >= 0) {
+      dispatch(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+    }
+  }
+  if (buffer.trim()) dispatch(buffer);
+}
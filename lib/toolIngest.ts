@@ -0,0 +1,362 @@
+// Bulk tool ingestion for /api/tools/upload.
+// NDJSON and CSV bodies are parsed as a stream, validated in chunks and each
+// chunk is written with one unordered insertMany, so a catalog import costs a
+// round trip per CHUNK_SIZE rows rather than one per tool, and a bad or
+// duplicate row is reported instead of aborting the rows around it.
+import type { Model } from "mongoose";
+import { ITool, sanitizeToolFields } from "../models/tools";
+
+export type IngestFormat = "ndjson" | "csv";
+
+export interface ToolInput {
+  title?: string;
+  logoUrl?: string;
+  websiteUrl?: string;
+  category?: string;
+  about?: string;
+  keywords?: string[];
+  toolType?: string;
+}
+
+export interface FormattedTool {
+  title: string;
+  logoUrl: string;
+  websiteUrl: string;
+  category: string;
+  about: string;
+  keywords: string[];
+  toolType: string;
+}
+
+export type RowStatus = "inserted" | "duplicate" | "invalid" | "failed";
+
+export interface RowReport {
+  // 1-based data row (the CSV header is not counted)
+  row: number;
+  status: RowStatus;
+  title?: string;
+  id?: string;
+  error?: string;
+}
+
+export interface IngestTotals {
+  processed: number;
+  inserted: number;
+  duplicates: number;
+  invalid: number;
+  failed: number;
+}
+
+export interface IngestChunkResult {
+  rows: RowReport[];
+  insertedTools: ITool[];
+}
+
+export const CHUNK_SIZE = 500;
+
+// Helper function to format URLs
+function formatUrl(url: string): string {
+  if (!url) return url;
+
+  // Remove whitespace
+  url = url.trim();
+
+  // If it doesn't start with http:// or https://, add https://
+  if (!url.match(/^https?:\/\//)) {
+    url = `https://${url}`;
+  }
+
+  return url;
+}
+
+// Helper function to validate and format tool data
+export function validateAndFormatTool(toolData: ToolInput): FormattedTool {
+  const errors: string[] = [];
+
+  // Check required fields
+  if (!toolData.title?.trim()) {
+    errors.push("Tool title is required");
+  }
+
+  if (!toolData.logoUrl?.trim()) {
+    errors.push("Logo URL is required");
+  }
+
+  if (!toolData.websiteUrl?.trim()) {
+    errors.push("Website URL is required");
+  }
+
+  if (!toolData.category?.trim()) {
+    errors.push("Category is required");
+  }
+
+  if (!toolData.about?.trim()) {
+    errors.push("About text is required");
+  }
+
+  if (!toolData.keywords || !Array.isArray(toolData.keywords) || toolData.keywords.length < 5 || toolData.keywords.length > 10) {
+    errors.push("Keywords must be an array with 5-10 items");
+  }
+
+  if (!toolData.toolType) {
+    errors.push("Tool type is required");
+  }
+
+  if (errors.length > 0) {
+    throw new Error(`Validation failed: ${errors.join(', ')}`);
+  }
+
+  // Format URLs
+  const formattedLogoUrl = formatUrl(toolData.logoUrl || '');
+  const formattedWebsiteUrl = formatUrl(toolData.websiteUrl || '');
+
+  return {
+    title: (toolData.title || '').trim(),
+    logoUrl: formattedLogoUrl,
+    websiteUrl: formattedWebsiteUrl,
+    category: (toolData.category || '').trim(),
+    about: toolData.about?.trim() || "",
+    keywords: toolData.keywords || [],
+    toolType: toolData.toolType || '',
+  };
+}
+
+// Ingest format from the request Content-Type, or null for the JSON array upload
+export function ingestFormat(contentType: string | null): IngestFormat | null {
+  const type = (contentType || "").split(";")[0].trim().toLowerCase();
+  if (type === "application/x-ndjson" || type === "application/ndjson" || type === "application/jsonl") {
+    return "ndjson";
+  }
+  if (type === "text/csv") return "csv";
+  return null;
+}
+
+async function* readLines(body: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let newline = buffer.indexOf("\n");
+    while (newline !== -1) {
+      yield buffer.slice(0, newline).replace(/\r$/, "");
+      buffer = buffer.slice(newline + 1);
+      newline = buffer.indexOf("\n");
+    }
+  }
+
+  buffer += decoder.decode();
+  if (buffer) yield buffer.replace(/\r$/, "");
+}
+
+// CSV records (RFC 4180: quoted fields may hold commas, doubled quotes and
+// newlines), read incrementally so large files are never held in memory
+async function* readCsvRecords(body: ReadableStream<Uint8Array>): AsyncGenerator<string[]> {
+  let record: string[] = [];
+  let field = "";
+  let quoted = false;
+  let open = false; // inside a record that has not been yielded yet
+
+  for await (const line of readLines(body)) {
+    for (let i = 0; i < line.length; i++) {
+      const char = line[i];
+      open = true;
+      if (quoted) {
+        if (char !== '"') field += char;
+        else if (line[i + 1] === '"') { field += '"'; i++; }
+        else quoted = false;
+      } else if (char === '"') {
+        quoted = true;
+      } else if (char === ",") {
+        record.push(field);
+        field = "";
+      } else {
+        field += char;
+      }
+    }
+
+    if (quoted) {
+      // The newline belongs to a quoted field
+      field += "\n";
+      continue;
+    }
+    if (open) {
+      record.push(field);
+      yield record;
+    }
+    record = [];
+    field = "";
+    open = false;
+  }
+
+  if (open) {
+    record.push(field);
+    yield record;
+  }
+}
+
+// Keywords cell: a JSON array, or a list separated by ";", "|" or ","
+function parseKeywords(cell: string): string[] {
+  const value = cell.trim();
+  if (value.startsWith("[")) {
+    try {
+      const parsed = JSON.parse(value);
+      if (Array.isArray(parsed)) return parsed.map(String);
+    } catch {
+      // Fall through to the separated form
+    }
+  }
+  return value.split(/[;|,]/).map(keyword => keyword.trim()).filter(Boolean);
+}
+
+export interface ParsedRow {
+  row: number;
+  tool?: ToolInput;
+  error?: string;
+}
+
+// Rows of an NDJSON or CSV body. Blank lines are skipped; unparseable rows
+// are yielded with an error so they appear in the report as invalid.
+export async function* readToolRows(
+  body: ReadableStream<Uint8Array>,
+  format: IngestFormat
+): AsyncGenerator<ParsedRow> {
+  let row = 0;
+
+  if (format === "ndjson") {
+    for await (const line of readLines(body)) {
+      if (!line.trim()) continue;
+      row++;
+      try {
+        const tool = JSON.parse(line);
+        if (!tool || typeof tool !== "object" || Array.isArray(tool)) {
+          yield { row, error: "Row must be a JSON object" };
+        } else {
+          yield { row, tool };
+        }
+      } catch {
+        yield { row, error: "Malformed JSON" };
+      }
+    }
+    return;
+  }
+
+  let header: string[] | null = null;
+  for await (const record of readCsvRecords(body)) {
+    if (record.every(cell => !cell.trim())) continue;
+    if (!header) {
+      header = record.map(name => name.trim());
+      continue;
+    }
+
+    row++;
+    const cells: Record<string, string> = {};
+    header.forEach((name, i) => {
+      cells[name] = record[i] ?? "";
+    });
+    yield {
+      row,
+      tool: {
+        title: cells.title,
+        logoUrl: cells.logoUrl,
+        websiteUrl: cells.websiteUrl,
+        category: cells.category,
+        about: cells.about,
+        keywords: cells.keywords ? parseKeywords(cells.keywords) : [],
+        toolType: cells.toolType?.trim(),
+      },
+    };
+  }
+}
+
+interface WriteErrorLike {
+  index: number;
+  code?: number;
+  errmsg?: string;
+}
+
+function writeErrorsOf(error: unknown): WriteErrorLike[] | null {
+  const writeErrors = (error as { writeErrors?: WriteErrorLike | WriteErrorLike[] })?.writeErrors;
+  if (!writeErrors) return null;
+  return Array.isArray(writeErrors) ? writeErrors : [writeErrors];
+}
+
+// Validate and insert one chunk of rows, reporting the outcome of every row
+export async function ingestToolChunk(
+  Tool: Model<ITool>,
+  chunk: ParsedRow[]
+): Promise<IngestChunkResult> {
+  const reports = new Map<number, RowReport>();
+  const docs: ITool[] = [];
+  const docRows: number[] = [];
+
+  for (const { row, tool, error } of chunk) {
+    if (!tool) {
+      reports.set(row, { row, status: "invalid", error });
+      continue;
+    }
+
+    try {
+      const doc = new Tool({ ...validateAndFormatTool(tool), likeCount: 0, saveCount: 0 });
+      // In-memory schema validation, so only rows that can be written are sent.
+      // It sees the raw fields and sanitizing follows, as with save(), so a row
+      // is accepted here exactly when the JSON upload would accept it.
+      await doc.validate();
+      sanitizeToolFields(doc);
+      docs.push(doc);
+      docRows.push(row);
+    } catch (validationError) {
+      reports.set(row, {
+        row,
+        status: "invalid",
+        title: tool.title,
+        error: validationError instanceof Error ? validationError.message : "Unknown validation error",
+      });
+    }
+  }
+
+  const failedDocs = new Map<number, WriteErrorLike>();
+  if (docs.length > 0) {
+    try {
+      await Tool.insertMany(docs, { ordered: false });
+    } catch (error) {
+      const writeErrors = writeErrorsOf(error);
+      // Anything other than per-document write errors fails the whole chunk
+      if (!writeErrors) throw error;
+      for (const writeError of writeErrors) failedDocs.set(writeError.index, writeError);
+    }
+  }
+
+  const insertedTools: ITool[] = [];
+  docs.forEach((doc, index) => {
+    const row = docRows[index];
+    const writeError = failedDocs.get(index);
+    if (!writeError) {
+      insertedTools.push(doc);
+      reports.set(row, { row, status: "inserted", title: doc.title, id: String(doc._id) });
+    } else if (writeError.code === 11000) {
+      reports.set(row, { row, status: "duplicate", title: doc.title, error: "A tool with this title already exists" });
+    } else {
+      reports.set(row, { row, status: "failed", title: doc.title, error: writeError.errmsg || "Write failed" });
+    }
+  });
+
+  return {
+    rows: [...reports.values()].sort((a, b) => a.row - b.row),
+    insertedTools,
+  };
+}
+
+export function addToTotals(totals: IngestTotals, rows: RowReport[]): void {
+  for (const { status } of rows) {
+    totals.processed++;
+    if (status === "inserted") totals.inserted++;
+    else if (status === "duplicate") totals.duplicates++;
+    else if (status === "invalid") totals.invalid++;
+    else totals.failed++;
+  }
+}
@@ -0,0 +1,158 @@
+// Keyset (cursor) pagination for tool listings.
+// Every listing sort ends with _id so the order is total: the cursor carries
+// the sort values of the last tool on a page and the next page resumes with a
+// range predicate on the matching compound index, so page N costs the same as
+// page 1 and tools no longer shift between pages when counters change.
+// Cursors are opaque base64url tokens bound to the sort they were issued for.
+// Date fields may be missing on older documents; MongoDB orders missing/null
+// before every date, so a cursor can carry null and keysetFilter places those
+// documents at the low end of the order explicitly.
+import { CacheStats, LRUCache } from "./lruCache";
+import { getCatalogGeneration } from "./toolSearchIndex";
+
+type SortDirection = 1 | -1;
+type FieldKind = "number" | "string" | "date" | "id";
+
+export interface SortField {
+  field: string;
+  direction: SortDirection;
+  kind: FieldKind;
+}
+
+export const TOOL_SORTS = {
+  popularity: [
+    { field: "likeCount", direction: -1, kind: "number" },
+    { field: "saveCount", direction: -1, kind: "number" },
+    { field: "_id", direction: -1, kind: "id" },
+  ],
+  name: [
+    { field: "title", direction: 1, kind: "string" },
+    { field: "_id", direction: 1, kind: "id" },
+  ],
+  date: [
+    { field: "createdAt", direction: -1, kind: "date" },
+    { field: "_id", direction: -1, kind: "id" },
+  ],
+} satisfies Record<string, SortField[]>;
+
+export type ToolSortKey = keyof typeof TOOL_SORTS;
+
+export function isToolSortKey(value: string): value is ToolSortKey {
+  return Object.prototype.hasOwnProperty.call(TOOL_SORTS, value);
+}
+
+export function sortSpec(fields: SortField[]): Record<string, SortDirection> {
+  const spec: Record<string, SortDirection> = {};
+  for (const { field, direction } of fields) spec[field] = direction;
+  return spec;
+}
+
+function isValidValue(value: unknown, kind: FieldKind): boolean {
+  switch (kind) {
+    case "number":
+      return typeof value === "number" && Number.isFinite(value);
+    case "string":
+      return typeof value === "string";
+    case "date":
+      return value === null || (typeof value === "string" && !Number.isNaN(Date.parse(value)));
+    case "id":
+      return typeof value === "string" && /^[0-9a-f]{24}$/i.test(value);
+  }
+}
+
+export function encodeCursor(sort: string, values: unknown[]): string {
+  return Buffer.from(JSON.stringify({ s: sort, v: values })).toString("base64url");
+}
+
+// Returns the cursor's values, or null when it is malformed or was issued
+// for a different sort
+export function decodeCursor(cursor: string, sort: string, kinds: FieldKind[]): unknown[] | null {
+  try {
+    const payload = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+    if (payload?.s !== sort || !Array.isArray(payload.v) || payload.v.length !== kinds.length) {
+      return null;
+    }
+    return payload.v.every((value: unknown, i: number) => isValidValue(value, kinds[i])) ? payload.v : null;
+  } catch {
+    return null;
+  }
+}
+
+// Cursor pointing just past `doc` in the given sort
+export function cursorAfter(sort: ToolSortKey, doc: Record<string, unknown>): string {
+  const values = TOOL_SORTS[sort].map(({ field, kind }) => {
+    const value = doc[field];
+    if (kind === "number") return Number(value) || 0;
+    if (kind === "date") {
+      const date = value == null ? null : new Date(value as string | Date);
+      return date && !Number.isNaN(date.getTime()) ? date.toISOString() : null;
+    }
+    return String(value ?? "");
+  });
+  return encodeCursor(sort, values);
+}
+
+export function decodeToolCursor(cursor: string, sort: ToolSortKey): unknown[] | null {
+  return decodeCursor(cursor, sort, TOOL_SORTS[sort].map(field => field.kind));
+}
+
+// Condition for `field` lying strictly after `value` in the sort order, or
+// null when nothing can. Null dates sort lowest, and $lt/$gt never match null.
+function strictlyAfter({ field, direction, kind }: SortField, value: unknown): Record<string, unknown>[] | null {
+  if (kind === "date" && value === null) {
+    // Descending: nulls come last, so nothing is past a null; ascending: every date is
+    return direction === -1 ? null : [{ [field]: { $ne: null } }];
+  }
+  const range = { [field]: { [direction === 1 ? "$gt" : "$lt"]: value } };
+  // Descending past a real date still leaves the undated documents
+  return kind === "date" && direction === -1 ? [range, { [field]: null }] : [range];
+}
+
+// Filter selecting documents strictly after `values` in the sort order:
+// (a < x) OR (a = x AND b < y) OR (a = x AND b = y AND _id < z) for descending keys.
+// Mongoose casts the ids and ISO dates back through the schema.
+export function keysetFilter(fields: SortField[], values: unknown[]): Record<string, unknown> {
+  const branches: Record<string, unknown>[] = [];
+  fields.forEach((sortField, i) => {
+    const prefix: Record<string, unknown> = {};
+    for (let j = 0; j < i; j++) prefix[fields[j].field] = values[j];
+    for (const condition of strictlyAfter(sortField, values[i]) ?? []) {
+      branches.push({ ...prefix, ...condition });
+    }
+  });
+  return { $or: branches };
+}
+
+// `query` restricted to documents after the cursor; a query with its own $or
+// (category lookups) is combined under $and so neither $or is overwritten
+export function afterCursor(query: Record<string, unknown>, fields: SortField[], values: unknown[]): Record<string, unknown> {
+  const keyset = keysetFilter(fields, values);
+  return "$or" in query ? { $and: [query, keyset] } : { ...query, ...keyset };
+}
+
+// Totals only change when tools are added or removed, so counts are cached per
+// filter and dropped whenever the catalog generation moves
+const countCache = new LRUCache<number>({ maxEntries: 500, ttlMs: 60 * 1000 });
+let countGeneration = getCatalogGeneration();
+
+export async function cachedCount(filter: Record<string, unknown>, count: () => Promise<number>): Promise<number> {
+  const generation = getCatalogGeneration();
+  if (generation !== countGeneration) {
+    countCache.clear();
+    countGeneration = generation;
+  }
+
+  const key = JSON.stringify(filter, (_, value) => (value instanceof RegExp ? value.toString() : value));
+  const cached = countCache.get(key);
+  if (cached !== undefined) return cached;
+
+  const total = await count();
+  if (typeof total === "number" && generation === getCatalogGeneration()) {
+    countCache.set(key, total);
+  }
+  return total;
+}
+
+export function getCountCacheStats(): CacheStats {
+  return countCache.stats();
+}
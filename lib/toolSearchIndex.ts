@@ -0,0 +1,415 @@
+// In-process inverted index over active tools for relevance-ranked search.
+// Title, keywords, category and the start of the about text are tokenized
+// into per-term posting lists with field-weighted term frequencies and scored
+// with BM25. Query terms also match by prefix, so partially typed words work
+// without the unanchored regex scans this replaces. rank() serves the chatbot:
+// any-term BM25 plus a popularity boost and title-match bonuses, keeping only
+// the top k candidates so callers fetch just the winning ids from Mongo.
+//
+// Category-scoped searches only score the category's tools, and short
+// prefixes expand to the most widely used matching terms.
+//
+// The index is loaded from Mongo on first use, updated in place when this
+// instance uploads or deletes tools, and fully rebuilt in the background every
+// REBUILD_INTERVAL_MS to pick up writes made by other instances.
+import { getToolModel, toCategorySlug } from "../models/tools";
+import { logger } from "./logger";
+
+const FIELD_WEIGHTS = { title: 3, keywords: 2, category: 2, about: 1 } as const;
+const MAX_ABOUT_TOKENS = 200;
+const MAX_PREFIX_EXPANSIONS = 50;
+const PREFIX_MATCH_WEIGHT = 0.5;
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const POPULARITY_WEIGHT = 0.3;
+const EXACT_TITLE_BOOST = 100;
+const CONTAINED_TITLE_BOOST = 50;
+const REBUILD_INTERVAL_MS = 10 * 60 * 1000;
+
+export interface ToolSource {
+  _id: unknown;
+  title?: string;
+  category?: string;
+  about?: string;
+  keywords?: string[];
+  likeCount?: number;
+  saveCount?: number;
+}
+
+interface IndexedTool {
+  id: string;
+  titleKey: string;
+  category: string;
+  categorySlug: string;
+  likeCount: number;
+  saveCount: number;
+  length: number;
+  // Weighted term frequency per term
+  tfs: Map<string, number>;
+}
+
+// Weighted term frequency per slot; a Map so removals are O(1)
+type Posting = Map<number, number>;
+
+export interface SearchHit {
+  id: string;
+  score: number;
+  category: string;
+  likeCount: number;
+  saveCount: number;
+}
+
+export interface SearchOptions {
+  filter?: (tool: { category: string }) => boolean;
+  // Category slugs (see toCategorySlug) to search within; only their tools are scored
+  categories?: string[];
+  prefix?: boolean;
+}
+
+export interface RankOptions {
+  k: number;
+  filter?: (tool: { category: string }) => boolean;
+  // Tool names the query refers to; only tools whose title contains one are
+  // ranked, and exact title matches come first
+  titles?: string[];
+}
+
+export function tokenize(text: string | undefined): string[] {
+  return (text || "").toLowerCase().split(/[^a-z0-9]+/).filter(Boolean);
+}
+
+function titleKey(text: string | undefined): string {
+  return (text || "").toLowerCase().replace(/[^a-z0-9]/g, "");
+}
+
+function compareHits(a: SearchHit, b: SearchHit): number {
+  return (
+    b.score - a.score ||
+    b.likeCount - a.likeCount ||
+    b.saveCount - a.saveCount ||
+    (a.id < b.id ? -1 : a.id > b.id ? 1 : 0)
+  );
+}
+
+// Keep `top` sorted best-first and no longer than k.
+function insertTopK(top: SearchHit[], hit: SearchHit, k: number): void {
+  if (top.length === k && compareHits(hit, top[k - 1]) >= 0) return;
+  let position = top.length;
+  while (position > 0 && compareHits(hit, top[position - 1]) < 0) position--;
+  top.splice(position, 0, hit);
+  if (top.length > k) top.pop();
+}
+
+export class ToolSearchIndex {
+  private tools: (IndexedTool | null)[] = [];
+  private slotsById = new Map<string, number>();
+  private slotsByCategory = new Map<string, Set<number>>();
+  private freeSlots: number[] = [];
+  private postings = new Map<string, Posting>();
+  private sortedTerms: string[] | null = null;
+  private totalLength = 0;
+  builtAt = 0;
+
+  get size(): number {
+    return this.slotsById.size;
+  }
+
+  upsert(source: ToolSource): void {
+    const id = String(source._id);
+    this.remove(id);
+
+    const tfs = new Map<string, number>();
+    const add = (tokens: string[], weight: number) => {
+      for (const token of tokens) tfs.set(token, (tfs.get(token) || 0) + weight);
+    };
+    add(tokenize(source.title), FIELD_WEIGHTS.title);
+    add(tokenize((source.keywords || []).join(" ")), FIELD_WEIGHTS.keywords);
+    add(tokenize(source.category), FIELD_WEIGHTS.category);
+    add(tokenize(source.about).slice(0, MAX_ABOUT_TOKENS), FIELD_WEIGHTS.about);
+
+    let length = 0;
+    tfs.forEach(tf => { length += tf; });
+
+    const slot = this.freeSlots.pop() ?? this.tools.length;
+    const category = String(source.category || "");
+    const categorySlug = toCategorySlug(category);
+    this.tools[slot] = {
+      id,
+      titleKey: titleKey(source.title),
+      category,
+      categorySlug,
+      likeCount: Number(source.likeCount || 0),
+      saveCount: Number(source.saveCount || 0),
+      length,
+      tfs,
+    };
+    this.slotsById.set(id, slot);
+    this.totalLength += length;
+
+    const categorySlots = this.slotsByCategory.get(categorySlug) || new Set<number>();
+    categorySlots.add(slot);
+    this.slotsByCategory.set(categorySlug, categorySlots);
+
+    tfs.forEach((tf, term) => {
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+        this.sortedTerms = null;
+      }
+      posting.set(slot, tf);
+    });
+  }
+
+  remove(id: string): void {
+    const slot = this.slotsById.get(id);
+    if (slot === undefined) return;
+    const tool = this.tools[slot]!;
+
+    for (const term of tool.tfs.keys()) {
+      const posting = this.postings.get(term);
+      if (!posting) continue;
+      posting.delete(slot);
+      if (posting.size === 0) {
+        this.postings.delete(term);
+        this.sortedTerms = null;
+      }
+    }
+
+    const categorySlots = this.slotsByCategory.get(tool.categorySlug);
+    categorySlots?.delete(slot);
+    if (categorySlots?.size === 0) this.slotsByCategory.delete(tool.categorySlug);
+
+    this.totalLength -= tool.length;
+    this.tools[slot] = null;
+    this.slotsById.delete(id);
+    this.freeSlots.push(slot);
+  }
+
+  // Indexed terms starting with `prefix`, the exact term first. Beyond
+  // MAX_PREFIX_EXPANSIONS, the terms found in the most tools are kept.
+  private expand(token: string, prefix: boolean): [string, number][] {
+    const matches: [string, number][] = this.postings.has(token) ? [[token, 1]] : [];
+    if (!prefix) return matches;
+
+    if (!this.sortedTerms) {
+      this.sortedTerms = [...this.postings.keys()].sort();
+    }
+    const terms = this.sortedTerms;
+    let low = 0;
+    let high = terms.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (terms[mid] < token) low = mid + 1;
+      else high = mid;
+    }
+    const extensions: string[] = [];
+    for (let i = low; i < terms.length && terms[i].startsWith(token); i++) {
+      if (terms[i] !== token) extensions.push(terms[i]);
+    }
+    if (extensions.length > MAX_PREFIX_EXPANSIONS) {
+      const df = (term: string) => this.postings.get(term)!.size;
+      extensions.sort((a, b) => df(b) - df(a) || (a < b ? -1 : 1));
+      extensions.length = MAX_PREFIX_EXPANSIONS;
+    }
+    for (const term of extensions) matches.push([term, PREFIX_MATCH_WEIGHT]);
+    return matches;
+  }
+
+  // BM25 score per slot. With requireAll only tools matching every token are
+  // kept; with `within` only those slots are scored. When that set is smaller
+  // than the postings involved, the set is walked instead of the postings.
+  private score(tokens: string[], requireAll: boolean, prefix: boolean, within?: Set<number>): Map<number, number> {
+    const total = this.size;
+    const scores = new Map<number, number>();
+    if (tokens.length === 0 || total === 0) return scores;
+
+    const averageLength = this.totalLength / total;
+    for (let t = 0; t < tokens.length; t++) {
+      const tokenScores = new Map<number, number>();
+      const consider = (slot: number, tf: number, weight: number, idf: number) => {
+        const norm = tf * (BM25_K1 + 1) /
+          (tf + BM25_K1 * (1 - BM25_B + BM25_B * this.tools[slot]!.length / averageLength));
+        const score = weight * idf * norm;
+        // A token counts once per tool, through its best-matching term
+        if (score > (tokenScores.get(slot) || 0)) tokenScores.set(slot, score);
+      };
+
+      const terms = this.expand(tokens[t], prefix).map(([term, weight]) => {
+        const posting = this.postings.get(term)!;
+        const df = posting.size;
+        return { term, weight, posting, idf: Math.log(1 + (total - df + 0.5) / (df + 0.5)) };
+      });
+      // After the first token under requireAll, only tools still in the running matter
+      const candidates = requireAll && t > 0 ? new Set(scores.keys()) : within;
+      const postingSize = terms.reduce((sum, { posting }) => sum + posting.size, 0);
+
+      if (candidates && candidates.size < postingSize) {
+        candidates.forEach(slot => {
+          const tool = this.tools[slot]!;
+          for (const { term, weight, idf } of terms) {
+            const tf = tool.tfs.get(term);
+            if (tf !== undefined) consider(slot, tf, weight, idf);
+          }
+        });
+      } else {
+        for (const { weight, posting, idf } of terms) {
+          posting.forEach((tf, slot) => {
+            if (candidates && !candidates.has(slot)) return;
+            consider(slot, tf, weight, idf);
+          });
+        }
+      }
+
+      if (requireAll && t > 0) {
+        scores.forEach((_score, slot) => {
+          if (!tokenScores.has(slot)) scores.delete(slot);
+        });
+      }
+      tokenScores.forEach((score, slot) => scores.set(slot, (scores.get(slot) || 0) + score));
+      if (requireAll && scores.size === 0) break;
+    }
+    return scores;
+  }
+
+  private hit(slot: number, score: number): SearchHit {
+    const tool = this.tools[slot]!;
+    return {
+      id: tool.id,
+      score,
+      category: tool.category,
+      likeCount: tool.likeCount,
+      saveCount: tool.saveCount,
+    };
+  }
+
+  // Category slugs equal to `slug`, or containing it when none is equal
+  matchingCategories(slug: string): string[] {
+    if (this.slotsByCategory.has(slug)) return [slug];
+    return [...this.slotsByCategory.keys()].filter(key => slug && key.includes(slug));
+  }
+
+  // Tools matching every query token, best first. Ties break on popularity
+  // and then id so pages stay stable between requests.
+  search(query: string, options: SearchOptions = {}): SearchHit[] {
+    const tokens = [...new Set(tokenize(query))];
+    const hits: SearchHit[] = [];
+
+    let within: Set<number> | undefined;
+    if (options.categories) {
+      within = new Set();
+      for (const slug of options.categories) {
+        this.slotsByCategory.get(slug)?.forEach(slot => within!.add(slot));
+      }
+      if (within.size === 0) return hits;
+    }
+
+    this.score(tokens, true, options.prefix ?? true, within).forEach((score, slot) => {
+      if (options.filter && !options.filter(this.tools[slot]!)) return;
+      hits.push(this.hit(slot, score));
+    });
+    return hits.sort(compareHits);
+  }
+
+  // Top k tools matching any of the terms, with popularity and title boosts.
+  rank(terms: string[], options: RankOptions): SearchHit[] {
+    const tokens = [...new Set(terms.flatMap(tokenize))];
+    const titles = (options.titles || []).map(titleKey).filter(Boolean);
+    const top: SearchHit[] = [];
+
+    this.score(tokens, false, true).forEach((bm25, slot) => {
+      const tool = this.tools[slot]!;
+      if (options.filter && !options.filter(tool)) return;
+
+      let score = bm25 + POPULARITY_WEIGHT * Math.log1p(tool.likeCount + tool.saveCount);
+      if (titles.length > 0) {
+        if (titles.includes(tool.titleKey)) score += EXACT_TITLE_BOOST;
+        else if (titles.some(title => tool.titleKey.includes(title))) score += CONTAINED_TITLE_BOOST;
+        else return;
+      }
+      insertTopK(top, this.hit(slot, score), options.k);
+    });
+    return top;
+  }
+
+  // Most popular tools in a category (matched by slug).
+  topInCategory(category: string, k: number, excludeIds: string[] = []): SearchHit[] {
+    const top: SearchHit[] = [];
+    this.slotsByCategory.get(toCategorySlug(category))?.forEach(slot => {
+      const tool = this.tools[slot]!;
+      if (excludeIds.includes(tool.id)) return;
+      insertTopK(top, this.hit(slot, tool.likeCount + tool.saveCount), k);
+    });
+    return top;
+  }
+}
+
+let current: ToolSearchIndex | null = null;
+let building: Promise<ToolSearchIndex> | null = null;
+// Bumped whenever the indexed catalog changes, so caches derived from it can invalidate
+let generation = 0;
+
+export function getCatalogGeneration(): number {
+  return generation;
+}
+
+async function buildIndex(): Promise<ToolSearchIndex> {
+  const started = Date.now();
+  const Tool = await getToolModel();
+  const index = new ToolSearchIndex();
+
+  const cursor = Tool.find({ isActive: true })
+    .select("_id title category about keywords likeCount saveCount")
+    .lean<ToolSource>()
+    .cursor();
+  for await (const tool of cursor) {
+    index.upsert(tool as ToolSource);
+  }
+
+  index.builtAt = Date.now();
+  logger.info("Tool search index built", { tools: index.size, ms: index.builtAt - started });
+  return index;
+}
+
+function rebuild(): Promise<ToolSearchIndex> {
+  if (!building) {
+    building = buildIndex()
+      .then(index => {
+        current = index;
+        generation++;
+        return index;
+      })
+      .finally(() => {
+        building = null;
+      });
+  }
+  return building;
+}
+
+// The shared index; built on first use and refreshed in the background when stale.
+export async function getToolSearchIndex(): Promise<ToolSearchIndex> {
+  if (!current) {
+    return rebuild();
+  }
+  if (Date.now() - current.builtAt > REBUILD_INTERVAL_MS) {
+    rebuild().catch(error => {
+      logger.error("Tool search index rebuild failed", {
+        error: error instanceof Error ? error.message : error,
+      });
+    });
+  }
+  return current;
+}
+
+// Apply this instance's writes to the loaded index; a no-op before first use.
+export function indexTools(tools: ToolSource[]): void {
+  if (tools.length > 0) generation++;
+  if (!current) return;
+  for (const tool of tools) current.upsert(tool);
+}
+
+export function removeFromToolIndex(ids: string[]): void {
+  if (ids.length > 0) generation++;
+  if (!current) return;
+  for (const id of ids) current.remove(id);
+}
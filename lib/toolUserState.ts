@@ -0,0 +1,155 @@
+// Client-side batching of per-tool user state (liked / saved / folder).
+// Every like and save button on a page asks for its tool's state on mount.
+// Requests made within BATCH_WINDOW_MS are deduped and coalesced into a single
+// POST /api/user/tool-state, so a page of cards costs one round trip instead
+// of one status request (plus a folders request) per card.
+// Cached state belongs to one signed-in user and is dropped when the user
+// changes (or signs out); entries are refetched after STATE_TTL_MS.
+
+export interface ToolUserState {
+  hasLiked: boolean;
+  hasSaved: boolean;
+  folder: string | null;
+  likeCount: number;
+  saveCount: number;
+}
+
+export interface UserFolder {
+  name: string;
+  tools: Array<{ name: string; logoUrl: string; websiteUrl: string; category: string; toolType?: string }>;
+  createdAt: string;
+}
+
+const BATCH_WINDOW_MS = 10;
+const MAX_BATCH_SIZE = 100; // server-side limit per request
+const STATE_TTL_MS = 60 * 1000;
+
+// Resolved (or in-flight) state per tool of the current owner
+const states = new Map<string, { state: Promise<ToolUserState | null>; requestedAt: number }>();
+let queued = new Map<string, (state: ToolUserState | null) => void>();
+let batchTimer: ReturnType<typeof setTimeout> | null = null;
+
+// User the cached state belongs to; bumping `generation` orphans in-flight batches
+let owner: string | null = null;
+let generation = 0;
+
+let folders: UserFolder[] | null = null;
+const folderListeners = new Set<(folders: UserFolder[]) => void>();
+
+// Forget everything cached for the current user
+export function resetToolUserState(): void {
+  generation++;
+  if (batchTimer) {
+    clearTimeout(batchTimer);
+    batchTimer = null;
+  }
+  queued.forEach(resolve => resolve(null));
+  queued = new Map();
+  states.clear();
+  folders = null;
+}
+
+async function fetchBatch(batch: Map<string, (state: ToolUserState | null) => void>): Promise<void> {
+  const batchGeneration = generation;
+  const forget = (toolId: string) => {
+    if (batchGeneration === generation) states.delete(toolId);
+  };
+
+  try {
+    const response = await fetch('/api/user/tool-state', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ toolIds: [...batch.keys()] }),
+    });
+
+    if (!response.ok) {
+      if (response.status !== 401) {
+        console.error('Failed to fetch tool state:', response.status, response.statusText);
+      }
+      batch.forEach((resolve, toolId) => {
+        forget(toolId);
+        resolve(null);
+      });
+      return;
+    }
+
+    const data: { states: Record<string, ToolUserState>; folders: UserFolder[] } = await response.json();
+    // The user signed out or switched while this batch was in flight
+    if (batchGeneration !== generation) {
+      batch.forEach(resolve => resolve(null));
+      return;
+    }
+    setUserFolders(data.folders || []);
+    batch.forEach((resolve, toolId) => resolve(data.states?.[toolId] ?? null));
+  } catch (error) {
+    console.error('Error fetching tool state:', error);
+    batch.forEach((resolve, toolId) => {
+      forget(toolId);
+      resolve(null);
+    });
+  }
+}
+
+function flushQueue(): void {
+  batchTimer = null;
+  const pending = queued;
+  queued = new Map();
+
+  let batch = new Map<string, (state: ToolUserState | null) => void>();
+  pending.forEach((resolve, toolId) => {
+    batch.set(toolId, resolve);
+    if (batch.size === MAX_BATCH_SIZE) {
+      void fetchBatch(batch);
+      batch = new Map();
+    }
+  });
+  if (batch.size > 0) void fetchBatch(batch);
+}
+
+// State of one tool for the signed-in user `userId`, or null when it could not be loaded
+export function getToolUserState(toolId: string, userId: string | null | undefined): Promise<ToolUserState | null> {
+  if ((userId ?? null) !== owner) {
+    resetToolUserState();
+    owner = userId ?? null;
+  }
+
+  const known = states.get(toolId);
+  if (known && Date.now() - known.requestedAt < STATE_TTL_MS) return known.state;
+
+  const promise = new Promise<ToolUserState | null>(resolve => {
+    queued.set(toolId, resolve);
+  });
+  states.set(toolId, { state: promise, requestedAt: Date.now() });
+
+  if (!batchTimer) {
+    batchTimer = setTimeout(flushQueue, BATCH_WINDOW_MS);
+  }
+  return promise;
+}
+
+// Record the outcome of a like/save action so cards mounted later (or the
+// same tool rendered twice) do not show stale state
+export function updateToolUserState(toolId: string, changes: Partial<ToolUserState>): void {
+  const known = states.get(toolId);
+  if (!known) return;
+  known.state = known.state.then(state => (state ? { ...state, ...changes } : state));
+}
+
+// Folders of `userId`, delivered with the first batch response
+export function getUserFolders(userId: string | null | undefined): UserFolder[] | null {
+  return (userId ?? null) === owner ? folders : null;
+}
+
+export function setUserFolders(next: UserFolder[]): void {
+  folders = next;
+  folderListeners.forEach(listener => listener(next));
+}
+
+export function subscribeUserFolders(listener: (folders: UserFolder[]) => void): () => void {
+  folderListeners.add(listener);
+  return () => {
+    folderListeners.delete(listener);
+  };
+}
@@ -0,0 +1,210 @@
+// Scraping helpers shared by the auto-fill routes and the metadata job worker:
+// fetching a tool's website, picking its name and logo, and collecting the
+// text the keyword / about prompts are built from.
+import * as cheerio from 'cheerio';
+import { timeUpstream } from './metrics';
+import { logger } from './logger';
+
+export type CheerioRoot = ReturnType<typeof cheerio.load>;
+
+// Raised for non-2xx responses; timeouts surface as an AbortError
+export class WebsiteFetchError extends Error {
+  constructor(public status: number, statusText: string) {
+    super(`Failed to fetch URL: ${status} ${statusText}`);
+    this.name = 'WebsiteFetchError';
+  }
+}
+
+export async function fetchWebsiteHtml(websiteUrl: string, timeoutMs = 10000): Promise<string> {
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
+
+  try {
+    const res = await timeUpstream('website', () => fetch(websiteUrl, {
+      method: 'GET',
+      headers: {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Cache-Control': 'max-age=0',
+      },
+      signal: controller.signal,
+      redirect: 'follow',
+    }));
+
+    if (!res.ok) {
+      throw new WebsiteFetchError(res.status, res.statusText);
+    }
+    return await res.text();
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
+
+// Helper to extract only the tool name from a full title string
+export function extractToolName(title: string): string {
+  if (!title) return '';
+  // Common separators: |, -, :, ·, —, •
+  const separators = ['|', '-', ':', '·', '—', '•'];
+  let best = title;
+  separators.forEach(sep => {
+    if (best.includes(sep)) {
+      // Take the first part before the separator if it's not too short
+      const parts = best.split(sep).map(p => p.trim());
+      if (parts[0].length >= 3 && parts[0].length <= 40) {
+        best = parts[0];
+      }
+    }
+  });
+  // Remove common marketing suffixes
+  best = best.replace(/(Free|Official|AI|for .+|Online|App|Website|Platform|Tool|by .+)$/i, '').trim();
+  // Remove trailing punctuation
+  best = best.replace(/[\s\-:|·—•]+$/, '').trim();
+  // Remove extra spaces
+  best = best.replace(/\s{2,}/g, ' ');
+  return best;
+}
+
+// Tool name and logo URL (absolute, or '' when none was found)
+export function extractTitleAndLogo($: CheerioRoot, websiteUrl: string): { title: string; logoUrl: string } {
+  let title =
+    $('meta[property="og:title"]').attr('content')?.trim() ||
+    $('title').text().trim() ||
+    '';
+
+  // Clean and extract just the tool name from the title
+  title = extractToolName(title);
+
+  // Improved logo detection - prioritize actual logos over large images
+  let logoUrl = '';
+
+  // First, try to find specific logo meta tags
+  const logoMeta = $('meta[property="og:logo"], meta[name="logo"], meta[property="logo"]').attr('content')?.trim();
+  if (logoMeta) {
+    logoUrl = logoMeta;
+  }
+
+  // If no specific logo, try to find logo images in the HTML
+  if (!logoUrl) {
+    const logoImg = $('img[src*="logo"], img[alt*="logo"], img[class*="logo"], img[id*="logo"]').first();
+    if (logoImg.length > 0) {
+      logoUrl = logoImg.attr('src')?.trim() || '';
+    }
+  }
+
+  // If still no logo, try favicon (small icon)
+  if (!logoUrl) {
+    logoUrl = $('link[rel="icon"]').attr('href')?.trim() ||
+              $('link[rel="shortcut icon"]').attr('href')?.trim() ||
+              $('link[rel="apple-touch-icon"]').attr('href')?.trim() ||
+              '';
+  }
+
+  // Last resort: use og:image but only if it's not too large (likely a banner)
+  if (!logoUrl) {
+    const ogImage = $('meta[property="og:image"]').attr('content')?.trim();
+    if (ogImage) {
+      // Check if the image URL suggests it's a logo (smaller dimensions or logo-related filename)
+      const isLikelyLogo = ogImage.includes('logo') ||
+                          ogImage.includes('icon') ||
+                          ogImage.includes('favicon') ||
+                          ogImage.includes('brand') ||
+                          ogImage.includes('small') ||
+                          ogImage.includes('32') ||
+                          ogImage.includes('64') ||
+                          ogImage.includes('128');
+
+      if (isLikelyLogo) {
+        logoUrl = ogImage;
+      }
+    }
+  }
+
+  // Handle relative URLs
+  if (logoUrl && !logoUrl.startsWith('http')) {
+    try {
+      logoUrl = new URL(logoUrl, websiteUrl).href;
+    } catch (urlError) {
+      logger.debug('Failed to resolve logo URL', { logoUrl, error: urlError });
+      logoUrl = '';
+    }
+  }
+
+  return { title, logoUrl };
+}
+
+// Page text used as context for keyword and about generation
+export function extractContentForAnalysis($: CheerioRoot, bodyChars = 1000): string {
+  const title = $('title').text().trim();
+  const metaDescription = $('meta[name="description"]').attr('content')?.trim() || '';
+  const ogDescription = $('meta[property="og:description"]').attr('content')?.trim() || '';
+  const h1Text = $('h1').first().text().trim();
+  const h2Texts = $('h2').slice(0, 3).map((_, el) => $(el).text().trim()).get().join(' ');
+  const bodyText = $('body').text().replace(/\s+/g, ' ').trim().substring(0, bodyChars);
+
+  return `
+Title: ${title}
+Meta Description: ${metaDescription}
+OG Description: ${ogDescription}
+H1: ${h1Text}
+H2s: ${h2Texts}
+Body Text: ${bodyText}
+  `.trim();
+}
+
+// Keywords from an LLM reply: a JSON array, a bracketed list or delimited text
+export function parseKeywords(responseText: string): string[] {
+  let keywords: string[] = [];
+  try {
+    // Try to parse as JSON first
+    if (responseText.startsWith('[') && responseText.endsWith(']')) {
+      keywords = JSON.parse(responseText);
+    } else {
+      // Try to extract keywords from text response
+      const keywordMatch = responseText.match(/\[(.*)\]/);
+      if (keywordMatch) {
+        keywords = keywordMatch[1].split(',').map((k: string) => k.trim().replace(/"/g, ''));
+      } else {
+        // Fallback: split by common delimiters
+        keywords = responseText.split(/[,;]/).map((k: string) => k.trim()).filter((k: string) => k.length > 0);
+      }
+    }
+  } catch (parseError) {
+    logger.debug('Failed to parse keywords, splitting words instead', { error: parseError });
+    // Fallback: extract individual words
+    keywords = responseText.split(/\s+/).filter((word: string) => word.length > 2).slice(0, 10);
+  }
+  return cleanKeywords(keywords);
+}
+
+// Lowercase, bound to 10 keywords of at most 20 characters, padded to 5
+export function cleanKeywords(keywords: unknown[]): string[] {
+  let cleaned = keywords
+    .map(k => String(k).toLowerCase().trim())
+    .filter(k => k.length > 0 && k.length <= 20)
+    .slice(0, 10);
+
+  // Ensure we have at least 5 keywords
+  if (cleaned.length < 5) {
+    // Add some default keywords based on common AI tool patterns
+    const defaultKeywords = ['ai', 'tool', 'automation', 'productivity', 'software'];
+    cleaned = [...cleaned, ...defaultKeywords.slice(0, 5 - cleaned.length)];
+  }
+  return cleaned;
+}
+
+// Normalize a generated about text to a single unquoted line
+export function cleanAboutText(aboutText: string): string {
+  return aboutText
+    .replace(/^["']|["']$/g, '') // Remove quotes
+    .replace(/\n/g, ' ') // Replace newlines with spaces
+    .replace(/\s+/g, ' ') // Normalize spaces
+    .trim();
+}
@@ -0,0 +1,87 @@
+import { Schema, Document, Model } from "mongoose";
+import { connectToolsDB } from "../lib/db/websitedb";
+
+export type MetadataJobStatus = "queued" | "running" | "done" | "failed";
+
+export interface MetadataJobResult {
+  title: string;
+  logoUrl: string;
+  keywords: string[];
+  about: string;
+}
+
+// Interfaces
+export interface IMetadataJob extends Document {
+  // Dedupe key: normalized website URL (or title when no URL was given)
+  key: string;
+  websiteUrl?: string;
+  title?: string;
+  description?: string;
+  status: MetadataJobStatus;
+  attempts: number;
+  // Earliest time the worker may (re)claim the job; pushed back on retries
+  runAfter: Date;
+  // Set while a worker holds the job; an expired lock makes it claimable again
+  lockedUntil?: Date;
+  // Failed jobs keep what was scraped before the failure (title, logo) with
+  // empty keywords and about
+  result?: MetadataJobResult;
+  error?: string;
+  createdAt?: Date;
+  updatedAt?: Date;
+}
+
+type IMetadataJobModel = Model<IMetadataJob>;
+
+const MetadataJobSchema = new Schema<IMetadataJob, IMetadataJobModel>(
+  {
+    key: { type: String, required: true, unique: true },
+    websiteUrl: { type: String },
+    title: { type: String },
+    description: { type: String },
+    status: {
+      type: String,
+      enum: ["queued", "running", "done", "failed"],
+      default: "queued",
+    },
+    attempts: { type: Number, default: 0 },
+    runAfter: { type: Date, default: Date.now },
+    lockedUntil: { type: Date },
+    result: {
+      title: { type: String },
+      logoUrl: { type: String },
+      keywords: { type: [String], default: undefined },
+      about: { type: String },
+    },
+    error: { type: String },
+  },
+  {
+    collection: "metadatajobs",
+    timestamps: true,
+    versionKey: false,
+  }
+);
+
+// Claim query: runnable jobs, oldest first
+MetadataJobSchema.index({ status: 1, runAfter: 1 });
+
+let indexesReady: Promise<unknown> | null = null;
+
+// Function to get the job model on the tools database connection
+async function getMetadataJobModel(): Promise<IMetadataJobModel> {
+  const toolsConnection = await connectToolsDB();
+  const MetadataJob =
+    (toolsConnection.models.MetadataJob as IMetadataJobModel) ||
+    toolsConnection.model<IMetadataJob, IMetadataJobModel>("MetadataJob", MetadataJobSchema);
+
+  // autoIndex is off in production, but enqueue relies on the unique key
+  // index to dedupe, so build the indexes once per process on first use
+  indexesReady ??= MetadataJob.createIndexes().catch(error => {
+    indexesReady = null;
+    throw error;
+  });
+  await indexesReady;
+  return MetadataJob;
+}
+
+export { MetadataJobSchema, getMetadataJobModel };
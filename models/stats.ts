@@ -0,0 +1,48 @@
+import { Schema, Document, Model } from "mongoose";
+import { connectToolsDB } from "../lib/db/websitedb";
+
+// Single document holding the platform counters shown on the homepage
+export const PLATFORM_STATS_ID = "platform";
+
+// Interfaces
+export interface IPlatformStats extends Document<string> {
+  toolCount: number;
+  categoryCount: number;
+  userCount: number;
+  // Tools per category; categoryCount is the number of entries above zero
+  categories: Map<string, number>;
+  // Bumped whenever tools are added or removed; feeds catalog ETags
+  catalogVersion: number;
+  reconciledAt?: Date;
+  updatedAt?: Date;
+}
+
+type IPlatformStatsModel = Model<IPlatformStats>;
+
+const PlatformStatsSchema = new Schema<IPlatformStats, IPlatformStatsModel>(
+  {
+    _id: { type: String, default: PLATFORM_STATS_ID },
+    toolCount: { type: Number, default: 0 },
+    categoryCount: { type: Number, default: 0 },
+    userCount: { type: Number, default: 0 },
+    categories: { type: Map, of: Number, default: {} },
+    catalogVersion: { type: Number, default: 0 },
+    reconciledAt: { type: Date },
+  },
+  {
+    collection: "platformstats",
+    timestamps: { createdAt: false, updatedAt: true },
+    versionKey: false,
+  }
+);
+
+// Function to get the stats model on the tools database connection
+async function getPlatformStatsModel(): Promise<IPlatformStatsModel> {
+  const toolsConnection = await connectToolsDB();
+  return (
+    (toolsConnection.models.PlatformStats as IPlatformStatsModel) ||
+    toolsConnection.model<IPlatformStats, IPlatformStatsModel>("PlatformStats", PlatformStatsSchema)
+  );
+}
+
+export { PlatformStatsSchema, getPlatformStatsModel };
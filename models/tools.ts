@@ -1,6 +1,6 @@
 import mongoose, { Schema, model, models, Document, Model, Error as MongooseError } from "mongoose";
 import validator from "validator";
-import { isURL, isAlphanumeric, escape } from "validator";
+import { isURL, isAlphanumeric, escape, unescape } from "validator";
 import { connectToolsDB } from "../lib/db/websitedb";
 
 // Constants
@@ -15,6 +15,7 @@ export interface ITool extends Document {
   logoUrl: string;
   websiteUrl: string;
   category: string;
+  categorySlug: string;
   about: string;
   keywords: string[];
   toolType: 'browser' | 'downloadable';
@@ -30,6 +31,16 @@ interface IToolModel extends Model<ITool> {
   watchChanges(): mongoose.mongo.ChangeStream;
 }
 
+// Normalized category key: case, surrounding whitespace and space/hyphen
+// spelling differences collapse, so "All In One", "all in one" and
+// "all-in-one" share one slug that lookups can match by equality. Stored
+// categories are HTML-escaped (see sanitizeToolFields) while lookups and
+// query updates carry the raw name, so the slug is built from the unescaped
+// form: "AI &amp; ML" and "AI & ML" both map to "ai-&-ml"
+export function toCategorySlug(category: string): string {
+  return unescape(category).trim().toLowerCase().replace(/[\s-]+/g, "-").replace(/^-+|-+$/g, "");
+}
+
 // Structured logging function
 const logError = (error: unknown, context: string, metadata: Record<string, unknown> = {}) => {
   const errorDetails = {
@@ -97,6 +108,10 @@ const ToolSchema = new Schema<ITool, IToolModel>(
         message: "Category can only contain letters, numbers, spaces, or hyphens",
       },
     },
+    // Derived from category on every write; see toCategorySlug
+    categorySlug: {
+      type: String,
+    },
     about: {
       type: String,
       required: [true, "About text is required"],
@@ -162,6 +177,7 @@ const ToolSchema = new Schema<ITool, IToolModel>(
       },
     },
     autoIndex: process.env.NODE_ENV !== "production", // Disable auto-indexing in production
+    timestamps: true, // The date listing sorts on createdAt
   }
 );
 
@@ -170,6 +186,13 @@ ToolSchema.index({ title: 1 }, { unique: true }); // Ensure unique titles
 ToolSchema.index({ category: 1 }); // Optimize category-based queries
 ToolSchema.index({ keywords: 1 }); // Optimize keyword-based searches
 ToolSchema.index({ isActive: 1 }); // Optimize filtering active tools
+// Keyset pagination: each listing sort, _id tie-breaker included, is served in index order.
+// autoIndex is off in production; npm run migrate:category-slug builds these four there
+ToolSchema.index({ isActive: 1, likeCount: -1, saveCount: -1, _id: -1 });
+// Category listings: equality on slug and isActive, then the popularity order
+ToolSchema.index({ categorySlug: 1, isActive: 1, likeCount: -1, saveCount: -1, _id: -1 });
+ToolSchema.index({ isActive: 1, createdAt: -1, _id: -1 });
+ToolSchema.index({ isActive: 1, title: 1, _id: 1 });
 
 // Helper function to clean special characters
 function cleanSpecialCharacters(text: string): string {
@@ -188,17 +211,43 @@ function cleanTitleCharacters(text: string): string {
     .trim();
 }
 
+// Keep categorySlug in step with category on document writes
+ToolSchema.pre("validate", function (next) {
+  if (this.category) {
+    this.categorySlug = toCategorySlug(this.category);
+  }
+  next();
+});
+
+// ...and on query updates that change the category
+ToolSchema.pre(["findOneAndUpdate", "updateOne", "updateMany"], function (next) {
+  const update = this.getUpdate() as Record<string, unknown> | null;
+  if (!update || Array.isArray(update)) return next();
+
+  const set = (update.$set as Record<string, unknown> | undefined) ?? update;
+  if (typeof set.category === "string") {
+    set.categorySlug = toCategorySlug(set.category);
+  }
+  next();
+});
+
+// Input sanitization applied before a tool is first written. Shared by the
+// pre-save hook and bulk ingestion, whose insertMany does not run save hooks.
+export function sanitizeToolFields<T extends { title: string; category: string; about?: string }>(tool: T): T {
+  tool.title = cleanTitleCharacters(tool.title);
+  tool.category = escape(tool.category);
+
+  // Preserve about field without escaping to maintain user input
+  if (tool.about && tool.about.trim()) {
+    tool.about = tool.about.trim();
+  }
+  return tool;
+}
+
 // Pre-save hook for data sanitization
 ToolSchema.pre("save", async function (next) {
   try {
-    // Sanitize input data
-    this.title = cleanTitleCharacters(this.title);
-    this.category = escape(this.category);
-    
-    // Preserve about field without escaping to maintain user input
-    if (this.about && this.about.trim()) {
-      this.about = this.about.trim();
-    }
+    sanitizeToolFields(this);
 
     next();
   } catch (error) {
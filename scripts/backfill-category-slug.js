@@ -0,0 +1,89 @@
+const { MongoClient } = require('mongodb');
+const { unescape } = require('validator');
+require('dotenv').config({ path: '.env.local' });
+require('dotenv').config();
+
+// Backfill tools.categorySlug and createdAt for documents written before the
+// fields existed, then build the keyset listing indexes. Safe to re-run: only documents whose
+// slug is missing or stale are rewritten.
+//
+// Usage: MONGODB_URI_TOOLS=mongodb://... node scripts/backfill-category-slug.js
+
+const BATCH_SIZE = 1000;
+
+// Keyset pagination indexes; keep in sync with the ToolSchema.index calls in models/tools.ts
+const LISTING_INDEXES = [
+  { isActive: 1, likeCount: -1, saveCount: -1, _id: -1 },
+  { categorySlug: 1, isActive: 1, likeCount: -1, saveCount: -1, _id: -1 },
+  { isActive: 1, createdAt: -1, _id: -1 },
+  { isActive: 1, title: 1, _id: 1 },
+];
+
+// Keep in sync with toCategorySlug in models/tools.ts
+function toCategorySlug(category) {
+  return unescape(category).trim().toLowerCase().replace(/[\s-]+/g, '-').replace(/^-+|-+$/g, '');
+}
+
+async function backfillCategorySlug() {
+  const uri = process.env.MONGODB_URI_TOOLS;
+  if (!uri) {
+    console.error('❌ MONGODB_URI_TOOLS is not set');
+    process.exit(1);
+  }
+
+  const client = new MongoClient(uri);
+  await client.connect();
+
+  try {
+    const tools = client.db().collection('tools');
+    const cursor = tools.find({ category: { $type: 'string' } }, { projection: { category: 1, categorySlug: 1 } });
+
+    let scanned = 0;
+    let updated = 0;
+    let batch = [];
+
+    const flush = async () => {
+      if (batch.length === 0) return;
+      const result = await tools.bulkWrite(batch, { ordered: false });
+      updated += result.modifiedCount;
+      batch = [];
+      console.log(`   ${scanned} scanned, ${updated} updated`);
+    };
+
+    console.log('🔄 Backfilling categorySlug...');
+    for await (const tool of cursor) {
+      scanned++;
+      const slug = toCategorySlug(tool.category);
+      if (tool.categorySlug !== slug) {
+        batch.push({ updateOne: { filter: { _id: tool._id }, update: { $set: { categorySlug: slug } } } });
+      }
+      if (batch.length >= BATCH_SIZE) await flush();
+    }
+    await flush();
+
+    // Tools written before ToolSchema had timestamps have no createdAt, which
+    // the date listing sorts on; the ObjectId carries the insert time
+    console.log('🔄 Backfilling createdAt from _id...');
+    const dated = await tools.updateMany(
+      { createdAt: null },
+      [{ $set: { createdAt: { $toDate: '$_id' }, updatedAt: { $ifNull: ['$updatedAt', { $toDate: '$_id' }] } } }]
+    );
+    console.log(`   ${dated.modifiedCount} tools dated`);
+
+    // Production runs with autoIndex off, so create the listing indexes
+    // declared on ToolSchema here; createIndex is a no-op for existing ones
+    for (const keys of LISTING_INDEXES) {
+      console.log(`🔄 Creating ${JSON.stringify(keys)} index...`);
+      await tools.createIndex(keys);
+    }
+
+    console.log(`✅ Done: ${scanned} tools scanned, ${updated} updated`);
+  } finally {
+    await client.close();
+  }
+}
+
+backfillCategorySlug().catch(error => {
+  console.error('❌ Backfill failed:', error);
+  process.exit(1);
+});
@@ -0,0 +1,74 @@
+const fs = require('fs');
+const path = require('path');
+const { Readable } = require('stream');
+
+// Stream an NDJSON or CSV tool list into the bulk ingest mode of
+// /api/tools/upload and print progress as the server reports each chunk.
+// Rows that were not inserted are listed at the end.
+//
+// Usage: node scripts/import-tools.js tools.ndjson [http://localhost:3000]
+
+async function importTools(file, baseUrl) {
+  const contentType = path.extname(file).toLowerCase() === '.csv' ? 'text/csv' : 'application/x-ndjson';
+  const response = await fetch(`${baseUrl}/api/tools/upload`, {
+    method: 'POST',
+    headers: { 'Content-Type': contentType },
+    body: Readable.toWeb(fs.createReadStream(file)),
+    duplex: 'half',
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Upload failed: ${response.status} ${await response.text()}`);
+  }
+
+  const problems = [];
+  let summary = null;
+  let buffer = '';
+  const handle = line => {
+    if (!line.trim()) return;
+    const message = JSON.parse(line);
+    if (message.type === 'progress') {
+      problems.push(...message.rows.filter(row => row.status !== 'inserted'));
+      console.log(`📦 ${message.processed} rows: ${message.inserted} inserted, ${message.duplicates} duplicate, ${message.invalid} invalid, ${message.failed} failed`);
+    } else {
+      summary = message;
+    }
+  };
+
+  const decoder = new TextDecoder();
+  for await (const chunk of response.body) {
+    buffer += decoder.decode(chunk, { stream: true });
+    let newline = buffer.indexOf('\n');
+    while (newline !== -1) {
+      handle(buffer.slice(0, newline));
+      buffer = buffer.slice(newline + 1);
+      newline = buffer.indexOf('\n');
+    }
+  }
+  handle(buffer);
+
+  problems.slice(0, 50).forEach(row => {
+    console.log(`   row ${row.row} ${row.status}: ${row.title || ''} ${row.error || ''}`);
+  });
+  if (problems.length > 50) console.log(`   ... and ${problems.length - 50} more`);
+
+  if (!summary || summary.type === 'error') {
+    throw new Error(summary ? summary.details : 'Import stream ended without a summary');
+  }
+  console.log(`✅ Imported ${summary.inserted}/${summary.processed} rows in ${(summary.durationMs / 1000).toFixed(1)}s`);
+}
+
+if (require.main === module) {
+  const [file, baseUrl = 'http://localhost:3000'] = process.argv.slice(2);
+  if (!file) {
+    console.error('Usage: node scripts/import-tools.js <tools.ndjson|tools.csv> [baseUrl]');
+    process.exit(1);
+  }
+
+  importTools(file, baseUrl).catch(error => {
+    console.error('❌ Import failed:', error.message);
+    process.exit(1);
+  });
+}
+
+module.exports = { importTools };
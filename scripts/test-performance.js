@@ -35,7 +35,8 @@ async function testPerformance() {
     const apiCalls = networkRequests.filter(req => 
       req.url.includes('/api/tools/like') || 
       req.url.includes('/api/tools/save') || 
-      req.url.includes('/api/user/folders')
+      req.url.includes('/api/user/folders') ||
+      req.url.includes('/api/user/tool-state')
     );
     
     console.log('\n📊 Performance Test Results:');
@@ -44,6 +45,7 @@ async function testPerformance() {
     console.log(`Like API calls: ${apiCalls.filter(req => req.url.includes('/api/tools/like')).length}`);
     console.log(`Save API calls: ${apiCalls.filter(req => req.url.includes('/api/tools/save')).length}`);
     console.log(`Folders API calls: ${apiCalls.filter(req => req.url.includes('/api/user/folders')).length}`);
+    console.log(`Batched tool-state calls: ${apiCalls.filter(req => req.url.includes('/api/user/tool-state')).length}`);
     
     // Check for errors in console
     const consoleErrors = [];
@@ -117,7 +119,8 @@ async function testPerformance() {
       const afterClickApiCalls = networkRequests.filter(req => 
         req.url.includes('/api/tools/like') || 
         req.url.includes('/api/tools/save') || 
-        req.url.includes('/api/user/folders')
+        req.url.includes('/api/user/folders') ||
+        req.url.includes('/api/user/tool-state')
       );
       
       console.log(`API calls after like click: ${afterClickApiCalls.length - apiCalls.length}`);
@@ -132,7 +135,8 @@ async function testPerformance() {
       const afterSaveApiCalls = networkRequests.filter(req => 
         req.url.includes('/api/tools/like') || 
         req.url.includes('/api/tools/save') || 
-        req.url.includes('/api/user/folders')
+        req.url.includes('/api/user/folders') ||
+        req.url.includes('/api/user/tool-state')
       );
       
       console.log(`API calls after save click: ${afterSaveApiCalls.length - apiCalls.length}`);
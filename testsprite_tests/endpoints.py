@@ -0,0 +1,52 @@
+"""API requests the load generator and the query-plan audit send.
+
+Kept free of third-party imports so tools that only need the request mix
+(``query_audit.py``) do not pull in the HTTP client.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+DEFAULT_CATEGORIES = ["all in one ai tools", "image generation", "writing", "productivity"]
+CHAT_MESSAGES = [
+    "image generator",
+    "all in one ai tools",
+    "best ai tool for writing blog posts",
+    "free video editing ai",
+    "ai tools for content creation",
+]
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    build: Callable[[random.Random], Tuple[str, Optional[dict]]]
+
+
+def build_endpoints(categories: List[str]) -> Dict[str, Endpoint]:
+    def tools(rng):
+        return f"/api/tools?page={rng.randint(1, 5)}&limit=50", None
+
+    def category(rng):
+        name = quote(rng.choice(categories))
+        return f"/api/tools/category/{name}?page={rng.randint(1, 3)}&limit=25", None
+
+    def categories_page(rng):
+        return f"/api/categories?page={rng.randint(1, 5)}&limit=20", None
+
+    def stats(_rng):
+        return "/api/stats", None
+
+    def ai_agent(rng):
+        return "/api/ai-agent", {"message": rng.choice(CHAT_MESSAGES)}
+
+    return {
+        "tools": Endpoint("tools", "GET", tools),
+        "category": Endpoint("category", "GET", category),
+        "categories": Endpoint("categories", "GET", categories_page),
+        "stats": Endpoint("stats", "GET", stats),
+        "ai-agent": Endpoint("ai-agent", "POST", ai_agent),
+    }
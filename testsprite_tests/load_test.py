@@ -0,0 +1,347 @@
+"""asyncio HTTP load generator for the catalog and chatbot APIs.
+
+Two modes:
+
+    open   -- constant arrival rate. Requests are issued on schedule whether
+              or not earlier ones have finished, so queueing in the server
+              shows up as latency instead of silently lowering the load.
+              ``--rate 50,100,200,400`` steps through several rates and
+              reports the first one the server cannot keep up with.
+    closed -- ``--users`` virtual users, each sending its next request when
+              the previous one completes (plus optional think time).
+
+Every request goes through one pooled keep-alive connector. Latencies are
+recorded in a log-linear histogram (3 significant digits, HdrHistogram
+style). The report has p50/p95/p99/p99.9 and a per-second throughput and
+error-rate time series.
+
+Usage:
+    python testsprite_tests/load_test.py open --rate 50,100,200 --duration 30
+    python testsprite_tests/load_test.py closed --users 200 --duration 60 \\
+        --mix tools=4,category=3,categories=2,stats=1,ai-agent=0
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from endpoints import DEFAULT_CATEGORIES, build_endpoints
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+# /api/ai-agent is limited to 10 requests/minute per client IP, so it is off
+# unless asked for (and mostly measures the limiter when it is on).
+DEFAULT_MIX = "tools=4,category=3,categories=2,stats=1,ai-agent=0"
+# apiResponseTime in production-test-config.json
+DEFAULT_SLO_MS = 1000.0
+PERCENTILES = (50.0, 95.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram with a fixed number of significant digits.
+
+    Values are stored in microseconds, bucketed by decade and mantissa, so
+    the relative error of any reported percentile is below 10**(1 - digits) while
+    memory stays proportional to the number of distinct buckets hit.
+    """
+
+    def __init__(self, digits: int = 3):
+        self.digits = digits
+        self.counts: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.total = 0
+        self.max = 0.0
+
+    def _bucket(self, value_us: float) -> Tuple[int, int]:
+        if value_us < 1:
+            return (0, 0)
+        exponent = int(math.floor(math.log10(value_us))) - (self.digits - 1)
+        return (exponent, int(value_us // 10 ** exponent))
+
+    def record(self, value_ms: float) -> None:
+        value_us = max(value_ms, 0.0) * 1000
+        self.counts[self._bucket(value_us)] += 1
+        self.total += 1
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Upper edge of the bucket holding the ``pct`` percentile, in ms."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(self.total * pct / 100))
+        seen = 0
+        for (exponent, mantissa) in sorted(self.counts):
+            seen += self.counts[(exponent, mantissa)]
+            if seen >= rank:
+                return min((mantissa + 1) * 10 ** exponent / 1000, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        stats = {f"p{p:g}": round(self.percentile(p), 2) for p in PERCENTILES}
+        stats["max"] = round(self.max, 2)
+        stats["count"] = self.total
+        return stats
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """``name=weight,...`` to weights, dropping zero weights (argparse type)."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        try:
+            mix[name.strip()] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for {name.strip()!r}: {weight!r}")
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise argparse.ArgumentTypeError(f"mix {text!r} has no endpoint with a positive weight")
+    return mix
+
+
+@dataclass
+class Window:
+    requests: int = 0
+    errors: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class Recorder:
+    """Aggregates results per endpoint and per one-second window."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.per_endpoint: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.overall = LatencyHistogram()
+        self.windows: Dict[int, Window] = defaultdict(Window)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.dropped = 0
+
+    def record(self, endpoint: str, latency_ms: float, error: Optional[str]) -> None:
+        window = self.windows[int(time.monotonic() - self.started)]
+        window.requests += 1
+        window.histogram.record(latency_ms)
+        self.overall.record(latency_ms)
+        self.per_endpoint[endpoint].record(latency_ms)
+        if error:
+            window.errors += 1
+            self.errors[error] += 1
+
+    def report(self) -> dict:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total_errors = sum(self.errors.values())
+        return {
+            "requests": self.overall.total,
+            "durationSec": round(elapsed, 2),
+            "throughputRps": round(self.overall.total / elapsed, 2),
+            "errorRate": round(total_errors / self.overall.total, 4) if self.overall.total else 0.0,
+            "dropped": self.dropped,
+            "latencyMs": self.overall.summary(),
+            "endpoints": {name: h.summary() for name, h in sorted(self.per_endpoint.items())},
+            "errors": dict(self.errors),
+            "timeSeries": [
+                {
+                    "second": second,
+                    "rps": window.requests,
+                    "errorRate": round(window.errors / window.requests, 4) if window.requests else 0.0,
+                    "p50": round(window.histogram.percentile(50), 2),
+                    "p99": round(window.histogram.percentile(99), 2),
+                }
+                for second, window in sorted(self.windows.items())
+            ],
+        }
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, mix: Dict[str, float], categories: List[str],
+                 connections: int, timeout: float, seed: Optional[int] = None):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = build_endpoints(categories)
+        unknown = set(mix) - set(self.endpoints)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.connections = connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.rng = random.Random(seed)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.connections, keepalive_timeout=60,
+                                         enable_cleanup_closed=True)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def fetch_categories(self) -> List[str]:
+        """Category names from the live catalog, for realistic category requests."""
+        async with self.session.get(f"{self.base_url}/api/categories?page=1&limit=100") as resp:
+            data = await resp.json()
+        return [c["name"] for c in data.get("categories", [])]
+
+    async def one_request(self, recorder: Recorder, due: Optional[float] = None) -> None:
+        """Send one request from the mix and record its latency.
+
+        Open-loop runs pass the ``time.monotonic()`` the request was scheduled
+        for, so time spent waiting behind a stalled client or event loop counts
+        as latency (no coordinated omission); otherwise it is timed from now.
+        """
+        endpoint = self.endpoints[self.rng.choices(self.names, self.weights)[0]]
+        path, body = endpoint.build(self.rng)
+        error = None
+        started = time.monotonic() if due is None else due
+        try:
+            async with self.session.request(endpoint.method, self.base_url + path, json=body) as resp:
+                await resp.read()
+                if resp.status >= 400:
+                    error = f"HTTP {resp.status}"
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except aiohttp.ClientError as exc:
+            error = type(exc).__name__
+        recorder.record(endpoint.name, (time.monotonic() - started) * 1000, error)
+
+    async def run_open(self, rate: float, duration: float, max_inflight: int) -> dict:
+        """Issue ``rate`` requests/second on a fixed schedule for ``duration`` seconds."""
+        recorder = Recorder()
+        inflight: set = set()
+        interval = 1.0 / rate
+        start = time.monotonic()
+        sent = 0
+        while True:
+            due = start + sent * interval
+            if due - start >= duration:
+                break
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sent += 1
+            if len(inflight) >= max_inflight:
+                # The client itself is saturated; count it instead of queueing.
+                recorder.dropped += 1
+                continue
+            task = asyncio.ensure_future(self.one_request(recorder, due))
+            inflight.add(task)
+            task.add_done_callback(inflight.discard)
+        if inflight:
+            await asyncio.gather(*inflight, return_exceptions=True)
+        report = recorder.report()
+        report["offeredRps"] = rate
+        return report
+
+    async def run_closed(self, users: int, duration: float, think_time: float) -> dict:
+        """``users`` concurrent loops of request, optional think time, repeat."""
+        recorder = Recorder()
+        deadline = time.monotonic() + duration
+
+        async def user() -> None:
+            while time.monotonic() < deadline:
+                await self.one_request(recorder)
+                if think_time:
+                    await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+        await asyncio.gather(*(user() for _ in range(users)))
+        report = recorder.report()
+        report["users"] = users
+        return report
+
+
+def is_saturated(report: dict, slo_ms: float) -> bool:
+    """The server fell behind the offered rate or blew through the SLO at p99."""
+    offered = report.get("offeredRps")
+    behind = offered is not None and report["throughputRps"] < 0.95 * offered
+    return (behind or report["latencyMs"]["p99"] > slo_ms
+            or report["errorRate"] > 0.01 or report["dropped"] > 0)
+
+
+def print_report(label: str, report: dict) -> None:
+    lat = report["latencyMs"]
+    print(f"{label}: {report['requests']} req, {report['throughputRps']} rps, "
+          f"errors {report['errorRate']:.2%}, p50 {lat['p50']}ms p95 {lat['p95']}ms "
+          f"p99 {lat['p99']}ms p99.9 {lat['p99.9']}ms max {lat['max']}ms", flush=True)
+    for name, stats in report["endpoints"].items():
+        print(f"    {name:<11} n={stats['count']:<7} p50 {stats['p50']}ms p99 {stats['p99']}ms")
+
+
+async def run(args: argparse.Namespace) -> dict:
+    mix = args.mix
+    categories = args.category or DEFAULT_CATEGORIES
+    async with LoadGenerator(args.base_url, mix, categories, args.connections,
+                             args.timeout, args.seed) as generator:
+        if not args.category and "category" in mix:
+            try:
+                categories = await generator.fetch_categories() or categories
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                pass
+            generator.endpoints = build_endpoints(categories)
+
+        if args.mode == "closed":
+            report = await generator.run_closed(args.users, args.duration, args.think_time)
+            print_report(f"closed users={args.users}", report)
+            return {"mode": "closed", "runs": [report]}
+
+        runs = []
+        saturation = None
+        for rate in args.rate:
+            report = await generator.run_open(rate, args.duration, args.max_inflight)
+            print_report(f"open rate={rate:g}/s", report)
+            runs.append(report)
+            if is_saturated(report, args.slo_ms):
+                saturation = rate
+                print(f"saturated at {rate:g} req/s (p99 SLO {args.slo_ms:g}ms)")
+                break
+        return {"mode": "open", "runs": runs, "saturationRps": saturation}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("mode", choices=["open", "closed"])
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Weighted endpoint mix, e.g. tools=4,stats=1,ai-agent=1")
+    parser.add_argument("--category", action="append",
+                        help="Category names for the category route (default: fetched live)")
+    parser.add_argument("--rate", type=lambda s: [float(r) for r in s.split(",")], default=[50.0],
+                        help="Open loop: requests/second, comma-separated to step up")
+    parser.add_argument("--max-inflight", type=int, default=5000,
+                        help="Open loop: drop (and count) arrivals beyond this many in flight")
+    parser.add_argument("--users", type=int, default=50, help="Closed loop: virtual users")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="Closed loop: mean think time between requests, seconds")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per run (per rate step)")
+    parser.add_argument("--connections", type=int, default=256, help="Keep-alive connection pool size")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout, seconds")
+    parser.add_argument("--slo-ms", type=float, default=DEFAULT_SLO_MS,
+                        help="p99 latency above which a rate step counts as saturated")
+    parser.add_argument("--seed", type=int, help="Random seed for a reproducible request sequence")
+    parser.add_argument("--output", type=Path, help="Write the full report as JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""Local stand-in for the Groq (OpenAI-compatible) chat completions API.
+
+Point the app at it with
+
+    GROQ_API_URL=http://127.0.0.1:8787/openai/v1/chat/completions
+    GROQ_CHATBOT_API_KEY=mock GROQ_FORM_API_KEY=mock
+
+and the chatbot and admin metadata routes exercise their real Groq code
+paths with no network. Completions are canned and deterministic, chosen
+by recognising the system prompt of each route (search intent JSON,
+chatbot answer, keyword list, about text, batched metadata array). Latency, token streaming rate
+and 429/5xx faults are configurable, and every request is counted.
+
+    python testsprite_tests/mock_groq.py --port 8787 --latency lognormal:400:0.5 \\
+        --tokens-per-sec 250 --fail-429 0.05
+
+Control endpoints:
+    GET  /__stats    request counts by kind, status and model
+    POST /__reset    zero the counters
+    POST /__config   change latency/tokens_per_sec/fail_429/fail_5xx at runtime
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+COMPLETIONS_PATHS = ("/openai/v1/chat/completions", "/v1/chat/completions")
+DEFAULT_PORT = 8787
+
+_SPECIFIC_TOOL = re.compile(r"(?:tell me about|what is|show me|i want|find) (.+)", re.I)
+_STOPWORDS = {"the", "for", "and", "with", "best", "free", "tool", "tools", "app", "some", "that"}
+
+
+class LatencyModel:
+    """Injectable latency distribution, parsed from a spec string (milliseconds).
+
+    ``fixed:200``, ``uniform:100:400``, ``normal:300:50``, ``exp:250`` (mean)
+    and ``lognormal:400:0.5`` (median, sigma) are supported.
+    """
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        self.spec = spec
+        self.rng = rng or random.Random()
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in {"fixed", "uniform", "normal", "exp", "lognormal"}:
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample_ms(self) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0] if p else 0.0
+        elif self.kind == "uniform":
+            value = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = self.rng.gauss(p[0], p[1])
+        elif self.kind == "exp":
+            value = self.rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        else:
+            value = p[0] * self.rng.lognormvariate(0, p[1])
+        return max(value, 0.0)
+
+
+def classify(messages: List[Dict[str, str]]) -> str:
+    """Which route sent the prompt, judged by its system message."""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    if system.startswith("Extract search intent"):
+        return "search_intent"
+    if system.startswith("Generate a concise response about AI tools"):
+        return "chat_answer"
+    if "keyword extractor" in system:
+        return "keywords"
+    if "tool description generator" in system:
+        return "short_about"
+    if "tool summary generator" in system:
+        return "about"
+    if system.startswith("You write catalog metadata"):
+        return "metadata_batch"
+    return "generic"
+
+
+def _user_text(messages: List[Dict[str, str]]) -> str:
+    return next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in re.findall(r"[a-z0-9]+", text.lower()) if len(w) > 2 and w not in _STOPWORDS]
+
+
+def canned_completion(kind: str, messages: List[Dict[str, str]]) -> str:
+    """Deterministic completion text for a prompt of the given kind."""
+    user = _user_text(messages)
+    if kind == "search_intent":
+        lower = user.lower()
+        if "all in one" in lower or "all-in-one" in lower:
+            intent = {"intent": "category_search", "keywords": ["all", "in", "one"], "isSpecificTool": False}
+        elif _SPECIFIC_TOOL.search(user):
+            name = _SPECIFIC_TOOL.search(user).group(1).strip()
+            intent = {"intent": "specific_tool", "keywords": [name], "isSpecificTool": True}
+        else:
+            intent = {"intent": "general_search", "keywords": _words(user)[:5], "isSpecificTool": False}
+        return json.dumps(intent)
+    if kind == "chat_answer":
+        system = messages[0].get("content", "")
+        tools = re.findall(r"(?:^|Tools: )\d+\. (.+?) - ", system, re.M)
+        if not tools:
+            return "I couldn't find a matching tool for that yet, but new tools are added regularly."
+        listing = ", ".join(t.strip() for t in tools[:5])
+        return f"Here are the top picks for your request: {listing}. Each is ranked by likes and saves."
+    if kind == "keywords":
+        words = ["ai"] + [w for w in dict.fromkeys(_words(user)) if w != "ai"]
+        return json.dumps((words + ["automation", "productivity", "software", "assistant"])[:8])
+    if kind == "short_about":
+        title = re.search(r"Tool: (.+)", user)
+        name = title.group(1).strip() if title else "This tool"
+        return (f"{name} uses AI to automate repetitive work and deliver polished results in minutes. "
+                f"Save time, stay consistent, and focus on what matters most.")
+    if kind == "metadata_batch":
+        # One entry per "### Tool N" section of the batched metadata prompt
+        entries = []
+        for index, section in enumerate(re.split(r"^### Tool \d+\s*$", user, flags=re.M)[1:], start=1):
+            title = re.search(r"Tool: (.+)", section)
+            name = title.group(1).strip() if title else "This tool"
+            text = re.sub(r"^(?:Tool|Description): ", "", section, flags=re.M)
+            words = ["ai"] + [w for w in dict.fromkeys(_words(text)) if w != "ai"]
+            entries.append({
+                "tool": index,
+                "keywords": (words + ["automation", "productivity", "software", "assistant"])[:8],
+                "about": f"{name} uses AI to automate repetitive work and deliver polished results in minutes.",
+            })
+        return json.dumps(entries)
+    if kind == "about":
+        return (f"{user.strip()} It combines a simple interface with AI models tuned for the task, "
+                f"so teams get reliable output without setup. Results can be exported or shared instantly.")
+    digest = hashlib.sha1(user.encode("utf-8")).hexdigest()[:8]
+    return f"Mock completion {digest}."
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\S+\s*", text) or [text]
+
+
+class MockGroqServer:
+    """aiohttp application serving canned chat completions."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, latency: str = "fixed:0",
+                 tokens_per_sec: float = 0.0, fail_429: float = 0.0, fail_5xx: float = 0.0,
+                 seed: int = 0):
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.tokens_per_sec = tokens_per_sec
+        self.fail_429 = fail_429
+        self.fail_5xx = fail_5xx
+        self.counts: Counter = Counter()
+        self.started = time.time()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        for path in COMPLETIONS_PATHS:
+            self.app.router.add_post(path, self.handle_completion)
+        self.app.router.add_get("/__stats", self.handle_stats)
+        self.app.router.add_post("/__reset", self.handle_reset)
+        self.app.router.add_post("/__config", self.handle_config)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{COMPLETIONS_PATHS[0]}"
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockGroqServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        def by(prefix: str) -> Dict[str, int]:
+            return {key.split(":", 1)[1]: count for key, count in self.counts.items()
+                    if key.startswith(prefix + ":")}
+
+        return {
+            "total": self.counts["total"],
+            "byKind": by("kind"),
+            "byStatus": by("status"),
+            "byModel": by("model"),
+            "completionTokens": self.counts["completion_tokens"],
+            "uptimeSec": round(time.time() - self.started, 1),
+        }
+
+    def _fault(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        roll = self.rng.random()
+        if roll < self.fail_429:
+            return 429, {"retry-after": "1"}
+        if roll < self.fail_429 + self.fail_5xx:
+            return self.rng.choice((500, 502, 503)), {}
+        return None
+
+    # -- handlers ---------------------------------------------------------
+
+    async def handle_completion(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        messages = body.get("messages") or []
+        kind = classify(messages)
+        model = body.get("model", "unknown")
+        self.counts.update(["total", f"kind:{kind}", f"model:{model}"])
+
+        await asyncio.sleep(self.latency.sample_ms() / 1000)
+
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return self._error(401, "Invalid API Key", "invalid_api_key")
+        fault = self._fault()
+        if fault:
+            status, headers = fault
+            message = "Rate limit reached" if status == 429 else "Upstream unavailable"
+            return self._error(status, message, "rate_limit_exceeded" if status == 429 else "server_error",
+                               headers)
+
+        text = canned_completion(kind, messages)
+        tokens = _tokens(text)
+        self.counts.update({"status:200": 1, "completion_tokens": len(tokens)})
+        completion_id = f"chatcmpl-mock-{self.counts['total']}"
+
+        if body.get("stream"):
+            return await self._stream(request, completion_id, model, tokens)
+
+        await self._pace(len(tokens))
+        prompt_tokens = sum(len(_tokens(m.get("content", ""))) for m in messages)
+        return web.json_response({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                      "total_tokens": prompt_tokens + len(tokens)},
+        })
+
+    async def _pace(self, token_count: int) -> None:
+        if self.tokens_per_sec > 0:
+            await asyncio.sleep(token_count / self.tokens_per_sec)
+
+    async def _stream(self, request: web.Request, completion_id: str, model: str,
+                      tokens: List[str]) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream",
+                                               "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        def chunk(delta: Dict[str, str], finish: Optional[str] = None) -> bytes:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "model": model,
+                       "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+        await response.write(chunk({"role": "assistant"}))
+        for token in tokens:
+            await self._pace(1)
+            await response.write(chunk({"content": token}))
+        await response.write(chunk({}, "stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def _error(self, status: int, message: str, code: str,
+               headers: Optional[Dict[str, str]] = None) -> web.Response:
+        self.counts[f"status:{status}"] += 1
+        return web.json_response({"error": {"message": message, "type": code, "code": code}},
+                                 status=status, headers=headers)
+
+    async def handle_stats(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def handle_reset(self, _request: web.Request) -> web.Response:
+        self.counts.clear()
+        self.started = time.time()
+        return web.json_response({"ok": True})
+
+    async def handle_config(self, request: web.Request) -> web.Response:
+        changes = await request.json()
+        try:
+            if "latency" in changes:
+                self.latency = LatencyModel(changes["latency"], self.rng)
+            for name in ("tokens_per_sec", "fail_429", "fail_5xx"):
+                if name in changes:
+                    setattr(self, name, float(changes[name]))
+        except (TypeError, ValueError) as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        return web.json_response({"latency": self.latency.spec, "tokens_per_sec": self.tokens_per_sec,
+                                  "fail_429": self.fail_429, "fail_5xx": self.fail_5xx})
+
+
+def add_server_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    """Mock server options, shared with the suite runner's ``--mock-groq``."""
+    parser.add_argument(f"--{prefix}latency", default="fixed:0",
+                        help="Latency distribution: fixed:MS, uniform:LO:HI, normal:MEAN:SD, "
+                             "exp:MEAN, lognormal:MEDIAN:SIGMA")
+    parser.add_argument(f"--{prefix}tokens-per-sec", type=float, default=0.0,
+                        help="Completion token rate; 0 returns the whole completion at once")
+    parser.add_argument(f"--{prefix}fail-429", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument(f"--{prefix}fail-5xx", type=float, default=0.0, help="Fraction of 5xx responses")
+    parser.add_argument(f"--{prefix}seed", type=int, default=0, help="Seed for latency and fault rolls")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockGroqServer(args.host, args.port, args.latency, args.tokens_per_sec,
+                            args.fail_429, args.fail_5xx, args.seed)
+    print(f"Mock Groq listening on {server.url}", flush=True)
+    web.run_app(server.app, host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
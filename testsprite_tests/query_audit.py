@@ -0,0 +1,279 @@
+"""Query-plan audit for the Mongo queries the API routes issue.
+
+Turns on the database profiler (level 2) on a seeded tools database,
+optionally drives the API routes to generate traffic, and collects every
+find / aggregate / count / distinct the app sent. Each distinct query shape
+is replayed with ``explain`` at ``executionStats`` verbosity and flagged for:
+
+    COLLSCAN       the winning plan scans the whole collection
+    SORT           a blocking in-memory sort instead of an index-ordered scan
+    ratio          docsExamined / nReturned above ``--max-ratio``
+    regex          a case-insensitive or unanchored regex, which cannot use
+                   the ``category`` / ``keywords`` indexes in models/tools.ts
+
+Seed first with ``seed_catalog.py`` so the plans reflect catalog scale.
+
+Usage:
+    python testsprite_tests/seed_catalog.py --preset 100k --drop
+    python testsprite_tests/query_audit.py --drive http://localhost:3000 \\
+        --json tmp/query_audit.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from bson import Regex
+from bson.json_util import dumps
+from pymongo import MongoClient
+from pymongo.errors import OperationFailure
+
+from endpoints import DEFAULT_CATEGORIES, build_endpoints
+from seed_catalog import DEFAULT_URI
+
+EXPLAINABLE = ("find", "aggregate", "count", "distinct")
+# Session and routing fields the profiler records but explain rejects.
+STRIP_FIELDS = {
+    "lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "signature",
+    "apiVersion", "apiStrict", "apiDeprecationErrors", "readConcern", "writeConcern",
+    "batchSize", "singleBatch", "maxTimeMS",
+}
+DEFAULT_MAX_RATIO = 10.0
+
+
+@dataclass
+class Finding:
+    shape: str
+    collection: str
+    command: str
+    occurrences: int
+    stages: List[str]
+    docs_examined: int
+    keys_examined: int
+    n_returned: int
+    millis: int
+    flags: List[str] = field(default_factory=list)
+    sample: str = ""
+
+    @property
+    def ratio(self) -> float:
+        return self.docs_examined / max(self.n_returned, 1)
+
+
+def _shape(value: Any) -> Any:
+    """Replace literals with placeholders so queries differing only in values group together."""
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shape(v) for v in value] if any(isinstance(v, dict) for v in value) else "?"
+    if isinstance(value, Regex):
+        return "/?/i" if value.flags & re.IGNORECASE else "/?/"
+    return "?"
+
+
+def shape_key(command: Dict[str, Any]) -> str:
+    name = next(iter(command))
+    return dumps({name: command[name], **_shape({k: v for k, v in command.items() if k != name})},
+                 sort_keys=True)
+
+
+def clean_command(command: Dict[str, Any]) -> Dict[str, Any]:
+    cleaned = {k: v for k, v in command.items() if k not in STRIP_FIELDS}
+    if "aggregate" in cleaned:
+        cleaned["cursor"] = {}
+    return cleaned
+
+
+def profiled_commands(db, since: float) -> Iterator[Dict[str, Any]]:
+    """Explainable commands from ``system.profile`` recorded after ``since``."""
+    started = datetime.fromtimestamp(since, tz=timezone.utc)
+    query = {"ts": {"$gte": started}, "ns": {"$not": {"$regex": r"\.system\."}}}
+    for entry in db["system.profile"].find(query).sort("ts", 1):
+        command = entry.get("command") or {}
+        if command and next(iter(command)) in EXPLAINABLE:
+            yield command
+
+
+def walk_plan(stage: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Every stage in an ``executionStages`` tree, root first."""
+    yield stage
+    for child in stage.get("inputStages", []) + [stage[k] for k in ("inputStage", "innerStage", "outerStage")
+                                                  if k in stage]:
+        yield from walk_plan(child)
+
+
+def _execution_stats(explain: Dict[str, Any]) -> Dict[str, Any]:
+    if "executionStats" in explain:
+        return explain["executionStats"]
+    # Aggregations nest the cursor stage's explain under "stages" or "shards".
+    for stage in explain.get("stages", []):
+        cursor = stage.get("$cursor")
+        if cursor and "executionStats" in cursor:
+            return cursor["executionStats"]
+    return {}
+
+
+def _regex_flags(value: Any) -> List[str]:
+    """Index-defeating regexes anywhere in a filter or pipeline."""
+    if isinstance(value, dict):
+        flags = []
+        if isinstance(value.get("$regex"), str):
+            value = {**value, "$regex": Regex(value["$regex"], value.get("$options", ""))}
+        for item in value.values():
+            flags.extend(_regex_flags(item))
+        return flags
+    if isinstance(value, list):
+        return [flag for item in value for flag in _regex_flags(item)]
+    if isinstance(value, Regex):
+        flags = []
+        if value.flags & re.IGNORECASE:
+            flags.append("regex:case-insensitive")
+        if not value.pattern.startswith("^"):
+            flags.append("regex:unanchored")
+        return flags
+    return []
+
+
+def analyze(db, command: Dict[str, Any], occurrences: int, max_ratio: float) -> Finding:
+    name = next(iter(command))
+    explain = db.command({"explain": command, "verbosity": "executionStats"})
+    stats = _execution_stats(explain)
+    stages = [s.get("stage", "?") for s in walk_plan(stats.get("executionStages", {}))]
+    if not stages and "queryPlanner" in explain:
+        stages = [s.get("stage", "?") for s in walk_plan(explain["queryPlanner"].get("winningPlan", {}))]
+
+    finding = Finding(
+        shape=shape_key(command),
+        collection=str(command[name]),
+        command=name,
+        occurrences=occurrences,
+        stages=stages,
+        docs_examined=stats.get("totalDocsExamined", 0),
+        keys_examined=stats.get("totalKeysExamined", 0),
+        n_returned=stats.get("nReturned", 0),
+        millis=stats.get("executionTimeMillis", 0),
+        sample=dumps(command)[:500],
+    )
+    if "COLLSCAN" in stages:
+        finding.flags.append("COLLSCAN")
+    if "SORT" in stages:
+        finding.flags.append("SORT")
+    if finding.docs_examined and finding.ratio > max_ratio:
+        finding.flags.append(f"ratio:{finding.ratio:.0f}")
+    finding.flags.extend(sorted(set(_regex_flags(command.get("filter") or command.get("query")
+                                                 or command.get("pipeline")))))
+    return finding
+
+
+def drive(base_url: str, samples: int, include_ai_agent: bool, seed: int = 1) -> int:
+    """Hit every load-test endpoint ``samples`` times so the profiler sees each route."""
+    rng = random.Random(seed)
+    endpoints = build_endpoints(DEFAULT_CATEGORIES)
+    if not include_ai_agent:
+        endpoints.pop("ai-agent")
+    sent = 0
+    for endpoint in endpoints.values():
+        for _ in range(samples):
+            path, body = endpoint.build(rng)
+            data = json.dumps(body).encode() if body is not None else None
+            request = urllib.request.Request(base_url.rstrip("/") + path, data=data, method=endpoint.method,
+                                             headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    response.read()
+            except urllib.error.HTTPError as exc:
+                print(f"  {endpoint.method} {path}: HTTP {exc.code}", file=sys.stderr)
+            except urllib.error.URLError as exc:
+                print(f"  {endpoint.method} {path}: {exc.reason}", file=sys.stderr)
+            sent += 1
+    return sent
+
+
+def audit(db, since: float, max_ratio: float) -> List[Finding]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for command in profiled_commands(db, since):
+        command = clean_command(command)
+        grouped.setdefault(shape_key(command), []).append(command)
+
+    findings = []
+    for commands in grouped.values():
+        try:
+            findings.append(analyze(db, commands[0], len(commands), max_ratio))
+        except OperationFailure as exc:
+            print(f"  explain failed: {exc} for {dumps(commands[0])[:200]}", file=sys.stderr)
+    return sorted(findings, key=lambda f: (-len(f.flags), -f.docs_examined))
+
+
+def print_report(findings: List[Finding]) -> None:
+    flagged = [f for f in findings if f.flags]
+    print(f"\n{len(findings)} query shapes, {len(flagged)} flagged\n")
+    for f in findings:
+        marker = "!!" if f.flags else "ok"
+        print(f"[{marker}] {f.command} {f.collection} x{f.occurrences}  "
+              f"examined {f.docs_examined} docs / {f.keys_examined} keys -> {f.n_returned} "
+              f"in {f.millis}ms")
+        print(f"     plan: {' <- '.join(f.stages) or '-'}")
+        if f.flags:
+            print(f"     flags: {', '.join(f.flags)}")
+        print(f"     {f.sample[:200]}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--uri", default=os.environ.get("MONGODB_URI_TOOLS", DEFAULT_URI),
+                        help="Tools database URI (default: $MONGODB_URI_TOOLS)")
+    parser.add_argument("--drive", metavar="BASE_URL",
+                        help="Exercise the API routes at BASE_URL while profiling")
+    parser.add_argument("--samples", type=int, default=3, help="Requests per route when driving")
+    parser.add_argument("--include-ai-agent", action="store_true",
+                        help="Also drive /api/ai-agent (needs a Groq key or --mock-groq backend)")
+    parser.add_argument("--wait", type=float, default=0,
+                        help="Seconds to keep profiling for manual or external traffic")
+    parser.add_argument("--since", type=float,
+                        help="Audit existing profile entries from this UNIX time instead of profiling now")
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help="Flag queries examining more than this many docs per returned doc")
+    parser.add_argument("--json", type=Path, help="Write findings as JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    client = MongoClient(args.uri)
+    db = client.get_default_database(default="aifindertools")
+
+    since = args.since
+    if since is None:
+        since = time.time()
+        previous = db.command({"profile": 2})
+        try:
+            if args.drive:
+                print(f"Driving routes at {args.drive}...")
+                print(f"Sent {drive(args.drive, args.samples, args.include_ai_agent)} requests")
+            if args.wait:
+                print(f"Profiling for {args.wait:.0f}s...")
+                time.sleep(args.wait)
+        finally:
+            db.command({"profile": previous.get("was", 0)})
+
+    findings = audit(db, since, args.max_ratio)
+    print_report(findings)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps([{**asdict(f), "ratio": round(f.ratio, 1)} for f in findings],
+                                        indent=2), encoding="utf-8")
+    return 1 if any("COLLSCAN" in f.flags or "SORT" in f.flags for f in findings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""Bulk synthetic catalog seeder for performance testing.
+
+Generates tool documents shaped like ``ToolSchema`` in ``models/tools.ts``
+and streams them into MongoDB with unordered bulk inserts. The data is
+reproducible for a given ``--seed`` and skewed like a real catalog:
+category sizes and like/save counts follow Zipf distributions, so a few
+categories and tools dominate while the long tail stays thin.
+
+Presets:
+    1k    1,000 tools     100 categories
+    10k   10,000 tools    1,000 categories
+    100k  100,000 tools   1,200 categories
+    1m    1,000,000 tools 2,000 categories
+
+Usage:
+    MONGODB_URI_TOOLS=mongodb://localhost:27017/aifindertools \\
+        python testsprite_tests/seed_catalog.py --preset 100k --drop
+"""
+
+import argparse
+import bisect
+import html
+import itertools
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import BulkWriteError
+
+PRESETS = {
+    "1k": (1_000, 100),
+    "10k": (10_000, 1_000),
+    "100k": (100_000, 1_200),
+    "1m": (1_000_000, 2_000),
+}
+DEFAULT_URI = "mongodb://localhost:27017/aifindertools"
+COLLECTION = "tools"  # mongoose pluralises the "Tool" model
+BATCH_SIZE = 2_000
+ACTIVE_RATIO = 0.97
+DOWNLOADABLE_RATIO = 0.15
+TOP_LIKES = 50_000
+POPULARITY_SKEW = 0.9
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Categories the UI, TC scripts and load tests reference by name.
+FIXED_CATEGORIES = [
+    "all in one ai tools",
+    "image generation",
+    "writing",
+    "productivity",
+    "video editing",
+    "code assistant",
+]
+DOMAINS = [
+    "image", "video", "audio", "music", "writing", "code", "design", "marketing", "sales", "seo",
+    "email", "chat", "research", "education", "finance", "legal", "health", "hr", "resume", "logo",
+    "avatar", "voice", "translation", "presentation", "spreadsheet", "data", "analytics", "social",
+    "ecommerce", "support", "meeting", "note", "podcast", "3d", "animation", "photo", "story", "game",
+]
+QUALIFIERS = [
+    "generation", "editing", "assistant", "automation", "analysis", "enhancement", "creation",
+    "optimization", "management", "search", "summarization", "detection", "planning", "tutoring",
+]
+FEATURES = [
+    "templates", "real-time collaboration", "one-click export", "brand kits", "api access",
+    "batch processing", "multilingual output", "custom models", "analytics dashboards",
+    "browser extension", "team workspaces", "version history", "smart suggestions",
+]
+NAME_PREFIXES = [
+    "Nova", "Pixel", "Quill", "Echo", "Flux", "Vector", "Lumen", "Orbit", "Spark", "Atlas",
+    "Muse", "Cortex", "Prism", "Tango", "Zen", "Sonic", "Aura", "Bolt", "Cipher", "Drift",
+]
+NAME_SUFFIXES = [
+    "AI", "Studio", "Labs", "Pilot", "Forge", "Mate", "Genie", "Craft", "Flow", "Wise", "Hub", "Bot",
+]
+
+
+def category_slug(category: str) -> str:
+    """Mirror of ``toCategorySlug`` in ``models/tools.ts``, which unescapes first."""
+    return re.sub(r"[\s-]+", "-", html.unescape(category).strip().lower()).strip("-")
+
+
+class Zipf:
+    """Sample ranks 1..n with P(k) proportional to 1/k**s."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.rng = rng
+        weights = [1 / (k ** s) for k in range(1, n + 1)]
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1]) + 1
+
+
+def make_categories(count: int, rng: random.Random) -> List[str]:
+    """``count`` distinct category names, the well-known ones first."""
+    names = list(FIXED_CATEGORIES[:count])
+    seen = set(names)
+    combos = [f"{d} {q}" for d in DOMAINS for q in QUALIFIERS]
+    rng.shuffle(combos)
+    for name in itertools.chain(combos, (f"{c} {i}" for i in itertools.count(2) for c in combos)):
+        if len(names) >= count:
+            break
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate_tools(total: int, categories: List[str], seed: int) -> Iterator[Dict]:
+    """Yield ``total`` tool documents matching ``ToolSchema``."""
+    rng = random.Random(seed)
+    category_rank = Zipf(len(categories), 1.1, rng)
+    # Popularity rank of each tool; likes fall off as top_likes / rank**s.
+    ranks = list(range(1, total + 1))
+    rng.shuffle(ranks)
+
+    for index in range(total):
+        category = categories[category_rank.sample() - 1]
+        domain = category.split()[0]
+        if domain not in DOMAINS:
+            domain = rng.choice(DOMAINS)
+        name = f"{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_SUFFIXES)} {index + 1}"
+        slug = name.lower().replace(" ", "-")
+        features = rng.sample(FEATURES, 3)
+        about = (
+            f"{name} is an AI-powered {category} tool that helps teams with {domain} work. "
+            f"It offers {features[0]}, {features[1]} and {features[2]}. "
+            f"Trusted by creators who need fast, reliable {domain} results."
+        )
+        keywords = ["ai", domain, category] + rng.sample(QUALIFIERS, rng.randint(2, 7))
+        keywords = list(dict.fromkeys(keywords))[:10]
+        while len(keywords) < 5:
+            keywords.append(rng.choice(FEATURES))
+            keywords = list(dict.fromkeys(keywords))
+
+        likes = int(TOP_LIKES / ranks[index] ** POPULARITY_SKEW * rng.uniform(0.8, 1.2))
+        saves = int(likes * rng.uniform(0.2, 0.6))
+        created = EPOCH + timedelta(minutes=index * 7 + rng.randint(0, 6))
+
+        yield {
+            "title": name,
+            "logoUrl": f"https://ik.imagekit.io/seed/{slug}.png",
+            "websiteUrl": f"https://{slug}.example.com",
+            "category": category,
+            "categorySlug": category_slug(category),
+            "about": about,
+            "keywords": keywords,
+            "toolType": "downloadable" if rng.random() < DOWNLOADABLE_RATIO else "browser",
+            "isActive": rng.random() < ACTIVE_RATIO,
+            "likeCount": likes,
+            "saveCount": saves,
+            "createdAt": created,
+            "updatedAt": created,
+            "__v": 0,
+        }
+
+
+def ensure_indexes(collection) -> None:
+    """The indexes declared on ``ToolSchema``; production runs with autoIndex off."""
+    collection.create_index([("title", ASCENDING)], unique=True)
+    collection.create_index([("category", ASCENDING)])
+    collection.create_index([("keywords", ASCENDING)])
+    collection.create_index([("isActive", ASCENDING)])
+    collection.create_index([("isActive", ASCENDING), ("likeCount", DESCENDING), ("saveCount", DESCENDING), ("_id", DESCENDING)])
+    collection.create_index(
+        [("categorySlug", ASCENDING), ("isActive", ASCENDING), ("likeCount", DESCENDING), ("saveCount", DESCENDING), ("_id", DESCENDING)]
+    )
+    collection.create_index([("isActive", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)])
+    collection.create_index([("isActive", ASCENDING), ("title", ASCENDING), ("_id", ASCENDING)])
+
+
+def seed(collection, docs: Iterator[Dict], total: int, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    inserted = duplicates = 0
+    started = time.perf_counter()
+    batch: List[Dict] = []
+
+    def flush() -> None:
+        nonlocal inserted, duplicates
+        try:
+            inserted += len(collection.insert_many(batch, ordered=False).inserted_ids)
+        except BulkWriteError as exc:
+            details = exc.details
+            inserted += details.get("nInserted", 0)
+            errors = details.get("writeErrors", [])
+            duplicates += sum(1 for e in errors if e.get("code") == 11000)
+            if any(e.get("code") != 11000 for e in errors):
+                raise
+        batch.clear()
+        rate = inserted / max(time.perf_counter() - started, 1e-9)
+        print(f"\r{inserted:,}/{total:,} inserted ({rate:,.0f} docs/s)", end="", flush=True)
+
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    print()
+    return {"inserted": inserted, "duplicates": duplicates,
+            "seconds": round(time.perf_counter() - started, 1)}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="10k")
+    parser.add_argument("--tools", type=int, help="Override the preset's tool count")
+    parser.add_argument("--categories", type=int, help="Override the preset's category count")
+    parser.add_argument("--uri", default=os.environ.get("MONGODB_URI_TOOLS", DEFAULT_URI),
+                        help="Tools database URI (default: $MONGODB_URI_TOOLS)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for a reproducible catalog")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--drop", action="store_true", help="Drop the tools collection first")
+    parser.add_argument("--no-indexes", action="store_true", help="Skip creating the schema indexes")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    total, category_count = PRESETS[args.preset]
+    total = args.tools or total
+    category_count = args.categories or category_count
+
+    client = MongoClient(args.uri)
+    collection = client.get_default_database(default="aifindertools")[COLLECTION]
+    if args.drop:
+        collection.drop()
+    if not args.no_indexes:
+        ensure_indexes(collection)
+
+    categories = make_categories(category_count, random.Random(args.seed))
+    print(f"Seeding {total:,} tools across {len(categories):,} categories into "
+          f"{collection.database.name}.{COLLECTION}")
+    stats = seed(collection, generate_tools(total, categories, args.seed), total, args.batch_size)
+    print(f"Inserted {stats['inserted']:,} ({stats['duplicates']:,} duplicates skipped) "
+          f"in {stats['seconds']}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
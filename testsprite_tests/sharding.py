@@ -0,0 +1,215 @@
+"""Process-pool sharding for the TC suite.
+
+Splits the discovered TC scripts across worker processes, each running its
+own ``SuiteRunner`` with one browser, and merges the shard outputs into a
+single file in the ``tmp/test_results.json`` schema.
+
+Shards are balanced by historical duration (``modified - created`` of each
+entry in the previous results file) using longest-processing-time-first
+assignment, so the longest flows (the chatbot and end-to-end ones) land on
+separate workers instead of queueing behind each other.
+
+Usage:
+    python testsprite_tests/sharding.py --workers 4 --concurrency 2
+    python testsprite_tests/sharding.py --workers 4 --mock-groq 8787
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from suite_runner import (SUITE_DIR, SuiteRunner, TCModule, TCResult, build_parser, discover,
+                          make_mock_groq, summarize)
+
+RESULTS_FILE = SUITE_DIR / "tmp" / "test_results.json"
+# Estimate for every test when there is no history at all. Tests missing from
+# an existing history are estimated at the median of the known ones.
+FALLBACK_DURATION = 60.0
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _isoformat(timestamp: float) -> str:
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _test_id(title: str) -> str:
+    return title.split("-", 1)[0].strip()
+
+
+def load_records(path: Path = RESULTS_FILE) -> Dict[str, Dict[str, Any]]:
+    """Previous result records keyed by TC id (``TC004``)."""
+    if not path.exists():
+        return {}
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    return {_test_id(r.get("title", "")): r for r in records if r.get("title")}
+
+
+def load_history(records: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """Duration in seconds per TC id, from each record's timestamps."""
+    history = {}
+    for test_id, record in records.items():
+        created = _parse_time(record.get("created", ""))
+        modified = _parse_time(record.get("modified", ""))
+        if created and modified and modified > created:
+            history[test_id] = (modified - created).total_seconds()
+    return history
+
+
+def estimate(module: TCModule, history: Dict[str, float]) -> float:
+    if module.test_id in history:
+        return history[module.test_id]
+    return statistics.median(history.values()) if history else FALLBACK_DURATION
+
+
+def plan_shards(modules: List[TCModule], workers: int,
+                history: Dict[str, float]) -> List[List[TCModule]]:
+    """Assign modules to ``workers`` shards, longest first, to the lightest shard."""
+    weighted = sorted(modules, key=lambda m: estimate(m, history), reverse=True)
+
+    heap = [(0.0, index) for index in range(max(1, min(workers, len(modules))))]
+    shards: List[List[TCModule]] = [[] for _ in heap]
+    for module in weighted:
+        load, index = heapq.heappop(heap)
+        shards[index].append(module)
+        heapq.heappush(heap, (load + estimate(module, history), index))
+    return shards
+
+
+def _run_shard(paths: List[str], runner_options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Worker entry point: run one shard with its own browser."""
+    modules = [m for m in discover() if str(m.path) in set(paths)]
+    runner = SuiteRunner(**runner_options)
+    return [asdict(r) for r in asyncio.run(runner.run(modules))]
+
+
+def to_record(result: TCResult, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Render a result in the TestSprite ``test_results.json`` schema.
+
+    Identity fields (project, test and user ids, description, visualization)
+    carry over from the previous record for the same TC id when there is one.
+    Captured Web Vitals are stored alongside as ``performanceMetrics``.
+    """
+    previous = previous or {}
+    record = {
+        "projectId": previous.get("projectId", ""),
+        "testId": previous.get("testId", ""),
+        "userId": previous.get("userId", ""),
+        "title": previous.get("title") or f"{result.test_id}-{result.title}",
+        "description": previous.get("description", ""),
+        "code": Path(result.path).read_text(encoding="utf-8"),
+        "testStatus": result.status,
+        "testError": result.error,
+        "testType": previous.get("testType", "FRONTEND"),
+        "createFrom": previous.get("createFrom", "mcp"),
+        "testVisualization": previous.get("testVisualization", ""),
+        "created": _isoformat(result.started_at),
+        "modified": _isoformat(result.finished_at),
+    }
+    if "performance" in result.extra:
+        record["performanceMetrics"] = result.extra["performance"]
+    return record
+
+
+def merge_records(previous: Dict[str, Dict[str, Any]],
+                  results: List[TCResult]) -> List[Dict[str, Any]]:
+    """Previous records updated with this run's results, ordered by TC id.
+
+    Tests that were not selected keep their previous record.
+    """
+    merged = dict(previous)
+    merged.update({r.test_id: to_record(r, previous.get(r.test_id)) for r in results})
+    return [merged[test_id] for test_id in sorted(merged)]
+
+
+def run_sharded(modules: List[TCModule], workers: int, runner_options: Dict[str, Any],
+                history: Dict[str, float]) -> List[TCResult]:
+    shards = plan_shards(modules, workers, history)
+    for index, shard in enumerate(shards):
+        expected = sum(estimate(m, history) for m in shard)
+        print(f"shard {index}: {', '.join(m.test_id for m in shard)} (~{expected:.0f}s)", flush=True)
+
+    results: List[TCResult] = []
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [pool.submit(_run_shard, [str(m.path) for m in shard], runner_options)
+                   for shard in shards]
+        for future in futures:
+            results.extend(TCResult(**data) for data in future.result())
+
+    order = {m.path: i for i, m in enumerate(modules)}
+    return sorted(results, key=lambda r: order.get(Path(r.path), 0))
+
+
+async def run_sharded_with_mocks(modules: List[TCModule], workers: int, runner_options: Dict[str, Any],
+                                 history: Dict[str, float], args: argparse.Namespace) -> List[TCResult]:
+    """Run the shards, inside the mock Groq server when ``--mock-groq`` is given.
+
+    The server lives in this process; every shard's browser drives the same
+    app, which reaches it through GROQ_API_URL.
+    """
+    if not args.mock_groq:
+        return run_sharded(modules, workers, runner_options, history)
+    server = make_mock_groq(args)
+    async with server:
+        results = await asyncio.to_thread(run_sharded, modules, workers, runner_options, history)
+    print(f"Groq stand-in: {json.dumps(server.stats())}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser: argparse.ArgumentParser = build_parser()
+    parser.description = __doc__.split("\n\n")[0]
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--history", type=Path, default=RESULTS_FILE,
+                        help="Results file to read historical durations from")
+    parser.set_defaults(output=RESULTS_FILE)
+    args = parser.parse_args(argv)
+
+    modules = discover(select=args.select)
+    if not modules:
+        print("No TC scripts matched", file=sys.stderr)
+        return 2
+
+    previous = load_records(args.history)
+    runner_options = {
+        "concurrency": args.concurrency,
+        "timeout": args.timeout,
+        "headless": not args.headed,
+        "smart_waits": not args.fixed_waits,
+        "collect_metrics": not args.no_metrics,
+        "enforce_metrics": not args.metrics_report_only,
+        "origin": args.origin,
+    }
+    started = time.perf_counter()
+    results = asyncio.run(run_sharded_with_mocks(modules, args.workers, runner_options,
+                                                 load_history(previous), args))
+    print(summarize(results, time.perf_counter() - started))
+
+    records = merge_records(previous, results)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    return 0 if all(r.status == "PASSED" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""Concurrent runner for the generated TestSprite TC suite.
+
+Each generated ``TC0xx_*.py`` script starts its own Playwright driver and
+launches its own Chromium before calling ``run_test()``. This runner loads
+the scripts without executing their trailing ``asyncio.run(run_test())``,
+launches a single shared browser, and hands every test an isolated
+``new_context()`` on that browser. Tests run in one event loop, bounded by
+a configurable concurrency limit.
+
+Unless ``--fixed-waits`` is given, the scripts' ``page.wait_for_timeout`` and
+trailing ``asyncio.sleep`` calls are routed through ``waits.WaitEngine`` so
+they return as soon as the page is ready (see ``waits.py``). Every test's
+pages are also measured by ``web_vitals.MetricsCollector`` and fail the test
+when they miss the ``performanceRequirements`` in production-test-config.json.
+
+Usage:
+    python testsprite_tests/suite_runner.py --concurrency 4
+    python testsprite_tests/suite_runner.py -k TC004 -k TC006 --output tmp/run.json
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright import async_api
+
+from mock_groq import MockGroqServer, add_server_arguments
+from waits import SmartSleep, WaitEngine, install_smart_waits
+from web_vitals import DEFAULT_ORIGIN, MetricsCollector
+
+SUITE_DIR = Path(__file__).resolve().parent
+DEFAULT_PATTERN = "TC[0-9][0-9][0-9]_*.py"
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 300.0
+
+# Same flags as the generated scripts, minus --single-process, which does not
+# tolerate several contexts sharing one browser.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+
+@dataclass
+class TCModule:
+    """A discovered TC script."""
+
+    test_id: str
+    title: str
+    path: Path
+
+
+@dataclass
+class TCResult:
+    test_id: str
+    title: str
+    path: str
+    status: str
+    error: str = ""
+    duration: float = 0.0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def discover(directory: Path = SUITE_DIR, pattern: str = DEFAULT_PATTERN,
+             select: Optional[List[str]] = None) -> List[TCModule]:
+    """Find TC scripts in ``directory``, optionally filtered by substrings."""
+    modules = []
+    for path in sorted(directory.glob(pattern)):
+        test_id, _, rest = path.stem.partition("_")
+        if select and not any(s.lower() in path.stem.lower() for s in select):
+            continue
+        modules.append(TCModule(test_id=test_id, title=rest.replace("_", " "), path=path))
+    return modules
+
+
+def _is_entrypoint_call(node: ast.stmt) -> bool:
+    """Match the module-level ``asyncio.run(...)`` the generator appends."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (isinstance(func, ast.Attribute) and func.attr == "run"
+            and isinstance(func.value, ast.Name) and func.value.id == "asyncio")
+
+
+def load_flow(module: TCModule) -> Dict[str, Any]:
+    """Execute a TC script without its entrypoint and return its namespace."""
+    source = module.path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(module.path))
+    tree.body = [node for node in tree.body if not _is_entrypoint_call(node)]
+    namespace: Dict[str, Any] = {"__name__": f"testsprite_{module.test_id}",
+                                 "__file__": str(module.path)}
+    exec(compile(tree, str(module.path), "exec"), namespace)
+    if not asyncio.iscoroutinefunction(namespace.get("run_test")):
+        raise RuntimeError(f"{module.path.name} does not define async run_test()")
+    return namespace
+
+
+class _BorrowedBrowser:
+    """Proxy for the shared browser handed to a single test.
+
+    ``new_context()`` opens a real, isolated context on the shared browser;
+    ``close()`` only closes the contexts this test opened.
+    """
+
+    def __init__(self, browser: async_api.Browser, on_context=None):
+        self._browser = browser
+        self.on_context = on_context
+        self.contexts: List[async_api.BrowserContext] = []
+
+    async def new_context(self, **kwargs):
+        context = await self._browser.new_context(**kwargs)
+        self.contexts.append(context)
+        if self.on_context:
+            await self.on_context(context)
+        return context
+
+    async def new_page(self, **kwargs):
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    async def close(self, **_kwargs):
+        for context in self.contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self.contexts.clear()
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class _PooledPlaywright:
+    """Stands in for the object returned by ``async_playwright().start()``."""
+
+    def __init__(self, borrowed: _BorrowedBrowser):
+        self._borrowed = borrowed
+        self.chromium = self
+
+    async def launch(self, **_kwargs):
+        return self._borrowed
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        await self._borrowed.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+class _PooledAsyncApi:
+    """``playwright.async_api`` with ``async_playwright`` bound to the pool."""
+
+    def __init__(self, borrowed: _BorrowedBrowser):
+        self._borrowed = borrowed
+
+    def async_playwright(self):
+        return _PooledPlaywright(self._borrowed)
+
+    def __getattr__(self, name):
+        return getattr(async_api, name)
+
+
+@dataclass
+class TestSession:
+    """Per-test state shared between the runner and its hooks."""
+
+    result: TCResult
+    browser: _BorrowedBrowser
+    pages: List[async_api.Page] = field(default_factory=list)
+    wait_engines: List[WaitEngine] = field(default_factory=list)
+    metrics: Optional[MetricsCollector] = None
+
+    def open_pages(self) -> List[async_api.Page]:
+        return [p for p in self.pages if not p.is_closed()]
+
+
+class SuiteRunner:
+    """Run TC flows concurrently against one shared Chromium instance."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT,
+                 headless: bool = True, smart_waits: bool = True, collect_metrics: bool = True,
+                 enforce_metrics: bool = True, origin: str = DEFAULT_ORIGIN):
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.headless = headless
+        self.smart_waits = smart_waits
+        self.collect_metrics = collect_metrics
+        self.enforce_metrics = enforce_metrics
+        self.origin = origin
+        self._browser: Optional[async_api.Browser] = None
+
+    async def setup_context(self, context: async_api.BrowserContext, session: TestSession) -> None:
+        """Hook called for every context a test opens."""
+
+        def on_page(page: async_api.Page) -> None:
+            session.pages.append(page)
+            if self.smart_waits:
+                session.wait_engines.append(install_smart_waits(page))
+
+        context.on("page", on_page)
+        if self.collect_metrics:
+            if session.metrics is None:
+                session.metrics = MetricsCollector(origin=self.origin)
+            await session.metrics.attach(context)
+
+    async def teardown_test(self, session: TestSession) -> None:
+        """Hook called after a test finishes, before its contexts are closed."""
+        if session.wait_engines:
+            session.result.extra["waits"] = {
+                "summary": _merge_wait_summaries(session.wait_engines),
+                "steps": [step for engine in session.wait_engines for step in engine.report()],
+            }
+        if session.metrics is not None:
+            await session.metrics.drain()
+            report = session.metrics.report()
+            session.result.extra["performance"] = report
+            if self.enforce_metrics and report["violations"] and session.result.status == "PASSED":
+                session.result.status = "FAILED"
+                session.result.error = "Performance requirements not met: " + "; ".join(report["violations"])
+
+    def prepare_namespace(self, namespace: Dict[str, Any], session: TestSession) -> None:
+        """Hook to adjust a loaded TC namespace before ``run_test`` is called."""
+        namespace["async_api"] = _PooledAsyncApi(session.browser)
+        if self.smart_waits:
+            namespace["asyncio"] = SmartSleep(session.open_pages)
+
+    async def run_one(self, module: TCModule) -> TCResult:
+        result = TCResult(test_id=module.test_id, title=module.title,
+                          path=str(module.path), status="FAILED")
+        session = TestSession(result=result, browser=_BorrowedBrowser(self._browser))
+
+        async def on_context(context):
+            await self.setup_context(context, session)
+
+        session.browser.on_context = on_context
+        result.started_at = time.time()
+        try:
+            namespace = load_flow(module)
+            self.prepare_namespace(namespace, session)
+            await asyncio.wait_for(namespace["run_test"](), timeout=self.timeout)
+            result.status = "PASSED"
+        except asyncio.TimeoutError:
+            result.error = f"Timed out after {self.timeout:.0f}s"
+        except AssertionError as exc:
+            result.error = str(exc) or "Assertion failed"
+        except Exception as exc:  # noqa: BLE001 - a broken flow must not stop the suite
+            result.error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        finally:
+            result.finished_at = time.time()
+            result.duration = result.finished_at - result.started_at
+            try:
+                await self.teardown_test(session)
+            finally:
+                await session.browser.close()
+        return result
+
+    async def run(self, modules: List[TCModule]) -> List[TCResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(module: TCModule) -> TCResult:
+            async with semaphore:
+                result = await self.run_one(module)
+                print(f"[{result.status}] {result.test_id} {result.title} "
+                      f"({result.duration:.1f}s){' - ' + result.error if result.error else ''}",
+                      flush=True)
+                return result
+
+        async with async_api.async_playwright() as pw:
+            self._browser = await pw.chromium.launch(headless=self.headless, args=BROWSER_ARGS)
+            try:
+                return await asyncio.gather(*(bounded(m) for m in modules))
+            finally:
+                await self._browser.close()
+                self._browser = None
+
+
+def _merge_wait_summaries(engines: List[WaitEngine]) -> Dict[str, Any]:
+    summaries = [engine.summary() for engine in engines]
+    return {
+        "steps": sum(s["steps"] for s in summaries),
+        "waited_ms": round(sum(s["waited_ms"] for s in summaries), 1),
+        "budget_ms": round(sum(s["budget_ms"] for s in summaries), 1),
+        "over_budget": [name for s in summaries for name in s["over_budget"]],
+    }
+
+
+def summarize(results: List[TCResult], wall_time: float) -> str:
+    passed = sum(1 for r in results if r.status == "PASSED")
+    serial = sum(r.duration for r in results)
+    return (f"{passed}/{len(results)} passed in {wall_time:.1f}s "
+            f"(sum of test durations {serial:.1f}s)")
+
+
+def write_results(results: List[TCResult], output: Path) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", "--select", action="append",
+                        help="Only run TC files whose name contains this (repeatable)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of tests running at once")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Per-test timeout in seconds")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--fixed-waits", action="store_true",
+                        help="Keep the scripts' fixed sleeps instead of event-driven waits")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="Do not capture Web Vitals and API timings")
+    parser.add_argument("--metrics-report-only", action="store_true",
+                        help="Record performance metrics without failing tests on violations")
+    parser.add_argument("--origin", default=DEFAULT_ORIGIN,
+                        help="App origin whose pages and API calls are measured")
+    parser.add_argument("--mock-groq", type=int, metavar="PORT",
+                        help="Serve the local Groq stand-in on this port while the suite runs "
+                             "(the app must be started with GROQ_API_URL pointing at it)")
+    add_server_arguments(parser, prefix="mock-groq-")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    return parser
+
+
+def make_runner(args: argparse.Namespace) -> SuiteRunner:
+    return SuiteRunner(concurrency=args.concurrency, timeout=args.timeout,
+                       headless=not args.headed, smart_waits=not args.fixed_waits,
+                       collect_metrics=not args.no_metrics,
+                       enforce_metrics=not args.metrics_report_only, origin=args.origin)
+
+
+def make_mock_groq(args: argparse.Namespace) -> MockGroqServer:
+    """The Groq stand-in configured by the ``--mock-groq*`` options."""
+    return MockGroqServer(port=args.mock_groq, latency=args.mock_groq_latency,
+                          tokens_per_sec=args.mock_groq_tokens_per_sec,
+                          fail_429=args.mock_groq_fail_429, fail_5xx=args.mock_groq_fail_5xx,
+                          seed=args.mock_groq_seed)
+
+
+async def run_with_mocks(runner: SuiteRunner, modules: List[TCModule],
+                         args: argparse.Namespace) -> List[TCResult]:
+    """Run the suite, inside the mock Groq server when ``--mock-groq`` is given."""
+    if not args.mock_groq:
+        return await runner.run(modules)
+    server = make_mock_groq(args)
+    async with server:
+        results = await runner.run(modules)
+    print(f"Groq stand-in: {json.dumps(server.stats())}")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    modules = discover(select=args.select)
+    if not modules:
+        print("No TC scripts matched", file=sys.stderr)
+        return 2
+
+    runner = make_runner(args)
+    started = time.perf_counter()
+    results = asyncio.run(run_with_mocks(runner, modules, args))
+    print(summarize(results, time.perf_counter() - started))
+
+    if args.output:
+        write_results(results, args.output)
+    return 0 if all(r.status == "PASSED" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
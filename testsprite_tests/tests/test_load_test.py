@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import argparse  # noqa: E402
+
+from load_test import LatencyHistogram, build_parser, is_saturated, parse_mix  # noqa: E402
+
+
+def report(p99=100.0, throughput=50.0, offered=50.0, error_rate=0.0, dropped=0):
+    return {"offeredRps": offered, "throughputRps": throughput, "latencyMs": {"p99": p99},
+            "errorRate": error_rate, "dropped": dropped}
+
+
+def test_percentiles_are_within_the_histogram_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    # Bucket upper edges: never below the true value, at most 1% above it
+    assert 500 <= histogram.percentile(50) <= 505
+    assert 990 <= histogram.percentile(99) <= 999.9
+    assert histogram.percentile(100) == 1000
+    assert histogram.summary()["count"] == 1000
+
+
+def test_percentiles_never_exceed_the_maximum():
+    histogram = LatencyHistogram()
+    histogram.record(12.3456)
+
+    assert histogram.percentile(99.9) == 12.3456
+    assert LatencyHistogram().percentile(50) == 0.0
+
+
+def test_merged_histograms_report_the_combined_distribution():
+    fast, slow = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        fast.record(10.0)
+    for _ in range(10):
+        slow.record(500.0)
+    fast.merge(slow)
+
+    assert fast.percentile(50) == pytest.approx(10, rel=1e-2)
+    assert fast.percentile(95) == 500.0
+    assert fast.max == 500.0
+
+
+def test_is_saturated():
+    assert not is_saturated(report(), slo_ms=1000)
+    assert is_saturated(report(p99=1500), slo_ms=1000)
+    assert is_saturated(report(throughput=40), slo_ms=1000)
+    assert is_saturated(report(error_rate=0.02), slo_ms=1000)
+    assert is_saturated(report(dropped=1), slo_ms=1000)
+    # Closed-loop reports have no offered rate to fall behind
+    assert not is_saturated({**report(throughput=1), "offeredRps": None}, slo_ms=1000)
+
+
+def test_parse_mix_drops_zero_weights():
+    assert parse_mix("tools=4,stats,ai-agent=0") == {"tools": 4.0, "stats": 1.0}
+
+
+@pytest.mark.parametrize("text", ["ai-agent=0", "tools=0,stats=0", "tools=fast"])
+def test_parse_mix_rejects_unusable_mixes(text):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix(text)
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(["open", "--mix", text])
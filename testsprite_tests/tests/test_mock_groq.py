@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from mock_groq import classify  # noqa: E402
+
+
+@pytest.mark.parametrize("system, kind", [
+    ("Extract search intent from the message", "search_intent"),
+    ("Generate a concise response about AI tools for the user", "chat_answer"),
+    ("You are a keyword extractor for AI tools", "keywords"),
+    ("You are a tool description generator", "short_about"),
+    ("You are a tool summary generator", "about"),
+    ("You write catalog metadata for AI tools. For every tool below return:", "metadata_batch"),
+    ("Something else entirely", "generic"),
+])
+def test_classify_by_system_prompt(system, kind):
+    assert classify([{"role": "system", "content": system}, {"role": "user", "content": "hi"}]) == kind
+
+
+def test_classify_without_a_system_prompt():
+    assert classify([{"role": "user", "content": "Extract search intent"}]) == "generic"
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+import re  # noqa: E402
+
+from bson import Regex  # noqa: E402
+
+from query_audit import _regex_flags, _shape, shape_key  # noqa: E402
+
+
+def test_shape_replaces_literals_with_placeholders():
+    assert _shape({"isActive": True, "categorySlug": {"$in": ["a", "b"]}, "title": Regex("^x", "i")}) == {
+        "isActive": "?",
+        "categorySlug": {"$in": "?"},
+        "title": "/?/i",
+    }
+    assert _shape({"$or": [{"a": 1}, {"b": Regex("x")}]}) == {"$or": [{"a": "?"}, {"b": "/?/"}]}
+
+
+def test_queries_differing_only_in_values_share_a_shape():
+    first = {"find": "tools", "filter": {"categorySlug": "writing"}, "limit": 25}
+    second = {"find": "tools", "filter": {"categorySlug": "image-generation"}, "limit": 50}
+
+    assert shape_key(first) == shape_key(second)
+    assert shape_key(first) != shape_key({"find": "tools", "filter": {"title": "x"}, "limit": 25})
+
+
+def test_regex_flags_finds_index_defeating_regexes():
+    assert _regex_flags({"categorySlug": "writing"}) == []
+    assert _regex_flags({"title": Regex("^Cursor")}) == []
+    assert _regex_flags({"title": Regex("^cursor", re.IGNORECASE)}) == ["regex:case-insensitive"]
+    assert _regex_flags({"$or": [{"about": {"$regex": "ai", "$options": "i"}}]}) == [
+        "regex:case-insensitive", "regex:unanchored",
+    ]
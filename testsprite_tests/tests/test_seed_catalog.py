@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+from seed_catalog import category_slug  # noqa: E402
+
+
+# Expected values are what toCategorySlug in models/tools.ts returns
+@pytest.mark.parametrize("category, slug", [
+    ("Image Generation", "image-generation"),
+    ("  All in One   AI Tools ", "all-in-one-ai-tools"),
+    ("-Video - Editing-", "video-editing"),
+    ("AI &amp; ML", "ai-&-ml"),
+    ("AI & ML", "ai-&-ml"),
+    ("Code &lt;Dev&gt;", "code-<dev>"),
+    ("Text &#x2F; Speech", "text-/-speech"),
+])
+def test_category_slug_matches_the_app(category, slug):
+    assert category_slug(category) == slug
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("aiohttp")
+
+from pathlib import Path  # noqa: E402
+
+from sharding import FALLBACK_DURATION, estimate, merge_records, plan_shards, to_record  # noqa: E402
+from suite_runner import TCModule, TCResult  # noqa: E402
+
+
+def module(test_id):
+    return TCModule(test_id, test_id.lower(), Path(f"{test_id}_test.py"))
+
+
+def result(tmp_path, test_id, status="PASSED", **extra):
+    path = tmp_path / f"{test_id}_test.py"
+    path.write_text("# test\n", encoding="utf-8")
+    return TCResult(test_id, "Flow", str(path), status, started_at=0.0, finished_at=61.5, extra=extra)
+
+
+def test_plan_shards_assigns_longest_first_to_the_lightest_shard():
+    history = {"TC001": 100.0, "TC002": 80.0, "TC003": 60.0, "TC004": 50.0, "TC005": 30.0}
+    modules = [module(test_id) for test_id in sorted(history)]
+
+    shards = plan_shards(modules, 2, history)
+
+    assert [[m.test_id for m in shard] for shard in shards] == [
+        ["TC001", "TC004"],
+        ["TC002", "TC003", "TC005"],
+    ]
+
+
+def test_plan_shards_never_makes_empty_shards():
+    shards = plan_shards([module("TC001")], 4, {})
+
+    assert len(shards) == 1
+
+
+def test_unknown_tests_are_estimated_at_the_median():
+    history = {"TC001": 10.0, "TC002": 20.0, "TC003": 90.0}
+
+    assert estimate(module("TC009"), history) == 20.0
+    assert estimate(module("TC009"), {}) == FALLBACK_DURATION
+
+
+def test_to_record_keeps_identity_fields_of_the_previous_record(tmp_path):
+    previous = {"projectId": "p1", "testId": "t1", "title": "TC001-Login", "testType": "BACKEND"}
+
+    record = to_record(result(tmp_path, "TC001", performance={"lcp": 1200}), previous)
+
+    assert record["projectId"] == "p1"
+    assert record["title"] == "TC001-Login"
+    assert record["testType"] == "BACKEND"
+    assert record["code"] == "# test\n"
+    assert record["created"] == "1970-01-01T00:00:00.000Z"
+    assert record["modified"] == "1970-01-01T00:01:01.500Z"
+    assert record["performanceMetrics"] == {"lcp": 1200}
+
+
+def test_merge_records_keeps_tests_that_did_not_run(tmp_path):
+    previous = {
+        "TC001": {"title": "TC001-Login", "testStatus": "FAILED"},
+        "TC003": {"title": "TC003-Search", "testStatus": "PASSED"},
+    }
+
+    records = merge_records(previous, [result(tmp_path, "TC002"), result(tmp_path, "TC001")])
+
+    assert [r["title"] for r in records] == ["TC001-Login", "TC002-Flow", "TC003-Search"]
+    assert [r["testStatus"] for r in records] == ["PASSED", "PASSED", "PASSED"]
@@ -0,0 +1,237 @@
+"""Event-driven waits for the TC scripts.
+
+The generated scripts sleep a fixed 3s before every interaction and 5s at the
+end of every test. ``WaitEngine`` replaces those sleeps with waits on concrete
+readiness signals and records how long each step actually took:
+
+    waits = WaitEngine.attach(page)
+    async with waits.step("open chatbot", budget_ms=2000):
+        await waits.visible("textarea")
+        await waits.api_idle("/api/ai-agent")
+    print(waits.report())
+
+Signals:
+    visible(selector)      -- a selector or locator is visible
+    api_idle(*routes)      -- no in-flight requests to the given /api/ routes
+    hydrated()             -- ``<html data-hydrated="true">`` set by Providers.tsx
+    response(route)        -- a matching response arrives (optionally after an action)
+    settle(max_ms)         -- all of the above that apply, capped at ``max_ms``
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from playwright import async_api
+
+API_PREFIX = "/api/"
+DEFAULT_TIMEOUT_MS = 10000
+DEFAULT_IDLE_MS = 250
+# Pages outside the Next.js app never set the marker; for those a complete
+# document is as ready as it gets.
+HYDRATED_SCRIPT = """() => document.documentElement.dataset.hydrated === 'true'
+    || (document.readyState === 'complete' && !document.querySelector('script[src*="/_next/"]'))"""
+
+
+@dataclass
+class StepTiming:
+    name: str
+    elapsed_ms: float
+    budget_ms: Optional[float] = None
+    ok: bool = True
+    detail: str = ""
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ms is not None and self.elapsed_ms > self.budget_ms
+
+
+class WaitEngine:
+    """Tracks in-flight API requests on a page and waits on readiness signals."""
+
+    def __init__(self, page: async_api.Page, api_prefix: str = API_PREFIX):
+        self.page = page
+        self.api_prefix = api_prefix
+        self.steps: List[StepTiming] = []
+        self._inflight: Dict[async_api.Request, str] = {}
+        self._changed = asyncio.Event()
+        self._last_activity = time.monotonic()
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    @classmethod
+    def attach(cls, page: async_api.Page) -> "WaitEngine":
+        """Return the engine bound to ``page``, creating it on first use."""
+        engine = getattr(page, "_wait_engine", None)
+        if engine is None:
+            engine = cls(page)
+            setattr(page, "_wait_engine", engine)
+        return engine
+
+    # -- request tracking -------------------------------------------------
+
+    def _path(self, url: str) -> str:
+        after_scheme = url.split("://", 1)[-1]
+        slash = after_scheme.find("/")
+        return after_scheme[slash:] if slash >= 0 else "/"
+
+    def _on_request(self, request: async_api.Request) -> None:
+        path = self._path(request.url)
+        if path.startswith(self.api_prefix):
+            self._inflight[request] = path
+            self._touch()
+
+    def _on_request_done(self, request: async_api.Request) -> None:
+        if self._inflight.pop(request, None) is not None:
+            self._touch()
+
+    def _touch(self) -> None:
+        self._last_activity = time.monotonic()
+        self._changed.set()
+
+    def inflight(self, routes: Sequence[str] = ()) -> Set[str]:
+        """Paths of API requests still in flight, filtered by route prefixes."""
+        paths = set(self._inflight.values())
+        if routes:
+            paths = {p for p in paths if any(p.startswith(r) for r in routes)}
+        return paths
+
+    # -- signals ----------------------------------------------------------
+
+    async def visible(self, target: Union[str, async_api.Locator],
+                      timeout_ms: float = DEFAULT_TIMEOUT_MS) -> None:
+        locator = self.page.locator(target).first if isinstance(target, str) else target
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+
+    async def api_idle(self, *routes: str, idle_ms: float = DEFAULT_IDLE_MS,
+                       timeout_ms: float = DEFAULT_TIMEOUT_MS) -> None:
+        """Wait until matching API requests have been quiet for ``idle_ms``."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            now = time.monotonic()
+            quiet_for = (now - self._last_activity) * 1000
+            if not self.inflight(routes) and quiet_for >= idle_ms:
+                return
+            if now >= deadline:
+                pending = ", ".join(sorted(self.inflight(routes))) or "recent activity"
+                raise async_api.TimeoutError(
+                    f"API not idle after {timeout_ms:.0f}ms (pending: {pending})")
+            self._changed.clear()
+            wake_in = max(idle_ms - quiet_for, 10) / 1000
+            try:
+                await asyncio.wait_for(self._changed.wait(),
+                                       timeout=min(wake_in, deadline - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def hydrated(self, timeout_ms: float = DEFAULT_TIMEOUT_MS) -> None:
+        """Wait for the ``data-hydrated`` marker set by ``Providers.tsx``."""
+        await self.page.wait_for_function(HYDRATED_SCRIPT, timeout=timeout_ms)
+
+    async def response(self, route: str, action: Optional[Callable[[], Awaitable[object]]] = None,
+                       timeout_ms: float = DEFAULT_TIMEOUT_MS) -> async_api.Response:
+        """Wait for a response whose path starts with ``route``.
+
+        When ``action`` is given the listener is armed before it runs, so a
+        fast response cannot be missed.
+        """
+        def matches(resp: async_api.Response) -> bool:
+            return self._path(resp.url).startswith(route)
+
+        async with self.page.expect_response(matches, timeout=timeout_ms) as info:
+            if action is not None:
+                await action()
+        return await info.value
+
+    async def settle(self, max_ms: float = DEFAULT_TIMEOUT_MS, *routes: str) -> None:
+        """Wait for DOM, hydration and API quiescence, but never past ``max_ms``.
+
+        This is the drop-in replacement for ``page.wait_for_timeout``: the old
+        fixed delay becomes an upper bound instead of a floor.
+        """
+        deadline = time.monotonic() + max_ms / 1000
+
+        def remaining() -> float:
+            return max((deadline - time.monotonic()) * 1000, 0)
+
+        try:
+            await self.page.wait_for_load_state("domcontentloaded", timeout=remaining() or 1)
+            await self.hydrated(timeout_ms=remaining() or 1)
+            await self.api_idle(*routes, timeout_ms=remaining() or 1)
+        except async_api.Error:
+            # Running out the cap is the old behaviour; not a failure.
+            pass
+
+    # -- step timing ------------------------------------------------------
+
+    @asynccontextmanager
+    async def step(self, name: str, budget_ms: Optional[float] = None):
+        started = time.perf_counter()
+        timing = StepTiming(name=name, elapsed_ms=0.0, budget_ms=budget_ms)
+        try:
+            yield timing
+        except BaseException as exc:
+            timing.ok = False
+            timing.detail = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            timing.elapsed_ms = (time.perf_counter() - started) * 1000
+            self.steps.append(timing)
+
+    def report(self) -> List[dict]:
+        return [dict(asdict(s), over_budget=s.over_budget) for s in self.steps]
+
+    def summary(self) -> dict:
+        total = sum(s.elapsed_ms for s in self.steps)
+        budget = sum(s.budget_ms or 0 for s in self.steps)
+        return {
+            "steps": len(self.steps),
+            "waited_ms": round(total, 1),
+            "budget_ms": round(budget, 1),
+            "over_budget": [s.name for s in self.steps if s.over_budget],
+        }
+
+
+def install_smart_waits(page: async_api.Page) -> WaitEngine:
+    """Route a page's ``wait_for_timeout`` through ``WaitEngine.settle``.
+
+    Each replaced sleep is recorded as a step whose budget is the delay the
+    script originally asked for.
+    """
+    engine = WaitEngine.attach(page)
+    counter = {"n": 0}
+
+    async def wait_for_timeout(timeout: float) -> None:
+        counter["n"] += 1
+        async with engine.step(f"wait_for_timeout#{counter['n']}", budget_ms=timeout):
+            await engine.settle(timeout)
+
+    page.wait_for_timeout = wait_for_timeout
+    return engine
+
+
+class SmartSleep:
+    """``asyncio`` stand-in whose ``sleep`` settles the active page instead.
+
+    The generated scripts end with ``await asyncio.sleep(5)`` purely to let
+    the page finish; waiting for the page to settle is enough.
+    """
+
+    def __init__(self, pages: Callable[[], List[async_api.Page]]):
+        self._pages = pages
+
+    async def sleep(self, delay: float, result=None):
+        pages = [p for p in self._pages() if not p.is_closed()]
+        if not pages:
+            return result
+        engine = WaitEngine.attach(pages[-1])
+        async with engine.step("asyncio.sleep", budget_ms=delay * 1000):
+            await engine.settle(delay * 1000)
+        return result
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
@@ -0,0 +1,231 @@
+"""Per-test Web Vitals and timing capture for the TC suite.
+
+``MetricsCollector`` attaches to a browser context and records, for every
+document loaded from the app origin:
+
+    TTFB, FCP, LCP, CLS, long tasks  -- Performance API observers in the page
+    page load time                   -- navigation timing (loadEventEnd)
+    image load time                  -- resource timing for <img> requests
+    JS heap                          -- CDP ``Performance.getMetrics``
+
+plus the timing of every ``/api/`` response. Observers report to Python as
+entries arrive through an exposed binding, so nothing is lost when a flow
+closes its context before the runner gets to look.
+
+``check()`` compares the capture with ``performanceRequirements`` in
+``production-test-config.json``.
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from playwright import async_api
+
+CONFIG_FILE = Path(__file__).resolve().parent / "production-test-config.json"
+DEFAULT_ORIGIN = "http://localhost:3000"
+BINDING = "__tcReportVital"
+
+INIT_SCRIPT = """
+(() => {
+  if (window.__tcVitals) return;
+  window.__tcVitals = true;
+  const doc = Math.random().toString(36).slice(2);
+  const report = (kind, data) => {
+    try { window.%(binding)s({ doc, url: location.href, kind, ...data }); } catch (e) {}
+  };
+  const observe = (type, cb) => {
+    try { new PerformanceObserver((list) => list.getEntries().forEach(cb)).observe({ type, buffered: true }); }
+    catch (e) {}
+  };
+  observe('paint', (e) => { if (e.name === 'first-contentful-paint') report('fcp', { value: e.startTime }); });
+  observe('largest-contentful-paint', (e) => report('lcp', { value: e.startTime }));
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) report('cls', { value: e.value }); });
+  observe('longtask', (e) => report('longtask', { value: e.duration }));
+  observe('resource', (e) => {
+    if (e.initiatorType === 'img') report('image', { value: e.duration, name: e.name });
+  });
+  addEventListener('load', () => setTimeout(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return;
+    report('navigation', {
+      ttfb: nav.responseStart - nav.startTime,
+      domContentLoaded: nav.domContentLoadedEventEnd - nav.startTime,
+      load: nav.loadEventEnd - nav.startTime,
+    });
+  }, 0));
+})();
+""" % {"binding": BINDING}
+
+_UNITS = {
+    "ms": 1, "millisecond": 1, "milliseconds": 1,
+    "s": 1000, "sec": 1000, "second": 1000, "seconds": 1000,
+    "b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3,
+}
+
+
+def parse_requirement(text: str) -> Optional[float]:
+    """Turn ``"< 3 seconds"`` into 3000 (ms) and ``"< 100MB"`` into bytes."""
+    match = re.match(r"\s*<\s*([\d.]+)\s*([a-zA-Z]*)", text or "")
+    if not match:
+        return None
+    unit = _UNITS.get(match.group(2).lower())
+    return float(match.group(1)) * unit if unit else None
+
+
+def load_thresholds(path: Path = CONFIG_FILE) -> Dict[str, float]:
+    """Numeric thresholds from ``performanceRequirements``; unparsable ones are skipped."""
+    config = json.loads(path.read_text(encoding="utf-8"))
+    thresholds = {}
+    for name, text in config.get("performanceRequirements", {}).items():
+        limit = parse_requirement(text)
+        if limit is not None:
+            thresholds[name] = limit
+    return thresholds
+
+
+@dataclass
+class DocumentMetrics:
+    url: str
+    ttfb: Optional[float] = None
+    fcp: Optional[float] = None
+    lcp: Optional[float] = None
+    cls: float = 0.0
+    dom_content_loaded: Optional[float] = None
+    load: Optional[float] = None
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+    images: List[float] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "ttfbMs": self.ttfb,
+            "fcpMs": self.fcp,
+            "lcpMs": self.lcp,
+            "cls": round(self.cls, 4),
+            "domContentLoadedMs": self.dom_content_loaded,
+            "pageLoadMs": self.load,
+            "longTasks": {"count": self.long_tasks, "totalMs": round(self.long_task_ms, 1)},
+            "imageLoadMaxMs": max(self.images) if self.images else None,
+        }
+
+
+class MetricsCollector:
+    """Collects page and API timings for every page in the contexts it is attached to."""
+
+    def __init__(self, origin: str = DEFAULT_ORIGIN, thresholds: Optional[Dict[str, float]] = None):
+        self.origin = origin.rstrip("/")
+        self.thresholds = thresholds if thresholds is not None else load_thresholds()
+        self.documents: Dict[str, DocumentMetrics] = {}
+        self.api_calls: List[Dict[str, Any]] = []
+        self.js_heap_max: Optional[float] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def attach(self, context: async_api.BrowserContext) -> None:
+        await context.expose_binding(BINDING, self._on_vital)
+        await context.add_init_script(INIT_SCRIPT)
+        context.on("page", self._on_page)
+        context.on("requestfinished", self._on_request_finished)
+
+    # -- event handlers ---------------------------------------------------
+
+    def _is_app(self, url: str) -> bool:
+        return url.startswith(self.origin)
+
+    def _on_vital(self, _source: Dict[str, Any], payload: Dict[str, Any]) -> None:
+        if not self._is_app(payload.get("url", "")):
+            return
+        doc = self.documents.setdefault(payload["doc"], DocumentMetrics(url=payload["url"]))
+        kind, value = payload["kind"], payload.get("value")
+        if kind == "fcp":
+            doc.fcp = value
+        elif kind == "lcp":
+            doc.lcp = value
+        elif kind == "cls":
+            doc.cls += value
+        elif kind == "longtask":
+            doc.long_tasks += 1
+            doc.long_task_ms += value
+        elif kind == "image":
+            doc.images.append(value)
+        elif kind == "navigation":
+            doc.ttfb = payload["ttfb"]
+            doc.dom_content_loaded = payload["domContentLoaded"]
+            doc.load = payload["load"]
+
+    def _on_request_finished(self, request: async_api.Request) -> None:
+        if not self._is_app(request.url) or "/api/" not in request.url:
+            return
+        timing = request.timing
+        self._spawn(self._record_api_call(request, timing.get("responseEnd", -1)))
+
+    async def _record_api_call(self, request: async_api.Request, elapsed: float) -> None:
+        response = await request.response()
+        path = request.url[len(self.origin):].split("?", 1)[0]
+        self.api_calls.append({
+            "method": request.method,
+            "path": path,
+            "status": response.status if response else None,
+            "ms": round(elapsed, 1) if elapsed >= 0 else None,
+        })
+
+    def _on_page(self, page: async_api.Page) -> None:
+        self._spawn(self._watch_heap(page))
+
+    async def _watch_heap(self, page: async_api.Page) -> None:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+
+        async def sample(*_args) -> None:
+            metrics = await cdp.send("Performance.getMetrics")
+            for metric in metrics.get("metrics", []):
+                if metric["name"] == "JSHeapUsedSize":
+                    self.js_heap_max = max(self.js_heap_max or 0, metric["value"])
+
+        page.on("load", lambda _page: self._spawn(sample()))
+        await sample()
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # -- reporting --------------------------------------------------------
+
+    async def drain(self) -> None:
+        """Wait for pending CDP samples; pages may already be closed."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def check(self) -> List[str]:
+        """Threshold violations, one human-readable line each."""
+        violations = []
+        limits = self.thresholds
+        for doc in self.documents.values():
+            if "pageLoadTime" in limits and doc.load and doc.load > limits["pageLoadTime"]:
+                violations.append(f"pageLoadTime {doc.load:.0f}ms > {limits['pageLoadTime']:.0f}ms ({doc.url})")
+            if "imageLoadTime" in limits and doc.images and max(doc.images) > limits["imageLoadTime"]:
+                violations.append(
+                    f"imageLoadTime {max(doc.images):.0f}ms > {limits['imageLoadTime']:.0f}ms ({doc.url})")
+        if "apiResponseTime" in limits:
+            for call in self.api_calls:
+                if call["ms"] is not None and call["ms"] > limits["apiResponseTime"]:
+                    violations.append(f"apiResponseTime {call['ms']:.0f}ms > "
+                                      f"{limits['apiResponseTime']:.0f}ms ({call['method']} {call['path']})")
+        if "memoryUsage" in limits and self.js_heap_max and self.js_heap_max > limits["memoryUsage"]:
+            violations.append(f"memoryUsage {self.js_heap_max / 1024 ** 2:.1f}MB > "
+                              f"{limits['memoryUsage'] / 1024 ** 2:.0f}MB")
+        return violations
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "documents": [doc.as_dict() for doc in self.documents.values()],
+            "api": self.api_calls,
+            "jsHeapMaxBytes": self.js_heap_max,
+            "thresholds": self.thresholds,
+            "violations": self.check(),
+        }
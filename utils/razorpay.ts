@@ -1,5 +1,6 @@
 import Razorpay from 'razorpay';
 import crypto from 'crypto';
+import { timeUpstream } from '../lib/metrics';
 
 // Check if required environment variables are set
 const checkRazorpayConfig = () => {
@@ -36,7 +37,7 @@ export const createOrder = async (amount: number, receipt: string) => {
       payment_capture: 1,
     };
 
-    const order = await razorpay.orders.create(options);
+    const order = await timeUpstream('razorpay', () => razorpay.orders.create(options));
     return order;
   } catch (error) {
     console.error('Error creating Razorpay order:', error);